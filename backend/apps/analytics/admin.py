@@ -7,6 +7,7 @@ class PlatformAnalyticsAdmin(admin.ModelAdmin):
     list_display = ['platform_content', 'platform', 'metric_type', 'metric_value', 'recorded_at']
     list_filter = ['platform', 'metric_type', 'recorded_at']
     search_fields = ['platform_content__content_block__title']
+    list_select_related = ['platform_content__content_block']
     readonly_fields = ['recorded_at']
 
 
@@ -15,6 +16,7 @@ class PlatformConnectionAdmin(admin.ModelAdmin):
     list_display = ['user', 'platform', 'platform_username', 'is_active', 'connected_at', 'last_synced_at']
     list_filter = ['platform', 'is_active', 'connected_at']
     search_fields = ['user__email', 'platform_username', 'platform_user_id']
+    list_select_related = ['user']
     readonly_fields = ['connected_at']
     
     fieldsets = (
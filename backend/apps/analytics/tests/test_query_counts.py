@@ -0,0 +1,29 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from apps.analytics.models import PlatformAnalytics, PlatformConnection
+from apps.content.models import ContentBlock, PlatformContent
+from viral_ai.testing import QueryCountMixin
+
+User = get_user_model()
+
+
+class AnalyticsAdminQueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(email='admin@example.com', username='admin', password='pw12345!')
+        self.client.force_login(self.user)
+
+    def add_rows(self, count):
+        for _ in range(count):
+            n = User.objects.count()
+            user = User.objects.create_user(email=f'creator{n}@example.com', username=f'creator{n}', password='pw12345!')
+            block = ContentBlock.objects.create(user=user, title=f'Block {n}')
+            version = PlatformContent.objects.create(content_block=block, platform='instagram')
+            PlatformAnalytics.objects.create(platform_content=version, platform='instagram', metric_type='likes')
+            PlatformConnection.objects.create(user=user, platform='instagram')
+
+    def test_changelists(self):
+        for model in ('platformanalytics', 'platformconnection'):
+            with self.subTest(model=model):
+                self.assertConstantQueries(lambda: self.client.get(reverse(f'admin:analytics_{model}_changelist')), self.add_rows)
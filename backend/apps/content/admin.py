@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ContentBlock, PlatformContent, BrandKit, ImageLibrary
+from .models import ContentBlock, ContentBatchJob, PlatformContent, BrandKit, ImageLibrary
 
 
 class PlatformContentInline(admin.TabularInline):
@@ -15,6 +15,7 @@ class ContentBlockAdmin(admin.ModelAdmin):
     list_filter = ['status', 'niche', 'created_at']
     search_fields = ['title', 'keyword_text', 'user__email']
     readonly_fields = ['created_at', 'updated_at', 'total_reach', 'total_engagement', 'total_clicks']
+    list_select_related = ['user']
     inlines = [PlatformContentInline]
     
     fieldsets = (
@@ -22,7 +23,7 @@ class ContentBlockAdmin(admin.ModelAdmin):
             'fields': ('user', 'keyword', 'title', 'keyword_text', 'niche')
         }),
         ('Content Settings', {
-            'fields': ('content_angle', 'tone', 'status')
+            'fields': ('content_angle', 'tone', 'status', 'scheduled_for')
         }),
         ('Performance Metrics', {
             'fields': ('total_reach', 'total_engagement', 'total_clicks', 'total_conversions', 'revenue_generated'),
@@ -31,12 +32,22 @@ class ContentBlockAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(ContentBatchJob)
+class ContentBatchJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'status', 'total_items', 'completed_items', 'failed_items', 'created_at', 'finished_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['user__email']
+    list_select_related = ['user']
+    readonly_fields = ['attempts', 'heartbeat_at', 'created_at', 'updated_at', 'finished_at']
+
+
 @admin.register(PlatformContent)
 class PlatformContentAdmin(admin.ModelAdmin):
     list_display = ['content_block', 'platform', 'content_type', 'posted_at', 'reach', 'engagement']
     list_filter = ['platform', 'content_type', 'posted_at']
     search_fields = ['content_block__title', 'caption']
     readonly_fields = ['created_at', 'updated_at']
+    list_select_related = ['content_block']
 
 
 @admin.register(BrandKit)
@@ -44,6 +55,7 @@ class BrandKitAdmin(admin.ModelAdmin):
     list_display = ['name', 'user', 'is_default', 'created_at']
     list_filter = ['is_default']
     search_fields = ['name', 'user__email']
+    list_select_related = ['user']
 
 
 @admin.register(ImageLibrary)
@@ -51,3 +63,4 @@ class ImageLibraryAdmin(admin.ModelAdmin):
     list_display = ['filename', 'user', 'folder', 'file_size', 'is_ai_generated', 'created_at']
     list_filter = ['is_ai_generated', 'folder', 'created_at']
     search_fields = ['filename', 'user__email', 'tags']
+    list_select_related = ['user']
@@ -0,0 +1,302 @@
+"""
+Batch Content Generation
+Runs content calendar batches through a shared worker pool with per-user concurrency caps
+"""
+import threading
+import time
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.users.models import TIER_LIMITS, UsageTracking
+from viral_ai.background_jobs import ACTIVE_STATUSES, Heartbeat, resume_if_stale, start_job
+from .models import ContentBatchJob, ContentBlock, PlatformContent
+from .services import ContentGenerationService
+
+logger = logging.getLogger(__name__)
+
+# Seconds between progress writes while items complete
+PROGRESS_INTERVAL = 1.0
+
+SPEC_DEFAULTS = {
+    'content_type': 'post',
+    'tone': 'professional',
+    'angle': 'informative',
+    'niche': '',
+    'custom_prompt': '',
+    'scheduled_for': None,
+}
+
+
+# ==============================================================================
+# Spec normalisation
+# ==============================================================================
+
+def normalize_spec(spec: Dict) -> Dict:
+    """Canonical form of a batch item spec (JSON-safe)"""
+    scheduled_for = spec.get('scheduled_for')
+    normalized = {
+        **SPEC_DEFAULTS,
+        **{key: value for key, value in spec.items() if value is not None},
+        'keyword': ' '.join(spec['keyword'].split()),
+        'platforms': sorted(set(spec['platforms'])),
+        'scheduled_for': scheduled_for.isoformat() if hasattr(scheduled_for, 'isoformat') else scheduled_for,
+    }
+    return normalized
+
+
+def spec_key(spec: Dict) -> Tuple:
+    """Two specs with the same key would generate the same content"""
+    return (
+        spec['keyword'].lower(),
+        tuple(spec['platforms']),
+        spec['content_type'],
+        spec['tone'],
+        spec['angle'],
+        spec['niche'].lower(),
+        spec['custom_prompt'],
+        spec['scheduled_for'],
+    )
+
+
+def dedupe_specs(specs: List[Dict]) -> Tuple[List[Dict], int]:
+    """
+    Collapse identical specs into one job item
+
+    Returns:
+        (job items, number of duplicates removed); each item lists the request
+        positions it covers in `request_indexes`
+    """
+    items = []
+    by_key = {}
+    for index, spec in enumerate(specs):
+        normalized = normalize_spec(spec)
+        key = spec_key(normalized)
+        if key in by_key:
+            by_key[key]['request_indexes'].append(index)
+            continue
+        item = {
+            'index': len(items),
+            'request_indexes': [index],
+            'spec': normalized,
+            'status': 'pending',
+            'content_block_id': None,
+            'error': '',
+        }
+        by_key[key] = item
+        items.append(item)
+    return items, len(specs) - len(items)
+
+
+def remaining_content_blocks(user) -> int:
+    """
+    Content blocks the user's tier still allows this month
+
+    Items queued in the user's unfinished batches count as used, so several
+    batches submitted back to back can't overshoot the limit together.
+    """
+    limit = TIER_LIMITS.get(user.subscription_tier, TIER_LIMITS['free'])['content_blocks']
+    created = UsageTracking.objects.filter(
+        user=user, month=date.today().replace(day=1)
+    ).values_list('content_blocks_created', flat=True).first() or 0
+    queued = ContentBatchJob.objects.filter(user=user, status__in=ACTIVE_STATUSES).aggregate(
+        queued=Sum(F('total_items') - F('completed_items') - F('failed_items'))
+    )['queued'] or 0
+    return max(limit - created - queued, 0)
+
+
+# ==============================================================================
+# Worker pool
+# ==============================================================================
+
+_executor = None
+_executor_lock = threading.Lock()
+_user_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Process-wide worker pool shared by all batch jobs"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'CONTENT_BATCH_WORKERS', 8),
+                thread_name_prefix='content-batch'
+            )
+        return _executor
+
+
+def get_user_slots(user) -> threading.BoundedSemaphore:
+    """Per-user concurrency cap, shared across all of that user's jobs"""
+    with _executor_lock:
+        key = str(user.pk)
+        if key not in _user_slots:
+            caps = getattr(settings, 'CONTENT_BATCH_USER_CONCURRENCY', {})
+            _user_slots[key] = threading.BoundedSemaphore(caps.get(user.subscription_tier, caps.get('free', 1)))
+        return _user_slots[key]
+
+
+def _generate_item(service: ContentGenerationService, spec: Dict, slots: threading.BoundedSemaphore) -> List[Dict]:
+    """Generate text content for every platform in a spec (runs on a pool worker)"""
+    try:
+        results = []
+        for platform in spec['platforms']:
+            content_data = service.generate_content(
+                keyword=spec['keyword'],
+                platform=platform,
+                content_type=spec['content_type'],
+                tone=spec['tone'],
+                angle=spec['angle'],
+                niche=spec['niche'] or None,
+                custom_prompt=spec['custom_prompt'] or None
+            )
+            results.append(service.apply_custom_instructions(content_data, spec['custom_prompt']))
+        return results
+    finally:
+        slots.release()
+        # Usage accounting writes from this thread; don't leak its connection
+        connection.close()
+
+
+# ==============================================================================
+# Job runner
+# ==============================================================================
+
+def _build_rows(job: ContentBatchJob, spec: Dict, results: List[Dict]) -> Tuple[ContentBlock, List[PlatformContent]]:
+    block = ContentBlock(
+        user=job.user,
+        title=f"{spec['keyword']} - {spec['content_type']}",
+        keyword_text=spec['keyword'],
+        niche=spec['niche'],
+        content_angle=spec['angle'],
+        tone=spec['tone'],
+        status='draft',
+        scheduled_for=parse_datetime(spec['scheduled_for']) if spec['scheduled_for'] else None
+    )
+    versions = [
+        PlatformContent(
+            content_block=block,
+            platform=platform,
+            content_type=spec['content_type'],
+            caption=content_data.get('caption', ''),
+            hashtags=content_data.get('hashtags', []),
+            content_data={
+                'hook': content_data.get('hook', ''),
+                'cta': content_data.get('cta', ''),
+                'slides': content_data.get('slides', []),
+            }
+        )
+        for platform, content_data in zip(spec['platforms'], results)
+    ]
+    return block, versions
+
+
+def _flush(job: ContentBatchJob, blocks: List[ContentBlock], versions: List[PlatformContent]):
+    """Write buffered rows in bulk plus the job's progress"""
+    with transaction.atomic():
+        if blocks:
+            ContentBlock.objects.bulk_create(blocks)
+            PlatformContent.objects.bulk_create(versions)
+
+            # bulk_create skips post_save, so count the blocks here
+            current_month = date.today().replace(day=1)
+            UsageTracking.objects.get_or_create(user=job.user, month=current_month)
+            UsageTracking.objects.filter(user=job.user, month=current_month).update(
+                content_blocks_created=F('content_blocks_created') + len(blocks)
+            )
+
+        job.save(update_fields=['items', 'completed_items', 'failed_items', 'status', 'finished_at', 'updated_at'])
+
+    blocks.clear()
+    versions.clear()
+
+
+def run_batch_job(job_id, heartbeat: Heartbeat):
+    """
+    Generate every unfinished item of a job, writing results in bulk as they complete
+
+    Progress is written at least every PROGRESS_INTERVAL while items finish,
+    so pollers see each item shortly after it completes. Items left 'running'
+    by a runner that died are generated again when the job is resumed.
+    """
+    job = ContentBatchJob.objects.select_related('user').get(id=job_id)
+    job.status = 'running'
+    job.save(update_fields=['status', 'updated_at'])
+
+    service = ContentGenerationService(user=job.user)
+    slots = get_user_slots(job.user)
+    flush_size = getattr(settings, 'CONTENT_BATCH_FLUSH_SIZE', 10)
+
+    queue = [item['index'] for item in job.items if item['status'] in ('pending', 'running')]
+    running = {}
+    blocks: List[ContentBlock] = []
+    versions: List[PlatformContent] = []
+    dirty = False
+    last_progress = time.monotonic()
+
+    while queue or running:
+        heartbeat.beat()
+
+        # Submit as many items as the user's concurrency cap allows
+        while queue and slots.acquire(blocking=False):
+            index = queue.pop(0)
+            job.items[index]['status'] = 'running'
+            future = get_executor().submit(_generate_item, service, job.items[index]['spec'], slots)
+            running[future] = index
+
+        if not running:
+            # All of this user's slots are taken by another of their jobs
+            time.sleep(0.2)
+            continue
+
+        done, _ = wait(running, timeout=1, return_when=FIRST_COMPLETED)
+        for future in done:
+            item = job.items[running.pop(future)]
+            dirty = True
+            try:
+                block, block_versions = _build_rows(job, item['spec'], future.result())
+                blocks.append(block)
+                versions.extend(block_versions)
+                item['status'] = 'completed'
+                item['content_block_id'] = str(block.id)
+                job.completed_items += 1
+            except Exception as e:
+                logger.error(f"Batch {job.id} item {item['index']} failed: {str(e)}")
+                item['status'] = 'failed'
+                item['error'] = str(e)
+                job.failed_items += 1
+
+        if len(blocks) >= flush_size or (dirty and time.monotonic() - last_progress >= PROGRESS_INTERVAL):
+            heartbeat.beat(force=True)
+            _flush(job, blocks, versions)
+            dirty = False
+            last_progress = time.monotonic()
+
+    if job.failed_items == 0:
+        job.status = 'completed'
+    elif job.completed_items == 0:
+        job.status = 'failed'
+    else:
+        job.status = 'completed_with_errors'
+    job.finished_at = timezone.now()
+    heartbeat.beat(force=True)
+    _flush(job, blocks, versions)
+
+    logger.info(f"Batch {job.id} finished: {job.completed_items} completed, {job.failed_items} failed")
+
+
+def start_batch_job(job: ContentBatchJob):
+    """Run a job in the background once the request's transaction has committed"""
+    start_job(job, run_batch_job, inline=getattr(settings, 'CONTENT_BATCH_RUN_INLINE', False))
+
+
+def resume_batch_job_if_stale(jobs) -> bool:
+    """Resume a job whose runner died (e.g. in a deploy) when it's polled"""
+    return resume_if_stale(jobs, run_batch_job, inline=getattr(settings, 'CONTENT_BATCH_RUN_INLINE', False))
@@ -2,11 +2,11 @@
 Content Humanization Module
 Makes AI-generated content more natural and authentic
 """
-import os
-import requests
 from typing import Optional
 
-def humanize_content(content: str, style: str = 'casual', user_context: Optional[dict] = None) -> str:
+from .providers import ProviderError, get_provider_pool
+
+def humanize_content(content: str, style: str = 'casual', user_context: Optional[dict] = None, user=None) -> str:
     """
     Makes AI-generated content more natural and human-like
     
@@ -14,6 +14,7 @@ def humanize_content(content: str, style: str = 'casual', user_context: Optional
         content: The AI-generated content to humanize
         style: Writing style (casual, professional, friendly, etc.)
         user_context: Optional user brand guidelines and preferences
+        user: Optional user the LLM usage is accounted to
     
     Returns:
         Humanized version of the content
@@ -53,44 +54,38 @@ Content to humanize:
 
 Return ONLY the humanized version. No explanations, no meta-commentary."""
     
-    # Call LiteLLM API
+    # Call LiteLLM (falls back to OpenAI when LiteLLM is degraded)
     try:
-        response = requests.post(
-            os.environ.get('LITELLM_API_URL', 'https://litellm.ai-it.io/v1') + '/chat/completions',
-            headers={
-                'Authorization': f"Bearer {os.environ.get('LITELLM_API_KEY')}",
-                'Content-Type': 'application/json'
-            },
-            json={
-                'model': 'gpt-4o',
-                'messages': [
-                    {'role': 'user', 'content': humanization_prompt}
-                ],
-                'temperature': 0.9,  # Higher temperature for more creativity
-                'max_tokens': 2000
-            },
-            timeout=60
+        response = get_provider_pool().chat(
+            model='gpt-4o',
+            prefer='litellm',
+            messages=[
+                {'role': 'user', 'content': humanization_prompt}
+            ],
+            temperature=0.9,  # Higher temperature for more creativity
+            # Rewrites stay close to the original length
+            max_tokens=min(max(len(content) // 2, 300), 2000),
+            user=user,
+            purpose='humanize'
         )
+        return response.choices[0].message.content.strip()
         
-        if response.status_code == 200:
-            result = response.json()
-            return result['choices'][0]['message']['content'].strip()
-        else:
-            print(f"Humanization API error: {response.status_code}")
-            return content  # Return original if humanization fails
-            
+    except ProviderError as e:
+        print(f"Humanization API error: {type(e).__name__}: {str(e)}")
+        return content  # Return original if humanization fails
     except Exception as e:
         print(f"Humanization error: {str(e)}")
         return content  # Return original if error occurs
 
 
-def apply_brand_voice(content: str, brand_guidelines: dict) -> str:
+def apply_brand_voice(content: str, brand_guidelines: dict, user=None) -> str:
     """
     Apply brand guidelines to content
     
     Args:
         content: The content to brand
         brand_guidelines: Dictionary with brand voice, tone, values, etc.
+        user: Optional user the LLM usage is accounted to
     
     Returns:
         Content with brand voice applied
@@ -112,28 +107,19 @@ Content:
 Return the rewritten content that perfectly matches the brand guidelines."""
     
     try:
-        response = requests.post(
-            os.environ.get('LITELLM_API_URL', 'https://litellm.ai-it.io/v1') + '/chat/completions',
-            headers={
-                'Authorization': f"Bearer {os.environ.get('LITELLM_API_KEY')}",
-                'Content-Type': 'application/json'
-            },
-            json={
-                'model': 'gpt-4o',
-                'messages': [
-                    {'role': 'user', 'content': brand_prompt}
-                ],
-                'temperature': 0.7
-            },
-            timeout=60
+        response = get_provider_pool().chat(
+            model='gpt-4o',
+            prefer='litellm',
+            messages=[
+                {'role': 'user', 'content': brand_prompt}
+            ],
+            temperature=0.7,
+            max_tokens=min(max(len(content) // 2, 300), 2000),
+            user=user,
+            purpose='brand_voice'
         )
+        return response.choices[0].message.content.strip()
         
-        if response.status_code == 200:
-            result = response.json()
-            return result['choices'][0]['message']['content'].strip()
-        else:
-            return content
-            
     except Exception as e:
         print(f"Brand voice error: {str(e)}")
         return content
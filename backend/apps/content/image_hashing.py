@@ -0,0 +1,242 @@
+"""
+Perceptual Image Hashing
+Near-duplicate detection for the image library (pHash / dHash + BK-tree)
+"""
+import hashlib
+import math
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from io import BytesIO
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from django.core.cache import cache
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 8  # 8x8 bits -> 64-bit hash, stored as 16 hex chars
+PHASH_IMG_SIZE = 32  # pHash works on a 32x32 greyscale thumbnail
+
+# Two images within this Hamming distance are treated as the same picture
+DEFAULT_DUPLICATE_DISTANCE = 6
+DEFAULT_SIMILAR_DISTANCE = 12
+
+
+def _to_hex(bits: Iterable[bool]) -> str:
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return f"{value:0{HASH_SIZE * HASH_SIZE // 4}x}"
+
+
+def _greyscale(image: Image.Image, size: Tuple[int, int]) -> List[int]:
+    return list(image.convert('L').resize(size, Image.LANCZOS).getdata())
+
+
+def dhash(image: Image.Image) -> str:
+    """Difference hash: compares each pixel with its right-hand neighbour"""
+    width = HASH_SIZE + 1
+    pixels = _greyscale(image, (width, HASH_SIZE))
+    bits = []
+    for row in range(HASH_SIZE):
+        offset = row * width
+        for col in range(HASH_SIZE):
+            bits.append(pixels[offset + col] > pixels[offset + col + 1])
+    return _to_hex(bits)
+
+
+# DCT-II basis for the low-frequency 8x32 block, computed once
+_DCT_BASIS = [
+    [math.cos((2 * x + 1) * u * math.pi / (2 * PHASH_IMG_SIZE)) for x in range(PHASH_IMG_SIZE)]
+    for u in range(HASH_SIZE)
+]
+
+
+def phash(image: Image.Image) -> str:
+    """
+    Perceptual hash: 2D DCT of a 32x32 thumbnail, keep the top-left 8x8
+    low frequencies and threshold them against their median.
+    """
+    n = PHASH_IMG_SIZE
+    pixels = _greyscale(image, (n, n))
+    rows = [pixels[i * n:(i + 1) * n] for i in range(n)]
+
+    # Separable DCT: transform rows, then columns, only for the 8 lowest frequencies
+    row_dct = [
+        [sum(basis[x] * row[x] for x in range(n)) for basis in _DCT_BASIS]
+        for row in rows
+    ]
+    coefficients = []
+    for u in range(HASH_SIZE):
+        basis = _DCT_BASIS[u]
+        for v in range(HASH_SIZE):
+            coefficients.append(sum(basis[y] * row_dct[y][v] for y in range(n)))
+
+    # Skip the DC term when computing the median, it dominates the other values
+    median = sorted(coefficients[1:])[len(coefficients[1:]) // 2]
+    return _to_hex(c > median for c in coefficients)
+
+
+def hamming_distance(hash_a: str, hash_b: str) -> int:
+    """Number of differing bits between two hex hashes"""
+    return bin(int(hash_a, 16) ^ int(hash_b, 16)).count('1')
+
+
+def compute_hashes(image: Image.Image) -> Dict[str, str]:
+    """Compute both perceptual hashes for an image"""
+    return {
+        'phash': phash(image),
+        'dhash': dhash(image),
+    }
+
+
+def fetch_image(url: str, timeout: int = 10) -> Optional[Image.Image]:
+    """Download an image so it can be hashed, or None if it can't be read"""
+    try:
+        response = requests.get(url, timeout=timeout)
+        response.raise_for_status()
+        image = Image.open(BytesIO(response.content))
+        image.load()
+        return image
+    except Exception as e:
+        logger.warning(f"Could not fetch image for hashing from {url[:80]}: {str(e)}")
+        return None
+
+
+def hash_image_url(url: str) -> Dict:
+    """
+    Download and hash an image URL
+
+    Returns:
+        Dict with phash, dhash, width and height (empty if the image is unreadable)
+    """
+    image = fetch_image(url)
+    if image is None:
+        return {}
+
+    return {
+        **compute_hashes(image),
+        'width': image.width,
+        'height': image.height,
+    }
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over Hamming distance
+
+    Lets us find every hash within distance d of a query without comparing
+    against the whole library.
+    """
+
+    def __init__(self, items: Iterable[Tuple[str, object]] = ()):
+        self.root = None
+        self.size = 0
+        for hash_value, payload in items:
+            self.add(hash_value, payload)
+
+    def add(self, hash_value: str, payload) -> None:
+        node = [int(hash_value, 16), [payload], {}]
+        if self.root is None:
+            self.root = node
+            self.size = 1
+            return
+
+        current = self.root
+        while True:
+            distance = bin(current[0] ^ node[0]).count('1')
+            if distance == 0:
+                current[1].append(payload)
+                self.size += 1
+                return
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                self.size += 1
+                return
+            current = child
+
+    def search(self, hash_value: str, max_distance: int) -> List[Tuple[int, object]]:
+        """Return (distance, payload) pairs within max_distance, closest first"""
+        if self.root is None:
+            return []
+
+        query = int(hash_value, 16)
+        results = []
+        stack = [self.root]
+        while stack:
+            value, payloads, children = stack.pop()
+            distance = bin(value ^ query).count('1')
+            if distance <= max_distance:
+                results.extend((distance, payload) for payload in payloads)
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for d, child in children.items() if low <= d <= high)
+
+        results.sort(key=lambda item: item[0])
+        return results
+
+    def __len__(self):
+        return self.size
+
+
+def prompt_fingerprint(prompt: str, size: str = '', style: str = '') -> str:
+    """Stable key for an image generation request (same prompt/size/style -> same key)"""
+    normalized = ' '.join(prompt.lower().split())
+    return hashlib.sha1(f"{normalized}|{size}|{style}".encode('utf-8')).hexdigest()
+
+
+def build_library_index(rows: Iterable[Tuple[object, str]]) -> BKTree:
+    """Build a BK-tree from (image_id, phash) rows, skipping images without a hash"""
+    return BKTree((hash_value, image_id) for image_id, hash_value in rows if hash_value)
+
+
+# Per-process BK-trees of recently searched libraries, each tagged with the library
+# version it was built from. The version lives in the shared cache so a change
+# in one process invalidates the trees in all of them.
+LIBRARY_INDEX_USERS = 256
+
+_library_indexes: "OrderedDict[str, Tuple[str, BKTree]]" = OrderedDict()
+_library_lock = threading.Lock()
+
+
+def _version_key(user_id) -> str:
+    return f'image_library_version:{user_id}'
+
+
+def invalidate_library_index(user_id) -> None:
+    """Mark a user's library as changed (ImageLibrary save/delete signals call this)"""
+    cache.set(_version_key(user_id), uuid.uuid4().hex, None)
+
+
+def get_library_index(user_id, load_rows: Callable[[], Iterable[Tuple[object, str]]]) -> BKTree:
+    """
+    BK-tree of a user's library, rebuilt only when the library has changed
+
+    Args:
+        user_id: Library owner
+        load_rows: Returns the library's (image_id, phash) rows when a rebuild is needed
+    """
+    # A fresh random version (rather than a counter) can never match a tree built
+    # before the cache entry was evicted
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(_version_key(user_id), version, None)
+
+    key = str(user_id)
+    with _library_lock:
+        cached = _library_indexes.get(key)
+        if cached is not None and cached[0] == version:
+            _library_indexes.move_to_end(key)
+            return cached[1]
+
+    index = build_library_index(load_rows())
+    with _library_lock:
+        _library_indexes[key] = (version, index)
+        _library_indexes.move_to_end(key)
+        while len(_library_indexes) > LIBRARY_INDEX_USERS:
+            _library_indexes.popitem(last=False)
+    return index
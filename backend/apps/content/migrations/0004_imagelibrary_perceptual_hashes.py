@@ -0,0 +1,41 @@
+# Generated by Django 5.0 on 2026-10-19 18:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0003_artdirectionpreset_referencefile"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="imagelibrary",
+            name="dhash",
+            field=models.CharField(blank=True, max_length=16),
+        ),
+        migrations.AddField(
+            model_name="imagelibrary",
+            name="phash",
+            field=models.CharField(blank=True, max_length=16),
+        ),
+        migrations.AddField(
+            model_name="imagelibrary",
+            name="prompt_hash",
+            field=models.CharField(blank=True, max_length=40),
+        ),
+        migrations.AddIndex(
+            model_name="imagelibrary",
+            index=models.Index(
+                fields=["user", "phash"], name="image_libra_user_id_481376_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="imagelibrary",
+            index=models.Index(
+                fields=["user", "prompt_hash"], name="image_libra_user_id_da5f37_idx"
+            ),
+        ),
+    ]
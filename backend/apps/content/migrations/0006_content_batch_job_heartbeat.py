@@ -0,0 +1,30 @@
+# Generated by Django 5.0 on 2026-10-19 19:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0005_content_batch_jobs"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contentbatchjob",
+            name="attempts",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="contentbatchjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="contentbatchjob",
+            index=models.Index(
+                fields=["status", "heartbeat_at"], name="content_bat_status_cfd775_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0 on 2026-10-19 19:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0006_content_batch_job_heartbeat"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="imagelibrary",
+            name="prompt_terms_hash",
+            field=models.CharField(blank=True, max_length=40),
+        ),
+        migrations.AddIndex(
+            model_name="imagelibrary",
+            index=models.Index(
+                fields=["user", "prompt_terms_hash"],
+                name="image_libra_user_id_ba1e1f_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0 on 2026-10-19 20:09
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0007_imagelibrary_prompt_terms_hash"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="imagelibrary",
+            name="image_libra_user_id_ba1e1f_idx",
+        ),
+        migrations.RemoveField(
+            model_name="imagelibrary",
+            name="prompt_terms_hash",
+        ),
+    ]
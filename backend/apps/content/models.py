@@ -25,6 +25,7 @@ class ContentBlock(models.Model):
         ],
         default='draft'
     )
+    scheduled_for = models.DateTimeField(null=True, blank=True)  # Content calendar slot
     
     # Performance metrics (aggregated from all platforms)
     total_reach = models.IntegerField(default=0)
@@ -48,6 +49,50 @@ class ContentBlock(models.Model):
         return self.title
 
 
+class ContentBatchJob(models.Model):
+    """Batch content generation job (e.g. a month of content calendar posts)"""
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('completed_with_errors', 'Completed with errors'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='content_batch_jobs')
+    
+    status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='pending')
+    
+    # One entry per unique spec: the spec plus its status, content_block_id and error
+    items = models.JSONField(default=list, blank=True)
+    
+    total_items = models.IntegerField(default=0)
+    completed_items = models.IntegerField(default=0)
+    failed_items = models.IntegerField(default=0)
+    duplicate_items = models.IntegerField(default=0)  # Identical specs collapsed into one
+    
+    # Runner liveness (see viral_ai/background_jobs.py): times the job was claimed, last sign of life
+    attempts = models.IntegerField(default=0)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'content_batch_jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['status', 'heartbeat_at']),
+        ]
+    
+    def __str__(self):
+        return f"Batch {self.id} ({self.completed_items}/{self.total_items})"
+
+
 class PlatformContent(models.Model):
     """Platform-specific content version"""
     
@@ -139,14 +184,21 @@ class ImageLibrary(models.Model):
     folder = models.CharField(max_length=255, blank=True)
     tags = models.JSONField(default=list, blank=True)
     is_ai_generated = models.BooleanField(default=False)
-    
+
+    # Perceptual hashes (64-bit, hex) for near-duplicate detection
+    phash = models.CharField(max_length=16, blank=True)
+    dhash = models.CharField(max_length=16, blank=True)
+    prompt_hash = models.CharField(max_length=40, blank=True)  # For AI images: fingerprint of the generation request
+
     created_at = models.DateTimeField(auto_now_add=True)
-    
+
     class Meta:
         db_table = 'image_library'
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['user', 'phash']),
+            models.Index(fields=['user', 'prompt_hash']),
         ]
     
     def __str__(self):
@@ -0,0 +1,270 @@
+"""
+Structured Output Parsing
+Tolerant JSON extraction and per-content-type schema validation for LLM responses
+"""
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+# ==============================================================================
+# Schemas
+# ==============================================================================
+
+# field -> (type, required)
+POST_SCHEMA = {
+    'caption': (str, True),
+    'hook': (str, False),
+    'cta': (str, False),
+    'hashtags': (list, True),
+    'slides': (list, False),
+}
+
+MULTI_PART_SCHEMA = {
+    **POST_SCHEMA,
+    'slides': (list, True),
+}
+
+VIDEO_SCRIPT_SCHEMA = {
+    'hook': (str, True),
+    'intro': (str, False),
+    'main_points': (list, True),
+    'outro': (str, False),
+    'voiceover': (str, True),
+    'visual_suggestions': (list, False),
+    'music_suggestion': (str, False),
+}
+
+CONTENT_SCHEMAS = {
+    'carousel': MULTI_PART_SCHEMA,
+    'thread': MULTI_PART_SCHEMA,
+    'video_script': VIDEO_SCRIPT_SCHEMA,
+}
+
+
+def schema_for(content_type: str) -> Dict:
+    """Schema for a content type; single posts are the default"""
+    return CONTENT_SCHEMAS.get(content_type, POST_SCHEMA)
+
+
+def example_for(schema: Dict, fields: Optional[List[str]] = None) -> str:
+    """JSON skeleton of a schema (or a subset of its fields) for repair prompts"""
+    skeleton = {
+        name: ["..."] if field_type is list else "..."
+        for name, (field_type, _) in schema.items()
+        if fields is None or name in fields
+    }
+    return json.dumps(skeleton, indent=2)
+
+
+# ==============================================================================
+# Extraction
+# ==============================================================================
+
+class IncrementalJSONExtractor:
+    """
+    Finds complete top-level JSON objects in a stream of text
+
+    Feed it chunks as they arrive (streamed completions, or the whole response
+    at once); it tracks string/escape state and brace depth so braces inside
+    strings, markdown fences and chatter around the JSON are all ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.position = 0
+        self.depth = 0
+        self.start = None
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add text; return the raw text of every object completed by it"""
+        self.buffer += chunk
+        completed = []
+
+        for index in range(self.position, len(self.buffer)):
+            char = self.buffer[index]
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"' and self.depth > 0:
+                self.in_string = True
+            elif char in '{[':
+                if self.depth == 0:
+                    if char != '{':
+                        continue  # Only objects are top-level results
+                    self.start = index
+                self.depth += 1
+            elif char in '}]' and self.depth > 0:
+                self.depth -= 1
+                if self.depth == 0:
+                    completed.append(self.buffer[self.start:index + 1])
+                    self.start = None
+
+        self.position = len(self.buffer)
+        return completed
+
+    def pending(self) -> Optional[str]:
+        """Text of the object currently being streamed, if any"""
+        if self.start is None:
+            return None
+        return self.buffer[self.start:]
+
+
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+_SMART_QUOTES = str.maketrans({'“': '"', '”': '"'})
+
+
+def _strip_comments(text: str) -> str:
+    """Drop // line comments outside strings (copied from our prompt's example JSON)"""
+    result = []
+    in_string = escaped = False
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '/' and text[index + 1:index + 2] == '/':
+            newline = text.find('\n', index)
+            index = len(text) if newline == -1 else newline
+            continue
+        result.append(char)
+        index += 1
+    return ''.join(result)
+
+
+def _close_truncated(text: str) -> str:
+    """Close strings/brackets left open by a response cut off at max_tokens"""
+    stack = []
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append('}' if char == '{' else ']')
+        elif char in '}]' and stack:
+            stack.pop()
+
+    if in_string:
+        text += '"'
+    text = text.rstrip().rstrip(',')
+    return text + ''.join(reversed(stack))
+
+
+def _loads_tolerant(text: str) -> Optional[Dict]:
+    """json.loads with fixes for the mistakes LLMs commonly make"""
+    attempts = [text]
+    cleaned = _TRAILING_COMMA.sub(r'\1', _strip_comments(text.translate(_SMART_QUOTES)))
+    attempts.append(cleaned)
+    attempts.append(_TRAILING_COMMA.sub(r'\1', _close_truncated(cleaned)))
+
+    for attempt in attempts:
+        try:
+            parsed = json.loads(attempt)
+        except (json.JSONDecodeError, ValueError):
+            continue
+        if isinstance(parsed, dict):
+            return parsed
+    return None
+
+
+def extract_json(text: str) -> Optional[Dict]:
+    """
+    First JSON object in an LLM response
+
+    Handles fenced and unfenced JSON, leading/trailing prose, comments,
+    trailing commas and truncated output. Returns None if nothing parses.
+    """
+    if not text:
+        return None
+
+    extractor = IncrementalJSONExtractor()
+    for candidate in extractor.feed(text):
+        parsed = _loads_tolerant(candidate)
+        if parsed is not None:
+            return parsed
+
+    # No complete object - the response was probably cut off mid-way
+    pending = extractor.pending()
+    if pending:
+        return _loads_tolerant(pending)
+    return None
+
+
+# ==============================================================================
+# Validation
+# ==============================================================================
+
+def _coerce(value, field_type):
+    """Fix up near-misses (e.g. hashtags as one space-separated string)"""
+    if isinstance(value, field_type):
+        return value
+    if field_type is list and isinstance(value, str):
+        parts = value.split(',') if ',' in value else value.split()
+        return [part.strip() for part in parts if part.strip()]
+    if field_type is str and isinstance(value, (int, float)):
+        return str(value)
+    if field_type is str and isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return '\n'.join(value)
+    return None
+
+
+def validate(data: Dict, schema: Dict) -> Tuple[Dict, List[str]]:
+    """
+    Validate parsed data against a schema
+
+    Returns:
+        (cleaned data with every schema field present, names of invalid fields)
+    """
+    cleaned = {}
+    invalid = []
+
+    for name, (field_type, required) in schema.items():
+        value = data.get(name)
+        coerced = _coerce(value, field_type) if value is not None else None
+
+        if coerced is None or (required and not coerced):
+            if required:
+                invalid.append(name)
+            coerced = field_type()
+
+        cleaned[name] = coerced
+
+    return cleaned, invalid
+
+
+def parse_structured(text: str, schema: Dict) -> Tuple[Optional[Dict], List[str]]:
+    """
+    Extract and validate a structured response
+
+    Returns:
+        (cleaned data or None if no JSON was found, names of invalid fields)
+    """
+    parsed = extract_json(text)
+    if parsed is None:
+        return None, list(schema.keys())
+
+    cleaned, invalid = validate(parsed, schema)
+    return cleaned, invalid
@@ -0,0 +1,499 @@
+"""
+LLM Provider Client Layer
+Shared rate limiting, retries and circuit breaking for OpenAI and LiteLLM calls
+"""
+import random
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, Optional
+
+import openai
+from openai import OpenAI
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# Error classes
+# ==============================================================================
+
+class ProviderError(Exception):
+    """Base class for provider failures"""
+
+    retryable = False  # Worth retrying against the same provider
+    failover = True    # Worth trying the next provider
+
+    def __init__(self, message: str, provider: str = '', retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class RateLimitError(ProviderError):
+    """429 from the provider, or our own token bucket ran dry"""
+    retryable = True
+
+
+class ProviderServerError(ProviderError):
+    """5xx from the provider"""
+    retryable = True
+
+
+class ProviderTimeoutError(ProviderError):
+    """Timeout or connection failure"""
+    retryable = True
+
+
+class ProviderAuthError(ProviderError):
+    """Bad or missing credentials - the other provider may still work"""
+
+
+class InvalidRequestError(ProviderError):
+    """4xx caused by the request itself - retrying or switching won't help"""
+    failover = False
+
+
+class CircuitOpenError(ProviderError):
+    """Provider is marked degraded and is failing fast"""
+
+
+class NoProviderAvailableError(ProviderError):
+    """No provider is configured, or all of them are degraded"""
+    failover = False
+
+
+def _retry_after(exc) -> Optional[float]:
+    response = getattr(exc, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after')) if headers.get('retry-after') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(exc: Exception, provider: str = '') -> ProviderError:
+    """Map SDK / HTTP exceptions onto our typed provider errors"""
+    if isinstance(exc, ProviderError):
+        return exc
+
+    message = str(exc)
+    if isinstance(exc, openai.RateLimitError):
+        return RateLimitError(message, provider, _retry_after(exc))
+    if isinstance(exc, (openai.AuthenticationError, openai.PermissionDeniedError)):
+        return ProviderAuthError(message, provider)
+    if isinstance(exc, openai.APIConnectionError):  # Includes APITimeoutError
+        return ProviderTimeoutError(message, provider)
+    if isinstance(exc, openai.APIStatusError):
+        if exc.status_code >= 500:
+            return ProviderServerError(message, provider)
+        return InvalidRequestError(message, provider)
+
+    # Plain HTTP callers (requests) raise their own exception types
+    import requests
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError)):
+        return ProviderTimeoutError(message, provider)
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return error_for_status(exc.response.status_code, message, provider, _retry_after(exc))
+
+    return ProviderError(message, provider)
+
+
+def error_for_status(status_code: int, message: str, provider: str = '', retry_after: Optional[float] = None) -> ProviderError:
+    """Typed error for a raw HTTP status code"""
+    if status_code == 429:
+        return RateLimitError(message, provider, retry_after)
+    if status_code in (401, 403):
+        return ProviderAuthError(message, provider)
+    if status_code >= 500:
+        return ProviderServerError(message, provider)
+    return InvalidRequestError(message, provider)
+
+
+# ==============================================================================
+# Rate limiting and circuit breaking
+# ==============================================================================
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available; otherwise return how long to wait for them"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, max_wait: float = 0.0) -> bool:
+        """Block up to max_wait seconds for tokens; False if they didn't arrive in time"""
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker
+
+    closed -> open after `failure_threshold` consecutive failures; open fails
+    fast for `reset_timeout` seconds, then half-open lets one probe through.
+    Concurrent callers keep failing fast until that probe reports back.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self._state = self.CLOSED
+        self.lock = threading.Lock()
+
+    def _refresh(self):
+        # Caller holds the lock
+        if self._state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self.probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self.lock:
+            self._refresh()
+            return self._state
+
+    def allow_request(self) -> bool:
+        with self.lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            return False
+
+    def release_probe(self):
+        """The probe ended without telling us anything about the provider; let another through"""
+        with self.lock:
+            self.probe_in_flight = False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.probe_in_flight = False
+            self._state = self.CLOSED
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.probe_in_flight = False
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"Circuit opened after {self.failures} consecutive failures")
+                self._state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+# Buckets and breakers are process-wide so every service instance shares them
+_registry_lock = threading.Lock()
+_buckets: Dict[str, TokenBucket] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_bucket(provider: str, model: str) -> TokenBucket:
+    key = f"{provider}:{model}"
+    with _registry_lock:
+        if key not in _buckets:
+            limits = getattr(settings, 'LLM_RATE_LIMITS', {})
+            per_minute = limits.get(model, limits.get('default', 60))
+            _buckets[key] = TokenBucket(rate=per_minute / 60.0, capacity=max(per_minute / 6.0, 1.0))
+        return _buckets[key]
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    with _registry_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(
+                failure_threshold=getattr(settings, 'LLM_BREAKER_FAILURE_THRESHOLD', 5),
+                reset_timeout=getattr(settings, 'LLM_BREAKER_RESET_SECONDS', 30),
+            )
+        return _breakers[provider]
+
+
+def reset_provider_state():
+    """Forget all buckets, breakers and the cached pool (tests, settings changes)"""
+    global _pool
+    with _registry_lock:
+        _buckets.clear()
+        _breakers.clear()
+        _pool = None
+
+
+# ==============================================================================
+# Providers
+# ==============================================================================
+
+class Provider:
+    """One OpenAI-compatible backend (OpenAI itself or the LiteLLM proxy)"""
+
+    def __init__(self, name: str, client, chat_model: str, image_model: str, image_params: Optional[Dict] = None):
+        self.name = name
+        self.client = client
+        self.chat_model = chat_model
+        self.image_model = image_model
+        self.image_params = image_params or {}
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return get_breaker(self.name)
+
+    def supports_json_mode(self, model: str) -> bool:
+        """Whether response_format={"type": "json_object"} can be sent for this model"""
+        return model in getattr(settings, 'LLM_JSON_MODE_MODELS', {}).get(self.name, [])
+
+    def __repr__(self):
+        return f"Provider({self.name})"
+
+
+class ProviderPool:
+    """
+    Ordered set of providers with retry, rate limiting and failover
+
+    Calls go to the first healthy provider; typed retryable errors are retried
+    with jittered exponential backoff, and once a provider's breaker opens the
+    pool fails over to the next one.
+    """
+
+    def __init__(self, providers: List[Provider]):
+        self.providers = providers
+        self.max_attempts = getattr(settings, 'LLM_RETRY_MAX_ATTEMPTS', 3)
+        self.base_delay = getattr(settings, 'LLM_RETRY_BASE_DELAY', 1.0)
+        self.max_delay = getattr(settings, 'LLM_RETRY_MAX_DELAY', 8.0)
+        self.max_queue_wait = getattr(settings, 'LLM_RATE_LIMIT_MAX_WAIT', 10.0)
+
+    @property
+    def available(self) -> bool:
+        return bool(self.providers)
+
+    @property
+    def primary(self) -> Optional[Provider]:
+        return self.providers[0] if self.providers else None
+
+    def _ordered(self, prefer: Optional[str]) -> List[Provider]:
+        if not prefer:
+            return list(self.providers)
+        return sorted(self.providers, key=lambda p: p.name != prefer)
+
+    def _backoff(self, attempt: int, error: ProviderError) -> float:
+        if error.retry_after:
+            return min(error.retry_after, self.max_delay)
+        # Full jitter keeps concurrent retries from stampeding the provider together
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, kind: str, fn: Callable[[Provider, str], object], model: Optional[str] = None,
+             prefer: Optional[str] = None):
+        """
+        Run fn(provider, model) against the pool
+
+        Args:
+            kind: 'chat' or 'image' - picks the provider's default model
+            fn: Performs the actual SDK call
+            model: Explicit model name, overriding the provider default
+            prefer: Provider name to try first
+        """
+        if not self.providers:
+            raise NoProviderAvailableError("No LLM provider configured. Please configure OPENAI_API_KEY or LITELLM_API_KEY.")
+
+        last_error: Optional[ProviderError] = None
+
+        for provider in self._ordered(prefer):
+            breaker = provider.breaker
+            if not breaker.allow_request():
+                logger.info(f"Skipping {provider.name}: circuit open")
+                last_error = CircuitOpenError(f"{provider.name} circuit open", provider.name)
+                continue
+
+            model_name = model or (provider.chat_model if kind == 'chat' else provider.image_model)
+            bucket = get_bucket(provider.name, model_name)
+
+            for attempt in range(self.max_attempts):
+                if not bucket.acquire(max_wait=self.max_queue_wait):
+                    # Local rate limit: try the next provider rather than queueing forever
+                    breaker.release_probe()
+                    last_error = RateLimitError(f"Local rate limit reached for {model_name}", provider.name)
+                    break
+
+                try:
+                    result = fn(provider, model_name)
+                    breaker.record_success()
+                    return result
+                except Exception as e:
+                    error = classify_error(e, provider.name)
+                    last_error = error
+                    logger.warning(
+                        f"{provider.name} {kind} call failed (attempt {attempt + 1}/{self.max_attempts}): "
+                        f"{type(error).__name__}: {str(error)[:200]}"
+                    )
+
+                    if not error.failover:
+                        breaker.release_probe()
+                        raise error from e
+                    if not error.retryable:
+                        breaker.record_failure()
+                        break
+
+                    breaker.record_failure()
+                    if attempt < self.max_attempts - 1 and breaker.allow_request():
+                        time.sleep(self._backoff(attempt, error))
+                        continue
+                    break
+
+            if last_error is not None:
+                logger.warning(f"Failing over from {provider.name}: {type(last_error).__name__}")
+
+        raise last_error or NoProviderAvailableError("All LLM providers are unavailable")
+
+    def chat(self, messages: List[Dict], max_tokens: Optional[int] = None, model: Optional[str] = None,
+             prefer: Optional[str] = None, user=None, purpose: str = '', json_mode: bool = False, **kwargs):
+        """
+        Chat completion with retry and failover; returns the SDK response
+
+        Token usage, latency and cost of the successful call are recorded
+        against `user` (may be None for system calls). With json_mode, JSON
+        output is requested from providers/models that support it.
+        """
+        def _chat(provider: Provider, model_name: str):
+            params = dict(kwargs)
+            if max_tokens:
+                params['max_tokens'] = max_tokens
+            if json_mode and provider.supports_json_mode(model_name):
+                params['response_format'] = {'type': 'json_object'}
+            started = time.monotonic()
+            response = provider.client.chat.completions.create(model=model_name, messages=messages, **params)
+            usage = getattr(response, 'usage', None)
+            _record_usage(
+                user=user,
+                provider=provider.name,
+                model=model_name,
+                kind='chat',
+                prompt_tokens=getattr(usage, 'prompt_tokens', 0) or 0,
+                completion_tokens=getattr(usage, 'completion_tokens', 0) or 0,
+                latency_ms=int((time.monotonic() - started) * 1000),
+                max_tokens=max_tokens,
+                purpose=purpose,
+            )
+            return response
+
+        return self.call('chat', _chat, model=model, prefer=prefer)
+
+    def generate_image(self, prompt: str, size: str = '1024x1024', n: int = 1, prefer: Optional[str] = None,
+                       user=None, purpose: str = ''):
+        """Image generation with retry and failover; returns the SDK response"""
+        def _generate(provider: Provider, model_name: str):
+            started = time.monotonic()
+            response = provider.client.images.generate(
+                model=model_name,
+                prompt=prompt,
+                size=size,
+                n=n,
+                **provider.image_params
+            )
+            _record_usage(
+                user=user,
+                provider=provider.name,
+                model=model_name,
+                kind='image',
+                latency_ms=int((time.monotonic() - started) * 1000),
+                purpose=purpose,
+                images=n,
+            )
+            return response
+
+        return self.call('image', _generate, prefer=prefer)
+
+
+def _record_usage(**kwargs):
+    """Usage accounting must never break the call it is measuring"""
+    from .signals import track_llm_call
+    try:
+        track_llm_call(**kwargs)
+    except Exception as e:
+        logger.error(f"Failed to record LLM usage: {str(e)}")
+
+
+def _build_client(api_key: str, base_url: Optional[str] = None) -> OpenAI:
+    # Retries are handled by the pool, so the SDK's own retry loop is disabled
+    kwargs = {
+        'api_key': api_key,
+        'max_retries': 0,
+        'timeout': getattr(settings, 'LLM_REQUEST_TIMEOUT', 60),
+    }
+    if base_url:
+        kwargs['base_url'] = base_url
+    return OpenAI(**kwargs)
+
+
+def build_providers() -> List[Provider]:
+    """Providers from settings, OpenAI first when configured, LiteLLM as fallback"""
+    providers = []
+
+    openai_key = getattr(settings, 'OPENAI_API_KEY', '')
+    if openai_key and openai_key != 'your_openai_api_key_here':
+        providers.append(Provider(
+            name='openai',
+            client=_build_client(openai_key, getattr(settings, 'OPENAI_BASE_URL', '') or None),
+            chat_model='gpt-4o-mini',
+            image_model='dall-e-3',
+            image_params={'quality': 'standard'},
+        ))
+
+    litellm_key = getattr(settings, 'LITELLM_API_KEY', '')
+    if litellm_key:
+        providers.append(Provider(
+            name='litellm',
+            client=_build_client(litellm_key, settings.LITELLM_BASE_URL),
+            chat_model='gpt-4o-mini',
+            image_model='gpt-image-1',
+        ))
+
+    return providers
+
+
+_pool: Optional[ProviderPool] = None
+
+
+def get_provider_pool() -> ProviderPool:
+    """Process-wide provider pool, built lazily from settings"""
+    global _pool
+    if _pool is None:
+        with _registry_lock:
+            if _pool is None:
+                _pool = ProviderPool(build_providers())
+                if _pool.providers:
+                    logger.info(f"LLM providers initialized: {[p.name for p in _pool.providers]}")
+                else:
+                    logger.error("No API key configured. Content generation will not work.")
+    return _pool
@@ -1,11 +1,38 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import ContentBlock, PlatformContent, BrandKit, ImageLibrary
+from viral_ai.sparse_fields import SparseFieldsetSerializerMixin
+from .models import ContentBlock, ContentBatchJob, PlatformContent, BrandKit, ImageLibrary
 
 
-class ContentBlockSerializer(serializers.ModelSerializer):
+class PlatformContentSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    """Serializer for platform-specific content"""
+    
+    class Meta:
+        model = PlatformContent
+        fields = [
+            'id',
+            'platform',
+            'content_type',
+            'caption',
+            'hashtags',
+            'content_data',
+            'images',
+            'video_script',
+            'video_url',
+            'trackable_link',
+            'posted_at',
+            'reach',
+            'engagement',
+            'created_at',
+        ]
+        read_only_fields = ['id', 'created_at', 'reach', 'engagement']
+
+
+class ContentBlockSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for content blocks"""
     
-    platform_versions = serializers.SerializerMethodField()
+    # Reads the prefetched versions - querysets must prefetch_related('platform_versions')
+    platform_versions = PlatformContentSerializer(many=True, read_only=True)
     
     class Meta:
         model = ContentBlock
@@ -17,6 +44,7 @@ class ContentBlockSerializer(serializers.ModelSerializer):
             'content_angle',
             'tone',
             'status',
+            'scheduled_for',
             'total_reach',
             'total_engagement',
             'total_clicks',
@@ -27,34 +55,6 @@ class ContentBlockSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'total_reach', 'total_engagement', 'total_clicks']
-    
-    def get_platform_versions(self, obj):
-        """Get all platform versions"""
-        return PlatformContentSerializer(obj.platform_versions.all(), many=True).data
-
-
-class PlatformContentSerializer(serializers.ModelSerializer):
-    """Serializer for platform-specific content"""
-    
-    class Meta:
-        model = PlatformContent
-        fields = [
-            'id',
-            'platform',
-            'content_type',
-            'caption',
-            'hashtags',
-            'content_data',
-            'images',
-            'video_script',
-            'video_url',
-            'trackable_link',
-            'posted_at',
-            'reach',
-            'engagement',
-            'created_at',
-        ]
-        read_only_fields = ['id', 'created_at', 'reach', 'engagement']
 
 
 class ContentGenerationRequestSerializer(serializers.Serializer):
@@ -77,6 +77,56 @@ class ContentGenerationRequestSerializer(serializers.Serializer):
     adapt_from = serializers.CharField(max_length=100, required=False, allow_blank=True)
 
 
+class BatchItemSpecSerializer(serializers.Serializer):
+    """One content calendar slot in a batch generation request"""
+    
+    keyword = serializers.CharField(max_length=255)
+    platforms = serializers.ListField(
+        child=serializers.ChoiceField(choices=['instagram', 'tiktok', 'linkedin', 'twitter', 'facebook', 'youtube']),
+        min_length=1
+    )
+    content_type = serializers.CharField(max_length=100, required=False, default='post')
+    tone = serializers.CharField(max_length=100, required=False, default='professional')
+    angle = serializers.CharField(max_length=100, required=False, default='informative')
+    niche = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    custom_prompt = serializers.CharField(max_length=1000, required=False, allow_blank=True, default='')
+    scheduled_for = serializers.DateTimeField(required=False, allow_null=True, default=None)
+
+
+class BatchGenerationRequestSerializer(serializers.Serializer):
+    """Serializer for batch content generation request"""
+    
+    items = BatchItemSpecSerializer(many=True)
+    
+    def validate_items(self, value):
+        max_items = getattr(settings, 'CONTENT_BATCH_MAX_ITEMS', 100)
+        if not value:
+            raise serializers.ValidationError('At least one item is required.')
+        if len(value) > max_items:
+            raise serializers.ValidationError(f'A batch can contain at most {max_items} items.')
+        return value
+
+
+class ContentBatchJobSerializer(serializers.ModelSerializer):
+    """Serializer for batch generation jobs"""
+    
+    class Meta:
+        model = ContentBatchJob
+        fields = [
+            'id',
+            'status',
+            'items',
+            'total_items',
+            'completed_items',
+            'failed_items',
+            'duplicate_items',
+            'created_at',
+            'updated_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
+
+
 class ImageGenerationRequestSerializer(serializers.Serializer):
     """Serializer for image generation request"""
     
@@ -86,6 +136,7 @@ class ImageGenerationRequestSerializer(serializers.Serializer):
         choices=['1024x1024', '1024x1792', '1792x1024'],
         default='1024x1024'
     )
+    dedup = serializers.BooleanField(default=False, required=False)
 
 
 class BrandKitSerializer(serializers.ModelSerializer):
@@ -122,6 +173,8 @@ class ImageLibrarySerializer(serializers.ModelSerializer):
             'folder',
             'tags',
             'is_ai_generated',
+            'phash',
+            'dhash',
             'created_at',
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'phash', 'dhash', 'created_at']
@@ -1,8 +1,8 @@
-from openai import OpenAI
-from django.conf import settings
 from typing import Dict, List, Optional
 import logging
-import json
+
+from .parsing import VIDEO_SCRIPT_SCHEMA, example_for, parse_structured, schema_for, validate
+from .providers import ProviderError, get_provider_pool
 
 logger = logging.getLogger(__name__)
 
@@ -56,32 +56,44 @@ class ContentGenerationService:
         },
     }
     
-    def __init__(self):
-        # Try OpenAI first, then fall back to LiteLLM
-        if hasattr(settings, 'OPENAI_API_KEY') and settings.OPENAI_API_KEY and settings.OPENAI_API_KEY != 'your_openai_api_key_here':
-            self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            self.image_client = OpenAI(api_key=settings.OPENAI_API_KEY)  # Separate client for images
-            self.model = "gpt-4o-mini"
-            self.image_model = "dall-e-3"
-            self.use_openai = True
-            logger.info("OpenAI client initialized successfully")
-        elif hasattr(settings, 'LITELLM_API_KEY') and settings.LITELLM_API_KEY:
-            self.client = OpenAI(
-                api_key=settings.LITELLM_API_KEY,
-                base_url=settings.LITELLM_BASE_URL
-            )
-            self.image_client = self.client  # Use same client for LiteLLM
-            self.model = "gpt-4o-mini"
-            self.image_model = "gpt-image-1"
-            self.use_openai = False
-            logger.info("LiteLLM client initialized successfully")
-        else:
-            self.client = None
-            self.image_client = None
-            self.model = None
-            self.image_model = None
-            self.use_openai = False
-            logger.error("No API key configured. Content generation will not work.")
+    # Token budgeting: generous enough for the platform's longest caption plus JSON structure
+    CHARS_PER_TOKEN = 4
+    RESPONSE_OVERHEAD_TOKENS = 200  # JSON keys, hook, CTA
+    TOKENS_PER_HASHTAG = 8
+    MULTI_PART_TOKENS = 600  # Slides / thread tweets
+    MULTI_PART_CONTENT_TYPES = ['carousel', 'thread', 'article']
+    MIN_MAX_TOKENS = 300
+    MAX_MAX_TOKENS = 2000
+    REPAIR_TOKENS_PER_FIELD = {str: 400, list: 250}
+    
+    def __init__(self, user=None):
+        # OpenAI first, LiteLLM as fallback - the pool fails over between them
+        self.user = user
+        self.providers = get_provider_pool()
+        primary = self.providers.primary
+        self.model = primary.chat_model if primary else None
+        self.image_model = primary.image_model if primary else None
+        self.use_openai = bool(primary and primary.name == 'openai')
+    
+    def max_tokens_for(self, platform: str, content_type: str = 'post') -> int:
+        """
+        Completion budget derived from the platform's caption length
+        
+        A 280-character tweet doesn't need the 2000-token budget a Facebook
+        post might, and a smaller max_tokens keeps latency and cost down.
+        """
+        guidelines = self.PLATFORM_SPECS.get(platform, {})
+        caption_chars = guidelines.get('caption_max_length', 2000)
+        
+        budget = (
+            caption_chars // self.CHARS_PER_TOKEN
+            + guidelines.get('optimal_hashtags', 10) * self.TOKENS_PER_HASHTAG
+            + self.RESPONSE_OVERHEAD_TOKENS
+        )
+        if content_type in self.MULTI_PART_CONTENT_TYPES:
+            budget += self.MULTI_PART_TOKENS
+        
+        return max(self.MIN_MAX_TOKENS, min(budget, self.MAX_MAX_TOKENS))
     
     def generate_content(
         self,
@@ -122,21 +134,19 @@ class ContentGenerationService:
             
             logger.info(f"Generating content for {platform} - {content_type}")
             
-            if not self.client:
-                raise Exception("LiteLLM client not initialized. Please configure LITELLM_API_KEY.")
-            
-            # Use configured model (OpenAI or LiteLLM)
-            response = self.client.chat.completions.create(
-                model=self.model,
-                max_tokens=2000,
+            response = self.providers.chat(
+                max_tokens=self.max_tokens_for(platform, content_type),
                 messages=[
                     {"role": "user", "content": prompt}
-                ]
+                ],
+                user=self.user,
+                purpose=f"content:{platform}",
+                json_mode=True
             )
             
             # Parse the response
             content_text = response.choices[0].message.content
-            parsed_content = self._parse_content_response(content_text, platform)
+            parsed_content = self._parse_content_response(content_text, platform, content_type)
             
             logger.info(f"Content generated successfully for {platform}")
             
@@ -146,6 +156,25 @@ class ContentGenerationService:
             logger.error(f"Error generating content: {str(e)}")
             raise
     
+    def apply_custom_instructions(self, content_data: Dict, custom_prompt: Optional[str]) -> Dict:
+        """Append "end with:" / "mention:" brand instructions the model may have ignored"""
+        if not custom_prompt:
+            return content_data
+        
+        # Extract the actual instruction (e.g., "Always end with: Visit ai-it.io")
+        if 'end with:' in custom_prompt.lower():
+            ending = custom_prompt.split('end with:', 1)[1].strip()
+            if content_data.get('caption'):
+                content_data['caption'] = content_data['caption'].rstrip() + f" {ending}"
+            if content_data.get('cta'):
+                content_data['cta'] = content_data['cta'].rstrip() + f" {ending}"
+        elif 'mention:' in custom_prompt.lower():
+            mention = custom_prompt.split('mention:', 1)[1].strip()
+            if content_data.get('caption'):
+                content_data['caption'] = content_data['caption'].rstrip() + f" {mention}"
+        
+        return content_data
+    
     def _build_content_prompt(
         self,
         keyword: str,
@@ -210,131 +239,130 @@ Make it viral-worthy and platform-optimized!"""
         
         return prompt
     
-    def _parse_content_response(self, response_text: str, platform: str) -> Dict:
-        """Parse Claude's response into structured data"""
-        try:
-            # Try to extract JSON from the response
-            # Claude sometimes wraps JSON in markdown code blocks
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            else:
-                json_text = response_text
-            
-            parsed = json.loads(json_text)
-            
-            return {
-                'caption': parsed.get('caption', ''),
-                'hook': parsed.get('hook', ''),
-                'cta': parsed.get('cta', ''),
-                'hashtags': parsed.get('hashtags', []),
-                'slides': parsed.get('slides', []),
-                'platform': platform,
-            }
-            
-        except json.JSONDecodeError:
+    def _parse_content_response(self, response_text: str, platform: str, content_type: str = 'post') -> Dict:
+        """Parse the model's response into structured data, repairing invalid fields"""
+        parsed = self._parse_structured(response_text, schema_for(content_type), purpose=f"content:{platform}")
+        
+        if parsed is None:
             logger.warning("Failed to parse JSON, returning raw response")
-            return {
-                'caption': response_text,
-                'hook': '',
-                'cta': '',
-                'hashtags': [],
-                'slides': [],
-                'platform': platform,
-            }
+            parsed = {'caption': response_text}
+        
+        return {
+            'caption': parsed.get('caption', ''),
+            'hook': parsed.get('hook', ''),
+            'cta': parsed.get('cta', ''),
+            'hashtags': parsed.get('hashtags', []),
+            'slides': parsed.get('slides', []),
+            'platform': platform,
+        }
+    
+    def _parse_structured(self, response_text: str, schema: Dict, purpose: str) -> Optional[Dict]:
+        """
+        Extract and validate JSON from a response
+        
+        Fields that are missing or invalid are fetched with a small repair call
+        instead of regenerating the whole piece of content.
+        
+        Returns:
+            Validated data, or None if no usable JSON could be recovered
+        """
+        data, invalid = parse_structured(response_text, schema)
+        if not invalid:
+            return data
+        
+        logger.info(f"Repairing invalid fields {invalid} for {purpose}")
+        repaired = self._repair_fields(response_text, schema, invalid, purpose)
+        
+        if data is None:
+            if repaired is None:
+                return None
+            data, _ = validate({}, schema)
+        
+        if repaired:
+            data.update({name: value for name, value in repaired.items() if value})
+        return data
+    
+    def _repair_fields(self, response_text: str, schema: Dict, fields: List[str], purpose: str) -> Optional[Dict]:
+        """Ask the model for just the listed fields, as JSON, based on its previous answer"""
+        prompt = f"""Your previous answer was supposed to be a JSON object, but these fields were missing or invalid: {', '.join(fields)}.
+
+Previous answer:
+{response_text[:4000]}
+
+Using the previous answer, return ONLY a JSON object with exactly these fields:
+{example_for(schema, fields)}"""
+        
+        field_schema = {name: schema[name] for name in fields}
+        budget = sum(self.REPAIR_TOKENS_PER_FIELD.get(schema[name][0], 200) for name in fields)
+        
+        try:
+            response = self.providers.chat(
+                max_tokens=min(budget, self.MAX_MAX_TOKENS),
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0,
+                json_mode=True,
+                user=self.user,
+                purpose=f"{purpose}:repair"
+            )
+        except ProviderError as e:
+            logger.warning(f"Repair call failed for {purpose}: {str(e)}")
+            return None
+        
+        repaired, still_invalid = parse_structured(response.choices[0].message.content, field_schema)
+        if still_invalid:
+            logger.warning(f"Fields still invalid after repair for {purpose}: {still_invalid}")
+        return repaired
     
     def generate_image(
         self,
         prompt: str,
         style: str = 'natural',
-        size: str = '1024x1024',
-        max_retries: int = 3
+        size: str = '1024x1024'
     ) -> Dict:
         """
-        Generate image using OpenAI DALL-E 3 with retry logic for server errors
+        Generate image using OpenAI DALL-E 3 (or LiteLLM)
+        
+        Retries, rate limiting and provider failover are handled by the
+        shared provider pool.
         
         Args:
             prompt: Image description
             style: Image style (natural, vivid)
             size: Image size (1024x1024, 1024x1792, 1792x1024)
-            max_retries: Maximum number of retry attempts (default: 3)
         
         Returns:
-            Dict with image URL and metadata, or None if all attempts fail
+            Dict with image URL and metadata, or None if generation fails
         """
-        import time
-        
-        if not self.image_client:
+        if not self.providers.available:
             logger.error("Image client not initialized. Cannot generate images.")
             return None
         
         logger.info(f"Generating image with prompt: {prompt[:100]}...")
         
-        for attempt in range(max_retries):
-            try:
-                # Use appropriate model based on client type
-                if self.use_openai:
-                    # OpenAI DALL-E 3
-                    response = self.image_client.images.generate(
-                        model="dall-e-3",
-                        prompt=prompt,
-                        size=size,
-                        quality="standard",
-                        n=1,
-                    )
-                else:
-                    # LiteLLM
-                    response = self.image_client.images.generate(
-                        model=self.image_model,
-                        prompt=prompt,
-                        size=size,
-                        n=1,
-                    )
-                
-                image_url = response.data[0].url
-                revised_prompt = getattr(response.data[0], 'revised_prompt', prompt)
-                
-                logger.info(f"Image generated successfully: {image_url[:50]}...")
-                
-                return {
-                    'url': image_url,
-                    'prompt': prompt,
-                    'revised_prompt': revised_prompt,
-                    'size': size,
-                    'style': style,
-                }
-                
-            except Exception as e:
-                error_msg = str(e)
-                logger.error(f"Error generating image (attempt {attempt + 1}/{max_retries}): {error_msg}")
-                
-                # Check if it's a server error (500) that we should retry
-                is_server_error = any([
-                    'server_error' in error_msg,
-                    '500' in error_msg,
-                    'server had an error' in error_msg.lower(),
-                    'internal server error' in error_msg.lower()
-                ])
-                
-                if is_server_error and attempt < max_retries - 1:
-                    wait_time = (2 ** attempt) * 2  # Exponential backoff: 2s, 4s, 8s
-                    logger.info(f"OpenAI server error detected. Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    continue
-                
-                # For other errors or last attempt, log full traceback and return None
-                if attempt == max_retries - 1:
-                    logger.error(f"Failed to generate image after {max_retries} attempts")
-                    logger.exception(e)
-                
-                return None
+        try:
+            response = self.providers.generate_image(
+                prompt=prompt,
+                size=size,
+                n=1,
+                user=self.user,
+                purpose="image"
+            )
+        except ProviderError as e:
+            logger.error(f"Failed to generate image: {type(e).__name__}: {str(e)}")
+            return None
         
-        return None
+        image_url = response.data[0].url
+        revised_prompt = getattr(response.data[0], 'revised_prompt', prompt)
+        
+        logger.info(f"Image generated successfully: {image_url[:50]}...")
+        
+        return {
+            'url': image_url,
+            'prompt': prompt,
+            'revised_prompt': revised_prompt,
+            'size': size,
+            'style': style,
+        }
     
     def generate_carousel_images(
         self,
@@ -384,26 +412,22 @@ Format your response as JSON:
 
 Make it engaging and viral-worthy!"""
             
-            if not self.client:
-                raise Exception("LiteLLM client not initialized. Please configure LITELLM_API_KEY.")
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                max_tokens=1500,
-                messages=[{"role": "user", "content": prompt}]
+            # ~2.5 spoken words per second, ~1.3 tokens per word, plus the JSON structure
+            max_tokens = min(int(duration * 2.5 * 1.3) + 600, 1500)
+            response = self.providers.chat(
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+                user=self.user,
+                purpose="video_script",
+                json_mode=True
             )
             
             script_text = response.choices[0].message.content
+            script = self._parse_structured(script_text, VIDEO_SCRIPT_SCHEMA, purpose="video_script")
             
-            # Parse JSON response
-            if "```json" in script_text:
-                json_start = script_text.find("```json") + 7
-                json_end = script_text.find("```", json_start)
-                json_text = script_text[json_start:json_end].strip()
-            else:
-                json_text = script_text
+            if script is None:
+                raise ValueError("Could not parse video script response as JSON")
             
-            script = json.loads(json_text)
             script['duration'] = duration
             script['platform'] = platform
             
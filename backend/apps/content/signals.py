@@ -1,9 +1,18 @@
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.db.models import F
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from django.utils import timezone
 from datetime import date
-from apps.content.models import ContentBlock
+from decimal import Decimal
+from apps.content.image_hashing import invalidate_library_index
+from apps.content.models import ContentBlock, ImageLibrary
 from apps.keywords.models import KeywordResearch
-from apps.users.models import UsageTracking
+from apps.users.models import UsageTracking, LLMUsageLog
+import logging
+
+logger = logging.getLogger(__name__)
 
 @receiver(post_save, sender=ContentBlock)
 def track_content_creation(sender, instance, created, **kwargs):
@@ -44,3 +53,55 @@ def track_video_generation(user):
     )
     usage.video_generations += 1
     usage.save()
+
+def estimate_llm_cost(model, prompt_tokens=0, completion_tokens=0, images=0):
+    """USD cost of a call from settings.LLM_PRICING (per 1M tokens / per image)"""
+    pricing = getattr(settings, 'LLM_PRICING', {}).get(model, {})
+    cost = (
+        Decimal(str(pricing.get('input', 0))) * prompt_tokens / 1_000_000
+        + Decimal(str(pricing.get('output', 0))) * completion_tokens / 1_000_000
+        + Decimal(str(pricing.get('image', 0))) * images
+    )
+    return cost.quantize(Decimal('0.000001'))
+
+def track_llm_call(user, provider, model, kind='chat', prompt_tokens=0, completion_tokens=0,
+                   latency_ms=0, max_tokens=None, purpose='', images=0):
+    cost = estimate_llm_cost(model, prompt_tokens, completion_tokens, images)
+    logger.info(
+        f"LLM call {provider}/{model} [{purpose or kind}]: {prompt_tokens} in, {completion_tokens} out"
+        f" (max {max_tokens}), {latency_ms}ms, ${cost}"
+    )
+    
+    LLMUsageLog.objects.create(
+        user=user,
+        provider=provider,
+        model=model,
+        kind=kind,
+        purpose=purpose,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        max_tokens=max_tokens,
+        latency_ms=latency_ms,
+        cost=cost
+    )
+    
+    if user is None:
+        return
+    
+    current_month = date.today().replace(day=1)
+    UsageTracking.objects.get_or_create(user=user, month=current_month)
+    UsageTracking.objects.filter(user=user, month=current_month).update(
+        llm_calls=F('llm_calls') + 1,
+        llm_prompt_tokens=F('llm_prompt_tokens') + prompt_tokens,
+        llm_completion_tokens=F('llm_completion_tokens') + completion_tokens,
+        llm_cost=F('llm_cost') + cost,
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=ImageLibrary)
+@receiver(post_delete, sender=ImageLibrary)
+def invalidate_image_index(sender, instance, **kwargs):
+    # After commit, so no process rebuilds the index without the change
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_library_index(user_id))
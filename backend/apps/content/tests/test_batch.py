@@ -0,0 +1,157 @@
+from datetime import date, timedelta
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from unittest.mock import patch
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.utils import timezone
+
+from apps.content import batch
+from apps.content.batch import dedupe_specs
+from apps.content.models import ContentBatchJob, ContentBlock, PlatformContent
+from apps.users.models import UsageTracking
+from viral_ai.background_jobs import Heartbeat, JobLost
+
+User = get_user_model()
+
+
+def fake_content(keyword, platform, **kwargs):
+    if keyword == 'broken':
+        raise ValueError('provider exploded')
+    return {'caption': f'{keyword} on {platform}', 'hashtags': ['#ai'], 'hook': 'Hook', 'slides': []}
+
+
+@override_settings(CONTENT_BATCH_RUN_INLINE=True, CONTENT_BATCH_FLUSH_SIZE=2)
+@patch('apps.content.batch.ContentGenerationService.generate_content', side_effect=fake_content)
+@patch('apps.content.services.get_provider_pool')
+class BatchGenerationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='batch@example.com', username='batch', password='pw12345!', subscription_tier='pro'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, items):
+        return self.client.post('/api/content/blocks/generate_batch/', {'items': items}, format='json')
+
+    def test_batch_creates_blocks_in_bulk(self, mock_pool, mock_generate):
+        items = [
+            {'keyword': f'topic {i}', 'platforms': ['instagram', 'linkedin'], 'scheduled_for': f'2026-11-0{i + 1}T09:00:00Z'}
+            for i in range(5)
+        ]
+        response = self.post(items)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'completed')
+        self.assertEqual(response.data['completed_items'], 5)
+        self.assertEqual(ContentBlock.objects.filter(user=self.user).count(), 5)
+        self.assertEqual(PlatformContent.objects.filter(content_block__user=self.user).count(), 10)
+        self.assertEqual(ContentBlock.objects.filter(scheduled_for__isnull=False).count(), 5)
+
+        usage = UsageTracking.objects.get(user=self.user, month=date.today().replace(day=1))
+        self.assertEqual(usage.content_blocks_created, 5)
+
+    def test_identical_specs_are_generated_once(self, mock_pool, mock_generate):
+        spec = {'keyword': 'AI tools', 'platforms': ['twitter']}
+        response = self.post([spec, dict(spec, keyword='  ai   tools '), {'keyword': 'Other', 'platforms': ['twitter']}])
+
+        self.assertEqual(response.data['total_items'], 2)
+        self.assertEqual(response.data['duplicate_items'], 1)
+        self.assertEqual(response.data['items'][0]['request_indexes'], [0, 1])
+        self.assertEqual(mock_generate.call_count, 2)
+
+    def test_failed_items_are_reported_per_item(self, mock_pool, mock_generate):
+        response = self.post([
+            {'keyword': 'fine', 'platforms': ['facebook']},
+            {'keyword': 'broken', 'platforms': ['facebook']},
+        ])
+
+        self.assertEqual(response.data['status'], 'completed_with_errors')
+        failed = [item for item in response.data['items'] if item['status'] == 'failed']
+        self.assertEqual(len(failed), 1)
+        self.assertIn('provider exploded', failed[0]['error'])
+        self.assertEqual(ContentBlock.objects.count(), 1)
+
+    def test_batch_size_is_capped(self, mock_pool, mock_generate):
+        with self.settings(CONTENT_BATCH_MAX_ITEMS=2):
+            response = self.post([{'keyword': str(i), 'platforms': ['tiktok']} for i in range(3)])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ContentBatchJob.objects.exists())
+
+    def test_batches_count_against_the_tier_limit(self, mock_pool, mock_generate):
+        self.user.subscription_tier = 'creator'  # 50 blocks a month
+        self.user.save()
+        UsageTracking.objects.create(user=self.user, month=date.today().replace(day=1), content_blocks_created=47)
+        ContentBatchJob.objects.create(user=self.user, status='running', total_items=2, completed_items=1)
+
+        response = self.post([{'keyword': str(i), 'platforms': ['tiktok']} for i in range(3)])
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIn('2 left', response.data['detail'])
+        self.assertEqual(ContentBatchJob.objects.count(), 1)
+        self.assertEqual(self.post([{'keyword': 'x', 'platforms': ['tiktok']}] * 3).status_code, status.HTTP_202_ACCEPTED)
+
+    @override_settings(CONTENT_BATCH_FLUSH_SIZE=10, CONTENT_BATCH_USER_CONCURRENCY={'pro': 1})
+    def test_progress_is_written_as_items_complete(self, mock_pool, mock_generate):
+        progress = []
+        flush = batch._flush
+
+        def record_flush(job, blocks, versions):
+            flush(job, blocks, versions)
+            progress.append(ContentBatchJob.objects.get(id=job.id).completed_items)
+
+        with patch.object(batch, 'PROGRESS_INTERVAL', 0), patch.object(batch, '_flush', side_effect=record_flush):
+            self.post([{'keyword': f'topic {i}', 'platforms': ['instagram']} for i in range(3)])
+
+        self.assertEqual(progress[:3], [1, 2, 3])
+
+    def test_orphaned_job_resumes_when_polled(self, mock_pool, mock_generate):
+        items, _ = dedupe_specs([{'keyword': f'topic {i}', 'platforms': ['twitter']} for i in range(3)])
+        items[0].update(status='completed', content_block_id='x')
+        items[1]['status'] = 'running'  # In flight when the worker died
+        job = ContentBatchJob.objects.create(
+            user=self.user, items=items, total_items=3, completed_items=1, status='running',
+            attempts=1, heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+
+        response = self.client.get(f'/api/content/batches/{job.id}/')
+
+        self.assertEqual(response.data['status'], 'completed')
+        self.assertEqual(response.data['completed_items'], 3)
+        self.assertEqual(mock_generate.call_count, 2)
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 2)
+
+    def test_job_is_failed_after_max_attempts(self, mock_pool, mock_generate):
+        items, _ = dedupe_specs([{'keyword': 'topic', 'platforms': ['twitter']}])
+        job = ContentBatchJob.objects.create(
+            user=self.user, items=items, total_items=1, status='running',
+            attempts=3, heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(self.client.get(f'/api/content/batches/{job.id}/').data['status'], 'failed')
+        mock_generate.assert_not_called()
+
+    def test_heartbeat_of_replaced_runner_raises(self, mock_pool, mock_generate):
+        job = ContentBatchJob.objects.create(user=self.user, status='running', attempts=2)
+        Heartbeat(ContentBatchJob, job.id, 2).beat(force=True)
+        with self.assertRaises(JobLost):
+            Heartbeat(ContentBatchJob, job.id, 1).beat(force=True)
+
+    def test_jobs_are_scoped_to_user(self, mock_pool, mock_generate):
+        other = User.objects.create_user(email='other@example.com', username='other', password='pw12345!')
+        job = ContentBatchJob.objects.create(user=other)
+
+        response = self.client.get(f'/api/content/batches/{job.id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class DedupeSpecsTests(TestCase):
+    def test_platform_order_does_not_matter(self):
+        items, duplicates = dedupe_specs([
+            {'keyword': 'x', 'platforms': ['instagram', 'tiktok']},
+            {'keyword': 'x', 'platforms': ['tiktok', 'instagram']},
+        ])
+        self.assertEqual((len(items), duplicates), (1, 1))
@@ -0,0 +1,118 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.content.models import BrandKit, ContentBlock, ImageLibrary, PlatformContent
+from apps.keywords.models import KeywordResearch
+from apps.links.models import TrackableLink
+from viral_ai.testing import QueryCountMixin
+
+User = get_user_model()
+
+
+class ConditionalGetTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='etag@example.com', username='etag', password='pw12345!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.block = ContentBlock.objects.create(user=self.user, title='Block')
+        self.version = PlatformContent.objects.create(content_block=self.block, platform='instagram', caption='Hi')
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_list_returns_304_without_serializing(self):
+        first = self.client.get('/api/content/blocks/')
+        self.assertEqual(first.status_code, 200)
+
+        count, queries = self.count_queries(lambda: self.client.get('/api/content/blocks/'))
+        not_modified, _ = self.count_queries(lambda: self.revalidate('/api/content/blocks/', first['ETag']))
+        response = self.revalidate('/api/content/blocks/', first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(not_modified, 1)
+        self.assertGreater(count, not_modified)
+
+    def test_nested_edits_and_deletes_change_the_etag(self):
+        url = f'/api/content/blocks/{self.block.id}/'
+        etag = self.client.get(url)['ETag']
+
+        self.version.caption = 'Edited'
+        self.version.save()
+        response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['platform_versions'][0]['caption'], 'Edited')
+
+        etag = response['ETag']
+        self.version.delete()
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_deleted_row_is_not_hidden_by_if_modified_since(self):
+        ContentBlock.objects.create(user=self.user, title='Second')
+        first = self.client.get('/api/content/blocks/')
+        self.assertNotIn('Last-Modified', first)
+        self.assertNotIn('Last-Modified', self.client.get(f'/api/content/blocks/{self.block.id}/'))
+
+        self.block.delete()
+        response = self.client.get('/api/content/blocks/', HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_single_object_with_own_timestamps_gets_last_modified(self):
+        kit = BrandKit.objects.create(user=self.user, name='Kit')
+        response = self.client.get(f'/api/content/brand-kits/{kit.id}/')
+        self.assertIn('Last-Modified', response)
+        self.assertEqual(
+            self.client.get(f'/api/content/brand-kits/{kit.id}/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code,
+            304
+        )
+
+    def test_etag_varies_by_query_and_user(self):
+        etag = self.client.get('/api/content/blocks/')['ETag']
+        self.assertEqual(self.revalidate('/api/content/blocks/?fields=title', etag).status_code, 200)
+
+        other = User.objects.create_user(email='other@example.com', username='other', password='pw12345!')
+        ContentBlock.objects.create(user=other, title='Theirs')
+        client = APIClient()
+        client.force_authenticate(other)
+        self.assertEqual(client.get('/api/content/blocks/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_missing_object_is_still_404(self):
+        response = self.revalidate('/api/content/blocks/00000000-0000-0000-0000-000000000000/', '*')
+        self.assertEqual(response.status_code, 404)
+
+    def test_other_endpoints_get_content_hash_etags(self):
+        link = TrackableLink.objects.create(user=self.user, destination_url='https://example.com')
+        for url in ('/api/keywords/', '/api/links/', f'/api/links/{link.id}/analytics/', '/api/auth/usage/'):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                self.assertEqual(self.revalidate(url, etag).status_code, 304)
+
+    def test_link_clicks_change_the_etag(self):
+        link = TrackableLink.objects.create(user=self.user, destination_url='https://example.com')
+        for url in ('/api/links/', f'/api/links/{link.id}/', f'/api/links/{link.id}/analytics/'):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                self.assertEqual(self.revalidate(url, etag).status_code, 304)
+
+                self.client.get(f'/l/{link.short_code}/', REMOTE_ADDR='10.0.0.1')
+                self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+        link.refresh_from_db()
+        self.assertEqual((link.clicks, link.unique_visitors), (3, 1))
+        self.assertIsNotNone(link.last_clicked_at)
+
+    def test_keyword_and_image_lists_revalidate_without_serializing(self):
+        KeywordResearch.objects.create(user=self.user, keyword='ai tools')
+        ImageLibrary.objects.create(user=self.user, filename='a.png', file_url='https://example.com/a.png')
+        etags = {url: self.client.get(url)['ETag'] for url in ('/api/keywords/', '/api/content/images/')}
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                count, _ = self.count_queries(lambda: self.revalidate(url, etag))
+                self.assertEqual(self.revalidate(url, etag).status_code, 304)
+                self.assertEqual(count, 1)
+
+        KeywordResearch.objects.create(user=self.user, keyword='ai writing')
+        ImageLibrary.objects.filter(user=self.user).delete()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.revalidate(url, etag).status_code, 200)
@@ -0,0 +1,149 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from unittest.mock import patch
+from rest_framework.test import APIClient
+from rest_framework import status
+from PIL import Image, ImageDraw
+
+from apps.content import image_hashing
+from apps.content.image_hashing import BKTree, dhash, hamming_distance, phash, prompt_fingerprint
+from apps.content.models import ImageLibrary
+
+User = get_user_model()
+
+
+def make_image(shift=0, size=256):
+    image = Image.new('RGB', (size, size), 'white')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([40 + shift, 40, 140 + shift, 200], fill='black')
+    draw.ellipse([150, 60 + shift, 230, 140 + shift], fill='red')
+    return image
+
+
+class PerceptualHashTests(TestCase):
+    def test_resized_copy_is_near_duplicate(self):
+        original = make_image()
+        resized = original.resize((128, 128))
+        self.assertLessEqual(hamming_distance(phash(original), phash(resized)), 4)
+        self.assertLessEqual(hamming_distance(dhash(original), dhash(resized)), 4)
+
+    def test_different_images_are_far_apart(self):
+        other = Image.new('RGB', (256, 256), 'white')
+        ImageDraw.Draw(other).rectangle([0, 180, 256, 256], fill='blue')
+        self.assertGreater(hamming_distance(phash(make_image()), phash(other)), 12)
+
+    def test_bk_tree_matches_linear_scan(self):
+        hashes = [f"{(i * 2654435761) % (1 << 64):016x}" for i in range(300)]
+        tree = BKTree((h, i) for i, h in enumerate(hashes))
+        query = hashes[17]
+
+        expected = sorted(i for i, h in enumerate(hashes) if hamming_distance(h, query) <= 20)
+        found = sorted(i for _, i in tree.search(query, 20))
+        self.assertEqual(found, expected)
+        self.assertEqual(len(tree), 300)
+
+
+class ImageDedupApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def _add_image(self, image, name):
+        return ImageLibrary.objects.create(
+            user=self.user,
+            filename=name,
+            file_url=f'https://example.com/{name}',
+            is_ai_generated=True,
+            phash=phash(image),
+            dhash=dhash(image),
+        )
+
+    def test_similar_endpoint_returns_near_duplicates(self):
+        base = self._add_image(make_image(), 'a.png')
+        near = self._add_image(make_image(shift=2), 'b.png')
+        far_image = Image.new('RGB', (256, 256), 'white')
+        ImageDraw.Draw(far_image).rectangle([0, 180, 256, 256], fill='blue')
+        self._add_image(far_image, 'c.png')
+
+        response = self.client.get(f'/api/content/images/{base.id}/similar/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [item['image']['id'] for item in response.data['results']]
+        self.assertEqual(ids, [str(near.id)])
+
+    @patch('apps.content.views.ContentGenerationService')
+    def test_dedup_reuses_identical_prompt_without_generating(self, mock_service):
+        payload = {'prompt': 'A cat on a laptop', 'dedup': True}
+        mock_service.return_value.generate_image.return_value = {'url': 'https://example.com/cat.png'}
+
+        with patch('apps.content.views.hash_image_url', return_value={'phash': phash(make_image())}):
+            first = self.client.post('/api/content/blocks/generate_image/', payload, format='json')
+        second = self.client.post('/api/content/blocks/generate_image/', payload, format='json')
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertTrue(second.data['deduplicated'])
+        self.assertEqual(second.data['image']['id'], first.data['image']['id'])
+        self.assertEqual(mock_service.return_value.generate_image.call_count, 1)
+        self.assertEqual(ImageLibrary.objects.filter(user=self.user).count(), 1)
+
+    @patch('apps.content.views.ContentGenerationService')
+    def test_dedup_reuses_visually_identical_image(self, mock_service):
+        existing = self._add_image(make_image(), 'existing.png')
+        mock_service.return_value.generate_image.return_value = {'url': 'https://example.com/new.png'}
+
+        with patch('apps.content.views.hash_image_url', return_value={'phash': phash(make_image().resize((200, 200)))}):
+            response = self.client.post(
+                '/api/content/blocks/generate_image/',
+                {'prompt': 'A different wording', 'dedup': True},
+                format='json'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['image']['id'], str(existing.id))
+        self.assertEqual(ImageLibrary.objects.filter(user=self.user).count(), 1)
+
+    @patch('apps.content.views.ContentGenerationService')
+    def test_prompts_with_the_same_words_are_not_reused(self, mock_service):
+        existing = self._add_image(make_image(), 'car.png')
+        existing.prompt_hash = prompt_fingerprint('red car by a blue house', '1024x1024', 'natural')
+        existing.save()
+        mock_service.return_value.generate_image.return_value = {'url': 'https://example.com/blue-car.png'}
+        different = Image.new('RGB', (256, 256), 'white')
+        ImageDraw.Draw(different).rectangle([0, 180, 256, 256], fill='blue')
+
+        with patch('apps.content.views.hash_image_url', return_value={'phash': phash(different)}):
+            response = self.client.post(
+                '/api/content/blocks/generate_image/', {'prompt': 'blue car by a red house', 'dedup': True}, format='json'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotEqual(response.data['image']['id'], str(existing.id))
+        mock_service.return_value.generate_image.assert_called_once()
+
+    def test_library_index_is_reused_until_the_library_changes(self):
+        base = self._add_image(make_image(), 'a.png')
+        url = f'/api/content/images/{base.id}/similar/'
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(url)
+        with patch.object(image_hashing, 'build_library_index', wraps=image_hashing.build_library_index) as build:
+            self.client.get(url)
+            build.assert_not_called()
+
+            with self.captureOnCommitCallbacks(execute=True):
+                near = self._add_image(make_image(shift=2), 'b.png')
+            near_id = str(near.id)
+            response = self.client.get(url)
+            self.assertEqual(build.call_count, 1)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                near.delete()
+            self.assertEqual(self.client.get(url).data['results'], [])
+
+        self.assertEqual([item['image']['id'] for item in response.data['results']], [near_id])
@@ -0,0 +1,59 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.content.models import ContentBlock, PlatformContent
+from viral_ai.sparse_fields import parse_fields_param
+from viral_ai.testing import QueryCountMixin
+
+User = get_user_model()
+
+
+class ContentListParamsTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='pages@example.com', username='pages', password='pw12345!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for i in range(5):
+            block = ContentBlock.objects.create(user=self.user, title=f'Block {i}')
+            PlatformContent.objects.create(content_block=block, platform='instagram', caption='Hi', content_data={'big': 'x' * 100})
+
+    def test_page_numbers_remain_the_default(self):
+        response = self.client.get('/api/content/blocks/')
+        self.assertEqual(response.data['count'], 5)
+
+    def test_cursor_pages_cover_every_block_once(self):
+        seen = []
+        url = '/api/content/blocks/?pagination=cursor&page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertNotIn('count', response.data)
+            seen += [block['id'] for block in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_sparse_fields_skip_heavy_columns(self):
+        response = self.client.get('/api/content/blocks/?fields=title,platform_versions.platform')
+        block = response.data['results'][0]
+        self.assertEqual(set(block), {'id', 'title', 'platform_versions'})
+        self.assertEqual(set(block['platform_versions'][0]), {'id', 'platform'})
+
+        _, queries = self.count_queries(lambda: self.client.get('/api/content/blocks/?fields=title,platform_versions.platform'))
+        self.assertFalse(any('content_data' in sql for sql in queries))
+
+    def test_sparse_cursor_pages_keep_constant_queries(self):
+        def add_blocks(count):
+            for _ in range(count):
+                ContentBlock.objects.create(user=self.user, title='More')
+
+        self.assertConstantQueries(
+            lambda: self.client.get('/api/content/blocks/?pagination=cursor&fields=title'), add_blocks
+        )
+
+    def test_parse_fields_param(self):
+        self.assertEqual(
+            parse_fields_param('id, title,platform_versions.caption,platform_versions.platform'),
+            {'id': {}, 'title': {}, 'platform_versions': {'caption': {}, 'platform': {}}}
+        )
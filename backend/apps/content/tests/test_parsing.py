@@ -0,0 +1,80 @@
+from django.test import SimpleTestCase
+from unittest.mock import MagicMock, patch
+
+from apps.content.parsing import (
+    MULTI_PART_SCHEMA,
+    POST_SCHEMA,
+    IncrementalJSONExtractor,
+    extract_json,
+    parse_structured,
+)
+from apps.content.services import ContentGenerationService
+
+
+def chat_response(text):
+    response = MagicMock()
+    response.choices[0].message.content = text
+    return response
+
+
+class ExtractJsonTests(SimpleTestCase):
+    def test_fenced_json_with_prose_comments_and_trailing_commas(self):
+        text = '''Here is your post!
+```json
+{
+    "caption": "Braces {like these} and \\"quotes\\" stay intact",
+    "hashtags": ["ai", "tools",],
+    "slides": [] // Only for carousel/thread
+}
+```
+Hope it helps.'''
+        data = extract_json(text)
+        self.assertEqual(data['caption'], 'Braces {like these} and "quotes" stay intact')
+        self.assertEqual(data['hashtags'], ['ai', 'tools'])
+
+    def test_truncated_response_is_closed(self):
+        data = extract_json('{"caption": "Cut off at max_tok')
+        self.assertEqual(data, {'caption': 'Cut off at max_tok'})
+
+    def test_incremental_extractor_handles_split_chunks(self):
+        extractor = IncrementalJSONExtractor()
+        self.assertEqual(extractor.feed('noise {"a": "}'), [])
+        self.assertEqual(extractor.feed('", "b": [1, 2]} tail'), ['{"a": "}", "b": [1, 2]}'])
+
+    def test_schema_validation_reports_invalid_fields(self):
+        data, invalid = parse_structured('{"caption": "Hi", "hashtags": "#ai #tools"}', MULTI_PART_SCHEMA)
+        self.assertEqual(data['hashtags'], ['#ai', '#tools'])
+        self.assertEqual(invalid, ['slides'])
+
+
+@patch('apps.content.services.get_provider_pool')
+class RepairTests(SimpleTestCase):
+    def test_only_invalid_fields_are_repaired(self, mock_pool):
+        pool = mock_pool.return_value
+        pool.chat.return_value = chat_response('{"hashtags": ["ai", "productivity"]}')
+        service = ContentGenerationService()
+
+        result = service._parse_content_response('{"caption": "Great post", "hook": "Wow"}', 'twitter')
+
+        self.assertEqual(result['caption'], 'Great post')
+        self.assertEqual(result['hashtags'], ['ai', 'productivity'])
+        prompt = pool.chat.call_args.kwargs['messages'][0]['content']
+        self.assertIn('hashtags', prompt)
+        self.assertNotIn('"caption"', prompt.split('exactly these fields:')[1])
+        self.assertTrue(pool.chat.call_args.kwargs['json_mode'])
+
+    def test_valid_response_makes_no_repair_call(self, mock_pool):
+        service = ContentGenerationService()
+        result = service._parse_content_response('{"caption": "Hi", "hashtags": ["a"]}', 'instagram')
+
+        self.assertEqual(result['caption'], 'Hi')
+        mock_pool.return_value.chat.assert_not_called()
+
+    def test_unrecoverable_response_falls_back_to_raw_caption(self, mock_pool):
+        mock_pool.return_value.chat.return_value = chat_response('still not json')
+        service = ContentGenerationService()
+
+        result = service._parse_content_response('Just some text', 'linkedin')
+
+        self.assertEqual(result['caption'], 'Just some text')
+        self.assertEqual(set(POST_SCHEMA) - set(result), set())
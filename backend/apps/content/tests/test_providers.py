@@ -0,0 +1,171 @@
+from decimal import Decimal
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.contrib.auth import get_user_model
+from unittest.mock import MagicMock, patch
+
+from apps.content.providers import (
+    CircuitBreaker,
+    InvalidRequestError,
+    Provider,
+    ProviderPool,
+    ProviderServerError,
+    RateLimitError,
+    TokenBucket,
+    reset_provider_state,
+)
+from apps.content.humanizer import apply_brand_voice, humanize_content
+from apps.content.services import ContentGenerationService
+from apps.users.models import LLMUsageLog, UsageTracking
+
+User = get_user_model()
+
+
+def make_provider(name, side_effect):
+    client = MagicMock()
+    client.chat.completions.create.side_effect = side_effect
+    return Provider(name=name, client=client, chat_model='gpt-4o-mini', image_model='dall-e-3')
+
+
+@override_settings(
+    LLM_RETRY_MAX_ATTEMPTS=3,
+    LLM_BREAKER_FAILURE_THRESHOLD=2,
+    LLM_BREAKER_RESET_SECONDS=60,
+    LLM_RATE_LIMITS={'default': 6000},
+)
+@patch('apps.content.providers.time.sleep')
+class ProviderPoolTests(SimpleTestCase):
+    def setUp(self):
+        reset_provider_state()
+        # Usage accounting writes to the DB; it has its own tests below
+        recorder = patch('apps.content.providers._record_usage')
+        self.record_usage = recorder.start()
+        self.addCleanup(recorder.stop)
+
+    def tearDown(self):
+        reset_provider_state()
+
+    def test_retries_typed_errors_then_succeeds(self, mock_sleep):
+        provider = make_provider('openai', [ProviderServerError('500'), RateLimitError('429'), 'ok'])
+        pool = ProviderPool([provider])
+
+        with self.settings(LLM_BREAKER_FAILURE_THRESHOLD=5):
+            self.assertEqual(pool.chat(messages=[]), 'ok')
+        self.assertEqual(provider.client.chat.completions.create.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_fails_over_when_breaker_opens(self, mock_sleep):
+        primary = make_provider('openai', ProviderServerError('500'))
+        fallback = make_provider('litellm', lambda **kwargs: 'fallback')
+        pool = ProviderPool([primary, fallback])
+
+        self.assertEqual(pool.chat(messages=[]), 'fallback')
+        # Breaker opened after two failures, so the third attempt was skipped
+        self.assertEqual(primary.client.chat.completions.create.call_count, 2)
+
+        # Subsequent calls fail fast straight to the fallback
+        self.assertEqual(pool.chat(messages=[]), 'fallback')
+        self.assertEqual(primary.client.chat.completions.create.call_count, 2)
+
+    def test_invalid_request_is_not_retried_or_failed_over(self, mock_sleep):
+        primary = make_provider('openai', InvalidRequestError('400'))
+        fallback = make_provider('litellm', lambda **kwargs: 'fallback')
+
+        with self.assertRaises(InvalidRequestError):
+            ProviderPool([primary, fallback]).chat(messages=[])
+        fallback.client.chat.completions.create.assert_not_called()
+
+    def test_half_open_lets_a_single_probe_through(self, mock_sleep):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        breaker.record_success()
+        self.assertTrue(breaker.allow_request())
+        self.assertTrue(breaker.allow_request())
+
+    def test_probe_is_released_when_the_request_itself_is_bad(self, mock_sleep):
+        provider = make_provider('openai', InvalidRequestError('400'))
+        provider.breaker.reset_timeout = 0
+        provider.breaker.record_failure()
+        provider.breaker.record_failure()
+
+        with self.assertRaises(InvalidRequestError):
+            ProviderPool([provider]).chat(messages=[])
+        self.assertTrue(provider.breaker.allow_request())
+
+    def test_prefer_reorders_providers(self, mock_sleep):
+        openai_provider = make_provider('openai', lambda **kwargs: 'openai')
+        litellm_provider = make_provider('litellm', lambda **kwargs: 'litellm')
+        pool = ProviderPool([openai_provider, litellm_provider])
+
+        self.assertEqual(pool.chat(messages=[], prefer='litellm'), 'litellm')
+
+
+class PrimitivesTests(SimpleTestCase):
+    def test_token_bucket_limits_burst(self):
+        bucket = TokenBucket(rate=1.0, capacity=2)
+        self.assertTrue(bucket.acquire())
+        self.assertTrue(bucket.acquire())
+        self.assertFalse(bucket.acquire(max_wait=0))
+
+    def test_circuit_breaker_half_opens_after_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+@override_settings(LLM_RATE_LIMITS={'default': 6000}, LLM_PRICING={'gpt-4o-mini': {'input': 1.0, 'output': 2.0}})
+class UsageAccountingTests(TestCase):
+    def setUp(self):
+        reset_provider_state()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword123'
+        )
+
+    def test_chat_usage_is_logged_and_aggregated(self):
+        response = MagicMock()
+        response.usage.prompt_tokens = 1000
+        response.usage.completion_tokens = 500
+        provider = make_provider('openai', lambda **kwargs: response)
+        pool = ProviderPool([provider])
+
+        pool.chat(messages=[], max_tokens=300, user=self.user, purpose='content:twitter')
+        pool.chat(messages=[], max_tokens=300, user=self.user, purpose='content:twitter')
+
+        log = LLMUsageLog.objects.filter(user=self.user).first()
+        self.assertEqual(log.model, 'gpt-4o-mini')
+        self.assertEqual(log.max_tokens, 300)
+        self.assertEqual(log.cost, Decimal('0.002000'))
+
+        usage = UsageTracking.objects.get(user=self.user)
+        self.assertEqual(usage.llm_calls, 2)
+        self.assertEqual(usage.llm_prompt_tokens, 2000)
+        self.assertEqual(usage.llm_completion_tokens, 1000)
+        self.assertEqual(usage.llm_cost, Decimal('0.004'))
+
+    def test_max_tokens_scales_with_platform(self):
+        service = ContentGenerationService()
+        twitter = service.max_tokens_for('twitter', 'tweet')
+        linkedin = service.max_tokens_for('linkedin', 'post')
+
+        self.assertLess(twitter, 500)
+        self.assertLess(twitter, linkedin)
+        self.assertGreater(service.max_tokens_for('twitter', 'thread'), twitter)
+        self.assertEqual(service.max_tokens_for('facebook', 'post'), 2000)
+
+    def test_rewrites_are_accounted_to_the_user(self):
+        pool = MagicMock()
+        pool.chat.return_value.choices[0].message.content = 'Rewritten'
+        with patch('apps.content.humanizer.get_provider_pool', return_value=pool):
+            self.assertEqual(humanize_content('Draft', user=self.user), 'Rewritten')
+            self.assertEqual(apply_brand_voice('Draft', {}, user=self.user), 'Rewritten')
+
+        self.assertEqual(
+            [(call.kwargs['user'], call.kwargs['purpose']) for call in pool.chat.call_args_list],
+            [(self.user, 'humanize'), (self.user, 'brand_voice')]
+        )
@@ -0,0 +1,94 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.content.models import BrandKit, ContentBatchJob, ContentBlock, ImageLibrary, PlatformContent
+from viral_ai.testing import QueryCountMixin
+
+User = get_user_model()
+
+
+class ContentQueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='queries@example.com', username='queries', password='pw12345!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_blocks(self, count):
+        for i in range(count):
+            block = ContentBlock.objects.create(user=self.user, title=f'Block {i}')
+            for platform in ('instagram', 'linkedin'):
+                PlatformContent.objects.create(content_block=block, platform=platform, caption='Hi')
+
+    def test_block_list(self):
+        self.assertConstantQueries(lambda: self.client.get('/api/content/blocks/'), self.add_blocks)
+
+    def test_block_detail(self):
+        block = ContentBlock.objects.create(user=self.user, title='Detail')
+
+        def add_versions(count):
+            for _ in range(count):
+                PlatformContent.objects.create(content_block=block, platform='twitter')
+
+        self.assertConstantQueries(lambda: self.client.get(f'/api/content/blocks/{block.id}/'), add_versions)
+
+    def test_block_update(self):
+        block = ContentBlock.objects.create(user=self.user, title='Update')
+
+        def add_versions(count):
+            for _ in range(count):
+                PlatformContent.objects.create(content_block=block, platform='twitter')
+
+        self.assertConstantQueries(
+            lambda: self.client.patch(f'/api/content/blocks/{block.id}/', {'title': 'Renamed'}, format='json'),
+            add_versions
+        )
+
+    def test_batch_detail(self):
+        job = ContentBatchJob.objects.create(user=self.user, status='completed')
+        # Stale-job check, ETag validators, then the job itself
+        with self.assertNumQueries(3):
+            self.client.get(f'/api/content/batches/{job.id}/')
+
+    def test_batch_list(self):
+        self.assertConstantQueries(
+            lambda: self.client.get('/api/content/batches/'),
+            lambda count: [ContentBatchJob.objects.create(user=self.user) for _ in range(count)]
+        )
+
+    def test_brand_kit_list(self):
+        self.assertConstantQueries(
+            lambda: self.client.get('/api/content/brand-kits/'),
+            lambda count: [BrandKit.objects.create(user=self.user, name='Kit') for _ in range(count)]
+        )
+
+    def test_image_list_and_similar(self):
+        image = ImageLibrary.objects.create(user=self.user, filename='a.png', file_url='https://x.test/a.png', phash='0' * 16)
+
+        def add_images(count):
+            for i in range(count):
+                ImageLibrary.objects.create(
+                    user=self.user, filename=f'{i}.png', file_url=f'https://x.test/{i}.png', phash=f'{i + 1:016x}'
+                )
+
+        self.assertConstantQueries(lambda: self.client.get('/api/content/images/'), add_images)
+        self.assertConstantQueries(lambda: self.client.get(f'/api/content/images/{image.id}/similar/'), add_images)
+
+
+class ContentAdminQueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(email='admin@example.com', username='admin', password='pw12345!')
+        self.client.force_login(self.user)
+
+    def test_changelists(self):
+        def add_blocks(count):
+            for i in range(count):
+                block = ContentBlock.objects.create(user=self.user, title=f'Block {i}')
+                PlatformContent.objects.create(content_block=block, platform='instagram')
+                BrandKit.objects.create(user=self.user, name=f'Kit {i}')
+                ContentBatchJob.objects.create(user=self.user)
+
+        for model in ('contentblock', 'platformcontent', 'brandkit', 'contentbatchjob'):
+            with self.subTest(model=model):
+                self.assertConstantQueries(lambda: self.client.get(reverse(f'admin:content_{model}_changelist')), add_blocks)
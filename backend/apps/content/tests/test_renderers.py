@@ -0,0 +1,74 @@
+import io
+import json
+from decimal import Decimal
+from unittest.mock import patch
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.content.models import ContentBlock, PlatformContent
+from apps.content.serializers import ContentBlockSerializer
+from viral_ai import renderers
+from viral_ai.renderers import FastJSONParser, FastJSONRenderer
+
+User = get_user_model()
+
+
+class FastJSONTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='json@example.com', username='json', password='pw12345!')
+        block = ContentBlock.objects.create(user=self.user, title='Ünïcode ✨ block', revenue_generated=Decimal('12.50'))
+        PlatformContent.objects.create(content_block=block, platform='instagram', hashtags=['#ai'], content_data={'slides': [1, 2]})
+        self.block = ContentBlock.objects.prefetch_related('platform_versions').get(id=block.id)
+
+    def test_output_matches_stdlib_renderer(self):
+        data = ContentBlockSerializer(self.block).data
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_non_native_types_use_drf_encoding(self):
+        data = {'amount': Decimal('1.10'), 'id': self.block.id, 'when': self.block.created_at, 1: 'int key'}
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+
+    def test_line_separators_are_escaped_like_stdlib(self):
+        data = {'a': 'x\u2028y\u2029z', 'b': None}
+        rendered = FastJSONRenderer().render(data)
+        self.assertEqual(rendered, JSONRenderer().render(data))
+        self.assertIn(b'x\\u2028y\\u2029z', rendered)
+
+    def test_non_finite_floats_match_stdlib(self):
+        for value in (float('nan'), float('inf')):
+            data = {'scores': [1.5, {'x': value}]}
+            with self.assertRaises(ValueError):
+                JSONRenderer().render(data)
+            with self.assertRaises(ValueError):
+                FastJSONRenderer().render(data)
+
+        # STRICT_JSON = False
+        fast, stdlib = FastJSONRenderer(), JSONRenderer()
+        fast.strict = stdlib.strict = False
+        data = {'score': float('nan'), 'none': None}
+        self.assertEqual(fast.render(data), stdlib.render(data))
+        self.assertEqual(FastJSONRenderer().render({'none': None}), b'{"none":null}')
+
+    def test_indented_output_falls_back_to_stdlib(self):
+        rendered = FastJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+        self.assertEqual(rendered, b'{\n    "a": 1\n}')
+
+    def test_parser_round_trip_and_errors(self):
+        parser = FastJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO('{"keyword": "café"}'.encode())), {'keyword': 'café'})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"keyword": '))
+
+    def test_stdlib_fallback_without_orjson(self):
+        with patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render({'a': 1}), b'{"a":1}')
+            self.assertEqual(FastJSONParser().parse(io.BytesIO(b'{"a": 1}')), {'a': 1})
+
+    def test_api_uses_fast_renderer(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/content/blocks/')
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
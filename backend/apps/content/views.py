@@ -2,30 +2,49 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from .models import ContentBlock, PlatformContent, BrandKit, ImageLibrary
+from viral_ai.conditional import ConditionalGetMixin
+from viral_ai.pagination import HybridPagination
+from viral_ai.sparse_fields import SparseFieldsetViewMixin
+from .models import ContentBlock, ContentBatchJob, PlatformContent, BrandKit, ImageLibrary
 from .serializers import (
     ContentBlockSerializer,
     PlatformContentSerializer,
     ContentGenerationRequestSerializer,
+    BatchGenerationRequestSerializer,
+    ContentBatchJobSerializer,
     ImageGenerationRequestSerializer,
     BrandKitSerializer,
     ImageLibrarySerializer
 )
 from .services import ContentGenerationService
+from .batch import dedupe_specs, remaining_content_blocks, resume_batch_job_if_stale, start_batch_job
+from .image_hashing import (
+    DEFAULT_DUPLICATE_DISTANCE,
+    DEFAULT_SIMILAR_DISTANCE,
+    get_library_index,
+    hash_image_url,
+    prompt_fingerprint,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class ContentBlockViewSet(viewsets.ModelViewSet):
-    """API endpoint for content blocks"""
+class ContentBlockViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    """
+    API endpoint for content blocks
+    
+    GET /api/content/blocks/?pagination=cursor&fields=id,title,platform_versions.platform
+    """
     
     serializer_class = ContentBlockSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = HybridPagination
+    conditional_timestamp_fields = ('updated_at', 'platform_versions__updated_at')
     
     def get_queryset(self):
         """Return content blocks for current user"""
-        return ContentBlock.objects.filter(user=self.request.user)
+        return ContentBlock.objects.filter(user=self.request.user).prefetch_related('platform_versions')
     
     @action(detail=False, methods=['post'])
     def generate(self, request):
@@ -58,7 +77,7 @@ class ContentBlockViewSet(viewsets.ModelViewSet):
         data = serializer.validated_data
         
         try:
-            service = ContentGenerationService()
+            service = ContentGenerationService(user=request.user)
             
             # Create content block
             content_block = ContentBlock.objects.create(
@@ -92,19 +111,7 @@ class ContentBlockViewSet(viewsets.ModelViewSet):
                 )
 
                 # Post-process: Append custom instructions if provided
-                if data.get('custom_prompt'):
-                    custom_text = data.get('custom_prompt')
-                    # Extract the actual instruction (e.g., "Always end with: Visit ai-it.io")
-                    if 'end with:' in custom_text.lower():
-                        ending = custom_text.split('end with:', 1)[1].strip()
-                        if content_data.get('caption'):
-                            content_data['caption'] = content_data['caption'].rstrip() + f" {ending}"
-                        if content_data.get('cta'):
-                            content_data['cta'] = content_data['cta'].rstrip() + f" {ending}"
-                    elif 'mention:' in custom_text.lower():
-                        mention = custom_text.split('mention:', 1)[1].strip()
-                        if content_data.get('caption'):
-                            content_data['caption'] = content_data['caption'].rstrip() + f" {mention}"
+                content_data = service.apply_custom_instructions(content_data, data.get('custom_prompt'))
                 
                 
                 images = []
@@ -190,6 +197,65 @@ class ContentBlockViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @action(detail=False, methods=['post'])
+    def generate_batch(self, request):
+        """
+        Queue text content for many content calendar slots at once
+        
+        POST /api/content/blocks/generate_batch/
+        {
+            "items": [
+                {"keyword": "AI tools", "platforms": ["instagram"], "scheduled_for": "2026-11-02T09:00:00Z"},
+                {"keyword": "Remote work", "platforms": ["linkedin", "twitter"], "tone": "casual"}
+            ]
+        }
+        
+        Returns 202 with the job; poll GET /api/content/batches/<id>/ for progress.
+        Identical items are generated once. Images are not generated in batches.
+        Returns 403 when the unique items exceed what the user's tier has left this month.
+        """
+        serializer = BatchGenerationRequestSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            items, duplicates = dedupe_specs(serializer.validated_data['items'])
+            remaining = remaining_content_blocks(request.user)
+            if len(items) > remaining:
+                return Response(
+                    {
+                        'error': 'Monthly content block limit reached',
+                        'detail': f'{len(items)} items requested, {remaining} left on the '
+                                  f'{request.user.subscription_tier} plan this month',
+                    },
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            
+            job = ContentBatchJob.objects.create(
+                user=request.user,
+                items=items,
+                total_items=len(items),
+                duplicate_items=duplicates
+            )
+            start_batch_job(job)
+            job.refresh_from_db()
+            
+            return Response(
+                ContentBatchJobSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED
+            )
+            
+        except Exception as e:
+            logger.error(f"Error starting batch generation: {str(e)}")
+            return Response(
+                {'error': 'Failed to start batch generation', 'detail': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
     @action(detail=False, methods=['post'])
     def generate_image(self, request):
         """
@@ -199,8 +265,13 @@ class ContentBlockViewSet(viewsets.ModelViewSet):
         {
             "prompt": "Professional social media image about AI",
             "style": "natural",
-            "size": "1024x1024"
+            "size": "1024x1024",
+            "dedup": true
         }
+        
+        With "dedup", an earlier request with the same prompt, size and style is
+        returned without calling the image API, and a generated image that is visually near-identical to a library image is
+        returned instead of adding a new library entry.
         """
         serializer = ImageGenerationRequestSerializer(data=request.data)
         
@@ -210,21 +281,60 @@ class ContentBlockViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        data = serializer.validated_data
+        prompt_hash = prompt_fingerprint(data['prompt'], data.get('size', ''), data.get('style', ''))
+        
         try:
-            service = ContentGenerationService()
+            # Dedup: the exact same request already in the library is reused without
+            # calling the image API (pHash only exists once an image is paid for)
+            if data.get('dedup'):
+                existing = ImageLibrary.objects.filter(user=request.user, prompt_hash=prompt_hash).first()
+                if existing:
+                    logger.info(f"Reusing library image {existing.id} for matching prompt")
+                    return Response({
+                        'image': ImageLibrarySerializer(existing).data,
+                        'metadata': {'size': data.get('size'), 'style': data.get('style')},
+                        'deduplicated': True,
+                    }, status=status.HTTP_200_OK)
+            
+            service = ContentGenerationService(user=request.user)
             image_data = service.generate_image(
-                prompt=serializer.validated_data['prompt'],
-                style=serializer.validated_data.get('style', 'natural'),
-                size=serializer.validated_data.get('size', '1024x1024')
+                prompt=data['prompt'],
+                style=data.get('style', 'natural'),
+                size=data.get('size', '1024x1024')
             )
             
+            hashes = hash_image_url(image_data['url'])
+            
+            # Dedup: a visually near-identical image is reused instead of growing the library
+            if data.get('dedup') and hashes.get('phash'):
+                duplicate = find_duplicate_image(request.user, hashes['phash'], DEFAULT_DUPLICATE_DISTANCE)
+                if duplicate:
+                    distance, existing = duplicate
+                    logger.info(f"Generated image duplicates library image {existing.id} (distance {distance})")
+                    return Response({
+                        'image': ImageLibrarySerializer(existing).data,
+                        'metadata': {
+                            'revised_prompt': image_data.get('revised_prompt'),
+                            'size': image_data.get('size'),
+                            'style': image_data.get('style'),
+                            'distance': distance,
+                        },
+                        'deduplicated': True,
+                    }, status=status.HTTP_200_OK)
+            
             # Save to image library
             image = ImageLibrary.objects.create(
                 user=request.user,
                 filename=f"ai_generated_{image_data['url'].split('/')[-1][:20]}.png",
                 file_url=image_data['url'],
+                width=hashes.get('width'),
+                height=hashes.get('height'),
                 is_ai_generated=True,
-                tags=['ai-generated', 'dall-e-3']
+                tags=['ai-generated', 'dall-e-3'],
+                phash=hashes.get('phash', ''),
+                dhash=hashes.get('dhash', ''),
+                prompt_hash=prompt_hash
             )
             
             return Response({
@@ -233,7 +343,8 @@ class ContentBlockViewSet(viewsets.ModelViewSet):
                     'revised_prompt': image_data.get('revised_prompt'),
                     'size': image_data.get('size'),
                     'style': image_data.get('style'),
-                }
+                },
+                'deduplicated': False,
             }, status=status.HTTP_201_CREATED)
             
         except Exception as e:
@@ -244,27 +355,124 @@ class ContentBlockViewSet(viewsets.ModelViewSet):
             )
 
 
-class BrandKitViewSet(viewsets.ModelViewSet):
+class ContentBatchJobViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    """API endpoint for batch generation jobs (poll with If-None-Match to get 304s while nothing changes)"""
+    
+    serializer_class = ContentBatchJobSerializer
+    permission_classes = [IsAuthenticated]
+    conditional_timestamp_fields = ('updated_at',)
+    
+    def get_queryset(self):
+        return ContentBatchJob.objects.filter(user=self.request.user)
+    
+    def retrieve(self, request, *args, **kwargs):
+        # A job orphaned by a restart picks up again when its owner polls it
+        resume_batch_job_if_stale(self.get_queryset().filter(pk=kwargs['pk']))
+        return super().retrieve(request, *args, **kwargs)
+
+
+class BrandKitViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """API endpoint for brand kits"""
     
     serializer_class = BrandKitSerializer
     permission_classes = [IsAuthenticated]
+    conditional_timestamp_fields = ('updated_at',)
     
     def get_queryset(self):
-        return BrandKit.objects.filter(user=self.request.user)
+        return BrandKit.objects.filter(user=self.request.user).order_by('-created_at')
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
 
-class ImageLibraryViewSet(viewsets.ModelViewSet):
+class ImageLibraryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """API endpoint for image library"""
     
     serializer_class = ImageLibrarySerializer
     permission_classes = [IsAuthenticated]
+    # Library images aren't edited after creation: newest row plus row count is enough
+    conditional_timestamp_fields = ('created_at',)
     
     def get_queryset(self):
         return ImageLibrary.objects.filter(user=self.request.user)
     
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        """Hash the image at ingest so it can be matched against the library later"""
+        hashes = hash_image_url(serializer.validated_data['file_url'])
+        serializer.save(
+            user=self.request.user,
+            phash=hashes.get('phash', ''),
+            dhash=hashes.get('dhash', ''),
+            width=serializer.validated_data.get('width') or hashes.get('width'),
+            height=serializer.validated_data.get('height') or hashes.get('height'),
+        )
+    
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """
+        Find visually similar images in the user's library
+        
+        GET /api/content/images/<id>/similar/?max_distance=12
+        """
+        image = self.get_object()
+        
+        if not image.phash:
+            return Response(
+                {'error': 'Image has no perceptual hash'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            max_distance = int(request.query_params.get('max_distance', DEFAULT_SIMILAR_DISTANCE))
+        except ValueError:
+            return Response(
+                {'error': 'max_distance must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        max_distance = max(0, min(max_distance, 32))
+        
+        matches = find_similar_images(request.user, image.phash, max_distance, exclude_id=image.id)
+        
+        return Response({
+            'image_id': str(image.id),
+            'max_distance': max_distance,
+            'results': [
+                {'distance': distance, 'image': ImageLibrarySerializer(match).data}
+                for distance, match in matches
+            ],
+        })
+
+
+def find_similar_images(user, phash, max_distance, exclude_id=None):
+    """
+    Return (distance, ImageLibrary) pairs from the user's library within
+    max_distance bits of the given perceptual hash, closest first
+    
+    Searches the user's cached BK-tree; it is only rebuilt after the library changes.
+    """
+    index = get_library_index(
+        user.pk,
+        lambda: ImageLibrary.objects.filter(user=user).exclude(phash='').values_list('id', 'phash')
+    )
+    
+    matches = [
+        (distance, image_id)
+        for distance, image_id in index.search(phash, max_distance)
+        if image_id != exclude_id
+    ]
+    images = ImageLibrary.objects.in_bulk([image_id for _, image_id in matches])
+    
+    return [(distance, images[image_id]) for distance, image_id in matches if image_id in images]
+
+
+def find_duplicate_image(user, phash, max_distance):
+    """
+    Closest (distance, ImageLibrary) within max_distance of the hash, or None
+    
+    An exact match is looked up on the (user, phash) index before the BK-tree.
+    """
+    exact = ImageLibrary.objects.filter(user=user, phash=phash).first()
+    if exact:
+        return 0, exact
+    matches = find_similar_images(user, phash, max_distance)
+    return matches[0] if matches else None
@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import KeywordResearch
+from .models import (
+    KeywordResearch, KeywordResearchJob, KeywordSuggestion, NicheKeywordSnapshot, SerpApiCall, SerpApiDailyUsage,
+    SuggestionTerm, TrendSeries, YouTubeApiCall, YouTubeQuotaUsage
+)
 
 
 @admin.register(KeywordResearch)
@@ -7,17 +10,89 @@ class KeywordResearchAdmin(admin.ModelAdmin):
     list_display = ['keyword', 'user', 'country', 'language', 'search_volume', 'created_at']
     list_filter = ['country', 'language', 'created_at']
     search_fields = ['keyword', 'user__email']
-    readonly_fields = ['created_at']
+    list_select_related = ['user']
+    readonly_fields = ['summary', 'suggestions_in_table', 'shared_from', 'created_at']
     
     fieldsets = (
         ('Basic Info', {
             'fields': ('user', 'keyword', 'country', 'language')
         }),
         ('Search Data', {
-            'fields': ('search_volume', 'trend_direction')
+            'fields': ('search_volume', 'trend_direction', 'summary', 'suggestions_in_table', 'shared_from')
         }),
         ('Structured Data', {
             'fields': ('platform_breakdown', 'questions', 'prepositions', 'alphabetical', 'comparisons', 'related_keywords', 'viral_examples'),
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(KeywordSuggestion)
+class KeywordSuggestionAdmin(admin.ModelAdmin):
+    list_display = ['suggestion', 'section', 'category', 'position', 'popularity_score', 'research']
+    list_filter = ['section']
+    search_fields = ['suggestion', 'query']
+    raw_id_fields = ['research']
+
+
+@admin.register(NicheKeywordSnapshot)
+class NicheKeywordSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['niche', 'geo', 'computed_at']
+    list_filter = ['niche', 'geo']
+    readonly_fields = ['computed_at']
+
+
+@admin.register(SerpApiCall)
+class SerpApiCallAdmin(admin.ModelAdmin):
+    list_display = ['endpoint', 'query', 'geo', 'user', 'priority', 'status_code', 'latency_ms', 'created_at']
+    list_filter = ['endpoint', 'priority', 'status_code', 'created_at']
+    search_fields = ['query', 'user__email']
+    list_select_related = ['user']
+    readonly_fields = ['created_at']
+
+
+@admin.register(SerpApiDailyUsage)
+class SerpApiDailyUsageAdmin(admin.ModelAdmin):
+    list_display = ['scope', 'day', 'calls']
+    list_filter = ['day']
+    search_fields = ['scope']
+
+
+@admin.register(YouTubeApiCall)
+class YouTubeApiCallAdmin(admin.ModelAdmin):
+    list_display = ['call_type', 'units', 'keyword', 'error', 'quota_day', 'created_at']
+    list_filter = ['call_type', 'error', 'quota_day']
+    search_fields = ['keyword']
+    readonly_fields = ['created_at']
+
+
+@admin.register(YouTubeQuotaUsage)
+class YouTubeQuotaUsageAdmin(admin.ModelAdmin):
+    list_display = ['day', 'call_type', 'calls', 'units']
+    list_filter = ['day', 'call_type']
+
+
+@admin.register(SuggestionTerm)
+class SuggestionTermAdmin(admin.ModelAdmin):
+    list_display = ['text', 'country', 'language', 'popularity_score', 'times_seen', 'last_seen']
+    list_filter = ['country', 'language']
+    search_fields = ['text']
+    readonly_fields = ['first_seen', 'last_seen']
+
+
+@admin.register(KeywordResearchJob)
+class KeywordResearchJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'status', 'total_items', 'completed_items', 'failed_items', 'unique_queries',
+                    'created_at', 'finished_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['user__email']
+    list_select_related = ['user']
+    readonly_fields = ['attempts', 'heartbeat_at', 'created_at', 'updated_at', 'finished_at']
+
+
+@admin.register(TrendSeries)
+class TrendSeriesAdmin(admin.ModelAdmin):
+    list_display = ['keyword', 'geo', 'granularity', 'covered_from', 'refreshed_at']
+    list_filter = ['granularity', 'geo']
+    search_fields = ['keyword']
+    readonly_fields = ['created_at']
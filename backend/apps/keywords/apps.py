@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class KeywordsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.keywords'
+    
+    def ready(self):
+        import apps.keywords.signals  # noqa
@@ -0,0 +1,233 @@
+"""
+Bulk Keyword Research
+Researches many seed keywords through one shared autocomplete fetch pool, deduplicating queries across keywords
+"""
+import threading
+import time
+import logging
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from viral_ai.background_jobs import Heartbeat, resume_if_stale, start_job
+from .models import KeywordResearch, KeywordResearchJob
+from .research_cache import copy_research, find_recent_research
+from .services import KeywordResearchService, query_key
+from .suggestion_index import extract_suggestions, record_suggestions
+from .suggestion_rows import build_research, save_research
+
+logger = logging.getLogger(__name__)
+
+# Seconds between progress writes while queries complete
+PROGRESS_INTERVAL = 1.0
+
+
+def dedupe_keywords(keywords: List[str]) -> Tuple[List[Dict], int]:
+    """
+    Collapse keywords that differ only in case or spacing into one job item
+
+    Returns:
+        (job items, number of duplicates removed); each item lists the request
+        positions it covers in `request_indexes`
+    """
+    items = []
+    by_key = {}
+    for index, keyword in enumerate(keywords):
+        key = query_key(keyword)
+        if key in by_key:
+            by_key[key]['request_indexes'].append(index)
+            continue
+        item = {
+            'index': len(items),
+            'request_indexes': [index],
+            'keyword': ' '.join(keyword.split()),
+            'status': 'pending',
+            'research_id': None,
+            'cached': False,
+            'error': '',
+        }
+        by_key[key] = item
+        items.append(item)
+    return items, len(keywords) - len(items)
+
+
+# ==============================================================================
+# Fetch pool
+# ==============================================================================
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Process-wide autocomplete fetch pool shared by all bulk jobs"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'KEYWORD_BULK_WORKERS', 16),
+                thread_name_prefix='keyword-bulk'
+            )
+        return _executor
+
+
+# ==============================================================================
+# Job runner
+# ==============================================================================
+
+def _reuse_recent_research(job: KeywordResearchJob):
+    """Point items at recent research of the same keyword instead of redoing it (see research_cache.py)"""
+    for item in job.items:
+        if item['status'] != 'pending':
+            continue
+        research, shared = find_recent_research(job.user, item['keyword'], job.country, job.language)
+        if research is None:
+            continue
+        if shared:
+            research = copy_research(research, job.user)
+        item.update(status='completed', research_id=str(research.id), cached=True)
+        job.completed_items += 1
+        job.cached_items += 1
+
+
+def _build_research(job: KeywordResearchJob, keyword: str, fetched: Dict[str, List[Dict]],
+                    suggestions: Dict[str, int]) -> KeywordResearch:
+    service = KeywordResearchService(keyword, job.country, job.language, prefetched=fetched)
+    research_data = service.perform_full_research()
+    for text, score in extract_suggestions(research_data).items():
+        suggestions[text] = max(suggestions.get(text, 0), score)
+    return build_research(research_data, user=job.user, keyword=keyword, country=job.country, language=job.language)
+
+
+def _flush(job: KeywordResearchJob, rows: List[KeywordResearch], suggestions: Dict[str, int]):
+    """Write buffered research rows (and their suggestion rows) in bulk plus the job's progress"""
+    with transaction.atomic():
+        if rows:
+            save_research(rows)
+        job.save(update_fields=[
+            'items', 'completed_items', 'failed_items', 'cached_items', 'total_queries', 'unique_queries',
+            'fetched_queries', 'status', 'finished_at', 'updated_at'
+        ])
+
+    if suggestions:
+        try:
+            record_suggestions(suggestions, job.country, job.language)
+        except Exception as e:
+            logger.warning(f"Could not index suggestions for keyword job {job.id}: {str(e)}")
+    rows.clear()
+    suggestions.clear()
+
+
+def run_research_job(job_id, heartbeat: Heartbeat):
+    """
+    Research every pending keyword of a job
+
+    The queries of all keywords are collected and deduplicated first, then
+    fetched through the shared pool with at most KEYWORD_BULK_JOB_CONCURRENCY
+    in flight for this job. A keyword is assembled as soon as its last query
+    arrives, and rows are written in bulk as they accumulate (progress at
+    least every PROGRESS_INTERVAL). A resumed job redoes only the keywords
+    its last flush didn't record.
+    """
+    job = KeywordResearchJob.objects.select_related('user').get(id=job_id)
+    job.status = 'running'
+    _reuse_recent_research(job)
+
+    fetcher = KeywordResearchService('', job.country, job.language)
+    flush_size = getattr(settings, 'KEYWORD_BULK_FLUSH_SIZE', 10)
+    window = getattr(settings, 'KEYWORD_BULK_JOB_CONCURRENCY', 8)
+
+    # Which items are waiting on each distinct query, queries in item order
+    unique_queries: Dict[str, str] = {}
+    waiting: Dict[str, List[int]] = defaultdict(list)
+    remaining: Dict[int, int] = {}
+    for item in job.items:
+        if item['status'] != 'pending':
+            continue
+        queries = KeywordResearchService(item['keyword'], job.country, job.language).research_queries()
+        job.total_queries += len(queries)
+        keys = {query_key(query): query for query in queries}
+        for key, query in keys.items():
+            unique_queries.setdefault(key, query)
+            waiting[key].append(item['index'])
+        remaining[item['index']] = len(keys)
+    job.unique_queries += len(unique_queries)
+    job.save(update_fields=['status', 'items', 'completed_items', 'cached_items', 'total_queries',
+                            'unique_queries', 'updated_at'])
+
+    queue = deque(unique_queries.items())
+    running = {}
+    fetched: Dict[str, List[Dict]] = {}
+    rows: List[KeywordResearch] = []
+    suggestions: Dict[str, int] = {}
+    dirty = False
+    last_progress = time.monotonic()
+
+    while queue or running:
+        heartbeat.beat()
+        while queue and len(running) < window:
+            key, query = queue.popleft()
+            running[get_executor().submit(fetcher.fetch_autocomplete, query)] = key
+
+        done, _ = wait(running, timeout=1, return_when=FIRST_COMPLETED)
+        for future in done:
+            key = running.pop(future)
+            try:
+                fetched[key] = future.result()
+            except Exception as e:
+                logger.warning(f"Keyword job {job.id} query '{unique_queries[key]}' failed: {str(e)}")
+                fetched[key] = []
+            job.fetched_queries += 1
+            dirty = True
+
+            for index in waiting.pop(key):
+                remaining[index] -= 1
+                if remaining[index]:
+                    continue
+                item = job.items[index]
+                try:
+                    research = _build_research(job, item['keyword'], fetched, suggestions)
+                    rows.append(research)
+                    item['status'] = 'completed'
+                    item['research_id'] = str(research.id)
+                    job.completed_items += 1
+                except Exception as e:
+                    logger.error(f"Keyword job {job.id} item {index} failed: {str(e)}")
+                    item['status'] = 'failed'
+                    item['error'] = str(e)
+                    job.failed_items += 1
+
+        if len(rows) >= flush_size or (dirty and time.monotonic() - last_progress >= PROGRESS_INTERVAL):
+            heartbeat.beat(force=True)
+            _flush(job, rows, suggestions)
+            dirty = False
+            last_progress = time.monotonic()
+
+    if job.failed_items == 0:
+        job.status = 'completed'
+    elif job.completed_items == 0:
+        job.status = 'failed'
+    else:
+        job.status = 'completed_with_errors'
+    job.finished_at = timezone.now()
+    heartbeat.beat(force=True)
+    _flush(job, rows, suggestions)
+
+    logger.info(
+        f"Keyword job {job.id} finished: {job.completed_items} completed ({job.cached_items} cached), "
+        f"{job.failed_items} failed, {job.unique_queries}/{job.total_queries} queries fetched"
+    )
+
+
+def start_research_job(job: KeywordResearchJob):
+    """Run a job in the background once the request's transaction has committed"""
+    start_job(job, run_research_job, inline=getattr(settings, 'KEYWORD_BULK_RUN_INLINE', False))
+
+
+def resume_research_job_if_stale(jobs) -> bool:
+    """Resume a job whose runner died (e.g. in a deploy) when it's polled"""
+    return resume_if_stale(jobs, run_research_job, inline=getattr(settings, 'KEYWORD_BULK_RUN_INLINE', False))
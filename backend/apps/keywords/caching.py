@@ -0,0 +1,134 @@
+"""
+Upstream Response Cache
+Stale-while-revalidate caching with request coalescing for slow, billed upstream APIs
+"""
+import hashlib
+import json
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from django.core.cache import caches
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class _InFlight:
+    """One upstream call that concurrent identical requests wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class StaleWhileRevalidateCache:
+    """
+    Cache in front of an upstream call
+
+    - Fresh entries (younger than `ttl`) are returned directly.
+    - Stale entries (up to `ttl + stale_ttl`) are returned immediately while
+      one background thread refreshes them.
+    - Misses call upstream once per key per process; concurrent identical
+      requests wait for that call instead of issuing their own. A waiter that
+      outlasts `wait_timeout` stops waiting and calls upstream itself.
+
+    Only values the fetch function returns are cached; exceptions propagate to
+    every waiting caller and nothing is stored.
+    """
+
+    def __init__(self, prefix: str, cache_alias: str = 'default'):
+        self.prefix = prefix
+        self.cache_alias = cache_alias
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _InFlight] = {}
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def make_key(self, params: Dict) -> str:
+        """Stable key for a set of request parameters (order-insensitive)"""
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return f'{self.prefix}:{digest}'
+
+    def get(self, params: Dict, fetch: Callable[[], Any], ttl: int, stale_ttl: int = 0,
+            wait_timeout: Optional[float] = None) -> Any:
+        """
+        Cached value for params, calling fetch() when needed
+
+        Args:
+            params: Request parameters identifying the upstream call
+            fetch: Performs the upstream call; raise to avoid caching a result
+            ttl: Seconds an entry is fresh
+            stale_ttl: Extra seconds a stale entry may be served while refreshing
+            wait_timeout: Longest wait on another caller's fetch - the upstream
+                timeout plus a margin; None waits as long as it takes
+        """
+        key = self.make_key(params)
+        entry = self.cache.get(key)
+
+        if entry is not None:
+            if time.time() < entry['fresh_until']:
+                return entry['value']
+            self._refresh_in_background(key, fetch, ttl, stale_ttl)
+            return entry['value']
+
+        return self._fetch_coalesced(key, fetch, ttl, stale_ttl, wait_timeout)
+
+    def invalidate(self, params: Dict):
+        self.cache.delete(self.make_key(params))
+
+    def _store(self, key: str, value: Any, ttl: int, stale_ttl: int):
+        entry = {'value': value, 'fresh_until': time.time() + ttl}
+        self.cache.set(key, entry, timeout=ttl + stale_ttl)
+
+    def _fetch_coalesced(self, key: str, fetch: Callable[[], Any], ttl: int, stale_ttl: int,
+                         wait_timeout: Optional[float] = None) -> Any:
+        with self._lock:
+            inflight = self._inflight.get(key)
+            leader = inflight is None
+            if leader:
+                inflight = self._inflight[key] = _InFlight()
+
+        if not leader:
+            if inflight.done.wait(wait_timeout):
+                if inflight.error is not None:
+                    raise inflight.error
+                return inflight.value
+            # The leader is stuck past its own upstream timeout - don't hang with it
+            logger.warning(f"Gave up waiting {wait_timeout}s for in-flight fetch of {key}, fetching directly")
+            value = fetch()
+            self._store(key, value, ttl, stale_ttl)
+            return value
+
+        try:
+            inflight.value = fetch()
+            self._store(key, inflight.value, ttl, stale_ttl)
+            return inflight.value
+        except Exception as e:
+            inflight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            inflight.done.set()
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Any], ttl: int, stale_ttl: int):
+        # One refresher per key across processes sharing the cache
+        if not self.cache.add(f'{key}:refreshing', 1, timeout=max(ttl, 60)):
+            return
+
+        def refresh():
+            try:
+                self._fetch_coalesced(key, fetch, ttl, stale_ttl)
+            except Exception as e:
+                logger.warning(f"Background refresh of {key} failed, serving stale data: {str(e)}")
+            finally:
+                self.cache.delete(f'{key}:refreshing')
+                # fetch() may have used the database (quota ledger) from this thread
+                connection.close()
+
+        threading.Thread(target=refresh, name=f'refresh-{key}', daemon=True).start()
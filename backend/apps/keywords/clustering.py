@@ -0,0 +1,156 @@
+"""
+Suggestion Clustering
+Groups near-duplicate and same-intent suggestions with MinHash/LSH over stemmed token sets
+"""
+import random
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List
+
+# 16 bands x 4 rows: pairs with Jaccard similarity ~0.5 and above become candidates
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS = NUM_PERMUTATIONS // BANDS
+
+DEFAULT_THRESHOLD = 0.5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+# Words that change the phrasing but not the intent ("what is ai" ~ "what are ai")
+STOPWORDS = frozenset([
+    'a', 'an', 'the', 'is', 'are', 'was', 'were', 'be', 'do', 'does', 'did', 'i', 'you', 'my', 'your', 'it',
+    'its', 'of', 'in', 'on', 'at',
+])
+
+_punctuation = re.compile(r"[^\w\s]|_")
+_whitespace = re.compile(r'\s+')
+
+
+def normalize_keyword(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return _whitespace.sub(' ', _punctuation.sub(' ', text.lower())).strip()
+
+
+def stem(word: str) -> str:
+    """Light suffix stripping: enough to merge plurals and -ing/-ed forms"""
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith('ies') and len(word) > 4:
+        return word[:-3] + 'y'
+    for suffix in ('ing', 'ed'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            # running -> run, stopped -> stop
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in 'lsz':
+                word = word[:-1]
+            return word
+    if word.endswith('es') and word[-3] in 'sxz':
+        return word[:-2]
+    if word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+def token_set(text: str, ignore: Iterable[str] = ()) -> FrozenSet[str]:
+    """Stemmed words of text, without stopwords and the stems in ignore"""
+    ignore = set(ignore)
+    stems = (stem(word) for word in normalize_keyword(text).split() if word not in STOPWORDS)
+    return frozenset(word for word in stems if word not in ignore)
+
+
+def minhash(tokens: FrozenSet[str]) -> List[int]:
+    hashes = [zlib.crc32(token.encode()) for token in tokens]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def _jaccard(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    return len(first & second) / len(first | second)
+
+
+def cluster_suggestions(suggestions: List[Dict], keyword: str = '', threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Cluster suggestions by token-set similarity
+
+    The seed keyword's own words are ignored (every suggestion shares them).
+    Suggestions with identical stemmed token sets are merged directly; the
+    rest are compared only when their MinHash signatures share an LSH band,
+    and joined when the exact Jaccard similarity reaches `threshold`.
+
+    Args:
+        suggestions: Dicts with 'keyword', 'popularity_score' and optionally 'category'
+        keyword: The researched keyword
+        threshold: Minimum Jaccard similarity of two suggestions' token sets
+
+    Returns:
+        Clusters, best first: representative (highest-scoring, then shortest
+        member), members, size, total and max popularity score, categories
+    """
+    ignore = token_set(keyword)
+
+    # Exact dedup first: a suggestion found in several categories is one member,
+    # and suggestions with the same stemmed token set share one LSH entry
+    members_by_text: Dict[str, Dict] = {}
+    for suggestion in suggestions:
+        text = normalize_keyword(suggestion['keyword'])
+        if not text:
+            continue
+        member = members_by_text.get(text)
+        if member is None:
+            member = members_by_text[text] = {'keyword': suggestion['keyword'], 'popularity_score': 0, 'categories': set()}
+        member['popularity_score'] = max(member['popularity_score'], suggestion.get('popularity_score', 0))
+        if suggestion.get('category'):
+            member['categories'].add(suggestion['category'])
+
+    groups: Dict[FrozenSet[str], List[Dict]] = defaultdict(list)
+    for text, member in members_by_text.items():
+        groups[token_set(text, ignore) or frozenset([text])].append(member)
+
+    token_sets = list(groups)
+    parent = list(range(len(token_sets)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = defaultdict(list)
+    for i, tokens in enumerate(token_sets):
+        signature = minhash(tokens)
+        for band in range(BANDS):
+            buckets[(band, tuple(signature[band * ROWS:(band + 1) * ROWS]))].append(i)
+
+    # Candidates are checked against each cluster's first member rather than the
+    # colliding pair itself, so chains of small overlaps don't merge everything
+    for members in buckets.values():
+        for n, j in enumerate(members):
+            for i in members[:n]:
+                first, second = find(i), find(j)
+                if first != second and _jaccard(token_sets[first], token_sets[second]) >= threshold:
+                    parent[max(first, second)] = min(first, second)
+
+    clusters = defaultdict(list)
+    for i, tokens in enumerate(token_sets):
+        clusters[find(i)].extend(groups[tokens])
+
+    results = []
+    for members in clusters.values():
+        members.sort(key=lambda item: (-item['popularity_score'], len(item['keyword'])))
+        scores = [item['popularity_score'] for item in members]
+        results.append({
+            'representative': members[0]['keyword'],
+            'keywords': [item['keyword'] for item in members],
+            'size': len(members),
+            'total_score': sum(scores),
+            'max_score': max(scores),
+            'categories': sorted(set().union(*(item['categories'] for item in members))),
+        })
+
+    results.sort(key=lambda cluster: (-cluster['total_score'], cluster['representative']))
+    return results
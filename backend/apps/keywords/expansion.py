@@ -0,0 +1,129 @@
+"""
+Keyword Expansion Crawler
+Recursive autocomplete expansion with depth, request budget and popularity priority
+"""
+import heapq
+import itertools
+import time
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, Optional, Set
+
+from .services import KeywordResearchService
+
+logger = logging.getLogger(__name__)
+
+# Priority of the seed's own expansions - above any suggestion's 1-10 popularity score
+SEED_PRIORITY = 11
+
+
+class KeywordExpansionCrawler:
+    """
+    Expands a keyword through Google Autocomplete, level by level
+
+    The seed is expanded with every letter and question word; each new
+    suggestion scoring at least `min_score` is expanded again with the
+    question words, until `max_depth`. The crawl is breadth-first: a level's
+    queries all run before the next level's. Within a level, queries are
+    ordered by the popularity score of the suggestion they came from, so when
+    the request budget runs out mid-level it has gone to the most promising
+    branches.
+
+    Queries and keywords are deduplicated case-insensitively through seen
+    sets, which can be passed in to continue an earlier crawl without
+    repeating it.
+    """
+
+    def __init__(self, keyword: str, country: str = 'us', language: str = 'en', max_depth: int = 2,
+                 max_requests: int = 100, max_keywords: int = 1000, min_score: int = 5, workers: int = 4,
+                 seen_queries: Optional[Set[str]] = None, seen_keywords: Optional[Set[str]] = None):
+        self.keyword = keyword.strip()
+        self.service = KeywordResearchService(self.keyword, country, language)
+        self.max_depth = max_depth
+        self.max_requests = max_requests
+        self.max_keywords = max_keywords
+        self.min_score = min_score
+        self.workers = workers
+        self.seen_queries = seen_queries if seen_queries is not None else set()
+        self.seen_keywords = seen_keywords if seen_keywords is not None else {self.keyword.lower()}
+
+        self.requests = 0
+        self._queue = []
+        self._counter = itertools.count()
+
+    def _push(self, query: str, priority: float, depth: int):
+        key = query.strip().lower()
+        if key in self.seen_queries:
+            return
+        self.seen_queries.add(key)
+        heapq.heappush(self._queue, (depth, -priority, next(self._counter), query))
+
+    def crawl(self) -> Iterator[Dict]:
+        """
+        Run the crawl, yielding each new keyword as soon as it's found
+
+        Yields:
+            {'type': 'keyword', 'keyword', 'popularity_score', 'estimated_volume', 'depth', 'source'}
+            for every keyword, then one {'type': 'done', ...} with crawl statistics
+        """
+        started = time.monotonic()
+        found = 0
+
+        self._push(self.keyword, SEED_PRIORITY, 0)
+        for suffix in self.service.ALPHABET + self.service.QUESTIONS:
+            self._push(f'{self.keyword} {suffix}', SEED_PRIORITY, 0)
+
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='expand')
+        pending = {}
+        limit_reached = False
+        try:
+            while (self._queue or pending) and not limit_reached:
+                while self._queue and len(pending) < self.workers and self.requests < self.max_requests:
+                    depth, _, _, query = heapq.heappop(self._queue)
+                    pending[executor.submit(self.service.fetch_autocomplete, query)] = (query, depth)
+                    self.requests += 1
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    query, depth = pending.pop(future)
+                    # fetch_autocomplete logs failures and returns []
+                    for suggestion in future.result():
+                        keyword = suggestion['keyword']
+                        key = keyword.strip().lower()
+                        if key in self.seen_keywords:
+                            continue
+                        self.seen_keywords.add(key)
+                        found += 1
+
+                        yield {
+                            'type': 'keyword',
+                            **suggestion,
+                            'depth': depth + 1,
+                            'source': query,
+                        }
+
+                        if depth + 1 < self.max_depth and suggestion['popularity_score'] >= self.min_score:
+                            for question in self.service.QUESTIONS:
+                                self._push(f'{keyword} {question}', suggestion['popularity_score'], depth + 1)
+
+                        if found >= self.max_keywords:
+                            limit_reached = True
+                            break
+                    if limit_reached:
+                        break
+        finally:
+            # Also runs when the consumer stops early (e.g. client disconnected)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        yield {
+            'type': 'done',
+            'keyword': self.keyword,
+            'keywords_found': found,
+            'requests': self.requests,
+            'queued': len(self._queue),
+            'budget_exhausted': self.requests >= self.max_requests and bool(self._queue),
+            'keyword_limit_reached': limit_reached,
+            'elapsed_ms': int((time.monotonic() - started) * 1000),
+        }
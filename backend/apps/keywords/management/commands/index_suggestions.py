@@ -0,0 +1,62 @@
+"""
+Backfill the suggestion store from saved keyword research
+
+    python manage.py index_suggestions                 # every research row
+    python manage.py index_suggestions --since 7       # rows from the last 7 days
+
+New research is indexed as it's saved; this is for rows from before the
+store existed. Running it twice only bumps times_seen.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.keywords.models import KeywordResearch
+from apps.keywords.suggestion_index import extract_suggestions, record_suggestions
+from apps.keywords.suggestion_rows import SECTIONS, research_sections
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Add the suggestions of saved keyword research to the suggestion store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=int, default=0, help='Only research from the last N days')
+        parser.add_argument('--batch-size', type=int, default=200, help='Research rows merged per write')
+
+    def handle(self, *args, **options):
+        # Copies of shared research would count the original's suggestions again
+        queryset = KeywordResearch.objects.filter(shared_from__isnull=True).only(
+            'country', 'language', 'related_keywords', 'suggestions_in_table', *SECTIONS
+        ).prefetch_related('suggestion_rows')
+        if options['since']:
+            queryset = queryset.filter(created_at__gte=timezone.now() - timedelta(days=options['since']))
+
+        rows = new_terms = 0
+        batch = defaultdict(dict)
+        for research in queryset.iterator(chunk_size=options['batch_size']):
+            found = extract_suggestions({
+                **research_sections(research), 'related_keywords': research.related_keywords
+            })
+            merged = batch[(research.country, research.language)]
+            for text, score in found.items():
+                merged[text] = max(merged.get(text, 0), score)
+            rows += 1
+
+            if rows % options['batch_size'] == 0:
+                new_terms += self.flush(batch)
+        new_terms += self.flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {rows} research rows, {new_terms} new suggestions'))
+
+    def flush(self, batch):
+        new_terms = sum(
+            record_suggestions(suggestions, country, language)
+            for (country, language), suggestions in batch.items()
+        )
+        batch.clear()
+        return new_terms
@@ -0,0 +1,47 @@
+"""
+Move the category suggestions of older research into KeywordSuggestion rows
+
+    python manage.py move_suggestions_to_table
+    python manage.py move_suggestions_to_table --batch-size 100
+
+Research saved before the table existed keeps its suggestions in JSON
+columns and is still served from them; this converts it so every row can
+be queried through the table. Each batch is converted in one transaction.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.keywords.models import KeywordResearch, KeywordSuggestion
+from apps.keywords.suggestion_rows import SECTIONS, suggestion_rows
+
+
+class Command(BaseCommand):
+    help = 'Convert JSON category suggestions of older research into KeywordSuggestion rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Research rows converted per transaction')
+
+    def handle(self, *args, **options):
+        moved = rows = 0
+        while True:
+            batch = list(KeywordResearch.objects.filter(suggestions_in_table=False).only('id', *SECTIONS)
+                         [:options['batch_size']])
+            if not batch:
+                break
+
+            rows_to_create = [
+                row
+                for research in batch
+                for row in suggestion_rows(research, {section: getattr(research, section) for section in SECTIONS})
+            ]
+
+            with transaction.atomic():
+                KeywordSuggestion.objects.bulk_create(rows_to_create, batch_size=1000)
+                # The summary was derived from the JSON and stays valid
+                KeywordResearch.objects.filter(id__in=[research.id for research in batch]).update(
+                    suggestions_in_table=True, **{section: [] for section in SECTIONS}
+                )
+            moved += len(batch)
+            rows += len(rows_to_create)
+
+        self.stdout.write(self.style.SUCCESS(f'Moved {rows} suggestions of {moved} research rows'))
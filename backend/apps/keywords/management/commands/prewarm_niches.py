@@ -0,0 +1,116 @@
+"""
+Pre-compute niche trend snapshots
+
+    python manage.py prewarm_niches                         # every niche x NICHE_PREWARM_GEOS, once
+    python manage.py prewarm_niches --niche tech --geo GB   # a subset
+    python manage.py prewarm_niches --interval 21600        # keep running, refresh every 6 hours
+
+Run once from cron, or with --interval as a long-running scheduler process.
+"""
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from apps.keywords.models import NicheKeywordSnapshot
+from apps.keywords.quota import BACKGROUND
+from apps.keywords.serpapi_service import SerpApiTrendingService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Pre-compute trending keyword snapshots for every niche and geo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--niche', action='append', dest='niches', help='Niche to refresh (repeatable; default: all)')
+        parser.add_argument('--geo', action='append', dest='geos', help='Geo to refresh (repeatable; default: NICHE_PREWARM_GEOS)')
+        parser.add_argument('--limit', type=int, default=getattr(settings, 'NICHE_SNAPSHOT_SIZE', 50),
+                            help='Keywords kept per snapshot')
+        parser.add_argument('--workers', type=int, default=4, help='Niche/geo pairs computed concurrently')
+        parser.add_argument('--max-age', type=int, default=0,
+                            help='Skip snapshots younger than this many seconds')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Repeat every N seconds instead of exiting')
+
+    def handle(self, *args, **options):
+        # Background priority: capped share of the budget, yields to API requests
+        service = SerpApiTrendingService(priority=BACKGROUND)
+        if not service.api_key:
+            raise CommandError('SerpApi key not configured')
+
+        niches = options['niches'] or list(service.NICHES)
+        unknown = set(niches) - set(service.NICHES)
+        if unknown:
+            raise CommandError(f"Unknown niche(s): {', '.join(sorted(unknown))}")
+        geos = [geo.upper() for geo in (options['geos'] or getattr(settings, 'NICHE_PREWARM_GEOS', ['US']))]
+
+        while True:
+            self.prewarm(service, niches, geos, options)
+            if not options['interval']:
+                return
+            close_old_connections()
+            time.sleep(options['interval'])
+
+    def compute(self, service, niche, geo, limit):
+        try:
+            return service.compute_niche_keywords(niche, geo, limit)
+        finally:
+            # Quota bookkeeping opens a connection per worker thread
+            connection.close()
+
+    def prewarm(self, service, niches, geos, options):
+        pairs = [(niche, geo) for niche in niches for geo in geos]
+
+        if options['max_age']:
+            cutoff = timezone.now() - timedelta(seconds=options['max_age'])
+            fresh = set(
+                NicheKeywordSnapshot.objects.filter(computed_at__gte=cutoff).values_list('niche', 'geo')
+            )
+            pairs = [pair for pair in pairs if pair not in fresh]
+
+        started = time.monotonic()
+        stored = failed = 0
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = {
+                executor.submit(self.compute, service, niche, geo, options['limit']): (niche, geo)
+                for niche, geo in pairs
+            }
+            # Upstream calls run in the pool; snapshots are written from this thread only
+            for future in as_completed(futures):
+                niche, geo = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Prewarm of {niche}/{geo} failed: {str(e)}")
+                    failed += 1
+                    continue
+
+                if not result['keywords']:
+                    # Every seed failed - keep serving the previous snapshot
+                    self.stderr.write(f"{niche}/{geo}: no data (failed seeds: {', '.join(result['failed_seeds'])})")
+                    failed += 1
+                    continue
+
+                NicheKeywordSnapshot.objects.update_or_create(
+                    niche=niche,
+                    geo=geo,
+                    defaults={
+                        'seed_keywords': result['seed_keywords'],
+                        'keywords': result['keywords'],
+                        'failed_seeds': result['failed_seeds'],
+                        'computed_at': timezone.now(),
+                    }
+                )
+                stored += 1
+                self.stdout.write(f"{niche}/{geo}: {result['total_count']} keywords")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Prewarmed {stored} niche snapshots ({failed} failed) in {time.monotonic() - started:.1f}s"
+        ))
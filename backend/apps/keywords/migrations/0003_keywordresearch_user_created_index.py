@@ -0,0 +1,20 @@
+# Generated by Django 5.0 on 2026-10-19 18:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="keywordresearch",
+            index=models.Index(
+                fields=["user", "-created_at"], name="keyword_res_user_id_53a024_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.0 on 2026-10-19 18:50
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+TOP_SUGGESTIONS = 5
+
+SUMMARY_SOURCE_FIELDS = ["questions", "prepositions", "alphabetical", "comparisons", "related_keywords", "platform_breakdown"]
+
+
+def summarize_research(questions, prepositions, alphabetical, comparisons, related_keywords, platform_breakdown):
+    """Frozen copy of apps.keywords.summary.summarize_research as of this migration"""
+    scored = {}
+    total = 0
+    for categories in (questions, prepositions, alphabetical, comparisons):
+        for category in categories or []:
+            if not isinstance(category, dict):
+                continue
+            for suggestion in category.get("suggestions", []):
+                total += 1
+                text = suggestion["keyword"] if isinstance(suggestion, dict) else suggestion
+                score = suggestion.get("popularity_score", 0) if isinstance(suggestion, dict) else 0
+                if score > scored.get(text, -1):
+                    scored[text] = score
+
+    top_suggestions = sorted(scored, key=lambda text: -scored[text])[:TOP_SUGGESTIONS]
+
+    top_platform = ""
+    if platform_breakdown:
+        platform, stats = max(platform_breakdown.items(), key=lambda item: item[1].get("count", 0))
+        if stats.get("count"):
+            top_platform = platform
+
+    return {
+        "total_suggestions": total,
+        "questions_count": len(questions or []),
+        "prepositions_count": len(prepositions or []),
+        "alphabetical_count": len(alphabetical or []),
+        "comparisons_count": len(comparisons or []),
+        "related_count": len(related_keywords or []),
+        "top_suggestions": top_suggestions,
+        "top_platform": top_platform,
+    }
+
+
+def backfill_summaries(apps, schema_editor):
+    KeywordResearch = apps.get_model("keywords", "KeywordResearch")
+    batch = []
+    for research in KeywordResearch.objects.only("id", *SUMMARY_SOURCE_FIELDS).iterator(chunk_size=BATCH_SIZE):
+        research.summary = summarize_research(*(getattr(research, name) for name in SUMMARY_SOURCE_FIELDS))
+        batch.append(research)
+        if len(batch) >= BATCH_SIZE:
+            KeywordResearch.objects.bulk_update(batch, ["summary"])
+            batch = []
+    if batch:
+        KeywordResearch.objects.bulk_update(batch, ["summary"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0003_keywordresearch_user_created_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="keywordresearch",
+            name="summary",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0 on 2026-10-19 18:56
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0004_keywordresearch_summary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NicheKeywordSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("niche", models.CharField(max_length=50)),
+                ("geo", models.CharField(max_length=10)),
+                ("seed_keywords", models.JSONField(blank=True, default=list)),
+                ("keywords", models.JSONField(blank=True, default=list)),
+                ("failed_seeds", models.JSONField(blank=True, default=list)),
+                ("computed_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "niche_keyword_snapshots",
+                "ordering": ["niche", "geo"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="nichekeywordsnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("niche", "geo"), name="unique_niche_snapshot"
+            ),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.0 on 2026-10-19 18:57
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0005_niche_keyword_snapshots"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SerpApiDailyUsage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("scope", models.CharField(max_length=64)),
+                ("day", models.DateField()),
+                ("calls", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "serpapi_daily_usage",
+            },
+        ),
+        migrations.CreateModel(
+            name="SerpApiCall",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("endpoint", models.CharField(max_length=50)),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("interactive", "Interactive"),
+                            ("background", "Background"),
+                        ],
+                        default="interactive",
+                        max_length=20,
+                    ),
+                ),
+                ("query", models.CharField(blank=True, max_length=255)),
+                ("geo", models.CharField(blank=True, max_length=10)),
+                ("status_code", models.IntegerField(blank=True, null=True)),
+                ("latency_ms", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="serpapi_calls",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "serpapi_calls",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="serpapidailyusage",
+            constraint=models.UniqueConstraint(
+                fields=("scope", "day"), name="unique_serpapi_usage_scope_day"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="serpapicall",
+            index=models.Index(
+                fields=["-created_at"], name="serpapi_cal_created_d81806_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="serpapicall",
+            index=models.Index(
+                fields=["user", "-created_at"], name="serpapi_cal_user_id_75fb85_idx"
+            ),
+        ),
+    ]
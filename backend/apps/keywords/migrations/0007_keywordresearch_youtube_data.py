@@ -0,0 +1,17 @@
+# Generated by Django 5.0 on 2026-10-19 19:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0006_serpapi_quota"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="keywordresearch",
+            name="youtube_data",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
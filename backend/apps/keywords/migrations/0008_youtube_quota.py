@@ -0,0 +1,73 @@
+# Generated by Django 5.0 on 2026-10-19 19:05
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0007_keywordresearch_youtube_data"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="YouTubeQuotaUsage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("call_type", models.CharField(max_length=30)),
+                ("day", models.DateField()),
+                ("calls", models.IntegerField(default=0)),
+                ("units", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "youtube_quota_usage",
+            },
+        ),
+        migrations.CreateModel(
+            name="YouTubeApiCall",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("call_type", models.CharField(max_length=30)),
+                ("units", models.IntegerField()),
+                ("quota_day", models.DateField()),
+                ("keyword", models.CharField(blank=True, max_length=255)),
+                ("error", models.CharField(blank=True, max_length=50)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "youtube_api_calls",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["-created_at"], name="youtube_api_created_0d402e_idx"
+                    ),
+                    models.Index(
+                        fields=["quota_day", "call_type"],
+                        name="youtube_api_quota_d_17b6c6_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="youtubequotausage",
+            constraint=models.UniqueConstraint(
+                fields=("call_type", "day"), name="unique_youtube_usage_call_type_day"
+            ),
+        ),
+    ]
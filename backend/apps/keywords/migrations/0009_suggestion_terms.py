@@ -0,0 +1,43 @@
+# Generated by Django 5.0 on 2026-10-19 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0008_youtube_quota"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SuggestionTerm",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("text", models.CharField(max_length=255)),
+                ("prefix", models.CharField(max_length=3)),
+                ("country", models.CharField(default="us", max_length=10)),
+                ("language", models.CharField(default="en", max_length=10)),
+                ("popularity_score", models.IntegerField(default=0)),
+                ("times_seen", models.IntegerField(default=1)),
+                ("first_seen", models.DateTimeField(auto_now_add=True)),
+                ("last_seen", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "suggestion_terms",
+                "ordering": ["text"],
+                "indexes": [
+                    models.Index(
+                        fields=["country", "language", "prefix"],
+                        name="suggestion__country_da54da_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="suggestionterm",
+            constraint=models.UniqueConstraint(
+                fields=("text", "country", "language"),
+                name="unique_suggestion_term_locale",
+            ),
+        ),
+    ]
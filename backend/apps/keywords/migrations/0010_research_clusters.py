@@ -0,0 +1,17 @@
+# Generated by Django 5.0 on 2026-10-19 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0009_suggestion_terms"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="keywordresearch",
+            name="clusters",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.0 on 2026-10-19 19:18
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0010_research_clusters"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="KeywordResearchJob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("country", models.CharField(default="us", max_length=10)),
+                ("language", models.CharField(default="en", max_length=10)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("completed_with_errors", "Completed with errors"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=50,
+                    ),
+                ),
+                ("items", models.JSONField(blank=True, default=list)),
+                ("total_items", models.IntegerField(default=0)),
+                ("completed_items", models.IntegerField(default=0)),
+                ("failed_items", models.IntegerField(default=0)),
+                ("cached_items", models.IntegerField(default=0)),
+                ("duplicate_items", models.IntegerField(default=0)),
+                ("total_queries", models.IntegerField(default=0)),
+                ("unique_queries", models.IntegerField(default=0)),
+                ("fetched_queries", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="keyword_research_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "keyword_research_jobs",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-created_at"],
+                        name="keyword_res_user_id_7b9a45_idx",
+                    )
+                ],
+            },
+        ),
+    ]
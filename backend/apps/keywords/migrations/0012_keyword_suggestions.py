@@ -0,0 +1,53 @@
+# Generated by Django 5.0 on 2026-10-19 19:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0011_keyword_research_jobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="keywordresearch",
+            name="suggestions_in_table",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name="KeywordSuggestion",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("section", models.CharField(max_length=20)),
+                ("category", models.CharField(max_length=50)),
+                ("category_position", models.PositiveSmallIntegerField(default=0)),
+                ("query", models.CharField(max_length=255)),
+                ("suggestion", models.CharField(max_length=255)),
+                ("position", models.PositiveSmallIntegerField(default=0)),
+                ("popularity_score", models.PositiveSmallIntegerField(default=0)),
+                ("estimated_volume", models.CharField(blank=True, max_length=20)),
+                (
+                    "research",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="suggestion_rows",
+                        to="keywords.keywordresearch",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "keyword_suggestions",
+                "ordering": ["category_position", "position"],
+                "indexes": [
+                    models.Index(
+                        fields=["suggestion"], name="keyword_sug_suggest_efeea8_idx"
+                    ),
+                    models.Index(
+                        fields=["section", "category"],
+                        name="keyword_sug_section_922e15_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0 on 2026-10-19 19:23
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def query_key(query):
+    """Frozen copy of apps.keywords.services.query_key as of this migration"""
+    return " ".join(query.lower().split())
+
+
+def backfill_keyword_keys(apps, schema_editor):
+    KeywordResearch = apps.get_model("keywords", "KeywordResearch")
+    batch = []
+    for research in KeywordResearch.objects.only("id", "keyword").iterator(chunk_size=BATCH_SIZE):
+        research.keyword_key = query_key(research.keyword)
+        batch.append(research)
+        if len(batch) >= BATCH_SIZE:
+            KeywordResearch.objects.bulk_update(batch, ["keyword_key"])
+            batch = []
+    if batch:
+        KeywordResearch.objects.bulk_update(batch, ["keyword_key"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0012_keyword_suggestions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="keywordresearch",
+            name="keyword_key",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.RunPython(backfill_keyword_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="keywordresearch",
+            index=models.Index(
+                fields=["keyword_key", "country", "language", "created_at"],
+                name="keyword_res_keyword_246c92_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.0 on 2026-10-19 19:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0013_research_keyword_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrendPoint",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("date", models.DateField()),
+                ("value", models.FloatField()),
+            ],
+            options={
+                "db_table": "trend_points",
+                "ordering": ["series", "date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="TrendSeries",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("keyword", models.CharField(max_length=255)),
+                ("keyword_key", models.CharField(max_length=255)),
+                ("geo", models.CharField(max_length=10)),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[
+                            ("day", "Daily"),
+                            ("week", "Weekly"),
+                            ("month", "Monthly"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("covered_from", models.DateField()),
+                ("related_queries", models.JSONField(blank=True, default=list)),
+                ("refreshed_at", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "trend_series",
+                "ordering": ["keyword_key", "geo", "granularity"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="trendseries",
+            constraint=models.UniqueConstraint(
+                fields=("keyword_key", "geo", "granularity"), name="unique_trend_series"
+            ),
+        ),
+        migrations.AddField(
+            model_name="trendpoint",
+            name="series",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="points",
+                to="keywords.trendseries",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="trendpoint",
+            constraint=models.UniqueConstraint(
+                fields=("series", "date"), name="unique_trend_point_date"
+            ),
+        ),
+    ]
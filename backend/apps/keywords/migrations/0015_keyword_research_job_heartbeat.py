@@ -0,0 +1,30 @@
+# Generated by Django 5.0 on 2026-10-19 19:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0014_trend_series"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="keywordresearchjob",
+            name="attempts",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="keywordresearchjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="keywordresearchjob",
+            index=models.Index(
+                fields=["status", "heartbeat_at"], name="keyword_res_status_44b1a5_idx"
+            ),
+        ),
+    ]
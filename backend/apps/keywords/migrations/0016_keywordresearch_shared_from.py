@@ -0,0 +1,24 @@
+# Generated by Django 5.0 on 2026-10-19 19:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("keywords", "0015_keyword_research_job_heartbeat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="keywordresearch",
+            name="shared_from",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="shared_copies",
+                to="keywords.keywordresearch",
+            ),
+        ),
+    ]
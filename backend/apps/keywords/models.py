@@ -2,6 +2,9 @@ from django.db import models
 from django.conf import settings
 import uuid
 
+from .services import query_key
+from .summary import SUMMARY_SOURCE_FIELDS, summarize_research
+
 
 class KeywordResearch(models.Model):
     """Keyword research data"""
@@ -10,6 +13,8 @@ class KeywordResearch(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='keyword_research')
     
     keyword = models.CharField(max_length=255)
+    # Lowercased, whitespace-collapsed keyword (services.query_key), for cache lookups
+    keyword_key = models.CharField(max_length=255, blank=True, default='')
     country = models.CharField(max_length=10, default='us')
     language = models.CharField(max_length=10, default='en')
     
@@ -26,6 +31,26 @@ class KeywordResearch(models.Model):
     related_keywords = models.JSONField(default=list, blank=True)
     viral_examples = models.JSONField(default=list, blank=True)
     
+    # Suggestions grouped into near-duplicate/intent clusters (clustering.py); table-backed
+    # research stores members as positions in its suggestions (suggestion_rows.compact_clusters)
+    clusters = models.JSONField(default=list, blank=True)
+    
+    # Counts and top suggestions, precomputed for list views (see summary.py)
+    summary = models.JSONField(default=dict, blank=True)
+    
+    # YouTube aggregates captured at research time (youtube_service.get_keyword_data)
+    youtube_data = models.JSONField(default=dict, blank=True)
+    
+    # Category suggestions live in KeywordSuggestion rows instead of the JSON
+    # columns above (see suggestion_rows.py); older research keeps the JSON
+    suggestions_in_table = models.BooleanField(default=False)
+    
+    # Set on another user's cached research reused by this user (research_cache.py):
+    # the category suggestions are read from that research rather than copied
+    shared_from = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='shared_copies'
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -34,7 +59,306 @@ class KeywordResearch(models.Model):
         indexes = [
             models.Index(fields=['keyword']),
             models.Index(fields=['user', 'keyword']),
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['keyword_key', 'country', 'language', 'created_at']),
         ]
     
     def __str__(self):
         return f"{self.keyword} ({self.user.email})"
+    
+    def save(self, *args, **kwargs):
+        """Keep the summary and keyword key in step with the data they're derived from"""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'keyword' in update_fields:
+            self.keyword_key = query_key(self.keyword)
+            if update_fields is not None:
+                kwargs['update_fields'] = update_fields = set(update_fields) | {'keyword_key'}
+        touches_sources = update_fields is None or set(update_fields) & set(SUMMARY_SOURCE_FIELDS)
+        # Table-backed research gets its summary when its rows are written
+        if self.suggestions_in_table and 'suggestions_in_table' not in self.get_deferred_fields():
+            touches_sources = False
+        if touches_sources and not set(SUMMARY_SOURCE_FIELDS) & self.get_deferred_fields():
+            self.summary = summarize_research(*(getattr(self, name) for name in SUMMARY_SOURCE_FIELDS))
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'summary'}
+        super().save(*args, **kwargs)
+
+
+class KeywordResearchJob(models.Model):
+    """Bulk keyword research job (many seed keywords researched together)"""
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('completed_with_errors', 'Completed with errors'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='keyword_research_jobs')
+    
+    country = models.CharField(max_length=10, default='us')
+    language = models.CharField(max_length=10, default='en')
+    status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='pending')
+    
+    # One entry per unique keyword: the keyword plus its status, research_id and error
+    items = models.JSONField(default=list, blank=True)
+    
+    total_items = models.IntegerField(default=0)
+    completed_items = models.IntegerField(default=0)
+    failed_items = models.IntegerField(default=0)
+    cached_items = models.IntegerField(default=0)  # Recent research reused instead of fetched
+    duplicate_items = models.IntegerField(default=0)  # Same keyword requested more than once
+    
+    # Autocomplete queries: all keywords' queries vs distinct ones actually fetched
+    total_queries = models.IntegerField(default=0)
+    unique_queries = models.IntegerField(default=0)
+    fetched_queries = models.IntegerField(default=0)
+    
+    # Runner liveness (see viral_ai/background_jobs.py): times the job was claimed, last sign of life
+    attempts = models.IntegerField(default=0)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'keyword_research_jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['status', 'heartbeat_at']),
+        ]
+    
+    def __str__(self):
+        return f"Keyword job {self.id} ({self.completed_items}/{self.total_items})"
+
+
+class KeywordSuggestion(models.Model):
+    """One autocomplete suggestion of a keyword research category"""
+    
+    id = models.BigAutoField(primary_key=True)
+    research = models.ForeignKey(KeywordResearch, on_delete=models.CASCADE, related_name='suggestion_rows')
+    
+    section = models.CharField(max_length=20)  # questions, prepositions, alphabetical or comparisons
+    category = models.CharField(max_length=50)  # e.g. "how", "for", "a", "vs"
+    category_position = models.PositiveSmallIntegerField(default=0)  # order of the category in its section
+    query = models.CharField(max_length=255)
+    
+    suggestion = models.CharField(max_length=255)
+    position = models.PositiveSmallIntegerField(default=0)  # order Google returned it in
+    popularity_score = models.PositiveSmallIntegerField(default=0)
+    estimated_volume = models.CharField(max_length=20, blank=True)
+    
+    class Meta:
+        db_table = 'keyword_suggestions'
+        ordering = ['category_position', 'position']
+        indexes = [
+            models.Index(fields=['suggestion']),
+            models.Index(fields=['section', 'category']),
+        ]
+    
+    def __str__(self):
+        return f"{self.suggestion} ({self.section}: {self.category})"
+
+class NicheKeywordSnapshot(models.Model):
+    """Pre-computed trending keywords for a niche + geo (see the prewarm_niches command)"""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    niche = models.CharField(max_length=50)
+    geo = models.CharField(max_length=10)
+    
+    seed_keywords = models.JSONField(default=list, blank=True)
+    keywords = models.JSONField(default=list, blank=True)  # Merged across seeds, ranked by score
+    failed_seeds = models.JSONField(default=list, blank=True)
+    
+    computed_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'niche_keyword_snapshots'
+        ordering = ['niche', 'geo']
+        constraints = [
+            models.UniqueConstraint(fields=['niche', 'geo'], name='unique_niche_snapshot'),
+        ]
+    
+    def __str__(self):
+        return f"{self.niche} ({self.geo})"
+
+
+class SerpApiCall(models.Model):
+    """Ledger of billed SerpApi searches (cache hits are free and not recorded)"""
+    
+    PRIORITY_CHOICES = [
+        ('interactive', 'Interactive'),
+        ('background', 'Background'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='serpapi_calls')
+    
+    endpoint = models.CharField(max_length=50)  # e.g. "trending_now", "niche_keywords"
+    priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='interactive')
+    query = models.CharField(max_length=255, blank=True)
+    geo = models.CharField(max_length=10, blank=True)
+    
+    status_code = models.IntegerField(null=True, blank=True)  # None when the request itself failed
+    latency_ms = models.IntegerField(default=0)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'serpapi_calls'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['user', '-created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.endpoint} {self.query} ({self.status_code})"
+
+
+class SerpApiDailyUsage(models.Model):
+    """Daily SerpApi call counters per budget scope ("global", "background", "user:<id>")"""
+    
+    scope = models.CharField(max_length=64)
+    day = models.DateField()
+    calls = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'serpapi_daily_usage'
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'day'], name='unique_serpapi_usage_scope_day'),
+        ]
+    
+    def __str__(self):
+        return f"{self.scope} {self.day}: {self.calls}"
+
+
+class YouTubeApiCall(models.Model):
+    """Ledger of YouTube Data API calls and the quota units they cost"""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    call_type = models.CharField(max_length=30)  # e.g. "search.list", "videos.list"
+    units = models.IntegerField()
+    quota_day = models.DateField()  # YouTube quota days run midnight to midnight Pacific
+    keyword = models.CharField(max_length=255, blank=True)
+    error = models.CharField(max_length=50, blank=True)  # e.g. "quotaExceeded"
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'youtube_api_calls'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['quota_day', 'call_type']),
+        ]
+    
+    def __str__(self):
+        return f"{self.call_type} ({self.units} units)"
+
+
+class YouTubeQuotaUsage(models.Model):
+    """Daily YouTube quota units per call type ("total" is the row budgets are enforced on)"""
+    
+    call_type = models.CharField(max_length=30)
+    day = models.DateField()
+    calls = models.IntegerField(default=0)
+    units = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'youtube_quota_usage'
+        constraints = [
+            models.UniqueConstraint(fields=['call_type', 'day'], name='unique_youtube_usage_call_type_day'),
+        ]
+    
+    def __str__(self):
+        return f"{self.call_type} {self.day}: {self.units} units"
+
+
+class SuggestionTerm(models.Model):
+    """Every distinct autocomplete suggestion seen, per locale (see suggestion_index.py)"""
+    
+    id = models.BigAutoField(primary_key=True)
+    
+    text = models.CharField(max_length=255)  # Normalized: lowercased, whitespace collapsed
+    prefix = models.CharField(max_length=3)  # First characters of text, for indexed prefix lookups
+    country = models.CharField(max_length=10, default='us')
+    language = models.CharField(max_length=10, default='en')
+    
+    popularity_score = models.IntegerField(default=0)  # Best score seen
+    times_seen = models.IntegerField(default=1)
+    
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'suggestion_terms'
+        ordering = ['text']
+        constraints = [
+            models.UniqueConstraint(fields=['text', 'country', 'language'], name='unique_suggestion_term_locale'),
+        ]
+        indexes = [
+            models.Index(fields=['country', 'language', 'prefix']),
+        ]
+    
+    def __str__(self):
+        return f"{self.text} ({self.country}/{self.language})"
+
+
+class TrendSeries(models.Model):
+    """Stored interest over time for a keyword, geo and granularity (see trend_series.py)"""
+    
+    GRANULARITY_CHOICES = [
+        ('day', 'Daily'),
+        ('week', 'Weekly'),
+        ('month', 'Monthly'),
+    ]
+    
+    id = models.BigAutoField(primary_key=True)
+    
+    keyword = models.CharField(max_length=255)
+    keyword_key = models.CharField(max_length=255)  # query_key(keyword)
+    geo = models.CharField(max_length=10)
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES)
+    
+    covered_from = models.DateField()  # Start of the longest timeframe fetched in full
+    related_queries = models.JSONField(default=list, blank=True)  # Rising queries of the latest fetch
+    
+    refreshed_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'trend_series'
+        ordering = ['keyword_key', 'geo', 'granularity']
+        constraints = [
+            models.UniqueConstraint(fields=['keyword_key', 'geo', 'granularity'], name='unique_trend_series'),
+        ]
+    
+    def __str__(self):
+        return f"{self.keyword} ({self.geo}, {self.granularity})"
+
+
+class TrendPoint(models.Model):
+    """One bucket of a TrendSeries, on the series' own scale rather than each fetch's 0-100"""
+    
+    id = models.BigAutoField(primary_key=True)
+    series = models.ForeignKey(TrendSeries, on_delete=models.CASCADE, related_name='points')
+    
+    date = models.DateField()  # Bucket start: the day, the week's Sunday or the month's 1st
+    value = models.FloatField()
+    
+    class Meta:
+        db_table = 'trend_points'
+        ordering = ['series', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['series', 'date'], name='unique_trend_point_date'),
+        ]
+    
+    def __str__(self):
+        return f"{self.series_id} {self.date}: {self.value}"
@@ -0,0 +1,129 @@
+"""
+Platform Classifier
+Word-level Aho-Corasick matcher that counts platform indicators in suggestions
+"""
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+
+# Words and phrases suggesting where content on a keyword performs well.
+# Matched as whole words, so plurals are listed separately.
+# PLATFORM_INDICATORS in settings adds to these per platform.
+DEFAULT_PLATFORM_INDICATORS = {
+    'instagram': [
+        'photo', 'photos', 'picture', 'pictures', 'pic', 'pics', 'image', 'images', 'aesthetic', 'feed',
+        'story', 'stories', 'reel', 'reels', 'caption', 'captions', 'selfie', 'filter', 'filters',
+        'influencer', 'influencers', 'carousel', 'outfit', 'outfits', 'ootd', 'instagram', 'insta',
+    ],
+    'tiktok': [
+        'video', 'videos', 'trend', 'trends', 'trending', 'viral', 'dance', 'dances', 'challenge',
+        'challenges', 'sound', 'sounds', 'duet', 'fyp', 'meme', 'memes', 'hack', 'hacks', 'prank', 'pranks',
+        'transition', 'tiktok',
+    ],
+    'linkedin': [
+        'professional', 'career', 'careers', 'business', 'job', 'jobs', 'work', 'industry', 'resume', 'cv',
+        'hiring', 'interview', 'interviews', 'salary', 'networking', 'b2b', 'leadership', 'recruiter',
+        'internship', 'skills', 'linkedin',
+    ],
+    'twitter': [
+        'news', 'update', 'updates', 'tweet', 'tweets', 'thread', 'threads', 'breaking', 'latest',
+        'announcement', 'debate', 'hot take', 'twitter',
+    ],
+    'youtube': [
+        'tutorial', 'tutorials', 'how to', 'guide', 'guides', 'review', 'reviews', 'watch', 'course',
+        'explained', 'walkthrough', 'unboxing', 'step by step', 'for beginners', 'lesson', 'lessons', 'vlog',
+        'documentary', 'youtube',
+    ],
+}
+
+_word = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    return _word.findall(text.lower())
+
+
+class PlatformClassifier:
+    """
+    Counts platform indicators in many suggestions in one pass
+
+    Indicators are compiled into an Aho-Corasick automaton over words rather
+    than characters: every match falls on word boundaries ("work" doesn't
+    match "network"), multi-word indicators like "how to" are single
+    patterns, and each suggestion costs one transition per word however
+    large the vocabulary is.
+    """
+
+    def __init__(self, indicators: Dict[str, Iterable[str]]):
+        self.platforms = list(indicators)
+        self._goto: List[Dict[str, int]] = [{}]
+        outputs = [[]]
+
+        for platform_id, platform in enumerate(self.platforms):
+            for indicator in dict.fromkeys(indicators[platform]):
+                state = 0
+                for word in tokenize(indicator):
+                    if word not in self._goto[state]:
+                        self._goto.append({})
+                        outputs.append([])
+                        self._goto[state][word] = len(self._goto) - 1
+                    state = self._goto[state][word]
+                if state:
+                    outputs[state].append(platform_id)
+
+        # Failure links, breadth first; each state also reports its fallback's matches
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(word, 0)
+                outputs[child].extend(outputs[self._fail[child]])
+                queue.append(child)
+        self._outputs: List[Tuple[int, ...]] = [tuple(output) for output in outputs]
+
+    def _matches(self, text: str):
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for word in tokenize(text):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            yield from outputs[state]
+
+    def count(self, suggestions: Iterable[str]) -> Dict[str, int]:
+        """Indicator matches per platform across all suggestions"""
+        counts = [0] * len(self.platforms)
+        for suggestion in suggestions:
+            for platform_id in self._matches(suggestion):
+                counts[platform_id] += 1
+        return dict(zip(self.platforms, counts))
+
+    def platforms_for(self, text: str) -> List[str]:
+        """Platforms with at least one indicator in text"""
+        return [self.platforms[platform_id] for platform_id in sorted(set(self._matches(text)))]
+
+
+_classifiers: Dict[tuple, PlatformClassifier] = {}
+
+
+def platform_indicators() -> Dict[str, List[str]]:
+    indicators = {platform: list(words) for platform, words in DEFAULT_PLATFORM_INDICATORS.items()}
+    for platform, words in getattr(settings, 'PLATFORM_INDICATORS', {}).items():
+        indicators.setdefault(platform, []).extend(words)
+    return indicators
+
+
+def get_platform_classifier() -> PlatformClassifier:
+    """Classifier for the configured vocabulary, compiled once per process"""
+    indicators = platform_indicators()
+    key = tuple((platform, tuple(words)) for platform, words in indicators.items())
+    classifier = _classifiers.get(key)
+    if classifier is None:
+        classifier = _classifiers[key] = PlatformClassifier(indicators)
+    return classifier
@@ -0,0 +1,204 @@
+"""
+SerpApi Quota Manager
+Daily budgets, a call ledger and a priority gate for metered SerpApi searches
+"""
+import heapq
+import itertools
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import SerpApiCall, SerpApiDailyUsage
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+PRIORITY_RANKS = {INTERACTIVE: 0, BACKGROUND: 1}
+
+GLOBAL_SCOPE = 'global'
+BACKGROUND_SCOPE = 'background'
+
+
+class QuotaError(Exception):
+    """A search was refused before reaching SerpApi"""
+
+    status_code = 429
+
+    def __init__(self, message: str, scope: str = ''):
+        super().__init__(message)
+        self.scope = scope
+
+
+class QuotaExceededError(QuotaError):
+    status_code = 429
+
+
+class SchedulerBusyError(QuotaError):
+    status_code = 503
+
+
+class PriorityGate:
+    """
+    Caps concurrent upstream searches; waiting interactive requests go first
+
+    Background pre-warms only get a slot when no interactive request is queued.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.active = 0
+        self.waiting = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+
+    @contextmanager
+    def slot(self, priority: str, timeout: Optional[float] = None):
+        ticket = (PRIORITY_RANKS.get(priority, 0), next(self.counter))
+        with self.condition:
+            heapq.heappush(self.waiting, ticket)
+            granted = self.condition.wait_for(
+                lambda: self.active < self.size and self.waiting[0] == ticket,
+                timeout=timeout
+            )
+            self.waiting.remove(ticket)
+            heapq.heapify(self.waiting)
+            if not granted:
+                self.condition.notify_all()
+                raise SchedulerBusyError('Too many SerpApi searches in progress')
+            self.active += 1
+            self.condition.notify_all()
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.active -= 1
+                self.condition.notify_all()
+
+
+class QuotaManager:
+    """
+    Enforces SerpApi budgets per day
+
+    - Global: SERPAPI_DAILY_BUDGET searches across everyone.
+    - Background: pre-warms may use at most SERPAPI_BACKGROUND_SHARE of the
+      global budget, so the rest is always left for interactive requests.
+    - Per user: SERPAPI_USER_DAILY_BUDGETS by subscription tier.
+
+    Counters are incremented with conditional UPDATEs, so concurrent workers
+    can't overshoot a budget.
+    """
+
+    def __init__(self):
+        self.gate = PriorityGate(getattr(settings, 'SERPAPI_MAX_CONCURRENT', 4))
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, 'SERPAPI_QUOTA_ENABLED', True)
+
+    def limits_for(self, user=None, priority: str = INTERACTIVE) -> Dict[str, int]:
+        """Budget scopes a search is charged to, with their daily limits"""
+        global_budget = getattr(settings, 'SERPAPI_DAILY_BUDGET', 1000)
+        limits = {GLOBAL_SCOPE: global_budget}
+
+        if priority == BACKGROUND:
+            share = getattr(settings, 'SERPAPI_BACKGROUND_SHARE', 0.5)
+            limits[BACKGROUND_SCOPE] = int(global_budget * share)
+        elif user is not None and user.is_authenticated:
+            budgets = getattr(settings, 'SERPAPI_USER_DAILY_BUDGETS', {})
+            limits[f'user:{user.pk}'] = budgets.get(user.subscription_tier, budgets.get('free', 20))
+
+        return limits
+
+    def reserve(self, user=None, priority: str = INTERACTIVE) -> List[str]:
+        """
+        Charge one search to every applicable budget
+
+        Returns:
+            Scopes charged (pass to release() if the search isn't billed)
+
+        Raises:
+            QuotaExceededError: A budget is used up; nothing is charged
+        """
+        day = timezone.localdate()
+        charged = []
+
+        for scope, limit in self.limits_for(user, priority).items():
+            SerpApiDailyUsage.objects.get_or_create(scope=scope, day=day)
+            updated = SerpApiDailyUsage.objects.filter(scope=scope, day=day, calls__lt=limit).update(
+                calls=F('calls') + 1
+            )
+            if not updated:
+                self.release(charged, day)
+                raise QuotaExceededError(f'SerpApi {scope} daily budget of {limit} searches used up', scope=scope)
+            charged.append(scope)
+
+        return charged
+
+    def release(self, scopes: List[str], day=None):
+        """Refund a reservation (e.g. the search failed before SerpApi billed it)"""
+        if scopes:
+            SerpApiDailyUsage.objects.filter(scope__in=scopes, day=day or timezone.localdate()).update(
+                calls=F('calls') - 1
+            )
+
+    def record(self, user, endpoint: str, priority: str, params: Dict, status_code: Optional[int], latency_ms: int):
+        """Add a search to the ledger"""
+        SerpApiCall.objects.create(
+            user=user if user is not None and user.is_authenticated else None,
+            endpoint=endpoint,
+            priority=priority,
+            query=str(params.get('q', ''))[:255],
+            geo=str(params.get('geo', ''))[:10],
+            status_code=status_code,
+            latency_ms=latency_ms
+        )
+
+    def remaining(self, user) -> Dict:
+        """Today's usage and remaining budget for a user, plus the shared budgets"""
+        day = timezone.localdate()
+        limits = {**self.limits_for(user, INTERACTIVE), **self.limits_for(None, BACKGROUND)}
+        used = dict(
+            SerpApiDailyUsage.objects.filter(day=day, scope__in=limits).values_list('scope', 'calls')
+        )
+
+        def budget(scope):
+            return {
+                'used': used.get(scope, 0),
+                'limit': limits[scope],
+                'remaining': max(limits[scope] - used.get(scope, 0), 0),
+            }
+
+        start_of_day = timezone.make_aware(timezone.datetime.combine(day, timezone.datetime.min.time()))
+        by_endpoint = dict(
+            SerpApiCall.objects.filter(user=user, created_at__gte=start_of_day)
+            .values_list('endpoint')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+
+        return {
+            'day': day,
+            'user': budget(f'user:{user.pk}'),
+            'global': budget(GLOBAL_SCOPE),
+            'background': budget(BACKGROUND_SCOPE),
+            'user_calls_by_endpoint': by_endpoint,
+        }
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_quota_manager() -> QuotaManager:
+    """Process-wide quota manager (shares one priority gate)"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = QuotaManager()
+        return _manager
@@ -0,0 +1,89 @@
+"""
+Research Cache
+Finds recent research for a keyword by its normalized key, shared across users when allowed
+"""
+import logging
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import KeywordResearch, KeywordSuggestion
+from .services import query_key
+from .suggestion_rows import SECTIONS
+
+logger = logging.getLogger(__name__)
+
+# Copied as-is from shared research; everything else belongs to the copy. The
+# category suggestions (rows, or the JSON columns of older research) stay put.
+NOT_COPIED = {'id', 'user', 'shared_from', 'created_at', *SECTIONS}
+
+
+def find_recent_research(user, keyword: str, country: str, language: str) -> Tuple[Optional[KeywordResearch], bool]:
+    """
+    Newest research of a keyword still within KEYWORD_RESEARCH_CACHE_TTL
+
+    The user's own research wins. With KEYWORD_RESEARCH_SHARED_CACHE, any
+    user's research of the same keyword, country and language is used
+    next: it is built only from public autocomplete data, and callers copy
+    it (copy_research) so nobody sees whose it was. Both lookups are seeks
+    on the (keyword_key, country, language, created_at) index.
+
+    Returns:
+        (research or None, whether it belongs to another user)
+    """
+    recent = KeywordResearch.objects.filter(
+        keyword_key=query_key(keyword),
+        country=country,
+        language=language,
+        created_at__gte=timezone.now() - timezone.timedelta(seconds=getattr(settings, 'KEYWORD_RESEARCH_CACHE_TTL', 86400))
+    ).order_by('-created_at')
+
+    own = recent.filter(user=user).first()
+    if own is not None or not getattr(settings, 'KEYWORD_RESEARCH_SHARED_CACHE', True):
+        return own, False
+    return recent.first(), True
+
+
+def copy_research(source: KeywordResearch, user) -> KeywordResearch:
+    """
+    Add another user's research to this user's history
+
+    The copy is a reference: it has its own id, user and summary, but its
+    category suggestions are read from the original (shared_from) instead of
+    being duplicated. It keeps the source's created_at, so shared data never
+    looks fresher than it is and can't be passed on past its expiry.
+    """
+    research = KeywordResearch(
+        user=user,
+        shared_from_id=source.shared_from_id or source.id,
+        **{field.name: getattr(source, field.name) for field in KeywordResearch._meta.concrete_fields
+           if field.name not in NOT_COPIED}
+    )
+    # bulk_create skips save(), which would re-derive the summary from the empty category columns
+    KeywordResearch.objects.bulk_create([research])
+    KeywordResearch.objects.filter(id=research.id).update(created_at=source.created_at)
+    research.created_at = source.created_at
+    logger.info(f"Shared cached keyword research for: {source.keyword}")
+    return research
+
+
+def hand_over_shared_research(source: KeywordResearch):
+    """
+    Keep copies of research working when the original is deleted
+
+    Its suggestions move to one of the copies, which the other copies then
+    reference. Runs from pre_delete, before the rows would be cascaded.
+    """
+    # Copies all carry the source's created_at, so any of them will do
+    heir = KeywordResearch.objects.filter(shared_from=source).order_by('id').first()
+    if heir is None:
+        return
+    with transaction.atomic():
+        KeywordResearch.objects.filter(id=heir.id).update(
+            shared_from=None, **{section: getattr(source, section) for section in SECTIONS}
+        )
+        KeywordSuggestion.objects.filter(research=source).update(research=heir)
+        KeywordResearch.objects.filter(shared_from=source).update(shared_from=heir)
+    logger.info(f"Handed shared keyword research for '{source.keyword}' over to {heir.id}")
@@ -1,8 +1,11 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import KeywordResearch
+from viral_ai.sparse_fields import SparseFieldsetSerializerMixin
+from .models import KeywordResearch, KeywordResearchJob
+from .suggestion_rows import SECTIONS, expand_clusters, research_sections
 
 
-class KeywordResearchSerializer(serializers.ModelSerializer):
+class KeywordResearchSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for keyword research data"""
     
     class Meta:
@@ -20,10 +23,52 @@ class KeywordResearchSerializer(serializers.ModelSerializer):
             'alphabetical',
             'comparisons',
             'related_keywords',
+            'clusters',
             'viral_examples',
+            'youtube_data',
+            'summary',
             'created_at',
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'clusters', 'youtube_data', 'summary', 'created_at']
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Table-backed or shared research: rebuild the category JSON from where it's stored
+        requested = [section for section in SECTIONS if section in data and not data[section]]
+        if not (instance.suggestions_in_table or instance.shared_from_id):
+            requested = []
+        # Clusters store positions in the suggestions (suggestion_rows.compact_clusters)
+        compact_clusters = any('members' in cluster for cluster in data.get('clusters') or [])
+        if requested or compact_clusters:
+            sections = research_sections(instance)
+            for section in requested:
+                data[section] = sections[section]
+            if compact_clusters:
+                data['clusters'] = expand_clusters(data['clusters'], sections)
+        return data
+
+
+class KeywordResearchListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    """
+    Lightweight keyword research representation for list views
+    
+    Reads only the precomputed summary - the suggestion JSON columns stay in
+    the database until the detail endpoint asks for them.
+    """
+    
+    class Meta:
+        model = KeywordResearch
+        fields = [
+            'id',
+            'keyword',
+            'country',
+            'language',
+            'search_volume',
+            'trend_direction',
+            'summary',
+            'created_at',
+        ]
+        read_only_fields = fields
 
 
 class KeywordResearchCreateSerializer(serializers.Serializer):
@@ -38,3 +83,73 @@ class KeywordResearchCreateSerializer(serializers.Serializer):
         if not value.strip():
             raise serializers.ValidationError("Keyword cannot be empty")
         return value.strip()
+
+
+class KeywordExpansionSerializer(serializers.Serializer):
+    """Parameters for a deep keyword expansion crawl (see expansion.py)"""
+    
+    keyword = serializers.CharField(max_length=255)
+    country = serializers.CharField(max_length=10, default='us')
+    language = serializers.CharField(max_length=10, default='en')
+    depth = serializers.IntegerField(min_value=1, default=2)
+    budget = serializers.IntegerField(min_value=1, default=100)
+    limit = serializers.IntegerField(min_value=1, default=1000)
+    min_score = serializers.IntegerField(min_value=1, max_value=10, default=5)
+    
+    def validate_depth(self, value):
+        return min(value, getattr(settings, 'KEYWORD_EXPANSION_MAX_DEPTH', 3))
+    
+    def validate_budget(self, value):
+        return min(value, getattr(settings, 'KEYWORD_EXPANSION_MAX_REQUESTS', 300))
+
+
+class KeywordAutocompleteSerializer(serializers.Serializer):
+    """Parameters for local prefix autocomplete (see suggestion_index.py)"""
+    
+    q = serializers.CharField(max_length=255)
+    country = serializers.CharField(max_length=10, default='us')
+    language = serializers.CharField(max_length=10, default='en')
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class KeywordBulkResearchSerializer(serializers.Serializer):
+    """Serializer for bulk keyword research request"""
+    
+    keywords = serializers.ListField(child=serializers.CharField(max_length=255))
+    country = serializers.CharField(max_length=10, default='us')
+    language = serializers.CharField(max_length=10, default='en')
+    
+    def validate_keywords(self, value):
+        max_keywords = getattr(settings, 'KEYWORD_BULK_MAX_KEYWORDS', 100)
+        value = [keyword.strip() for keyword in value if keyword.strip()]
+        if not value:
+            raise serializers.ValidationError('At least one keyword is required.')
+        if len(value) > max_keywords:
+            raise serializers.ValidationError(f'A bulk request can contain at most {max_keywords} keywords.')
+        return value
+
+
+class KeywordResearchJobSerializer(serializers.ModelSerializer):
+    """Serializer for bulk keyword research jobs"""
+    
+    class Meta:
+        model = KeywordResearchJob
+        fields = [
+            'id',
+            'status',
+            'country',
+            'language',
+            'items',
+            'total_items',
+            'completed_items',
+            'failed_items',
+            'cached_items',
+            'duplicate_items',
+            'total_queries',
+            'unique_queries',
+            'fetched_queries',
+            'created_at',
+            'updated_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
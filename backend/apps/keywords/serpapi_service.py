@@ -1,11 +1,27 @@
+import datetime
+import time
 import requests
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import logging
 import os
 from django.conf import settings
 
+from .caching import StaleWhileRevalidateCache
+from .quota import INTERACTIVE, QuotaError, get_quota_manager
+
 logger = logging.getLogger(__name__)
 
+# Shared by all service instances so identical searches hit the cache/coalesce
+_response_cache = StaleWhileRevalidateCache('serpapi')
+
+
+class SerpApiStatusError(Exception):
+    """Non-200 response from SerpApi (never cached)"""
+    
+    def __init__(self, status_code: int):
+        super().__init__(f'SerpApi returned status {status_code}')
+        self.status_code = status_code
+
 
 class SerpApiTrendingService:
     """Service for fetching trending searches using SerpApi Google Trends"""
@@ -26,11 +42,80 @@ class SerpApiTrendingService:
         'ecommerce': ['shopping', 'deals', 'products', 'reviews', 'ecommerce']
     }
     
-    def __init__(self):
+    def __init__(self, user=None, priority: str = INTERACTIVE):
+        """
+        Args:
+            user: User the searches are charged to (None for system jobs)
+            priority: 'interactive' for API requests, 'background' for pre-warms
+        """
+        self.user = user
+        self.priority = priority
         self.api_key = os.getenv('SERPAPI_KEY', settings.SERPAPI_KEY if hasattr(settings, 'SERPAPI_KEY') else None)
         if not self.api_key:
             logger.warning("SerpApi key not configured. Trending searches will not work.")
     
+    def _search(self, params: Dict, endpoint: str, timeout: int) -> Tuple[int, Optional[Dict]]:
+        """
+        Run a SerpApi search through the response cache
+        
+        Args:
+            params: Engine parameters (without api_key) - also the cache key
+            endpoint: Name used to look up the TTL in SERPAPI_CACHE_TTLS
+            timeout: Upstream request timeout in seconds
+        
+        Returns:
+            (status code, response JSON or None for non-200 responses)
+        """
+        ttls = getattr(settings, 'SERPAPI_CACHE_TTLS', {})
+        ttl = ttls.get(endpoint, ttls.get('default', 3600))
+        stale_ttl = getattr(settings, 'SERPAPI_CACHE_STALE_TTL', 0)
+        
+        def fetch():
+            # Only cache misses reach here, so cached results don't use quota
+            quota = get_quota_manager()
+            if not quota.enabled:
+                return self._request(params, timeout)
+            
+            charged = quota.reserve(self.user, self.priority)
+            status_code = None
+            started = time.monotonic()
+            try:
+                with quota.gate.slot(self.priority, timeout=getattr(settings, 'SERPAPI_QUEUE_TIMEOUT', 30)):
+                    started = time.monotonic()
+                    data = self._request(params, timeout)
+                status_code = 200
+                return data
+            except SerpApiStatusError as e:
+                status_code = e.status_code
+                raise
+            finally:
+                if status_code is None:
+                    # Never reached SerpApi (queue timeout, connection error): not billed
+                    quota.release(charged)
+                quota.record(
+                    self.user, endpoint, self.priority, params,
+                    status_code, int((time.monotonic() - started) * 1000)
+                )
+        
+        try:
+            # A coalesced waiter outlasting the leader's queue wait and request timeout means the leader is stuck
+            wait_timeout = getattr(settings, 'SERPAPI_QUEUE_TIMEOUT', 30) + timeout + 5
+            return 200, _response_cache.get(params, fetch, ttl=ttl, stale_ttl=stale_ttl, wait_timeout=wait_timeout)
+        except (SerpApiStatusError, QuotaError) as e:
+            if isinstance(e, QuotaError):
+                logger.warning(f"SerpApi search refused: {str(e)}")
+            return e.status_code, None
+    
+    def _request(self, params: Dict, timeout: int) -> Dict:
+        response = requests.get(
+            getattr(settings, 'SERPAPI_BASE_URL', self.SERPAPI_BASE_URL),
+            params={**params, 'api_key': self.api_key},
+            timeout=timeout
+        )
+        if response.status_code != 200:
+            raise SerpApiStatusError(response.status_code)
+        return response.json()
+    
     def get_trending_now(self, geo: str = 'US', frequency: str = 'daily') -> Dict:
         """
         Get trending searches right now from Google Trends
@@ -59,17 +144,11 @@ class SerpApiTrendingService:
                     'engine': 'google_trends',
                     'q': keyword,
                     'geo': geo,
-                    'api_key': self.api_key
                 }
             
-                response = requests.get(
-                    self.SERPAPI_BASE_URL,
-                    params=params,
-                    timeout=30  # Increased timeout
-                )
+                status_code, data = self._search(params, 'trending_now', timeout=30)
                 
-                if response.status_code == 200:
-                    data = response.json()
+                if status_code == 200:
                     
                     # Try to get rising queries as trending
                     if 'related_queries' in data and 'rising' in data['related_queries']:
@@ -143,17 +222,11 @@ class SerpApiTrendingService:
                 'q': keyword,
                 'geo': geo,
                 'date': timeframe,
-                'api_key': self.api_key
             }
             
-            response = requests.get(
-                self.SERPAPI_BASE_URL,
-                params=params,
-                timeout=10
-            )
+            status_code, data = self._search(params, 'interest_over_time', timeout=10)
             
-            if response.status_code == 200:
-                data = response.json()
+            if status_code == 200:
                 
                 # Extract interest over time
                 timeline_data = []
@@ -165,26 +238,17 @@ class SerpApiTrendingService:
                             'value': point.get('values', [{}])[0].get('value', 0)
                         })
                 
-                # Extract related queries
-                related_queries = []
-                if 'related_queries' in data:
-                    for query in data['related_queries'].get('rising', [])[:10]:
-                        related_queries.append({
-                            'query': query.get('query', ''),
-                            'value': query.get('value', 0)
-                        })
-                
                 return {
                     'keyword': keyword,
                     'geo': geo,
                     'timeframe': timeframe,
                     'timeline_data': timeline_data,
-                    'related_queries': related_queries
+                    'related_queries': self._rising_queries(data)
                 }
             else:
-                logger.error(f"SerpApi error: {response.status_code}")
+                logger.error(f"SerpApi error: {status_code}")
                 return {
-                    'error': f'API returned status {response.status_code}',
+                    'error': f'API returned status {status_code}',
                     'timeline_data': []
                 }
                 
@@ -195,6 +259,52 @@ class SerpApiTrendingService:
                 'timeline_data': []
             }
     
+    def get_timeline_points(self, keyword: str, geo: str, date: str) -> Tuple[List[Tuple[datetime.date, float]], List[Dict]]:
+        """
+        Interest over time as dated points, for the stored trend series (see trend_series.py)
+        
+        Args:
+            keyword: Search term
+            geo: Country code
+            date: SerpApi date parameter - a timeframe or a 'YYYY-MM-DD YYYY-MM-DD' range
+        
+        Returns:
+            ([(bucket start date, value)], rising related queries)
+        
+        Raises:
+            SerpApiStatusError: SerpApi (or the quota) refused the search
+        """
+        params = {
+            'engine': 'google_trends',
+            'q': keyword,
+            'geo': geo,
+            'date': date,
+        }
+        status_code, data = self._search(params, 'interest_over_time', timeout=10)
+        if status_code != 200:
+            raise SerpApiStatusError(status_code)
+        
+        points = []
+        for point in data.get('interest_over_time', {}).get('timeline_data', []):
+            if not point.get('timestamp'):
+                continue
+            value = (point.get('values') or [{}])[0]
+            value = value.get('extracted_value', value.get('value', 0))
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                value = 0.0  # "<1"
+            day = datetime.datetime.fromtimestamp(int(point['timestamp']), tz=datetime.timezone.utc).date()
+            points.append((day, value))
+        return points, self._rising_queries(data)
+    
+    @staticmethod
+    def _rising_queries(data: Dict) -> List[Dict]:
+        return [
+            {'query': query.get('query', ''), 'value': query.get('value', 0)}
+            for query in data.get('related_queries', {}).get('rising', [])[:10]
+        ]
+    
     def get_related_topics(self, keyword: str, geo: str = 'US') -> Dict:
         """
         Get related topics and queries for a keyword
@@ -218,17 +328,11 @@ class SerpApiTrendingService:
                 'engine': 'google_trends',
                 'q': keyword,
                 'geo': geo,
-                'api_key': self.api_key
             }
             
-            response = requests.get(
-                self.SERPAPI_BASE_URL,
-                params=params,
-                timeout=10
-            )
+            status_code, data = self._search(params, 'related_topics', timeout=10)
             
-            if response.status_code == 200:
-                data = response.json()
+            if status_code == 200:
                 
                 # Extract related topics
                 related_topics = []
@@ -256,9 +360,9 @@ class SerpApiTrendingService:
                     'related_queries': related_queries
                 }
             else:
-                logger.error(f"SerpApi error: {response.status_code}")
+                logger.error(f"SerpApi error: {status_code}")
                 return {
-                    'error': f'API returned status {response.status_code}',
+                    'error': f'API returned status {status_code}',
                     'related_topics': [],
                     'related_queries': []
                 }
@@ -309,17 +413,11 @@ class SerpApiTrendingService:
                 'q': main_keyword,
                 'geo': geo,
                 'data_type': 'RELATED_QUERIES',  # Specifically request related queries
-                'api_key': self.api_key
             }
             
-            response = requests.get(
-                self.SERPAPI_BASE_URL,
-                params=params,
-                timeout=30
-            )
+            status_code, data = self._search(params, 'niche_keywords', timeout=30)
             
-            if response.status_code == 200:
-                data = response.json()
+            if status_code == 200:
                 
                 # Get rising queries (trending up)
                 if 'related_queries' in data and 'rising' in data['related_queries']:
@@ -353,9 +451,9 @@ class SerpApiTrendingService:
                     'total_count': len(all_keywords[:limit])
                 }
             else:
-                logger.error(f"SerpApi error: {response.status_code}")
+                logger.error(f"SerpApi error: {status_code}")
                 return {
-                    'error': f'API returned status {response.status_code}',
+                    'error': f'API returned status {status_code}',
                     'niche': niche,
                     'keywords': []
                 }
@@ -368,6 +466,93 @@ class SerpApiTrendingService:
                 'keywords': []
             }
     
+    def compute_niche_keywords(self, niche: str, geo: str = 'US', limit: int = 50) -> Dict:
+        """
+        Trending keywords for a niche from every seed keyword, merged and ranked
+        
+        Each seed's related queries are scored (rising queries by position,
+        weighted double; top queries by their 0-100 value) and scores for the
+        same query are summed across seeds, so queries that trend for several
+        seeds rank first.
+        
+        Args:
+            niche: Niche category
+            geo: Country code
+            limit: Maximum number of keywords to keep
+        
+        Returns:
+            Dict with ranked keywords, the seeds used and the seeds that failed
+        """
+        seeds = self.NICHES[niche]
+        merged = {}
+        failed_seeds = []
+        
+        for seed in seeds:
+            params = {
+                'engine': 'google_trends',
+                'q': seed,
+                'geo': geo,
+                'data_type': 'RELATED_QUERIES',
+            }
+            try:
+                status_code, data = self._search(params, 'niche_keywords', timeout=30)
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Niche seed '{seed}' ({geo}) failed: {str(e)}")
+                status_code, data = None, None
+            
+            if status_code != 200:
+                failed_seeds.append(seed)
+                continue
+            
+            related = data.get('related_queries', {})
+            for trend in ('rising', 'top'):
+                items = related.get(trend, [])
+                for rank, item in enumerate(items):
+                    query = (item.get('query') or '').strip()
+                    if not query:
+                        continue
+                    value = item.get('extracted_value', item.get('value', 0))
+                    value = value if isinstance(value, (int, float)) else 0
+                    if trend == 'rising':
+                        score = 2.0 * (len(items) - rank) / len(items)
+                    else:
+                        score = value / 100
+                    
+                    entry = merged.setdefault(query.lower(), {
+                        'keyword': query,
+                        'trend': trend,
+                        'value': value,
+                        'seeds': [],
+                        'score': 0.0,
+                    })
+                    entry['score'] += score
+                    if seed not in entry['seeds']:
+                        entry['seeds'].append(seed)
+                    if trend == 'rising' and entry['trend'] != 'rising':
+                        entry['trend'], entry['value'] = 'rising', value
+                    elif trend == entry['trend']:
+                        entry['value'] = max(entry['value'], value)
+        
+        ranked = sorted(merged.values(), key=lambda entry: -entry['score'])[:limit]
+        for entry in ranked:
+            entry['score'] = round(entry['score'], 3)
+            if entry['trend'] == 'rising':
+                entry['growth'] = f"+{entry['value']}%"
+                entry['popularity'] = 'high'
+            else:
+                entry['trend'] = 'stable'
+                entry['growth'] = f"{entry['value']}"
+                entry['popularity'] = 'medium' if entry['value'] < 50 else 'high'
+        
+        return {
+            'niche': niche,
+            'geo': geo,
+            'seed_keywords': seeds,
+            'keywords': ranked,
+            'total_count': len(ranked),
+            'failed_seeds': failed_seeds,
+        }
+    
     def get_available_niches(self) -> List[Dict]:
         """Get list of available niche categories"""
         return [
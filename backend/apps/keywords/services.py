@@ -1,10 +1,19 @@
 import requests
-from typing import Dict, List
+from typing import Dict, List, Optional
 import logging
+from django.conf import settings
+
+from .clustering import cluster_suggestions
+from .platform_classifier import get_platform_classifier
 
 logger = logging.getLogger(__name__)
 
 
+def query_key(query: str) -> str:
+    """Queries with the same key get the same autocomplete results"""
+    return ' '.join(query.lower().split())
+
+
 class KeywordResearchService:
     """Service for keyword research using Google Autocomplete API"""
     
@@ -19,10 +28,40 @@ class KeywordResearchService:
     # Alphabet for research
     ALPHABET = list('abcdefghijklmnopqrstuvwxyz')
     
-    def __init__(self, keyword: str, country: str = 'us', language: str = 'en'):
+    # Comparison terms for research
+    COMPARISONS = ['vs', 'versus', 'or', 'compared to', 'better than']
+    
+    # Modifiers placed before the keyword for related keywords
+    RELATED_MODIFIERS = ['best', 'top', 'free', 'online', 'near me']
+    
+    def __init__(self, keyword: str, country: str = 'us', language: str = 'en',
+                 prefetched: Optional[Dict[str, List[Dict]]] = None):
+        """
+        Args:
+            prefetched: Autocomplete results by query_key(query), used instead of
+                fetching (bulk research fetches every keyword's queries up front)
+        """
         self.keyword = keyword
         self.country = country
         self.language = language
+        self.prefetched = prefetched if prefetched is not None else {}
+    
+    def research_queries(self) -> List[str]:
+        """Every autocomplete query perform_full_research makes"""
+        suffixes = self.QUESTIONS + self.PREPOSITIONS + self.ALPHABET + self.COMPARISONS
+        return (
+            [f"{self.keyword} {suffix}" for suffix in suffixes]
+            + [self.keyword]
+            + [f"{modifier} {self.keyword}" for modifier in self.RELATED_MODIFIERS]
+        )
+    
+    def _fetch(self, query: str) -> List[Dict]:
+        # Categories overlap ("vs", "versus" and "or" are both prepositions and
+        # comparisons), so results are kept for the rest of the research
+        key = query_key(query)
+        if key not in self.prefetched:
+            self.prefetched[key] = self.fetch_autocomplete(query)
+        return list(self.prefetched[key])
     
     def _estimate_volume(self, popularity_score: int) -> str:
         """Estimate search volume range based on popularity score"""
@@ -48,7 +87,7 @@ class KeywordResearchService:
             }
             
             response = requests.get(
-                self.GOOGLE_AUTOCOMPLETE_URL,
+                getattr(settings, 'GOOGLE_AUTOCOMPLETE_URL', self.GOOGLE_AUTOCOMPLETE_URL),
                 params=params,
                 timeout=5
             )
@@ -83,7 +122,7 @@ class KeywordResearchService:
         
         for question in self.QUESTIONS:
             query = f"{self.keyword} {question}"
-            suggestions = self.fetch_autocomplete(query)
+            suggestions = self._fetch(query)
             
             if suggestions:
                 results.append({
@@ -101,7 +140,7 @@ class KeywordResearchService:
         
         for preposition in self.PREPOSITIONS:
             query = f"{self.keyword} {preposition}"
-            suggestions = self.fetch_autocomplete(query)
+            suggestions = self._fetch(query)
             
             if suggestions:
                 results.append({
@@ -119,7 +158,7 @@ class KeywordResearchService:
         
         for letter in self.ALPHABET:
             query = f"{self.keyword} {letter}"
-            suggestions = self.fetch_autocomplete(query)
+            suggestions = self._fetch(query)
             
             if suggestions:
                 results.append({
@@ -133,12 +172,11 @@ class KeywordResearchService:
     
     def research_comparisons(self) -> List[Dict]:
         """Research comparison queries"""
-        comparison_terms = ['vs', 'versus', 'or', 'compared to', 'better than']
         results = []
         
-        for term in comparison_terms:
+        for term in self.COMPARISONS:
             query = f"{self.keyword} {term}"
-            suggestions = self.fetch_autocomplete(query)
+            suggestions = self._fetch(query)
             
             if suggestions:
                 results.append({
@@ -154,25 +192,11 @@ class KeywordResearchService:
         """
         Calculate estimated platform breakdown based on keyword patterns
         This is a simplified version - in production, you'd use actual platform APIs
-        """
-        # Platform keywords that indicate where content performs well
-        platform_indicators = {
-            'instagram': ['photo', 'picture', 'image', 'aesthetic', 'feed', 'story', 'reel'],
-            'tiktok': ['video', 'trend', 'viral', 'dance', 'challenge', 'sound'],
-            'linkedin': ['professional', 'career', 'business', 'job', 'work', 'industry'],
-            'twitter': ['news', 'update', 'tweet', 'thread', 'breaking'],
-            'youtube': ['tutorial', 'how to', 'guide', 'review', 'watch'],
-        }
         
-        platform_scores = {platform: 0 for platform in platform_indicators.keys()}
-        
-        # Score each platform based on keyword matches
-        for suggestion in all_suggestions:
-            suggestion_lower = suggestion.lower()
-            for platform, indicators in platform_indicators.items():
-                for indicator in indicators:
-                    if indicator in suggestion_lower:
-                        platform_scores[platform] += 1
+        Indicator words per platform are in platform_classifier.py (extend them
+        with the PLATFORM_INDICATORS setting) and only match whole words.
+        """
+        platform_scores = get_platform_classifier().count(all_suggestions)
         
         # Calculate percentages
         total_score = sum(platform_scores.values()) or 1
@@ -189,13 +213,12 @@ class KeywordResearchService:
     def get_related_keywords(self) -> List[str]:
         """Get related keywords"""
         # Fetch suggestions for the base keyword
-        suggestions = self.fetch_autocomplete(self.keyword)
+        suggestions = self._fetch(self.keyword)
         
         # Also try with common modifiers
-        modifiers = ['best', 'top', 'free', 'online', 'near me']
-        for modifier in modifiers:
+        for modifier in self.RELATED_MODIFIERS:
             query = f"{modifier} {self.keyword}"
-            suggestions.extend(self.fetch_autocomplete(query))
+            suggestions.extend(self._fetch(query))
         
         # Extract keyword strings from dict objects
         keyword_strings = []
@@ -223,19 +246,27 @@ class KeywordResearchService:
         comparisons = self.research_comparisons()
         related_keywords = self.get_related_keywords()
         
-        # Collect all suggestions for platform breakdown
+        # Collect all suggestions for platform breakdown and clustering
         all_suggestions = []
-        for category in [questions, prepositions, alphabetical, comparisons]:
+        scored_suggestions = []
+        sections = {'questions': questions, 'prepositions': prepositions,
+                    'alphabetical': alphabetical, 'comparisons': comparisons}
+        for section, category in sections.items():
             for item in category:
                 # Extract keyword strings from dict objects
                 for suggestion in item['suggestions']:
                     if isinstance(suggestion, dict):
                         all_suggestions.append(suggestion['keyword'])
+                        scored_suggestions.append({**suggestion, 'category': section})
                     else:
                         all_suggestions.append(suggestion)
+                        scored_suggestions.append({'keyword': suggestion, 'popularity_score': 0, 'category': section})
         
         platform_breakdown = self.calculate_platform_breakdown(all_suggestions)
         
+        # Near-duplicate and same-intent suggestions grouped under one representative
+        clusters = cluster_suggestions(scored_suggestions, self.keyword)
+        
         # Calculate summary statistics
         total_suggestions = len(all_suggestions)
         
@@ -249,6 +280,7 @@ class KeywordResearchService:
                 'prepositions_count': len(prepositions),
                 'alphabetical_count': len(alphabetical),
                 'comparisons_count': len(comparisons),
+                'clusters_count': len(clusters),
             },
             'platform_breakdown': platform_breakdown,
             'questions': questions,
@@ -256,6 +288,7 @@ class KeywordResearchService:
             'alphabetical': alphabetical,
             'comparisons': comparisons,
             'related_keywords': related_keywords,
+            'clusters': clusters,
             'viral_examples': [],  # Placeholder for now
         }
         
@@ -0,0 +1,10 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from apps.keywords.models import KeywordResearch
+from apps.keywords.research_cache import hand_over_shared_research
+
+
+@receiver(pre_delete, sender=KeywordResearch)
+def keep_shared_copies(sender, instance, **kwargs):
+    hand_over_shared_research(instance)
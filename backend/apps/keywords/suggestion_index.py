@@ -0,0 +1,250 @@
+"""
+Suggestion Index
+Normalized store of every autocomplete suggestion seen, with an in-memory prefix index
+"""
+import bisect
+import heapq
+import re
+import threading
+import time
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import SuggestionTerm
+
+logger = logging.getLogger(__name__)
+
+PREFIX_LENGTH = 3
+SUGGESTION_CATEGORIES = ('questions', 'prepositions', 'alphabetical', 'comparisons')
+
+# Prefixes this short match too many terms to scan per request; their best
+# completions are kept precomputed instead
+SHORT_PREFIX = 2
+TOP_PER_SHORT_PREFIX = 50
+
+_whitespace = re.compile(r'\s+')
+
+
+def normalize_suggestion(text: str) -> str:
+    return _whitespace.sub(' ', text).strip().lower()
+
+
+def extract_suggestions(research: Dict) -> Dict[str, int]:
+    """
+    Suggestions in a research payload (or KeywordResearch field values)
+
+    Returns:
+        Dict of normalized suggestion -> best popularity score
+    """
+    found = {}
+
+    def add(text, score):
+        text = normalize_suggestion(text or '')[:255]
+        if text:
+            found[text] = max(found.get(text, 0), score or 0)
+
+    for category in SUGGESTION_CATEGORIES:
+        for group in research.get(category) or []:
+            if not isinstance(group, dict):
+                continue
+            for suggestion in group.get('suggestions', []):
+                if isinstance(suggestion, dict):
+                    add(suggestion.get('keyword'), suggestion.get('popularity_score'))
+                else:
+                    add(suggestion, 0)
+
+    for keyword in research.get('related_keywords') or []:
+        add(keyword if isinstance(keyword, str) else keyword.get('keyword'), 0)
+
+    return found
+
+
+def record_suggestions(suggestions: Dict[str, int], country: str = 'us', language: str = 'en') -> int:
+    """
+    Add suggestions to the store and the in-memory index
+
+    Existing terms get their times_seen bumped and keep their best score.
+
+    Returns:
+        Number of new terms
+    """
+    if not suggestions:
+        return 0
+
+    country, language = country.lower(), language.lower()
+    existing = {
+        term.text: term
+        for term in SuggestionTerm.objects.filter(country=country, language=language, text__in=list(suggestions))
+    }
+
+    now = timezone.now()
+    for text, term in existing.items():
+        term.times_seen += 1
+        term.popularity_score = max(term.popularity_score, suggestions[text])
+        term.last_seen = now
+    SuggestionTerm.objects.bulk_update(existing.values(), ['times_seen', 'popularity_score', 'last_seen'], batch_size=500)
+
+    new_terms = [
+        SuggestionTerm(text=text, prefix=text[:PREFIX_LENGTH], country=country, language=language,
+                       popularity_score=score)
+        for text, score in suggestions.items() if text not in existing
+    ]
+    # Concurrent writers may insert the same term; the unique constraint keeps one
+    SuggestionTerm.objects.bulk_create(new_terms, batch_size=500, ignore_conflicts=True)
+
+    index = _indexes.get((country, language))
+    if index is not None:
+        for text, term in existing.items():
+            index.add(text, term.popularity_score, term.times_seen)
+        for term in new_terms:
+            index.add(term.text, term.popularity_score, 1)
+
+    return len(new_terms)
+
+
+class PrefixIndex:
+    """
+    Sorted in-memory index of one locale's suggestions
+
+    Terms in a prefix's range are found by binary search; the best
+    completions of 1-2 character prefixes (whose ranges are large) are
+    precomputed. Lookups take microseconds and never touch the database.
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, int, int]] = ()):
+        self._lock = threading.Lock()
+        self.texts: List[str] = []
+        self.ranks: Dict[str, Tuple[int, int]] = {}
+        self.short_tops: Dict[str, List[Tuple[Tuple[int, int], str]]] = {}
+
+        for text, score, times_seen in sorted(terms):
+            self.texts.append(text)
+            self.ranks[text] = (score, times_seen)
+        for text, rank in self.ranks.items():
+            for length in range(1, min(SHORT_PREFIX, len(text)) + 1):
+                self._offer(text[:length], rank, text)
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.texts)
+
+    def _offer(self, prefix: str, rank: Tuple[int, int], text: str):
+        top = self.short_tops.setdefault(prefix, [])
+        entry = (rank, text)
+        if len(top) < TOP_PER_SHORT_PREFIX:
+            heapq.heappush(top, entry)
+        elif entry > top[0]:
+            heapq.heapreplace(top, entry)
+
+    def add(self, text: str, score: int, times_seen: int):
+        with self._lock:
+            if text in self.ranks:
+                old = self.ranks[text]
+                rank = (max(old[0], score), max(old[1], times_seen))
+                self.ranks[text] = rank
+                for length in range(1, min(SHORT_PREFIX, len(text)) + 1):
+                    top = self.short_tops.get(text[:length], [])
+                    entries = [entry for entry in top if entry[1] != text]
+                    if len(entries) != len(top):
+                        heapq.heapify(entries)
+                        self.short_tops[text[:length]] = entries
+                    self._offer(text[:length], rank, text)
+                return
+
+            bisect.insort(self.texts, text)
+            self.ranks[text] = (score, times_seen)
+            for length in range(1, min(SHORT_PREFIX, len(text)) + 1):
+                self._offer(text[:length], (score, times_seen), text)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Best known completions of prefix, by popularity score then times seen"""
+        prefix = normalize_suggestion(prefix)
+        if not prefix:
+            return []
+
+        if len(prefix) <= SHORT_PREFIX and limit <= TOP_PER_SHORT_PREFIX:
+            best = heapq.nlargest(limit, self.short_tops.get(prefix, []))
+        else:
+            start = bisect.bisect_left(self.texts, prefix)
+            end = bisect.bisect_left(self.texts, prefix + '\U0010ffff', start)
+            best = heapq.nlargest(limit, ((self.ranks[text], text) for text in self.texts[start:end]))
+
+        return [
+            {'keyword': text, 'popularity_score': rank[0], 'times_seen': rank[1]}
+            for rank, text in best
+        ]
+
+
+_indexes: Dict[Tuple[str, str], PrefixIndex] = {}
+_indexes_lock = threading.Lock()
+_rebuilding = set()
+
+
+def _build(country: str, language: str) -> PrefixIndex:
+    terms = SuggestionTerm.objects.filter(country=country, language=language).values_list(
+        'text', 'popularity_score', 'times_seen'
+    )
+    return PrefixIndex(terms.iterator(chunk_size=5000))
+
+
+def get_prefix_index(country: str = 'us', language: str = 'en') -> PrefixIndex:
+    """
+    Process-wide index for a locale, built from the store on first use
+
+    Terms recorded by this process are added immediately; once older than
+    SUGGESTION_INDEX_REFRESH seconds the index is rebuilt in the background
+    to pick up other processes' terms, serving the old one meanwhile.
+    """
+    key = (country.lower(), language.lower())
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = _indexes[key] = _build(*key)
+        return index
+
+    if time.monotonic() - index.built_at > getattr(settings, 'SUGGESTION_INDEX_REFRESH', 300):
+        with _indexes_lock:
+            if key in _rebuilding:
+                return index
+            _rebuilding.add(key)
+
+        def rebuild():
+            try:
+                rebuilt = _build(*key)
+                with _indexes_lock:
+                    _indexes[key] = rebuilt
+            except Exception as e:
+                logger.warning(f"Rebuilding suggestion index {key} failed: {str(e)}")
+            finally:
+                with _indexes_lock:
+                    _rebuilding.discard(key)
+                connection.close()
+
+        threading.Thread(target=rebuild, name=f'suggestion-index-{key}', daemon=True).start()
+
+    return index
+
+
+def reset_prefix_indexes():
+    """Forget built indexes (tests, after bulk changes)"""
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def complete_from_store(prefix: str, country: str = 'us', language: str = 'en', limit: int = 10) -> Optional[List[Dict]]:
+    """Completions via the database prefix column (for callers that can't hold the index)"""
+    prefix = normalize_suggestion(prefix)
+    if len(prefix) < PREFIX_LENGTH:
+        return None
+    return list(
+        SuggestionTerm.objects.filter(
+            country=country.lower(), language=language.lower(),
+            prefix=prefix[:PREFIX_LENGTH], text__startswith=prefix
+        ).order_by('-popularity_score', '-times_seen').values('text', 'popularity_score', 'times_seen')[:limit]
+    )
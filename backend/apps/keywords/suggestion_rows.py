@@ -0,0 +1,163 @@
+"""
+Suggestion Rows
+Stores research category suggestions as KeywordSuggestion rows and reassembles the nested API shape
+"""
+from itertools import groupby
+from typing import Dict, Iterable, List
+
+from django.db import transaction
+
+from .clustering import normalize_keyword
+from .models import KeywordResearch, KeywordSuggestion
+from .services import query_key
+from .summary import summarize_research
+
+SECTIONS = ('questions', 'prepositions', 'alphabetical', 'comparisons')
+
+
+def build_research(research_data: Dict, **fields) -> KeywordResearch:
+    """
+    Unsaved KeywordResearch for a perform_full_research() result
+
+    The category suggestions become KeywordSuggestion rows (kept on the
+    instance until save_research writes them) instead of JSON columns.
+
+    Args:
+        research_data: KeywordResearchService.perform_full_research() result
+        fields: Other model fields (user, keyword, country, language, youtube_data, ...)
+    """
+    sections = {section: research_data[section] for section in SECTIONS}
+    research = KeywordResearch(
+        search_volume=research_data['summary']['total_suggestions'],
+        platform_breakdown=research_data['platform_breakdown'],
+        related_keywords=research_data['related_keywords'],
+        clusters=compact_clusters(research_data.get('clusters', []), sections),
+        viral_examples=research_data['viral_examples'],
+        suggestions_in_table=True,
+        keyword_key=query_key(fields.get('keyword', '')),
+        # bulk_create skips save(), and the JSON it would derive this from stays empty
+        summary=summarize_research(
+            *sections.values(), research_data['related_keywords'], research_data['platform_breakdown']
+        ),
+        **fields
+    )
+    research._suggestion_rows = suggestion_rows(research, sections)
+    return research
+
+
+def suggestion_rows(research: KeywordResearch, sections: Dict[str, List[Dict]]) -> List[KeywordSuggestion]:
+    """Unsaved KeywordSuggestion rows for a research's {section: categories}"""
+    return [
+        KeywordSuggestion(
+            research=research,
+            section=section,
+            category=category['category'][:50],
+            category_position=category_position,
+            query=category['query'][:255],
+            suggestion=(suggestion['keyword'] if isinstance(suggestion, dict) else suggestion)[:255],
+            position=position,
+            popularity_score=suggestion.get('popularity_score', 0) if isinstance(suggestion, dict) else 0,
+            estimated_volume=suggestion.get('estimated_volume', '') if isinstance(suggestion, dict) else '',
+        )
+        for section, categories in sections.items()
+        for category_position, category in enumerate(categories or [])
+        if isinstance(category, dict)
+        for position, suggestion in enumerate(category.get('suggestions', []))
+    ]
+
+
+def _suggestion_texts(sections: Dict[str, List[Dict]]) -> List[str]:
+    """Every suggestion of {section: categories}, in row order"""
+    return [
+        suggestion['keyword'] if isinstance(suggestion, dict) else suggestion
+        for section in SECTIONS
+        for category in sections.get(section) or []
+        if isinstance(category, dict)
+        for suggestion in category.get('suggestions', [])
+    ]
+
+
+def compact_clusters(clusters: List[Dict], sections: Dict[str, List[Dict]]) -> List[Dict]:
+    """
+    Clusters as stored: members are positions in the research's suggestions rather than their text
+
+    The first member is the representative. expand_clusters restores the
+    API shape.
+    """
+    positions = {}
+    for position, text in enumerate(_suggestion_texts(sections)):
+        positions.setdefault(normalize_keyword(text), position)
+
+    compacted = []
+    for cluster in clusters:
+        members = [positions.get(normalize_keyword(keyword)) for keyword in cluster['keywords']]
+        if None in members:
+            return clusters  # Not built from these sections - keep the text
+        stored = {key: value for key, value in cluster.items() if key not in ('representative', 'keywords')}
+        compacted.append({**stored, 'members': members})
+    return compacted
+
+
+def expand_clusters(clusters: List[Dict], sections: Dict[str, List[Dict]]) -> List[Dict]:
+    """Stored clusters back into the API shape, with representative and keywords"""
+    texts = _suggestion_texts(sections)
+    expanded = []
+    for cluster in clusters:
+        if 'members' not in cluster:
+            expanded.append(cluster)  # Stored with its text
+            continue
+        keywords = [texts[position] for position in cluster['members'] if position < len(texts)]
+        stored = {key: value for key, value in cluster.items() if key != 'members'}
+        expanded.append({'representative': keywords[0] if keywords else '', 'keywords': keywords, **stored})
+    return expanded
+
+
+def save_research(researches: List[KeywordResearch], batch_size: int = 1000) -> List[KeywordResearch]:
+    """Insert research built by build_research and all their suggestion rows in bulk"""
+    with transaction.atomic():
+        KeywordResearch.objects.bulk_create(researches)
+        KeywordSuggestion.objects.bulk_create(
+            [row for research in researches for row in research._suggestion_rows],
+            batch_size=batch_size
+        )
+    return researches
+
+
+def assemble_sections(rows: Iterable[KeywordSuggestion]) -> Dict[str, List[Dict]]:
+    """Rows back into {section: [{'category', 'query', 'suggestions', 'count'}]}"""
+    sections = {section: [] for section in SECTIONS}
+    rows = sorted(rows, key=lambda row: (row.section, row.category_position, row.position))
+    for (section, _), category_rows in groupby(rows, key=lambda row: (row.section, row.category_position)):
+        category_rows = list(category_rows)
+        suggestions = [
+            {
+                'keyword': row.suggestion,
+                'popularity_score': row.popularity_score,
+                'estimated_volume': row.estimated_volume,
+            }
+            for row in category_rows
+        ]
+        sections.setdefault(section, []).append({
+            'category': category_rows[0].category,
+            'query': category_rows[0].query,
+            'suggestions': suggestions,
+            'count': len(suggestions),
+        })
+    return sections
+
+
+def research_sections(research: KeywordResearch) -> Dict[str, List[Dict]]:
+    """
+    A research row's category suggestions, from its rows or (older research) its JSON columns
+
+    Copies of shared research (research_cache.copy_research) read them from the original.
+    """
+    if not research.suggestions_in_table:
+        source = research.shared_from if research.shared_from_id else research
+        return {section: getattr(source, section) for section in SECTIONS}
+    rows = getattr(research, '_suggestion_rows', None)
+    if rows is None and research.shared_from_id:
+        rows = KeywordSuggestion.objects.filter(research_id=research.shared_from_id)
+    elif rows is None:
+        rows = research.suggestion_rows.all()
+    return assemble_sections(rows)
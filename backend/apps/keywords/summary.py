@@ -0,0 +1,69 @@
+"""
+Keyword Research Summaries
+Small precomputed digest of a research row, used by list views
+"""
+from typing import Dict, List
+
+TOP_SUGGESTIONS = 5
+
+SUMMARY_SOURCE_FIELDS = ['questions', 'prepositions', 'alphabetical', 'comparisons', 'related_keywords', 'platform_breakdown']
+
+
+def _suggestion_text(suggestion) -> str:
+    return suggestion['keyword'] if isinstance(suggestion, dict) else suggestion
+
+
+def summarize_research(
+    questions: List[Dict],
+    prepositions: List[Dict],
+    alphabetical: List[Dict],
+    comparisons: List[Dict],
+    related_keywords: List[str],
+    platform_breakdown: Dict,
+    top_n: int = TOP_SUGGESTIONS
+) -> Dict:
+    """
+    Build the summary stored on KeywordResearch.summary
+
+    Args:
+        questions/prepositions/alphabetical/comparisons: Category lists as
+            returned by KeywordResearchService ({'category', 'suggestions', ...})
+        related_keywords: Related keyword strings
+        platform_breakdown: {platform: {'count', 'percentage'}}
+        top_n: Number of top suggestions to keep
+
+    Returns:
+        Counts per category, total suggestions, top suggestions and top platform
+    """
+    scored = {}
+    total = 0
+    for categories in (questions, prepositions, alphabetical, comparisons):
+        for category in categories or []:
+            if not isinstance(category, dict):
+                continue
+            for suggestion in category.get('suggestions', []):
+                total += 1
+                text = _suggestion_text(suggestion)
+                score = suggestion.get('popularity_score', 0) if isinstance(suggestion, dict) else 0
+                if score > scored.get(text, -1):
+                    scored[text] = score
+
+    # Highest popularity first; ties keep discovery order (dicts preserve insertion order)
+    top_suggestions = sorted(scored, key=lambda text: -scored[text])[:top_n]
+
+    top_platform = ''
+    if platform_breakdown:
+        platform, stats = max(platform_breakdown.items(), key=lambda item: item[1].get('count', 0))
+        if stats.get('count'):
+            top_platform = platform
+
+    return {
+        'total_suggestions': total,
+        'questions_count': len(questions or []),
+        'prepositions_count': len(prepositions or []),
+        'alphabetical_count': len(alphabetical or []),
+        'comparisons_count': len(comparisons or []),
+        'related_count': len(related_keywords or []),
+        'top_suggestions': top_suggestions,
+        'top_platform': top_platform,
+    }
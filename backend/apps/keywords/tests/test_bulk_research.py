@@ -0,0 +1,105 @@
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from unittest.mock import patch
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.keywords.bulk import dedupe_keywords
+from apps.keywords.models import KeywordResearch, KeywordResearchJob, SuggestionTerm
+from apps.keywords.services import KeywordResearchService
+
+User = get_user_model()
+
+
+def fake_autocomplete(self, query):
+    if query == 'broken':
+        raise ValueError('autocomplete exploded')
+    return [{'keyword': f'{query} idea', 'popularity_score': 8, 'estimated_volume': '5K-10K'}]
+
+
+@override_settings(KEYWORD_BULK_RUN_INLINE=True, KEYWORD_BULK_FLUSH_SIZE=2)
+@patch('apps.keywords.services.KeywordResearchService.fetch_autocomplete', autospec=True, side_effect=fake_autocomplete)
+class BulkResearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='bulk@example.com', username='bulk', password='pw12345!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, keywords, **extra):
+        return self.client.post('/api/keywords/bulk_research/', {'keywords': keywords, **extra}, format='json')
+
+    def test_keywords_are_researched_in_bulk(self, mock_fetch):
+        queries = KeywordResearchService('x').research_queries()
+        response = self.post(['AI tools', 'remote work', 'vegan recipes'])
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'completed')
+        self.assertEqual(response.data['completed_items'], 3)
+        self.assertEqual(response.data['total_queries'], 3 * len(queries))
+        # "vs", "versus" and "or" are both prepositions and comparisons
+        self.assertEqual(response.data['fetched_queries'], 3 * (len(queries) - 3))
+        self.assertEqual(mock_fetch.call_count, 3 * (len(queries) - 3))
+
+        research = KeywordResearch.objects.get(user=self.user, keyword='remote work')
+        self.assertEqual(str(research.id), response.data['items'][1]['research_id'])
+        self.assertEqual(research.summary['total_suggestions'], 51)
+        self.assertEqual(research.suggestion_rows.filter(section='questions').first().suggestion, 'remote work what idea')
+        self.assertTrue(SuggestionTerm.objects.filter(text='remote work what idea').exists())
+
+    def test_shared_queries_are_fetched_once(self, mock_fetch):
+        # "ai" and "best ai" share queries: "best ai" is one of ai's related-keyword queries
+        response = self.post(['AI', 'ai ', 'best ai'])
+
+        self.assertEqual(response.data['total_items'], 2)
+        self.assertEqual(response.data['duplicate_items'], 1)
+        self.assertEqual(response.data['items'][0]['request_indexes'], [0, 1])
+        self.assertLess(response.data['unique_queries'], response.data['total_queries'])
+        self.assertEqual(mock_fetch.call_count, response.data['unique_queries'])
+        self.assertEqual(KeywordResearch.objects.filter(user=self.user).count(), 2)
+
+    def test_recent_research_is_reused(self, mock_fetch):
+        existing = KeywordResearch.objects.create(user=self.user, keyword='AI Tools')
+        response = self.post(['ai tools'])
+
+        self.assertEqual(response.data['cached_items'], 1)
+        self.assertEqual(response.data['items'][0]['research_id'], str(existing.id))
+        mock_fetch.assert_not_called()
+
+    def test_orphaned_job_resumes_when_polled(self, mock_fetch):
+        items, _ = dedupe_keywords(['AI tools', 'remote work'])
+        items[0].update(status='completed', research_id='x')
+        job = KeywordResearchJob.objects.create(
+            user=self.user, items=items, total_items=2, completed_items=1, status='running',
+            attempts=1, heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+
+        response = self.client.get(f'/api/keywords/jobs/{job.id}/')
+
+        self.assertEqual(response.data['status'], 'completed')
+        self.assertEqual(response.data['completed_items'], 2)
+        self.assertEqual(list(KeywordResearch.objects.values_list('keyword', flat=True)), ['remote work'])
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 2)
+
+    def test_progress_endpoint_is_scoped_to_user(self, mock_fetch):
+        job_id = self.post(['ai']).data['id']
+        self.assertEqual(self.client.get(f'/api/keywords/jobs/{job_id}/').data['status'], 'completed')
+
+        other = APIClient()
+        other.force_authenticate(User.objects.create_user(email='o@example.com', username='o', password='pw12345!'))
+        self.assertEqual(other.get(f'/api/keywords/jobs/{job_id}/').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_keyword_count_is_capped(self, mock_fetch):
+        with self.settings(KEYWORD_BULK_MAX_KEYWORDS=2):
+            response = self.post(['a', 'b', 'c'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(KeywordResearchJob.objects.exists())
+
+
+class DedupeKeywordsTests(TestCase):
+    def test_case_and_spacing_are_ignored(self):
+        items, duplicates = dedupe_keywords(['AI  Tools', 'ai tools', 'other'])
+        self.assertEqual(duplicates, 1)
+        self.assertEqual([item['keyword'] for item in items], ['AI Tools', 'other'])
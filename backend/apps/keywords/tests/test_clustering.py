@@ -0,0 +1,57 @@
+from unittest.mock import patch
+from django.test import SimpleTestCase
+
+from apps.keywords.clustering import cluster_suggestions, normalize_keyword, stem, token_set
+from apps.keywords.services import KeywordResearchService
+
+
+def suggestion(keyword, score, category='alphabetical'):
+    return {'keyword': keyword, 'popularity_score': score, 'category': category}
+
+
+class ClusteringTests(SimpleTestCase):
+    def test_normalization_and_stemming(self):
+        self.assertEqual(normalize_keyword('  AI-Tools:  Best!! '), 'ai tools best')
+        self.assertEqual([stem(word) for word in ['tools', 'studies', 'running', 'boxes', 'class', 'ai']],
+                         ['tool', 'study', 'run', 'box', 'class', 'ai'])
+        self.assertEqual(token_set('What are the AI tools', ignore={'ai'}), {'what', 'tool'})
+
+    def test_near_duplicates_and_intents_are_grouped(self):
+        clusters = cluster_suggestions([
+            suggestion('AI tools', 10),
+            suggestion('ai tool', 8, 'questions'),
+            suggestion('free ai tools', 4),
+            suggestion('what is ai', 9, 'questions'),
+            suggestion('what are ai', 7, 'questions'),
+            suggestion('ai for kids', 3, 'prepositions'),
+        ], keyword='AI')
+
+        self.assertEqual([cluster['representative'] for cluster in clusters], ['AI tools', 'what is ai', 'ai for kids'])
+        self.assertEqual(clusters[0]['keywords'], ['AI tools', 'ai tool', 'free ai tools'])
+        self.assertEqual((clusters[0]['size'], clusters[0]['total_score'], clusters[0]['max_score']), (3, 22, 10))
+        self.assertEqual(clusters[0]['categories'], ['alphabetical', 'questions'])
+
+    def test_repeated_suggestion_counts_once_with_its_best_score(self):
+        clusters = cluster_suggestions([
+            suggestion('ai art', 3, 'alphabetical'), suggestion('AI Art', 8, 'prepositions'),
+        ], keyword='ai')
+
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual((clusters[0]['size'], clusters[0]['total_score']), (1, 8))
+        self.assertEqual(clusters[0]['categories'], ['alphabetical', 'prepositions'])
+
+    def test_dissimilar_suggestions_stay_apart(self):
+        keywords = [f'ai {word} generator' for word in ('art', 'music', 'voice', 'logo', 'video', 'code')]
+        clusters = cluster_suggestions([suggestion(keyword, 5) for keyword in keywords], keyword='ai')
+        self.assertEqual(len(clusters), 6)
+
+    def test_full_research_includes_clusters(self):
+        suggestions = [{'keyword': 'ai tools', 'popularity_score': 10, 'estimated_volume': '10K-100K'},
+                       {'keyword': 'ai tool', 'popularity_score': 9, 'estimated_volume': '10K-100K'}]
+        with patch.object(KeywordResearchService, 'fetch_autocomplete', return_value=suggestions):
+            result = KeywordResearchService('ai').perform_full_research()
+
+        self.assertEqual(result['summary']['clusters_count'], 1)
+        self.assertEqual(result['clusters'][0]['keywords'], ['ai tools', 'ai tool'])
+        self.assertEqual(result['clusters'][0]['categories'],
+                         ['alphabetical', 'comparisons', 'prepositions', 'questions'])
@@ -0,0 +1,88 @@
+import json
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from apps.keywords.expansion import KeywordExpansionCrawler
+
+User = get_user_model()
+
+
+def fake_autocomplete(self, query):
+    """Three suggestions per query; 'hot' ones score 9, the rest 2"""
+    return [
+        {'keyword': f'{query} {word}', 'popularity_score': score, 'estimated_volume': '1K-5K'}
+        for word, score in (('hot', 9), ('cold', 2), ('mild', 2))
+    ] + [{'keyword': 'ai', 'popularity_score': 10, 'estimated_volume': '10K-100K'}]
+
+
+@patch('apps.keywords.services.KeywordResearchService.fetch_autocomplete', autospec=True, side_effect=fake_autocomplete)
+class KeywordExpansionTests(TestCase):
+    def crawl(self, **kwargs):
+        events = list(KeywordExpansionCrawler('ai', workers=1, **kwargs).crawl())
+        return [event for event in events if event['type'] == 'keyword'], events[-1]
+
+    def test_budget_and_depth_are_respected(self, mock_fetch):
+        keywords, done = self.crawl(max_depth=2, max_requests=50)
+
+        self.assertEqual(mock_fetch.call_count, 50)
+        self.assertEqual(done['requests'], 50)
+        self.assertTrue(done['budget_exhausted'])
+        self.assertEqual({event['depth'] for event in keywords}, {1, 2})
+        self.assertEqual(len(keywords), len({event['keyword'] for event in keywords}))
+        self.assertNotIn('ai', [event['keyword'] for event in keywords])
+
+    def test_only_promising_suggestions_are_expanded_best_first(self, mock_fetch):
+        self.crawl(max_depth=2, max_requests=50)
+        queries = [call.args[1] for call in mock_fetch.call_args_list]
+
+        # The seed and its 36 letter/question expansions come first
+        self.assertEqual(queries[0], 'ai')
+        self.assertTrue(all(query.startswith('ai ') for query in queries[1:37]))
+        # Then only 'hot' suggestions get question-word expansions
+        self.assertEqual(queries[37], 'ai hot what')
+        self.assertTrue(all(' hot ' in query for query in queries[37:]))
+        self.assertFalse(any(' cold ' in query or ' mild ' in query for query in queries))
+
+    def test_levels_are_crawled_in_order(self, mock_fetch):
+        # Deeper suggestions score higher, which would pull a best-first crawl downwards
+        mock_fetch.side_effect = lambda self, query: [
+            {'keyword': f'{query} hot', 'popularity_score': min(len(query.split()) + 5, 10), 'estimated_volume': ''}
+        ]
+        keywords, _ = self.crawl(max_depth=3, max_requests=420)
+
+        depths = [event['depth'] for event in keywords]
+        self.assertEqual(depths, sorted(depths))
+        self.assertEqual(set(depths), {1, 2, 3})
+
+    def test_crawl_stops_when_nothing_is_left(self, mock_fetch):
+        keywords, done = self.crawl(max_depth=1, max_requests=500)
+
+        self.assertEqual(done['requests'], 37)
+        self.assertFalse(done['budget_exhausted'])
+        self.assertEqual({event['depth'] for event in keywords}, {1})
+
+    def test_seen_sets_continue_an_earlier_crawl(self, mock_fetch):
+        seen_queries, seen_keywords = set(), {'ai'}
+        first = list(KeywordExpansionCrawler('ai', max_depth=1, workers=1, seen_queries=seen_queries,
+                                             seen_keywords=seen_keywords).crawl())
+        second = list(KeywordExpansionCrawler('ai', max_depth=1, workers=1, seen_queries=seen_queries,
+                                              seen_keywords=seen_keywords).crawl())
+
+        self.assertGreater(first[-1]['keywords_found'], 0)
+        self.assertEqual(second, [second[-1]])
+        self.assertEqual(second[-1]['requests'], 0)
+
+    def test_endpoint_streams_ndjson(self, mock_fetch):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(email='x@example.com', username='x', password='pw12345!'))
+
+        response = client.get('/api/keywords/expand/', {'keyword': 'ai', 'depth': 9, 'budget': 10, 'limit': 5})
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        events = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([event['type'] for event in events], ['keyword'] * 5 + ['done'])
+        self.assertTrue(events[-1]['keyword_limit_reached'])
+        self.assertEqual(client.get('/api/keywords/expand/').status_code, 400)
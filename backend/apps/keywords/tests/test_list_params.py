@@ -0,0 +1,59 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.keywords.models import KeywordResearch
+from viral_ai.testing import QueryCountMixin
+
+User = get_user_model()
+
+
+class KeywordListParamsTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='kw@example.com', username='kw', password='pw12345!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for i in range(3):
+            KeywordResearch.objects.create(user=self.user, keyword=f'kw {i}', alphabetical=[{'letter': 'a', 'suggestions': ['x'] * 50}])
+
+    def test_sparse_fields_defer_json_columns(self):
+        url = '/api/keywords/?pagination=cursor&fields=keyword,search_volume'
+        response = self.client.get(url)
+
+        self.assertEqual(set(response.data['results'][0]), {'id', 'keyword', 'search_volume'})
+        _, queries = self.count_queries(lambda: self.client.get(url))
+        self.assertFalse(any('alphabetical' in sql for sql in queries))
+
+
+class KeywordSummaryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='summary@example.com', username='summary', password='pw12345!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.research = KeywordResearch.objects.create(
+            user=self.user,
+            keyword='ai tools',
+            questions=[{'category': 'how', 'suggestions': [
+                {'keyword': 'ai tools how to use', 'popularity_score': 10},
+                {'keyword': 'ai tools how much', 'popularity_score': 9},
+            ]}],
+            alphabetical=[{'category': 'a', 'suggestions': [{'keyword': 'ai tools app', 'popularity_score': 10}] * 3}],
+            related_keywords=['best ai tools'],
+            platform_breakdown={'youtube': {'count': 2, 'percentage': 100.0}, 'tiktok': {'count': 0, 'percentage': 0}},
+        )
+
+    def test_summary_is_computed_on_save(self):
+        summary = self.research.summary
+        self.assertEqual(summary['total_suggestions'], 5)
+        self.assertEqual(summary['questions_count'], 1)
+        self.assertEqual(summary['related_count'], 1)
+        self.assertEqual(summary['top_suggestions'][:2], ['ai tools how to use', 'ai tools app'])
+        self.assertEqual(summary['top_platform'], 'youtube')
+
+    def test_list_returns_summaries_and_detail_the_full_payload(self):
+        listed = self.client.get('/api/keywords/').data['results'][0]
+        self.assertNotIn('alphabetical', listed)
+        self.assertEqual(listed['summary']['alphabetical_count'], 1)
+
+        detail = self.client.get(f'/api/keywords/{self.research.id}/').data
+        self.assertEqual(len(detail['alphabetical'][0]['suggestions']), 3)
@@ -0,0 +1,74 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import MagicMock, patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.keywords.models import NicheKeywordSnapshot
+from apps.keywords.serpapi_service import SerpApiTrendingService
+
+User = get_user_model()
+
+
+def seed_response(*args, params=None, **kwargs):
+    """Every seed shares 'ai agents'; each also has its own rising query"""
+    seed = params['q']
+    if seed == 'apps':
+        return MagicMock(status_code=500)
+    response = MagicMock(status_code=200)
+    response.json.return_value = {'related_queries': {
+        'rising': [{'query': f'{seed} news', 'extracted_value': 150}, {'query': 'AI agents', 'extracted_value': 400}],
+        'top': [{'query': 'ai agents', 'extracted_value': 100}, {'query': f'best {seed}', 'extracted_value': 20}],
+    }}
+    return response
+
+
+@override_settings(SERPAPI_KEY='test-key', SERPAPI_QUOTA_ENABLED=False)
+@patch('apps.keywords.serpapi_service.requests.get', side_effect=seed_response)
+class NicheSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='niche@example.com', username='niche', password='pw12345!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_all_seeds_are_merged_and_ranked(self, mock_get):
+        result = SerpApiTrendingService().compute_niche_keywords('technology', 'US')
+
+        self.assertEqual(mock_get.call_count, 5)
+        self.assertEqual(result['failed_seeds'], ['apps'])
+        top = result['keywords'][0]
+        self.assertEqual(top['keyword'], 'AI agents')
+        self.assertEqual(top['trend'], 'rising')
+        self.assertEqual(len(top['seeds']), 4)
+        self.assertEqual(len({kw['keyword'].lower() for kw in result['keywords']}), len(result['keywords']))
+
+    def test_command_stores_snapshots_and_endpoint_reads_them(self, mock_get):
+        call_command('prewarm_niches', niches=['technology'], geos=['us', 'gb'], stdout=StringIO())
+
+        self.assertEqual(NicheKeywordSnapshot.objects.count(), 2)
+        mock_get.reset_mock()
+
+        response = self.client.get('/api/keywords/niche_keywords/?niche=technology&geo=gb&limit=3')
+        self.assertEqual(response.data['source'], 'snapshot')
+        self.assertEqual(response.data['total_count'], 3)
+        mock_get.assert_not_called()
+
+    def test_old_snapshots_fall_back_to_live_search(self, mock_get):
+        NicheKeywordSnapshot.objects.create(
+            niche='technology', geo='US', keywords=[{'keyword': 'old'}],
+            computed_at=timezone.now() - timedelta(days=30)
+        )
+
+        response = self.client.get('/api/keywords/niche_keywords/?niche=technology&geo=US')
+        self.assertNotIn('source', response.data)
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_max_age_skips_fresh_snapshots(self, mock_get):
+        NicheKeywordSnapshot.objects.create(niche='technology', geo='US', computed_at=timezone.now())
+        call_command('prewarm_niches', niches=['technology'], geos=['US'], max_age=3600, stdout=StringIO())
+        mock_get.assert_not_called()
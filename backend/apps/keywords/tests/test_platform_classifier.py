@@ -0,0 +1,37 @@
+from django.test import SimpleTestCase, override_settings
+
+from apps.keywords.platform_classifier import PlatformClassifier, get_platform_classifier
+from apps.keywords.services import KeywordResearchService
+
+
+class PlatformClassifierTests(SimpleTestCase):
+    def setUp(self):
+        self.classifier = PlatformClassifier({
+            'linkedin': ['work', 'job'],
+            'youtube': ['how to', 'to do list', 'tutorial'],
+            'twitter': ['news'],
+        })
+
+    def test_indicators_match_whole_words_only(self):
+        self.assertEqual(self.classifier.platforms_for('network newsletter jobless'), [])
+        self.assertEqual(self.classifier.platforms_for('Work from home: NEWS!'), ['linkedin', 'twitter'])
+
+    def test_phrases_and_overlapping_matches(self):
+        counts = self.classifier.count(['how to do list apps', 'python tutorial how to', 'how job'])
+        self.assertEqual(counts, {'linkedin': 1, 'youtube': 4, 'twitter': 0})
+
+    def test_matches_do_not_span_suggestions(self):
+        self.assertEqual(self.classifier.count(['learn how', 'to code'])['youtube'], 0)
+
+    @override_settings(PLATFORM_INDICATORS={'youtube': ['full episode'], 'pinterest': ['diy']})
+    def test_configured_indicators_extend_the_defaults(self):
+        counts = get_platform_classifier().count(['diy shelf', 'full episode guide'])
+        self.assertEqual((counts['pinterest'], counts['youtube']), (1, 2))
+
+    def test_platform_breakdown(self):
+        breakdown = KeywordResearchService('ai').calculate_platform_breakdown([
+            'ai video editor', 'ai networking', 'ai tutorial', 'ai for work',
+        ])
+        self.assertEqual(breakdown['tiktok'], {'count': 1, 'percentage': 25.0})
+        self.assertEqual(breakdown['linkedin'], {'count': 2, 'percentage': 50.0})
+        self.assertEqual(breakdown['instagram'], {'count': 0, 'percentage': 0.0})
@@ -0,0 +1,68 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.keywords.models import KeywordResearch, KeywordResearchJob, KeywordSuggestion
+from viral_ai.testing import QueryCountMixin
+
+User = get_user_model()
+
+
+class KeywordQueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='keywords@example.com', username='keywords', password='pw12345!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_research(self, count):
+        for i in range(count):
+            KeywordResearch.objects.create(user=self.user, keyword=f'keyword {i}', questions=['why?'])
+
+    def test_research_list(self):
+        self.assertConstantQueries(lambda: self.client.get('/api/keywords/'), self.add_research)
+
+    def test_research_detail(self):
+        research = KeywordResearch.objects.create(user=self.user, keyword='detail')
+        self.assertConstantQueries(lambda: self.client.get(f'/api/keywords/{research.id}/'), self.add_research)
+
+    def test_cached_research(self):
+        research = KeywordResearch.objects.create(user=self.user, keyword='cached', suggestions_in_table=True)
+
+        def add_suggestions(count):
+            start = research.suggestion_rows.count()
+            KeywordSuggestion.objects.bulk_create([
+                KeywordSuggestion(research=research, section='questions', category='how', query='how cached',
+                                  suggestion=f'how cached {start + i}', position=start + i)
+                for i in range(count)
+            ])
+
+        research_cached = lambda: self.client.post('/api/keywords/research/', {'keyword': 'Cached'}, format='json')
+        self.assertConstantQueries(research_cached, add_suggestions)
+        # Own-research lookup, then the suggestion rows
+        with self.assertNumQueries(2):
+            self.assertTrue(research_cached().data['cached'])
+
+    def test_job_list_and_detail(self):
+        job = KeywordResearchJob.objects.create(user=self.user, status='completed')
+        add_jobs = lambda count: [KeywordResearchJob.objects.create(user=self.user, status='completed') for _ in range(count)]
+
+        self.assertConstantQueries(lambda: self.client.get('/api/keywords/jobs/'), add_jobs)
+        # Stale-job check, ETag validators, then the job itself
+        with self.assertNumQueries(3):
+            self.client.get(f'/api/keywords/jobs/{job.id}/')
+
+    def test_admin_changelists(self):
+        admin = User.objects.create_superuser(email='admin@example.com', username='admin', password='pw12345!')
+        self.client.force_login(admin)
+
+        def add_rows(count):
+            for i in range(count):
+                research = KeywordResearch.objects.create(user=self.user, keyword=f'keyword {i}')
+                KeywordSuggestion.objects.create(research=research, section='questions', category='how',
+                                                 query=f'how keyword {i}', suggestion=f'how keyword {i} works')
+                KeywordResearchJob.objects.create(user=self.user)
+
+        for model in ('keywordresearch', 'keywordresearchjob', 'keywordsuggestion'):
+            with self.subTest(model=model):
+                self.assertConstantQueries(lambda: self.client.get(reverse(f'admin:keywords_{model}_changelist')), add_rows)
@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from unittest.mock import patch
+from rest_framework.test import APIClient
+
+from apps.keywords.models import KeywordResearch
+from apps.keywords.research_cache import copy_research, find_recent_research
+from apps.keywords.services import KeywordResearchService
+from apps.keywords.suggestion_rows import build_research, save_research
+
+User = get_user_model()
+
+
+def fake_autocomplete(self, query):
+    return [{'keyword': f'{query} tips', 'popularity_score': 9, 'estimated_volume': '10K-100K'}]
+
+
+class ResearchCacheTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(email='alice@example.com', username='alice', password='pw12345!')
+        self.bob = User.objects.create_user(email='bob@example.com', username='bob', password='pw12345!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.bob)
+
+    def research(self, user, keyword):
+        with patch.object(KeywordResearchService, 'fetch_autocomplete', autospec=True, side_effect=fake_autocomplete):
+            research_data = KeywordResearchService(keyword).perform_full_research()
+        return save_research([build_research(research_data, user=user, keyword=keyword, youtube_data={'video_count': 3})])[0]
+
+    def test_keyword_key_is_normalized(self):
+        research = KeywordResearch.objects.create(user=self.alice, keyword='  AI   Tools ')
+        self.assertEqual(research.keyword_key, 'ai tools')
+        self.assertEqual(self.research(self.alice, 'Remote  Work').keyword_key, 'remote work')
+
+        research.keyword = 'Vegan Food'
+        research.save(update_fields=['keyword'])
+        research.refresh_from_db()
+        self.assertEqual(research.keyword_key, 'vegan food')
+
+    def test_own_research_wins_and_stale_research_is_ignored(self):
+        shared = self.research(self.alice, 'ai tools')
+        own = self.research(self.bob, 'AI tools')
+
+        self.assertEqual(find_recent_research(self.bob, 'ai  TOOLS', 'us', 'en'), (own, False))
+        KeywordResearch.objects.filter(id=own.id).update(created_at=timezone.now() - timezone.timedelta(days=2))
+        self.assertEqual(find_recent_research(self.bob, 'ai tools', 'us', 'en'), (shared, True))
+        self.assertEqual(find_recent_research(self.bob, 'ai tools', 'gb', 'en'), (None, True))
+
+    def test_lookup_uses_the_keyword_key_column(self):
+        with CaptureQueriesContext(connection) as queries:
+            find_recent_research(self.bob, 'AI tools', 'us', 'en')
+        sql = queries[0]['sql']
+        self.assertIn('"keyword_key" =', sql)
+        self.assertNotIn('LIKE', sql.upper())
+
+    def test_other_users_research_is_copied(self):
+        source = self.research(self.alice, 'ai tools')
+
+        with patch('apps.keywords.views.KeywordResearchService.perform_full_research') as mock_research:
+            response = self.client.post('/api/keywords/research/', {'keyword': 'AI Tools'}, format='json')
+
+        mock_research.assert_not_called()
+        self.assertTrue(response.data['cached'])
+        self.assertTrue(response.data['shared'])
+        self.assertEqual(response.data['youtube'], {'video_count': 3})
+
+        copy = KeywordResearch.objects.get(user=self.bob)
+        self.assertNotEqual(copy.id, source.id)
+        self.assertEqual((copy.created_at, copy.summary), (source.created_at, source.summary))
+        self.assertEqual(copy.shared_from_id, source.id)
+        self.assertEqual(copy.suggestion_rows.count(), 0)
+        questions = self.client.get(f'/api/keywords/{copy.id}/').data['questions']
+        self.assertTrue(questions)
+        self.assertEqual(response.data['data']['questions'], questions)
+        self.assertNotIn('alice', str(response.data))
+
+    def test_copies_of_a_copy_reference_the_original(self):
+        source = self.research(self.alice, 'ai tools')
+        carol = User.objects.create_user(email='carol@example.com', username='carol', password='pw12345!')
+        copy = copy_research(source, self.bob)
+        self.assertEqual(copy_research(copy, carol).shared_from_id, source.id)
+
+    def test_copies_survive_the_original_being_deleted(self):
+        source = self.research(self.alice, 'ai tools')
+        carol = User.objects.create_user(email='carol@example.com', username='carol', password='pw12345!')
+        bobs = copy_research(source, self.bob)
+        carols = copy_research(source, carol)
+        rows = source.suggestion_rows.count()
+        expected = self.client.get(f'/api/keywords/{bobs.id}/').data['questions']
+
+        self.alice.delete()
+
+        bobs.refresh_from_db()
+        carols.refresh_from_db()
+        heir, other = (bobs, carols) if bobs.shared_from_id is None else (carols, bobs)
+        self.assertIsNone(heir.shared_from_id)
+        self.assertEqual(heir.suggestion_rows.count(), rows)
+        self.assertEqual(other.shared_from_id, heir.id)
+        self.assertEqual(self.client.get(f'/api/keywords/{bobs.id}/').data['questions'], expected)
+
+    @override_settings(KEYWORD_RESEARCH_SHARED_CACHE=False)
+    def test_sharing_can_be_disabled(self):
+        self.research(self.alice, 'ai tools')
+        self.assertEqual(find_recent_research(self.bob, 'ai tools', 'us', 'en'), (None, False))
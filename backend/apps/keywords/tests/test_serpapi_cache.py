@@ -0,0 +1,112 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from apps.keywords.caching import StaleWhileRevalidateCache
+from apps.keywords.serpapi_service import SerpApiTrendingService
+
+TRENDS_RESPONSE = {
+    'interest_over_time': {'timeline_data': [{'date': 'Jan', 'values': [{'value': 42}]}]},
+    'related_queries': {'rising': [{'query': 'ai agents', 'value': 300}], 'top': [{'query': 'ai', 'value': 100}]},
+    'related_topics': {'rising': []},
+}
+
+
+def upstream(status_code=200, payload=TRENDS_RESPONSE):
+    response = MagicMock(status_code=status_code)
+    response.json.return_value = payload
+    return response
+
+
+@override_settings(SERPAPI_KEY='test-key', SERPAPI_QUOTA_ENABLED=False)
+@patch('apps.keywords.serpapi_service.requests.get')
+class SerpApiCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.service = SerpApiTrendingService()
+
+    def test_identical_searches_are_served_from_cache(self, mock_get):
+        mock_get.return_value = upstream()
+
+        first = self.service.get_interest_over_time('AI', geo='US')
+        second = self.service.get_interest_over_time('AI', geo='US')
+        self.service.get_interest_over_time('AI', geo='GB')
+
+        self.assertEqual(first, second)
+        self.assertEqual(first['timeline_data'], [{'date': 'Jan', 'value': 42}])
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get.call_args.kwargs['params']['api_key'], 'test-key')
+
+    def test_error_responses_are_not_cached(self, mock_get):
+        mock_get.return_value = upstream(status_code=429)
+        self.assertEqual(self.service.get_related_topics('AI')['error'], 'API returned status 429')
+
+        mock_get.return_value = upstream()
+        self.assertNotIn('error', self.service.get_related_topics('AI'))
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_concurrent_misses_share_one_upstream_call(self, mock_get):
+        def slow_upstream(*args, **kwargs):
+            time.sleep(0.2)
+            return upstream()
+
+        mock_get.side_effect = slow_upstream
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.service.get_niche_keywords('technology')))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result['keywords'][0]['keyword'] == 'ai agents' for result in results))
+
+
+class StaleWhileRevalidateTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.cache = StaleWhileRevalidateCache('test')
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        self.cache.get({'q': 'x'}, lambda: 'old', ttl=0, stale_ttl=60)
+
+        refreshed = threading.Event()
+
+        def fetch_new():
+            refreshed.set()
+            return 'new'
+
+        self.assertEqual(self.cache.get({'q': 'x'}, fetch_new, ttl=60, stale_ttl=60), 'old')
+        self.assertTrue(refreshed.wait(2))
+        for _ in range(50):
+            if self.cache.get({'q': 'x'}, lambda: 'unused', ttl=60) == 'new':
+                break
+            time.sleep(0.02)
+        self.assertEqual(self.cache.get({'q': 'x'}, lambda: 'unused', ttl=60), 'new')
+
+    def test_key_ignores_parameter_order(self):
+        self.assertEqual(self.cache.make_key({'a': 1, 'b': 2}), self.cache.make_key({'b': 2, 'a': 1}))
+
+    def test_waiter_stops_waiting_on_a_stuck_leader(self):
+        release = threading.Event()
+
+        def stuck():
+            release.wait(5)
+            return 'leader'
+
+        leader = threading.Thread(target=lambda: self.cache.get({'q': 'y'}, stuck, ttl=60))
+        leader.start()
+        time.sleep(0.05)
+        try:
+            started = time.monotonic()
+            self.assertEqual(self.cache.get({'q': 'y'}, lambda: 'direct', ttl=60, wait_timeout=0.1), 'direct')
+            self.assertLess(time.monotonic() - started, 1)
+        finally:
+            release.set()
+            leader.join()
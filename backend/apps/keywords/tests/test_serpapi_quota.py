@@ -0,0 +1,120 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.keywords.models import SerpApiCall, SerpApiDailyUsage
+from apps.keywords.quota import BACKGROUND, INTERACTIVE, PriorityGate, SchedulerBusyError
+from apps.keywords.serpapi_service import SerpApiTrendingService
+
+User = get_user_model()
+
+
+def upstream(*args, params=None, **kwargs):
+    response = MagicMock(status_code=200)
+    response.json.return_value = {'related_queries': {'rising': [{'query': f"{params['q']} news", 'value': 100}]}}
+    return response
+
+
+@override_settings(
+    SERPAPI_KEY='test-key',
+    SERPAPI_DAILY_BUDGET=4,
+    SERPAPI_BACKGROUND_SHARE=0.5,
+    SERPAPI_USER_DAILY_BUDGETS={'free': 2, 'pro': 10},
+)
+@patch('apps.keywords.serpapi_service.requests.get', side_effect=upstream)
+class SerpApiQuotaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='quota@example.com', username='quota', password='pw12345!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_calls_are_recorded_and_cache_hits_are_free(self, mock_get):
+        service = SerpApiTrendingService(user=self.user)
+        service.get_related_topics('AI')
+        service.get_related_topics('AI')
+
+        self.assertEqual(mock_get.call_count, 1)
+        call = SerpApiCall.objects.get()
+        self.assertEqual((call.user, call.endpoint, call.query, call.status_code), (self.user, 'related_topics', 'AI', 200))
+        self.assertEqual(SerpApiDailyUsage.objects.get(scope=f'user:{self.user.pk}').calls, 1)
+
+    def test_user_budget_is_enforced(self, mock_get):
+        service = SerpApiTrendingService(user=self.user)
+        service.get_related_topics('one')
+        service.get_related_topics('two')
+        result = service.get_related_topics('three')
+
+        self.assertEqual(result['error'], 'API returned status 429')
+        self.assertEqual(mock_get.call_count, 2)
+        # The refused search isn't charged to the global budget either
+        self.assertEqual(SerpApiDailyUsage.objects.get(scope='global').calls, 2)
+
+    def test_background_share_leaves_budget_for_interactive_requests(self, mock_get):
+        background = SerpApiTrendingService(priority=BACKGROUND)
+        for seed in ('a', 'b', 'c'):
+            background.get_related_topics(seed)
+        self.assertEqual(mock_get.call_count, 2)
+
+        self.user.subscription_tier = 'pro'
+        self.user.save()
+        interactive = SerpApiTrendingService(user=self.user)
+        self.assertNotIn('error', interactive.get_related_topics('d'))
+        self.assertNotIn('error', interactive.get_related_topics('e'))
+        self.assertIn('error', interactive.get_related_topics('f'))
+
+    def test_failed_upstream_calls_are_refunded(self, mock_get):
+        mock_get.side_effect = ConnectionError('down')
+        SerpApiTrendingService(user=self.user).get_related_topics('AI')
+
+        self.assertEqual(SerpApiDailyUsage.objects.get(scope=f'user:{self.user.pk}').calls, 0)
+        self.assertIsNone(SerpApiCall.objects.get().status_code)
+
+    def test_budget_endpoint(self, mock_get):
+        SerpApiTrendingService(user=self.user).get_related_topics('AI')
+
+        response = self.client.get('/api/keywords/serpapi_budget/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user'], {'used': 1, 'limit': 2, 'remaining': 1})
+        self.assertEqual(response.data['global']['remaining'], 3)
+        self.assertEqual(response.data['background']['limit'], 2)
+        self.assertEqual(response.data['user_calls_by_endpoint'], {'related_topics': 1})
+
+
+class PriorityGateTests(SimpleTestCase):
+    def test_waiting_interactive_requests_go_before_background(self):
+        gate = PriorityGate(size=1)
+        order = []
+        release = threading.Event()
+
+        def hold():
+            with gate.slot(INTERACTIVE):
+                release.wait()
+
+        def run(priority):
+            with gate.slot(priority):
+                order.append(priority)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        time.sleep(0.05)
+        waiters = [threading.Thread(target=run, args=(BACKGROUND,)), threading.Thread(target=run, args=(INTERACTIVE,))]
+        for thread in waiters:
+            thread.start()
+            time.sleep(0.05)
+        release.set()
+        for thread in [holder, *waiters]:
+            thread.join()
+
+        self.assertEqual(order, [INTERACTIVE, BACKGROUND])
+
+    def test_queue_timeout(self):
+        gate = PriorityGate(size=1)
+        with gate.slot(INTERACTIVE):
+            with self.assertRaises(SchedulerBusyError):
+                with gate.slot(BACKGROUND, timeout=0.01):
+                    pass
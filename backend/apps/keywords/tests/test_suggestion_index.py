@@ -0,0 +1,95 @@
+from io import StringIO
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from rest_framework.test import APIClient
+
+from apps.keywords.models import KeywordResearch, SuggestionTerm
+from apps.keywords.suggestion_index import (
+    PrefixIndex, extract_suggestions, get_prefix_index, record_suggestions, reset_prefix_indexes
+)
+
+User = get_user_model()
+
+
+class PrefixIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = PrefixIndex([
+            ('ai tools', 9, 3), ('ai tools free', 7, 1), ('ai tutor', 9, 5), ('apple', 10, 1), ('banana', 4, 1),
+        ])
+
+    def test_completions_are_ranked_by_score_then_times_seen(self):
+        self.assertEqual([item['keyword'] for item in self.index.complete('ai t')],
+                         ['ai tutor', 'ai tools', 'ai tools free'])
+        self.assertEqual([item['keyword'] for item in self.index.complete('A', limit=2)], ['apple', 'ai tutor'])
+        self.assertEqual(self.index.complete('zebra'), [])
+
+    def test_short_and_long_prefix_paths_agree(self):
+        long_path = self.index.complete('a', limit=100)
+        self.assertEqual(self.index.complete('a', limit=10), long_path)
+
+    def test_added_terms_are_found_immediately(self):
+        self.index.add('ai art', 10, 1)
+        self.index.add('banana', 10, 2)
+
+        self.assertEqual(self.index.complete('ai')[0]['keyword'], 'ai art')
+        self.assertEqual(self.index.complete('b'), [{'keyword': 'banana', 'popularity_score': 10, 'times_seen': 2}])
+        self.assertEqual(len(self.index), 6)
+
+
+class SuggestionStoreTests(TestCase):
+    def setUp(self):
+        reset_prefix_indexes()
+        self.addCleanup(reset_prefix_indexes)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='s@example.com', username='s', password='pw12345!'))
+
+    def test_extract_normalizes_and_keeps_best_score(self):
+        found = extract_suggestions({
+            'questions': [{'question': 'what', 'suggestions': [{'keyword': 'What  is AI ', 'popularity_score': 4}]}],
+            'alphabetical': [{'letter': 'w', 'suggestions': [{'keyword': 'what is ai', 'popularity_score': 8}]}],
+            'related_keywords': ['AI Art'],
+        })
+        self.assertEqual(found, {'what is ai': 8, 'ai art': 0})
+
+    def test_record_merges_repeat_sightings(self):
+        self.assertEqual(record_suggestions({'ai art': 3, 'ai tools': 5}), 2)
+        self.assertEqual(record_suggestions({'ai art': 7}), 0)
+
+        term = SuggestionTerm.objects.get(text='ai art')
+        self.assertEqual((term.popularity_score, term.times_seen, term.prefix), (7, 2, 'ai '))
+
+    def test_autocomplete_serves_local_terms(self):
+        record_suggestions({f'ai tool {n}': n for n in range(1, 8)})
+
+        with patch('apps.keywords.services.KeywordResearchService.fetch_autocomplete') as mock_fetch:
+            response = self.client.get('/api/keywords/autocomplete/', {'q': 'AI to', 'limit': 3})
+
+        mock_fetch.assert_not_called()
+        self.assertEqual(response.data['source'], 'local')
+        self.assertEqual([item['keyword'] for item in response.data['suggestions']],
+                         ['ai tool 7', 'ai tool 6', 'ai tool 5'])
+
+    def test_autocomplete_falls_back_to_google_and_records(self):
+        fetched = [{'keyword': 'AI Video', 'popularity_score': 10, 'estimated_volume': '10K-100K'}]
+        with patch('apps.keywords.services.KeywordResearchService.fetch_autocomplete', return_value=fetched):
+            response = self.client.get('/api/keywords/autocomplete/', {'q': 'ai vid'})
+
+        self.assertEqual(response.data['source'], 'google')
+        self.assertEqual(response.data['suggestions'][0]['keyword'], 'ai video')
+        self.assertTrue(SuggestionTerm.objects.filter(text='ai video').exists())
+        self.assertEqual(get_prefix_index().complete('ai v')[0]['keyword'], 'ai video')
+        self.assertEqual(self.client.get('/api/keywords/autocomplete/').status_code, 400)
+
+    def test_backfill_command(self):
+        user = User.objects.get(username='s')
+        KeywordResearch.objects.create(user=user, keyword='ai', country='gb', questions=[
+            {'question': 'how', 'suggestions': [{'keyword': 'how ai works', 'popularity_score': 6}]},
+        ], related_keywords=['ai news'])
+
+        call_command('index_suggestions', stdout=StringIO())
+
+        self.assertEqual(set(SuggestionTerm.objects.filter(country='gb').values_list('text', flat=True)),
+                         {'how ai works', 'ai news'})
@@ -0,0 +1,114 @@
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from unittest.mock import patch
+from rest_framework.test import APIClient
+
+from apps.keywords.models import KeywordResearch, KeywordSuggestion
+from apps.keywords.services import KeywordResearchService
+from apps.keywords.suggestion_rows import build_research, research_sections, save_research
+from viral_ai.testing import QueryCountMixin
+
+User = get_user_model()
+
+
+def fake_autocomplete(self, query):
+    return [
+        {'keyword': f'{query} {n}', 'popularity_score': 10 - n, 'estimated_volume': self._estimate_volume(10 - n)}
+        for n in range(3)
+    ]
+
+
+@patch('apps.keywords.services.KeywordResearchService.fetch_autocomplete', autospec=True, side_effect=fake_autocomplete)
+class SuggestionRowsTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='rows@example.com', username='rows', password='pw12345!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def research(self, keyword='ai'):
+        research_data = KeywordResearchService(keyword).perform_full_research()
+        research = save_research([build_research(research_data, user=self.user, keyword=keyword)])[0]
+        return research_data, KeywordResearch.objects.get(id=research.id)
+
+    def test_suggestions_are_stored_as_rows(self, mock_fetch):
+        research_data, research = self.research()
+
+        self.assertTrue(research.suggestions_in_table)
+        self.assertEqual((research.questions, research.alphabetical), ([], []))
+        self.assertEqual(research.suggestion_rows.count(), research_data['summary']['total_suggestions'])
+        row = research.suggestion_rows.get(section='alphabetical', category='b', position=1)
+        self.assertEqual((row.query, row.suggestion, row.popularity_score, row.category_position),
+                         ('ai b', 'ai b 1', 9, 1))
+
+    def test_api_shape_is_assembled_from_rows(self, mock_fetch):
+        research_data, research = self.research()
+        data = self.client.get(f'/api/keywords/{research.id}/').data
+
+        for section in ('questions', 'prepositions', 'alphabetical', 'comparisons'):
+            self.assertEqual(data[section], research_data[section])
+        self.assertEqual(data['summary']['total_suggestions'], research_data['summary']['total_suggestions'])
+
+        sparse = self.client.get(f'/api/keywords/{research.id}/', {'fields': 'id,comparisons'}).data
+        self.assertEqual(set(sparse), {'id', 'comparisons'})
+        self.assertEqual(sparse['comparisons'], research_data['comparisons'])
+
+    def test_clusters_store_positions_instead_of_text(self, mock_fetch):
+        research_data, research = self.research()
+
+        self.assertTrue(research.clusters)
+        self.assertTrue(all('members' in cluster and 'keywords' not in cluster for cluster in research.clusters))
+        data = self.client.get(f'/api/keywords/{research.id}/').data
+        self.assertEqual(data['clusters'], research_data['clusters'])
+        sparse = self.client.get(f'/api/keywords/{research.id}/', {'fields': 'clusters'}).data
+        self.assertEqual(sparse['clusters'], research_data['clusters'])
+
+    def test_research_endpoint_writes_rows(self, mock_fetch):
+        with patch('apps.keywords.views.YouTubeResearchService.get_keyword_data', return_value={}):
+            response = self.client.post('/api/keywords/research/', {'keyword': 'ai'}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        research = KeywordResearch.objects.get(id=response.data['data']['id'])
+        self.assertEqual(research.suggestion_rows.count(), response.data['summary']['total_suggestions'])
+        self.assertEqual(response.data['data']['questions'][0]['suggestions'][0]['keyword'], 'ai what 0')
+        self.assertTrue(KeywordSuggestion.objects.filter(suggestion='ai what 0', section='questions').exists())
+
+    def test_edits_keep_the_summary(self, mock_fetch):
+        _, research = self.research()
+        summary = research.summary
+
+        response = self.client.patch(f'/api/keywords/{research.id}/', {'trend_direction': 'up'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        research.refresh_from_db()
+        self.assertEqual(research.summary, summary)
+
+    def test_older_json_research_is_unchanged(self, mock_fetch):
+        legacy = KeywordResearch.objects.create(user=self.user, keyword='old', questions=[
+            {'category': 'what', 'query': 'old what', 'suggestions': ['old what is'], 'count': 1},
+        ])
+        self.assertEqual(research_sections(legacy)['questions'][0]['suggestions'], ['old what is'])
+        self.assertEqual(self.client.get(f'/api/keywords/{legacy.id}/').data['questions'], legacy.questions)
+
+    def test_older_research_can_be_moved_to_the_table(self, mock_fetch):
+        legacy = KeywordResearch.objects.create(user=self.user, keyword='old', comparisons=[
+            {'category': 'vs', 'query': 'old vs', 'count': 2, 'suggestions': [
+                {'keyword': 'old vs new', 'popularity_score': 10, 'estimated_volume': '10K-100K'},
+                {'keyword': 'old vs young', 'popularity_score': 9, 'estimated_volume': '10K-100K'},
+            ]},
+        ])
+        before = self.client.get(f'/api/keywords/{legacy.id}/').data
+
+        call_command('move_suggestions_to_table', stdout=StringIO())
+
+        legacy.refresh_from_db()
+        self.assertTrue(legacy.suggestions_in_table)
+        self.assertEqual(legacy.comparisons, [])
+        self.assertEqual(legacy.suggestion_rows.count(), 2)
+        self.assertEqual(self.client.get(f'/api/keywords/{legacy.id}/').data, before)
+
+    def test_detail_query_count(self, mock_fetch):
+        _, research = self.research('detail')
+        self.assertConstantQueries(lambda: self.client.get(f'/api/keywords/{research.id}/'),
+                                   lambda count: [self.research(f'extra {n}') for n in range(count)])
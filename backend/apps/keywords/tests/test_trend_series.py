@@ -0,0 +1,206 @@
+import calendar
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import requests
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.keywords import trend_series
+from apps.keywords.models import TrendSeries
+from apps.keywords.quota import QuotaError
+from apps.keywords.serpapi_service import SerpApiStatusError, SerpApiTrendingService
+
+User = get_user_model()
+
+
+def interest(day):
+    """The 'true' daily interest the fake Trends API normalizes per request"""
+    return 50 + day.toordinal() % 97
+
+
+def week_interest(week):
+    days = [week + timedelta(days=n) for n in range(7) if week + timedelta(days=n) <= timezone.now().date()]
+    return sum(interest(day) for day in days) / len(days)
+
+
+def timestamp(day):
+    return str(calendar.timegm(datetime(day.year, day.month, day.day).timetuple()))
+
+
+def fake_trends(self, params, timeout):
+    """Weekly points for weekly timeframes, daily points for a custom range, each scaled to its own peak of 100"""
+    today = timezone.now().date()
+    if params['date'] in trend_series.TIMEFRAMES:
+        start = trend_series.bucket_start(today - timedelta(days=trend_series.TIMEFRAMES[params['date']][1]), 'week')
+        points = [(start + timedelta(weeks=n), week_interest(start + timedelta(weeks=n)))
+                  for n in range((today - start).days // 7 + 1)]
+    else:
+        first, last = (date.fromisoformat(part) for part in params['date'].split())
+        points = [(first + timedelta(days=n), interest(first + timedelta(days=n)))
+                  for n in range((last - first).days + 1)]
+    peak = max(value for _, value in points)
+    return {
+        'interest_over_time': {'timeline_data': [
+            {'date': day.isoformat(), 'timestamp': timestamp(day), 'values': [{'extracted_value': value * 100 / peak}]}
+            for day, value in points
+        ]},
+        'related_queries': {'rising': [{'query': f"{params['q']} {params['date']}", 'value': 100}]},
+    }
+
+
+@override_settings(SERPAPI_KEY='test-key', SERPAPI_QUOTA_ENABLED=False, TREND_SERIES_REFRESH=3600)
+@patch.object(SerpApiTrendingService, '_request', autospec=True, side_effect=fake_trends)
+class TrendSeriesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.service = SerpApiTrendingService()
+
+    def get(self, timeframe='today 12-m', **kwargs):
+        return trend_series.get_interest_over_time(self.service, 'AI Tools', geo='US', timeframe=timeframe, **kwargs)
+
+    def test_series_is_fetched_once_then_served_from_db(self, mock_request):
+        first = self.get()
+        second = trend_series.get_interest_over_time(self.service, 'ai   tools', geo='US')
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual((first['source'], second['source']), ('serpapi', 'db'))
+        self.assertEqual(first['timeline_data'], second['timeline_data'])
+        self.assertEqual(first['granularity'], 'week')
+        self.assertEqual(max(point['value'] for point in first['timeline_data']), 100)
+        self.assertEqual(TrendSeries.objects.get().points.count(), first['points_total'])
+
+    def test_stale_series_fetches_only_the_newest_window(self, mock_request):
+        self.get()
+        series = TrendSeries.objects.get()
+        # Pretend the last three weeks haven't been fetched yet
+        latest = list(series.points.order_by('-date')[:3].values_list('date', flat=True))
+        series.points.filter(date__in=latest).delete()
+        TrendSeries.objects.filter(id=series.id).update(refreshed_at=timezone.now() - timedelta(hours=2))
+
+        result = self.get()
+
+        self.assertEqual(result['source'], 'serpapi')
+        window = mock_request.call_args.args[1]['date']
+        since = date.fromisoformat(window.split()[0])
+        self.assertEqual(since, trend_series.bucket_start(min(latest) - timedelta(days=7 + 35), 'week'))
+        self.assertEqual(window.split()[1], timezone.now().date().isoformat())
+        self.assertEqual(result['related_queries'][0]['query'], f'AI Tools {window}')
+
+        # The spliced window is on the same scale as the points fetched before it
+        ratios = {round(point.value / week_interest(point.date), 6) for point in series.points.all()}
+        self.assertEqual(len(ratios), 1)
+        self.assertEqual(series.points.filter(date__in=latest).count(), 3)
+
+    def test_longer_timeframe_than_stored_is_fetched_in_full(self, mock_request):
+        self.get(timeframe='today 12-m')
+        five_years = self.get(timeframe='today 5-y')
+        one_year = self.get(timeframe='today 12-m')
+
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual((five_years['source'], one_year['source']), ('serpapi', 'db'))
+        self.assertGreater(five_years['points_total'], 250)
+        self.assertEqual(TrendSeries.objects.count(), 1)
+
+    def test_long_ranges_are_downsampled(self, mock_request):
+        full = self.get()
+        sampled = self.get(max_points=10)
+
+        self.assertEqual(len(sampled['timeline_data']), 10)
+        self.assertEqual(sampled['points_total'], full['points_total'])
+        self.assertEqual(sampled['timeline_data'][0], full['timeline_data'][0])
+        self.assertEqual(sampled['timeline_data'][-1], full['timeline_data'][-1])
+        self.assertIn(100, [point['value'] for point in sampled['timeline_data']])
+
+    def test_failed_refresh_serves_stored_series(self, mock_request):
+        self.get()
+        TrendSeries.objects.update(refreshed_at=timezone.now() - timedelta(hours=2))
+        mock_request.side_effect = SerpApiStatusError(503)
+
+        result = self.get()
+
+        self.assertEqual(result['source'], 'db')
+        self.assertTrue(result['timeline_data'])
+        TrendSeries.objects.all().delete()
+        cache.clear()
+        mock_request.side_effect = SerpApiStatusError(503)
+        self.assertEqual(self.get(), {'error': 'API returned status 503', 'timeline_data': []})
+
+    def test_refresh_timeout_serves_stored_series(self, mock_request):
+        self.get()
+        self.get(timeframe='today 5-y')
+        TrendSeries.objects.update(refreshed_at=timezone.now() - timedelta(hours=2))
+        mock_request.side_effect = requests.Timeout('read timed out')
+
+        for timeframe in ('today 12-m', 'today 5-y'):
+            with self.subTest(timeframe=timeframe):
+                result = self.get(timeframe=timeframe)
+                self.assertEqual(result['source'], 'db')
+                self.assertTrue(result['timeline_data'])
+
+        TrendSeries.objects.all().delete()
+        cache.clear()
+        result = self.get()
+        self.assertEqual(result['timeline_data'], [])
+        self.assertIn('error', result)
+
+    def test_refused_quota_serves_stored_series(self, mock_request):
+        self.get()
+        TrendSeries.objects.update(refreshed_at=timezone.now() - timedelta(hours=2))
+
+        with patch.object(SerpApiTrendingService, '_search', side_effect=QuotaError('Daily SerpApi budget used up')):
+            result = self.get()
+
+        self.assertEqual(result['source'], 'db')
+        self.assertTrue(result['timeline_data'])
+
+    def test_other_timeframes_are_fetched_live(self, mock_request):
+        mock_request.side_effect = None
+        mock_request.return_value = {'interest_over_time': {'timeline_data': [{'date': 'Mon 9am', 'values': [{'value': 7}]}]}}
+
+        result = self.get(timeframe='now 7-d')
+
+        self.assertEqual(result['timeline_data'], [{'date': 'Mon 9am', 'value': 7}])
+        self.assertFalse(TrendSeries.objects.exists())
+
+
+class DownsampleTests(TestCase):
+    def test_keeps_peaks_that_striding_would_skip(self):
+        start = date(2024, 1, 1)
+        points = [(start + timedelta(days=n), 100.0 if n == 37 else 10.0) for n in range(365)]
+
+        sampled = trend_series.downsample(points, 20)
+
+        self.assertEqual(len(sampled), 20)
+        self.assertIn(points[37], sampled)
+        self.assertEqual(trend_series.downsample(points[:5], 20), points[:5])
+
+
+@override_settings(SERPAPI_KEY='test-key', SERPAPI_QUOTA_ENABLED=False, TREND_SERIES_MAX_POINTS=20)
+@patch.object(SerpApiTrendingService, '_request', autospec=True, side_effect=fake_trends)
+class InterestOverTimeViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='a@example.com', username='a', password='pw12345!'))
+
+    def test_points_are_capped(self, mock_request):
+        response = self.client.get('/api/keywords/interest_over_time/', {'keyword': 'AI', 'points': 500})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['timeline_data']), 20)
+        for points in ('x', 0, -5, 2):
+            with self.subTest(points=points):
+                response = self.client.get('/api/keywords/interest_over_time/', {'keyword': 'AI', 'points': points})
+                self.assertEqual(response.status_code, 400)
+
+    def test_geo_is_case_insensitive(self, mock_request):
+        self.client.get('/api/keywords/interest_over_time/', {'keyword': 'AI', 'geo': 'gb'})
+        self.client.get('/api/keywords/interest_over_time/', {'keyword': 'AI', 'geo': 'GB'})
+
+        self.assertEqual(list(TrendSeries.objects.values_list('geo', flat=True)), ['GB'])
+        self.assertEqual(mock_request.call_count, 1)
@@ -0,0 +1,113 @@
+import threading
+from unittest.mock import MagicMock, patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.keywords.models import KeywordResearch
+from apps.keywords.youtube_service import YouTubeResearchService, reset_youtube_clients, thread_http
+
+User = get_user_model()
+
+RESEARCH = {
+    'summary': {'total_suggestions': 3},
+    'platform_breakdown': {},
+    'questions': [],
+    'prepositions': [],
+    'alphabetical': [],
+    'comparisons': [],
+    'related_keywords': [],
+    'clusters': [],
+    'viral_examples': [],
+}
+
+
+def fake_youtube(results_per_keyword=30):
+    """YouTube client whose searches return overlapping id ranges per keyword"""
+    youtube = MagicMock()
+
+    def search_list(q, **kwargs):
+        offset = {'cats': 0, 'dogs': 20}.get(q, 100)
+        items = [{'id': {'kind': 'youtube#video', 'videoId': f'v{offset + i}'}} for i in range(results_per_keyword)]
+        return MagicMock(execute=MagicMock(return_value={'items': items}))
+
+    def videos_list(id, **kwargs):
+        items = [
+            {'id': vid, 'statistics': {'viewCount': '100', 'likeCount': '10'}, 'snippet': {'title': vid}}
+            for vid in id.split(',')
+        ]
+        return MagicMock(execute=MagicMock(return_value={'items': items}))
+
+    youtube.search.return_value.list.side_effect = search_list
+    youtube.videos.return_value.list.side_effect = videos_list
+    return youtube
+
+
+class YouTubeCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_youtube_clients()
+        self.addCleanup(reset_youtube_clients)
+        self.youtube = fake_youtube()
+        patcher = patch('apps.keywords.youtube_service.build', return_value=self.youtube)
+        self.build = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = YouTubeResearchService(api_key='test-key')
+
+    def test_client_is_built_once_and_lazily(self):
+        self.build.assert_not_called()
+        for _ in range(3):
+            YouTubeResearchService(api_key='test-key').get_keyword_data('cats')
+
+        self.build.assert_called_once()
+        self.assertTrue(self.build.call_args.kwargs['static_discovery'])
+
+    def test_each_thread_gets_its_own_http(self):
+        seen = []
+        threads = [threading.Thread(target=lambda: seen.append(thread_http())) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+
+        self.assertIs(thread_http(), thread_http())
+        self.assertEqual(len({id(http) for http in seen + [thread_http()]}), 3)
+
+    def test_repeat_lookups_are_served_from_cache(self):
+        first = self.service.get_keyword_data('cats')
+        second = YouTubeResearchService(api_key='test-key').get_keyword_data('  Cats ')
+
+        self.assertEqual(first['video_count'], 30)
+        self.assertEqual(first['total_views'], 3000)
+        self.assertEqual(second['total_views'], first['total_views'])
+        self.assertEqual(self.youtube.search.return_value.list.call_count, 1)
+        self.assertEqual(self.youtube.videos.return_value.list.call_count, 1)
+
+    def test_statistics_are_batched_across_keywords(self):
+        results = self.service.get_keywords_data(['cats', 'dogs', 'fish'])
+
+        # 80 distinct ids (cats and dogs overlap by 10) -> two calls of <= 50 ids
+        batches = [call.kwargs['id'].split(',') for call in self.youtube.videos.return_value.list.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [50, 30])
+        self.assertEqual({keyword: data['video_count'] for keyword, data in results.items()},
+                         {'cats': 30, 'dogs': 30, 'fish': 30})
+
+        # Only ids not already cached are fetched for later keywords
+        self.service.get_keywords_data(['cats', 'birds'])
+        self.assertEqual(len(self.youtube.videos.return_value.list.call_args_list[-1].kwargs['id'].split(',')), 30)
+
+    @patch('apps.keywords.views.KeywordResearchService.perform_full_research', return_value=RESEARCH)
+    def test_research_persists_youtube_data(self, mock_research):
+        user = User.objects.create_user(email='yt@example.com', username='yt', password='pw12345!')
+        client = APIClient()
+        client.force_authenticate(user)
+
+        with self.settings(YOUTUBE_API_KEY='test-key'):
+            created = client.post('/api/keywords/research/', {'keyword': 'cats'}, format='json')
+            repeat = client.post('/api/keywords/research/', {'keyword': 'cats'}, format='json')
+
+        self.assertEqual(KeywordResearch.objects.get().youtube_data['video_count'], 30)
+        self.assertTrue(repeat.data['cached'])
+        self.assertEqual(repeat.data['youtube'], created.data['youtube'])
+        self.assertEqual(repeat.data['data']['youtube_data']['total_views'], 3000)
+        self.assertEqual(self.youtube.search.return_value.list.call_count, 1)
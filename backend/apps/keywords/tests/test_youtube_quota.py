@@ -0,0 +1,115 @@
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import httplib2
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from googleapiclient.errors import HttpError
+from rest_framework.test import APIClient
+
+from apps.keywords.models import KeywordResearch, YouTubeApiCall, YouTubeQuotaUsage
+from apps.keywords.youtube_quota import QUOTA_TIMEZONE, ledger, quota_day
+from apps.keywords.youtube_service import YouTubeResearchService, reset_youtube_clients
+
+from .test_youtube_cache import fake_youtube
+
+User = get_user_model()
+
+# Noon Pacific: twelve hours until the quota resets
+NOON = datetime(2026, 3, 10, 12, 0, tzinfo=QUOTA_TIMEZONE)
+
+
+@override_settings(YOUTUBE_DAILY_QUOTA=1000, YOUTUBE_REDUCED_MAX_RESULTS=20)
+@patch('django.utils.timezone.now', return_value=NOON)
+class YouTubeQuotaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_youtube_clients()
+        self.addCleanup(reset_youtube_clients)
+        self.youtube = fake_youtube()
+        patcher = patch('apps.keywords.youtube_service.build', return_value=self.youtube)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = YouTubeResearchService(api_key='test-key')
+
+    def use_units(self, units):
+        YouTubeQuotaUsage.objects.create(call_type='total', day=quota_day(), units=units)
+
+    def test_units_are_charged_per_call_type(self, mock_now):
+        result = self.service.get_keyword_data('cats')
+
+        status = ledger.status()
+        self.assertEqual(result['quota_level'], 'normal')
+        self.assertEqual(status['used'], 101)
+        self.assertEqual(status['by_call_type'], {
+            'search.list': {'calls': 1, 'units': 100},
+            'videos.list': {'calls': 1, 'units': 1},
+        })
+        self.assertEqual(YouTubeApiCall.objects.filter(keyword='cats').count(), 1)
+
+    def test_low_quota_reduces_search_size(self, mock_now):
+        self.use_units(600)
+        result = self.service.get_keyword_data('cats')
+
+        self.assertEqual(result['quota_level'], 'reduced')
+        self.assertEqual(self.youtube.search.return_value.list.call_args.kwargs['maxResults'], 20)
+
+    def test_fast_burn_rate_degrades_before_the_threshold(self, mock_now):
+        self.use_units(300)
+        YouTubeApiCall.objects.create(call_type='search.list', units=300, quota_day=quota_day())
+
+        status = ledger.status()
+        # 700 units left at 300/hour runs out mid-afternoon, before midnight
+        self.assertEqual(status['predicted_exhaustion_at'], NOON + timedelta(hours=700 / 300))
+        self.assertEqual(status['level'], 'reduced')
+
+    def test_no_search_level_reuses_known_video_ids(self, mock_now):
+        user = User.objects.create_user(email='known@example.com', username='known', password='pw12345!')
+        KeywordResearch.objects.create(user=user, keyword='Cats', youtube_data={
+            'top_videos': [{'video_id': 'v1'}, {'video_id': 'v2'}],
+        })
+        self.use_units(950)
+
+        result = self.service.get_keyword_data('cats')
+
+        self.youtube.search.return_value.list.assert_not_called()
+        self.assertEqual(result['quota_level'], 'no_search')
+        self.assertEqual(result['video_count'], 2)
+        self.assertEqual(ledger.status()['used'], 951)
+
+    def test_exhausted_quota_serves_stale_cache_without_calls(self, mock_now):
+        fresh = self.service.get_keyword_data('cats')
+        YouTubeQuotaUsage.objects.filter(call_type='total').update(units=1000)
+
+        two_days_later = time.time() + 2 * 24 * 60 * 60
+        with patch('apps.keywords.youtube_service.time.time', return_value=two_days_later):
+            stale = self.service.get_keyword_data('cats')
+
+        self.assertEqual(stale['quota_level'], 'exhausted')
+        self.assertEqual(stale['total_views'], fresh['total_views'])
+        self.assertEqual(self.youtube.search.return_value.list.call_count, 1)
+        self.assertEqual(self.youtube.videos.return_value.list.call_count, 1)
+
+    def test_quota_error_from_youtube_marks_the_day_exhausted(self, mock_now):
+        error = HttpError(httplib2.Response({'status': 403}), b'{"error": {"errors": [{"reason": "quotaExceeded"}]}}')
+        self.youtube.search.return_value.list.side_effect = None
+        self.youtube.search.return_value.list.return_value.execute.side_effect = error
+
+        result = self.service.get_keyword_data('cats')
+
+        self.assertEqual(result['video_count'], 0)
+        self.assertEqual(ledger.status()['remaining'], 0)
+        self.assertEqual(ledger.status()['level'], 'exhausted')
+        self.assertTrue(YouTubeApiCall.objects.filter(error='quotaExceeded').exists())
+
+    @override_settings(YOUTUBE_DAILY_QUOTA=10000)
+    def test_quota_endpoint(self, mock_now):
+        self.service.get_keyword_data('cats')
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(email='q@example.com', username='q', password='pw12345!'))
+
+        response = client.get('/api/keywords/youtube_quota/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['used'], response.data['remaining']), (101, 9899))
+        self.assertEqual(response.data['level'], 'normal')
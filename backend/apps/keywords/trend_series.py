@@ -0,0 +1,258 @@
+"""
+Trend Series
+Stores interest over time per keyword and geo, refreshes only the newest window and downsamples long ranges
+"""
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import TrendPoint, TrendSeries
+from .quota import QuotaError
+from .serpapi_service import SerpApiStatusError, SerpApiTrendingService
+from .services import query_key
+
+logger = logging.getLogger(__name__)
+
+# Timeframes served from the store: the granularity Google returns them in and
+# the days they span (None: everything since Trends data starts)
+TIMEFRAMES = {
+    'today 1-m': ('day', 30),
+    'today 3-m': ('day', 90),
+    'today 12-m': ('week', 365),
+    'today 5-y': ('week', 5 * 365),
+    'all': ('month', None),
+}
+TRENDS_START = date(2004, 1, 1)
+
+# Days requested again before the newest stored point; the new window is
+# rescaled onto the stored series by the buckets both cover
+OVERLAP_DAYS = {'day': 14, 'week': 35, 'month': 92}
+
+# Google answers ranges up to ~270 days with daily points, which is what the
+# incremental window relies on; series left longer than this are refetched whole
+MAX_INCREMENTAL_DAYS = 180
+
+Point = Tuple[date, float]
+
+
+def bucket_start(day: date, granularity: str) -> date:
+    """Start of the bucket containing day: the day itself, its week's Sunday (as Google's weeks) or its month's 1st"""
+    if granularity == 'week':
+        return day - timedelta(days=(day.weekday() + 1) % 7)
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def aggregate(points: List[Point], granularity: str) -> Dict[date, float]:
+    """Mean value per bucket (points already at the granularity pass through unchanged)"""
+    buckets = defaultdict(list)
+    for day, value in points:
+        buckets[bucket_start(day, granularity)].append(value)
+    return {day: sum(values) / len(values) for day, values in sorted(buckets.items())}
+
+
+def rescale_factor(stored: Dict[date, float], fresh: Dict[date, float]) -> float:
+    """
+    Factor putting a fresh window on the stored series' scale
+
+    Every Trends request is normalized to its own peak, so the same week has
+    different values in different requests. The ratio of the overlapping
+    buckets' sums maps one onto the other. The newest stored bucket was
+    possibly still in progress when fetched, so it is left out when there
+    are others.
+    """
+    common = sorted(set(stored) & set(fresh))
+    if len(common) > 1:
+        common = [day for day in common if day != max(stored)]
+    stored_total = sum(stored[day] for day in common)
+    fresh_total = sum(fresh[day] for day in common)
+    if not stored_total or not fresh_total:
+        return 1.0
+    return stored_total / fresh_total
+
+
+def downsample(points: List[Point], max_points: int) -> List[Point]:
+    """
+    Largest-Triangle-Three-Buckets downsampling
+
+    Keeps the first and last points and, from each of max_points - 2 equal
+    slices in between, the point forming the largest triangle with the point
+    kept before it and the next slice's average - so peaks and dips survive
+    where plain striding would skip them.
+    """
+    if max_points >= len(points) or max_points < 3:
+        return points
+
+    xs = [day.toordinal() for day, _ in points]
+    ys = [value for _, value in points]
+    every = (len(points) - 2) / (max_points - 2)
+
+    sampled = [points[0]]
+    previous = 0
+    for i in range(max_points - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, len(points))
+        if next_end <= end:
+            next_end = end + 1
+        avg_x = sum(xs[end:next_end]) / (next_end - end)
+        avg_y = sum(ys[end:next_end]) / (next_end - end)
+
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs(
+                (xs[previous] - avg_x) * (ys[j] - ys[previous])
+                - (xs[previous] - xs[j]) * (avg_y - ys[previous])
+            )
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        previous = best
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def _timeframe_start(timeframe: str, today: date) -> date:
+    days = TIMEFRAMES[timeframe][1]
+    return today - timedelta(days=days) if days else TRENDS_START
+
+
+def _replace_points(series: TrendSeries, buckets: Dict[date, float], since: Optional[date] = None):
+    points = series.points.all() if since is None else series.points.filter(date__gte=since)
+    points.delete()
+    TrendPoint.objects.bulk_create([TrendPoint(series=series, date=day, value=value) for day, value in buckets.items()])
+
+
+def _fetch_full(service: SerpApiTrendingService, keyword: str, geo: str, timeframe: str) -> TrendSeries:
+    granularity = TIMEFRAMES[timeframe][0]
+    points, related_queries = service.get_timeline_points(keyword, geo, timeframe)
+    buckets = aggregate(points, granularity)
+    now = timezone.now()
+
+    with transaction.atomic():
+        series, _ = TrendSeries.objects.select_for_update().get_or_create(
+            keyword_key=query_key(keyword), geo=geo, granularity=granularity,
+            defaults={'keyword': keyword, 'covered_from': TRENDS_START, 'refreshed_at': now}
+        )
+        _replace_points(series, buckets)
+        series.keyword = keyword
+        series.covered_from = bucket_start(_timeframe_start(timeframe, now.date()), granularity)
+        series.related_queries = related_queries
+        series.refreshed_at = now
+        series.save()
+
+    logger.info(f"Fetched {timeframe} trend series for '{keyword}' ({geo}): {len(buckets)} points")
+    return series
+
+
+def _refresh_latest(service: SerpApiTrendingService, series: TrendSeries) -> bool:
+    """
+    Request only the newest window (from OVERLAP_DAYS before the last stored
+    point) and splice it onto the series
+
+    Returns:
+        False when the gap is too long for a window and the timeframe needs a full fetch
+    """
+    today = timezone.now().date()
+    last = series.points.order_by('-date').values_list('date', flat=True).first()
+    if last is None:
+        return False
+    since = bucket_start(last - timedelta(days=OVERLAP_DAYS[series.granularity]), series.granularity)
+    if (today - since).days > MAX_INCREMENTAL_DAYS:
+        return False
+
+    points, related_queries = service.get_timeline_points(
+        series.keyword, series.geo, f'{since.isoformat()} {today.isoformat()}'
+    )
+    fresh = aggregate(points, series.granularity)
+
+    with transaction.atomic():
+        series = TrendSeries.objects.select_for_update().get(id=series.id)
+        if fresh:
+            stored = dict(series.points.filter(date__gte=since).values_list('date', 'value'))
+            factor = rescale_factor(stored, fresh)
+            _replace_points(series, {day: value * factor for day, value in fresh.items()}, since=since)
+        if related_queries:
+            series.related_queries = related_queries
+        series.refreshed_at = timezone.now()
+        series.save(update_fields=['related_queries', 'refreshed_at'])
+
+    logger.info(f"Refreshed trend series '{series.keyword}' ({series.geo}, {series.granularity}) since {since}")
+    return True
+
+
+def get_interest_over_time(service: SerpApiTrendingService, keyword: str, geo: str = 'US',
+                           timeframe: str = 'today 12-m', max_points: Optional[int] = None) -> Dict:
+    """
+    Interest over time from the stored series, fetching from SerpApi only what's missing
+
+    A series is fetched in full once per keyword, geo and granularity (again
+    only for a longer timeframe than it covers). After TREND_SERIES_REFRESH
+    seconds just the newest window is requested and spliced on. Timeframes
+    not in TIMEFRAMES (e.g. 'now 7-d') are fetched live as before.
+
+    Args:
+        service: SerpApi service the searches are charged through
+        keyword: Search term
+        geo: Country code
+        timeframe: Time range (e.g., 'today 12-m', 'today 5-y', 'all')
+        max_points: Downsample to at most this many points (default TREND_SERIES_MAX_POINTS)
+
+    Returns:
+        get_interest_over_time()'s shape with ISO dates, plus granularity,
+        points_total, refreshed_at and source ('db' or 'serpapi')
+    """
+    geo = geo.upper()  # One stored series per country, however callers spell it
+    if timeframe not in TIMEFRAMES or not service.api_key:
+        return service.get_interest_over_time(keyword=keyword, geo=geo, timeframe=timeframe)
+
+    granularity = TIMEFRAMES[timeframe][0]
+    today = timezone.now().date()
+    start = bucket_start(_timeframe_start(timeframe, today), granularity)
+    series = TrendSeries.objects.filter(keyword_key=query_key(keyword), geo=geo, granularity=granularity).first()
+    source = 'db'
+
+    try:
+        if series is None or series.covered_from > start:
+            series = _fetch_full(service, keyword, geo, timeframe)
+            source = 'serpapi'
+        elif timezone.now() - series.refreshed_at > timedelta(seconds=getattr(settings, 'TREND_SERIES_REFRESH', 21600)):
+            if not _refresh_latest(service, series):
+                _fetch_full(service, keyword, geo, timeframe)
+            source = 'serpapi'
+            series.refresh_from_db()
+    except (SerpApiStatusError, QuotaError, requests.RequestException) as e:
+        if series is None:
+            status_code = getattr(e, 'status_code', None)
+            logger.error(f"SerpApi error: {status_code or str(e)}")
+            error = f'API returned status {status_code}' if status_code else f'API request failed: {str(e)}'
+            return {'error': error, 'timeline_data': []}
+        # Serve what's stored (timeouts and refused searches alike); the next request tries again
+        logger.warning(f"Could not refresh trend series '{keyword}' ({geo}): {str(e)}")
+
+    points = list(series.points.filter(date__gte=start).values_list('date', 'value'))
+    peak = max((value for _, value in points), default=0)
+    points = [(day, value * 100 / peak if peak else 0) for day, value in points]
+    if max_points is None:
+        max_points = getattr(settings, 'TREND_SERIES_MAX_POINTS', 200)
+    sampled = downsample(points, max_points)
+
+    return {
+        'keyword': keyword,
+        'geo': geo,
+        'timeframe': timeframe,
+        'granularity': granularity,
+        'timeline_data': [{'date': day.isoformat(), 'value': round(value)} for day, value in sampled],
+        'points_total': len(points),
+        'related_queries': series.related_queries,
+        'refreshed_at': series.refreshed_at,
+        'source': source,
+    }
@@ -1,8 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import KeywordResearchViewSet
+from .views import KeywordResearchJobViewSet, KeywordResearchViewSet
 
 router = DefaultRouter()
+# Before the empty prefix, whose detail route would otherwise take 'jobs' as an id
+router.register(r'jobs', KeywordResearchJobViewSet, basename='keyword-job')
 router.register(r'', KeywordResearchViewSet, basename='keyword')
 
 urlpatterns = [
@@ -2,26 +2,62 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from viral_ai.conditional import ConditionalGetMixin
+from viral_ai.pagination import HybridPagination
+from viral_ai.sparse_fields import SparseFieldsetViewMixin
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.utils import timezone
-from .models import KeywordResearch
-from .serializers import KeywordResearchSerializer, KeywordResearchCreateSerializer
+from .models import KeywordResearch, KeywordResearchJob, NicheKeywordSnapshot
+from .serializers import (
+    KeywordResearchSerializer, KeywordResearchListSerializer, KeywordResearchCreateSerializer,
+    KeywordExpansionSerializer, KeywordAutocompleteSerializer, KeywordBulkResearchSerializer,
+    KeywordResearchJobSerializer
+)
+from .bulk import dedupe_keywords, resume_research_job_if_stale, start_research_job
+from .suggestion_rows import build_research, save_research
+from .research_cache import copy_research, find_recent_research
+from .expansion import KeywordExpansionCrawler
+from . import trend_series
+from .suggestion_index import extract_suggestions, get_prefix_index, normalize_suggestion, record_suggestions
 from .services import KeywordResearchService
 from .youtube_service import YouTubeResearchService
 from .serpapi_service import SerpApiTrendingService
+from .quota import get_quota_manager
+from .youtube_quota import ledger as youtube_ledger
+import json
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class KeywordResearchViewSet(viewsets.ModelViewSet):
-    """API endpoint for keyword research"""
+class KeywordResearchViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    """
+    API endpoint for keyword research
+    
+    GET /api/keywords/                  -> summaries (counts + top suggestions)
+    GET /api/keywords/<id>/             -> full research payload
+    GET /api/keywords/?pagination=cursor&fields=id,keyword,search_volume
+    """
     
     serializer_class = KeywordResearchSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = HybridPagination
+    # Research rows aren't edited after creation: newest row plus row count is enough
+    conditional_timestamp_fields = ('created_at',)
     
     def get_queryset(self):
         """Return keyword research for current user"""
-        return KeywordResearch.objects.filter(user=self.request.user)
+        queryset = KeywordResearch.objects.filter(user=self.request.user)
+        if self.action == 'list':
+            queryset = queryset.only(*KeywordResearchListSerializer.Meta.fields)
+        return queryset
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return KeywordResearchListSerializer
+        return KeywordResearchSerializer
     
     @action(detail=False, methods=['post'])
     def research(self, request):
@@ -48,20 +84,18 @@ class KeywordResearchViewSet(viewsets.ModelViewSet):
         language = serializer.validated_data.get('language', 'en')
         
         try:
-            # Check if research already exists (within last 24 hours)
-            existing = KeywordResearch.objects.filter(
-                user=request.user,
-                keyword__iexact=keyword,
-                country=country,
-                language=language,
-                created_at__gte=timezone.now() - timezone.timedelta(days=1)
-            ).first()
+            # Check if research already exists (within KEYWORD_RESEARCH_CACHE_TTL)
+            existing, shared = find_recent_research(request.user, keyword, country, language)
             
             if existing:
+                if shared:
+                    existing = copy_research(existing, request.user)
                 logger.info(f"Returning cached keyword research for: {keyword}")
                 return Response({
                     'cached': True,
-                    'data': KeywordResearchSerializer(existing).data
+                    'shared': shared,
+                    'data': KeywordResearchSerializer(existing).data,
+                    'youtube': existing.youtube_data or None
                 })
             
             # Perform new research
@@ -78,20 +112,20 @@ class KeywordResearchViewSet(viewsets.ModelViewSet):
                 logger.warning(f"YouTube data unavailable: {str(e)}")
             
             # Save to database
-            keyword_research = KeywordResearch.objects.create(
+            keyword_research = build_research(
+                research_data,
                 user=request.user,
                 keyword=keyword,
                 country=country,
                 language=language,
-                search_volume=research_data['summary']['total_suggestions'],
-                platform_breakdown=research_data['platform_breakdown'],
-                questions=research_data['questions'],
-                prepositions=research_data['prepositions'],
-                alphabetical=research_data['alphabetical'],
-                comparisons=research_data['comparisons'],
-                related_keywords=research_data['related_keywords'],
-                viral_examples=research_data['viral_examples'],
+                youtube_data=youtube_data or {},
             )
+            save_research([keyword_research])
+            
+            try:
+                record_suggestions(extract_suggestions(research_data), country, language)
+            except Exception as e:
+                logger.warning(f"Could not index suggestions for '{keyword}': {str(e)}")
             
             return Response({
                 'cached': False,
@@ -107,6 +141,145 @@ class KeywordResearchViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @action(detail=False, methods=['post'])
+    def bulk_research(self, request):
+        """
+        Research many keywords as one background job
+        
+        POST /api/keywords/bulk_research/
+        {
+            "keywords": ["AI tools", "remote work", "ai tools"],
+            "country": "us",
+            "language": "en"
+        }
+        
+        Returns 202 with the job; poll GET /api/keywords/jobs/<id>/ for progress.
+        Repeated keywords are researched once, autocomplete queries shared by
+        several keywords are fetched once, and research from the last 24 hours
+        is reused. YouTube data is not fetched in bulk.
+        """
+        serializer = KeywordBulkResearchSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            items, duplicates = dedupe_keywords(serializer.validated_data['keywords'])
+            job = KeywordResearchJob.objects.create(
+                user=request.user,
+                country=serializer.validated_data['country'],
+                language=serializer.validated_data['language'],
+                items=items,
+                total_items=len(items),
+                duplicate_items=duplicates
+            )
+            start_research_job(job)
+            job.refresh_from_db()
+            
+            return Response(
+                KeywordResearchJobSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED
+            )
+            
+        except Exception as e:
+            logger.error(f"Error starting bulk keyword research: {str(e)}")
+            return Response(
+                {'error': 'Failed to start bulk keyword research', 'detail': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    @action(detail=False, methods=['get'])
+    def expand(self, request):
+        """
+        Deep keyword expansion, streamed as newline-delimited JSON
+        
+        GET /api/keywords/expand/?keyword=AI tools&depth=2&budget=100&limit=500&min_score=5
+        
+        One {"type": "keyword", ...} line per new keyword as it's found, then a
+        {"type": "done", ...} line with the number of requests used.
+        """
+        serializer = KeywordExpansionSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = serializer.validated_data
+        
+        crawler = KeywordExpansionCrawler(
+            params['keyword'],
+            country=params['country'],
+            language=params['language'],
+            max_depth=params['depth'],
+            max_requests=params['budget'],
+            max_keywords=params['limit'],
+            min_score=params['min_score'],
+            workers=getattr(settings, 'KEYWORD_EXPANSION_WORKERS', 4)
+        )
+        
+        def lines():
+            try:
+                for event in crawler.crawl():
+                    yield json.dumps(event) + '\n'
+            except Exception as e:
+                logger.error(f"Keyword expansion of '{params['keyword']}' failed: {str(e)}")
+                yield json.dumps({'type': 'error', 'error': 'Keyword expansion failed', 'detail': str(e)}) + '\n'
+        
+        response = StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # let nginx pass lines through as they're written
+        return response
+    
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Prefix autocomplete from suggestions collected by earlier research
+        
+        GET /api/keywords/autocomplete/?q=ai to&country=us&language=en&limit=10
+        
+        Served from the in-memory prefix index; when it knows fewer than
+        AUTOCOMPLETE_MIN_LOCAL_RESULTS completions, Google Autocomplete is
+        asked instead and its answer is added to the store.
+        """
+        serializer = KeywordAutocompleteSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = serializer.validated_data
+        
+        started = time.monotonic()
+        try:
+            index = get_prefix_index(params['country'], params['language'])
+            suggestions = index.complete(params['q'], params['limit'])
+            source = 'local'
+            
+            if len(suggestions) < min(params['limit'], getattr(settings, 'AUTOCOMPLETE_MIN_LOCAL_RESULTS', 5)):
+                service = KeywordResearchService(params['q'], params['country'], params['language'])
+                fetched = service.fetch_autocomplete(params['q'])
+                if fetched:
+                    record_suggestions(
+                        {normalize_suggestion(item['keyword']): item['popularity_score'] for item in fetched},
+                        params['country'], params['language']
+                    )
+                    suggestions = index.complete(params['q'], params['limit']) or [
+                        {'keyword': item['keyword'], 'popularity_score': item['popularity_score'], 'times_seen': 1}
+                        for item in fetched[:params['limit']]
+                    ]
+                    source = 'google'
+            
+            return Response({
+                'query': params['q'],
+                'suggestions': suggestions,
+                'source': source,
+                'took_ms': round((time.monotonic() - started) * 1000, 2),
+            })
+        
+        except Exception as e:
+            logger.error(f"Error completing '{params['q']}': {str(e)}")
+            return Response(
+                {'error': 'Failed to autocomplete', 'detail': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
     @action(detail=False, methods=['get'])
     def trending(self, request):
         """
@@ -118,7 +291,7 @@ class KeywordResearchViewSet(viewsets.ModelViewSet):
         frequency = request.query_params.get('frequency', 'daily')
         
         try:
-            service = SerpApiTrendingService()
+            service = SerpApiTrendingService(user=request.user)
             trending_data = service.get_trending_now(geo=geo, frequency=frequency)
             
             return Response(trending_data, status=status.HTTP_200_OK)
@@ -135,7 +308,12 @@ class KeywordResearchViewSet(viewsets.ModelViewSet):
         """
         Get interest over time for a keyword
         
-        GET /api/keywords/interest_over_time/?keyword=AI&geo=US&timeframe=today 12-m
+        GET /api/keywords/interest_over_time/?keyword=AI&geo=US&timeframe=today 12-m&points=100
+        
+        Served from the stored trend series (see trend_series.py): only the
+        newest window is fetched once it is older than TREND_SERIES_REFRESH,
+        and long ranges are downsampled to `points` (at least 3; default and
+        cap TREND_SERIES_MAX_POINTS).
         """
         keyword = request.query_params.get('keyword')
         if not keyword:
@@ -144,12 +322,26 @@ class KeywordResearchViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        geo = request.query_params.get('geo', 'US')
+        geo = request.query_params.get('geo', 'US').upper()
         timeframe = request.query_params.get('timeframe', 'today 12-m')
+        max_points = getattr(settings, 'TREND_SERIES_MAX_POINTS', 200)
+        try:
+            points = int(request.query_params.get('points', max_points))
+        except ValueError:
+            points = None
+        # Downsampling needs the first, last and at least one point in between
+        if points is None or points < 3:
+            return Response(
+                {'error': 'points must be an integer of at least 3'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        max_points = min(points, max_points)
         
         try:
-            service = SerpApiTrendingService()
-            interest_data = service.get_interest_over_time(keyword=keyword, geo=geo, timeframe=timeframe)
+            service = SerpApiTrendingService(user=request.user)
+            interest_data = trend_series.get_interest_over_time(
+                service, keyword=keyword, geo=geo, timeframe=timeframe, max_points=max_points
+            )
             
             return Response(interest_data, status=status.HTTP_200_OK)
             
@@ -177,7 +369,7 @@ class KeywordResearchViewSet(viewsets.ModelViewSet):
         geo = request.query_params.get('geo', 'US')
         
         try:
-            service = SerpApiTrendingService()
+            service = SerpApiTrendingService(user=request.user)
             related_data = service.get_related_topics(keyword=keyword, geo=geo)
             
             return Response(related_data, status=status.HTTP_200_OK)
@@ -197,7 +389,7 @@ class KeywordResearchViewSet(viewsets.ModelViewSet):
         GET /api/keywords/niches/
         """
         try:
-            service = SerpApiTrendingService()
+            service = SerpApiTrendingService(user=request.user)
             niches = service.get_available_niches()
             
             return Response({
@@ -218,6 +410,9 @@ class KeywordResearchViewSet(viewsets.ModelViewSet):
         Get trending keywords for a specific niche
         
         GET /api/keywords/niche_keywords/?niche=technology&geo=US&limit=20
+        
+        Served from the pre-computed snapshot (all seeds, see prewarm_niches)
+        when one is fresh enough, otherwise searched live.
         """
         niche = request.query_params.get('niche')
         if not niche:
@@ -230,7 +425,26 @@ class KeywordResearchViewSet(viewsets.ModelViewSet):
         limit = int(request.query_params.get('limit', 20))
         
         try:
-            service = SerpApiTrendingService()
+            max_age = timezone.timedelta(seconds=getattr(settings, 'NICHE_SNAPSHOT_MAX_AGE', 48 * 60 * 60))
+            snapshot = NicheKeywordSnapshot.objects.filter(
+                niche=niche,
+                geo=geo.upper(),
+                computed_at__gte=timezone.now() - max_age
+            ).first()
+            
+            if snapshot:
+                keywords = snapshot.keywords[:limit]
+                return Response({
+                    'niche': niche,
+                    'geo': snapshot.geo,
+                    'seed_keywords': snapshot.seed_keywords,
+                    'keywords': keywords,
+                    'total_count': len(keywords),
+                    'computed_at': snapshot.computed_at,
+                    'source': 'snapshot',
+                }, status=status.HTTP_200_OK)
+            
+            service = SerpApiTrendingService(user=request.user)
             niche_data = service.get_niche_keywords(niche=niche, geo=geo, limit=limit)
             
             return Response(niche_data, status=status.HTTP_200_OK)
@@ -241,3 +455,54 @@ class KeywordResearchViewSet(viewsets.ModelViewSet):
                 {'error': 'Failed to fetch niche keywords', 'detail': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    @action(detail=False, methods=['get'])
+    def serpapi_budget(self, request):
+        """
+        Today's SerpApi usage and remaining budget
+        
+        GET /api/keywords/serpapi_budget/
+        """
+        try:
+            return Response(get_quota_manager().remaining(request.user), status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error fetching SerpApi budget: {str(e)}")
+            return Response(
+                {'error': 'Failed to fetch SerpApi budget', 'detail': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    @action(detail=False, methods=['get'])
+    def youtube_quota(self, request):
+        """
+        Today's YouTube Data API quota: units used per call type, burn rate,
+        predicted exhaustion and the current degradation level
+        
+        GET /api/keywords/youtube_quota/
+        """
+        try:
+            return Response(youtube_ledger.status(), status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error fetching YouTube quota: {str(e)}")
+            return Response(
+                {'error': 'Failed to fetch YouTube quota', 'detail': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class KeywordResearchJobViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    """API endpoint for bulk keyword research jobs (poll with If-None-Match to get 304s while nothing changes)"""
+    
+    serializer_class = KeywordResearchJobSerializer
+    permission_classes = [IsAuthenticated]
+    conditional_timestamp_fields = ('updated_at',)
+    
+    def get_queryset(self):
+        return KeywordResearchJob.objects.filter(user=self.request.user)
+    
+    def retrieve(self, request, *args, **kwargs):
+        # A job orphaned by a restart picks up again when its owner polls it
+        resume_research_job_if_stale(self.get_queryset().filter(pk=kwargs['pk']))
+        return super().retrieve(request, *args, **kwargs)
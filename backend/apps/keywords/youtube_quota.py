@@ -0,0 +1,160 @@
+"""
+YouTube Quota Ledger
+Tracks Data API units per call type, predicts exhaustion and picks a degradation level
+"""
+import logging
+from datetime import datetime, time as dt_time, timedelta
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import YouTubeApiCall, YouTubeQuotaUsage
+
+logger = logging.getLogger(__name__)
+
+# Units per call (https://developers.google.com/youtube/v3/determine_quota_cost)
+UNIT_COSTS = {
+    'search.list': 100,
+    'videos.list': 1,
+}
+
+TOTAL = 'total'
+
+# Quota resets at midnight Pacific time
+QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+
+# Degradation levels, least to most restrictive
+NORMAL = 'normal'
+REDUCED = 'reduced'        # smaller searches
+NO_SEARCH = 'no_search'    # reuse known video ids instead of search().list
+EXHAUSTED = 'exhausted'    # cached data only
+LEVELS = [NORMAL, REDUCED, NO_SEARCH, EXHAUSTED]
+
+
+class YouTubeQuotaExceeded(Exception):
+    """A call would go over today's quota"""
+
+
+def quota_day(now: Optional[datetime] = None):
+    return (now or timezone.now()).astimezone(QUOTA_TIMEZONE).date()
+
+
+def next_reset(now: Optional[datetime] = None) -> datetime:
+    day = quota_day(now) + timedelta(days=1)
+    return datetime.combine(day, dt_time.min, tzinfo=QUOTA_TIMEZONE)
+
+
+def is_quota_error(error: Exception) -> bool:
+    """HttpError from YouTube saying the daily quota is used up"""
+    resp = getattr(error, 'resp', None)
+    content = getattr(error, 'content', b'') or b''
+    return getattr(resp, 'status', None) == 403 and b'quotaExceeded' in content
+
+
+class YouTubeQuotaLedger:
+    """
+    Daily YouTube Data API quota accounting
+
+    Units are reserved before each call with a conditional UPDATE on the
+    day's "total" row, so concurrent requests can't overshoot
+    YOUTUBE_DAILY_QUOTA. The degradation level is chosen from the units left
+    and the burn rate over the last hour: if the current rate would exhaust
+    the quota before the reset, searches are reduced early.
+    """
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, 'YOUTUBE_QUOTA_ENABLED', True)
+
+    @property
+    def limit(self) -> int:
+        return getattr(settings, 'YOUTUBE_DAILY_QUOTA', 10000)
+
+    def charge(self, call_type: str, keyword: str = ''):
+        """
+        Reserve the units for one call and add it to the ledger
+
+        Raises:
+            YouTubeQuotaExceeded: Not enough units left today; nothing is charged
+        """
+        units = UNIT_COSTS[call_type]
+        day = quota_day()
+
+        YouTubeQuotaUsage.objects.get_or_create(call_type=TOTAL, day=day)
+        updated = YouTubeQuotaUsage.objects.filter(
+            call_type=TOTAL, day=day, units__lte=self.limit - units
+        ).update(calls=F('calls') + 1, units=F('units') + units)
+        if not updated:
+            raise YouTubeQuotaExceeded(f'YouTube quota of {self.limit} units used up for {day}')
+
+        YouTubeQuotaUsage.objects.get_or_create(call_type=call_type, day=day)
+        YouTubeQuotaUsage.objects.filter(call_type=call_type, day=day).update(
+            calls=F('calls') + 1, units=F('units') + units
+        )
+        YouTubeApiCall.objects.create(call_type=call_type, units=units, quota_day=day, keyword=keyword[:255])
+
+    def mark_exhausted(self, call_type: str, keyword: str = ''):
+        """YouTube rejected a call for quota: trust it over our own count until the reset"""
+        day = quota_day()
+        logger.warning(f"YouTube reported quota exhausted for {day}")
+        YouTubeQuotaUsage.objects.get_or_create(call_type=TOTAL, day=day)
+        YouTubeQuotaUsage.objects.filter(call_type=TOTAL, day=day).update(units=self.limit)
+        YouTubeApiCall.objects.create(call_type=call_type, units=0, quota_day=day, keyword=keyword[:255],
+                                      error='quotaExceeded')
+
+    def status(self) -> Dict:
+        """Today's usage, burn rate, predicted exhaustion and degradation level"""
+        now = timezone.now()
+        day = quota_day(now)
+        usage = {row.call_type: row for row in YouTubeQuotaUsage.objects.filter(day=day)}
+        used = usage[TOTAL].units if TOTAL in usage else 0
+        remaining = max(self.limit - used, 0)
+
+        last_hour = YouTubeApiCall.objects.filter(
+            quota_day=day, created_at__gte=now - timedelta(hours=1)
+        ).aggregate(units=Sum('units'))['units'] or 0
+
+        reset_at = next_reset(now)
+        exhausted_at = None
+        if remaining == 0:
+            exhausted_at = now
+        elif last_hour:
+            exhausted_at = now + timedelta(hours=remaining / last_hour)
+        if exhausted_at and exhausted_at >= reset_at:
+            exhausted_at = None
+
+        return {
+            'day': day,
+            'limit': self.limit,
+            'used': used,
+            'remaining': remaining,
+            'by_call_type': {
+                call_type: {'calls': row.calls, 'units': row.units}
+                for call_type, row in usage.items() if call_type != TOTAL
+            },
+            'units_last_hour': last_hour,
+            'predicted_exhaustion_at': exhausted_at,
+            'resets_at': reset_at,
+            'level': self._level(remaining, exhausted_at),
+        }
+
+    def level(self) -> str:
+        if not self.enabled:
+            return NORMAL
+        return self.status()['level']
+
+    def _level(self, remaining: int, exhausted_at: Optional[datetime]) -> str:
+        thresholds = getattr(settings, 'YOUTUBE_DEGRADE_THRESHOLDS', {REDUCED: 0.5, NO_SEARCH: 0.1})
+        if remaining < UNIT_COSTS['videos.list']:
+            return EXHAUSTED
+        if remaining < UNIT_COSTS['search.list'] or remaining <= self.limit * thresholds[NO_SEARCH]:
+            return NO_SEARCH
+        if remaining <= self.limit * thresholds[REDUCED] or exhausted_at is not None:
+            return REDUCED
+        return NORMAL
+
+
+ledger = YouTubeQuotaLedger()
@@ -1,28 +1,89 @@
+import hashlib
+import threading
+import time
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
 from django.conf import settings
+from django.core.cache import cache
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from . import youtube_quota
+from .services import query_key
 
 logger = logging.getLogger(__name__)
 
+# Built clients by (api key, endpoint). A Resource is safe to share between
+# threads as long as each request executes on that thread's own Http object.
+_clients = {}
+_clients_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+def get_youtube_client(api_key: str):
+    """
+    Process-wide YouTube client, built once from the discovery document
+    bundled with google-api-python-client (no discovery fetch, no file cache)
+    
+    Returns:
+        The client, or None if it couldn't be built (retried on next use)
+    """
+    endpoint = getattr(settings, 'YOUTUBE_API_ENDPOINT', '')
+    key = (api_key, endpoint)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                try:
+                    client = build(
+                        'youtube', 'v3',
+                        developerKey=api_key,
+                        static_discovery=True,
+                        cache_discovery=False,
+                        client_options={'api_endpoint': endpoint} if endpoint else None
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to initialize YouTube API: {str(e)}")
+                    return None
+                _clients[key] = client
+    return client
+
+
+def thread_http():
+    """This thread's Http connection (httplib2.Http isn't thread-safe)"""
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        http = _thread_local.http = build_http()
+    return http
+
+
+def reset_youtube_clients():
+    """Forget built clients (tests, settings changes)"""
+    with _clients_lock:
+        _clients.clear()
+
 
 class YouTubeResearchService:
     """Service for YouTube keyword research and video statistics"""
     
+    # videos().list accepts at most 50 ids per call (1 quota unit each call)
+    VIDEOS_BATCH_SIZE = 50
+    
     def __init__(self, api_key: str = None):
         # Use YouTube API key from settings, or None if not configured
         self.api_key = api_key or getattr(settings, 'YOUTUBE_API_KEY', None)
         
         if not self.api_key:
             logger.warning("YouTube API key not configured. YouTube data will not be available.")
-            self.youtube = None
-            return
-        
-        try:
-            self.youtube = build('youtube', 'v3', developerKey=self.api_key)
-        except Exception as e:
-            logger.error(f"Failed to initialize YouTube API: {str(e)}")
-            self.youtube = None
+    
+    @property
+    def youtube(self):
+        """Shared API client (built on first use), or None when unavailable"""
+        if not self.api_key:
+            return None
+        return get_youtube_client(self.api_key)
     
     def get_keyword_data(self, keyword: str, max_results: int = 50) -> Dict:
         """
@@ -36,92 +97,216 @@ class YouTubeResearchService:
         - total_comments: Total comments
         - top_videos: List of top performing videos
         """
+        return self.get_keywords_data([keyword], max_results)[keyword]
+    
+    def get_keywords_data(self, keywords: List[str], max_results: int = 50) -> Dict[str, Dict]:
+        """
+        YouTube data for several keywords with shared, batched statistics lookups
+        
+        Search results (keyword -> video ids) and per-video statistics are
+        cached, and statistics missing from the cache are fetched for all
+        keywords together, VIDEOS_BATCH_SIZE ids per videos().list call.
+        
+        As the daily quota runs low (see youtube_quota.py) searches shrink to
+        YOUTUBE_REDUCED_MAX_RESULTS, then stop in favour of known video ids,
+        then only cached data is served. quota_level in each result says which.
+        
+        Returns:
+            Dict of keyword -> same structure as get_keyword_data
+        """
         if not self.youtube:
-            return self._empty_response(keyword)
+            return {keyword: self._empty_response(keyword) for keyword in keywords}
+        
+        level = youtube_quota.ledger.level()
+        if level != youtube_quota.NORMAL:
+            logger.info(f"YouTube quota level is '{level}', degrading keyword lookups")
+            max_results = min(max_results, getattr(settings, 'YOUTUBE_REDUCED_MAX_RESULTS', 20))
+        
+        video_ids = {}
+        for keyword in keywords:
+            try:
+                video_ids[keyword] = self.search_video_ids(keyword, max_results, level)
+            except Exception as e:
+                logger.error(f"Error fetching YouTube data for '{keyword}': {str(e)}")
+        
+        try:
+            videos = self.get_video_stats([vid for ids in video_ids.values() for vid in ids], level)
+        except Exception as e:
+            logger.error(f"Error fetching YouTube video statistics: {str(e)}")
+            videos, video_ids = {}, {}
+        
+        results = {
+            keyword: self._aggregate(keyword, video_ids[keyword], videos)
+            if video_ids.get(keyword) else self._empty_response(keyword)
+            for keyword in keywords
+        }
+        for result in results.values():
+            result['quota_level'] = level
+        return results
+    
+    def search_video_ids(self, keyword: str, max_results: int = 50, level: str = youtube_quota.NORMAL) -> List[str]:
+        """
+        Video ids for a keyword search (cached for YOUTUBE_SEARCH_CACHE_TTL)
+        
+        Without quota for a search, falls back to stale cached ids or the
+        videos of an earlier research of the same keyword.
+        """
+        # Same key as research lookups, so spacing and case variants share one search
+        cache_key = 'youtube:search:' + hashlib.sha1(query_key(keyword).encode()).hexdigest()
+        entry = cache.get(cache_key)
+        if entry is not None and entry['max_results'] >= max_results and time.time() < entry['fresh_until']:
+            return entry['video_ids'][:max_results]
+        
+        if level in (youtube_quota.NO_SEARCH, youtube_quota.EXHAUSTED):
+            return self._known_video_ids(keyword, entry)
         
         try:
-            # Search for videos
-            search_response = self.youtube.search().list(
+            search_response = self._execute('search.list', self.youtube.search().list(
                 q=keyword,
-                part='id,snippet',
+                part='id',
                 maxResults=max_results,
                 type='video',
                 order='relevance',
                 relevanceLanguage='en'
-            ).execute()
-            
-            if not search_response.get('items'):
-                return self._empty_response(keyword)
-            
-            # Extract video IDs
-            video_ids = [
-                item['id']['videoId'] 
-                for item in search_response['items']
-                if item['id']['kind'] == 'youtube#video'
-            ]
-            
-            if not video_ids:
-                return self._empty_response(keyword)
-            
-            # Get detailed statistics for videos
-            stats_response = self.youtube.videos().list(
-                part='statistics,snippet',
-                id=','.join(video_ids)
-            ).execute()
-            
-            # Calculate aggregated statistics
-            total_views = 0
-            total_likes = 0
-            total_comments = 0
-            top_videos = []
-            
-            for video in stats_response.get('items', []):
-                stats = video.get('statistics', {})
-                snippet = video.get('snippet', {})
-                
-                views = int(stats.get('viewCount', 0))
-                likes = int(stats.get('likeCount', 0))
-                comments = int(stats.get('commentCount', 0))
-                
-                total_views += views
-                total_likes += likes
-                total_comments += comments
-                
-                top_videos.append({
-                    'video_id': video['id'],
-                    'title': snippet.get('title', ''),
-                    'channel': snippet.get('channelTitle', ''),
-                    'published_at': snippet.get('publishedAt', ''),
-                    'thumbnail': snippet.get('thumbnails', {}).get('medium', {}).get('url', ''),
-                    'views': views,
-                    'likes': likes,
-                    'comments': comments,
-                    'engagement_rate': round((likes / views * 100), 2) if views > 0 else 0
-                })
-            
-            # Sort by views
-            top_videos.sort(key=lambda x: x['views'], reverse=True)
-            
-            video_count = len(video_ids)
-            avg_views = total_views // video_count if video_count > 0 else 0
-            
-            return {
-                'keyword': keyword,
-                'platform': 'youtube',
-                'video_count': video_count,
-                'total_views': total_views,
-                'avg_views': avg_views,
-                'total_likes': total_likes,
-                'total_comments': total_comments,
-                'engagement_rate': round((total_likes / total_views * 100), 2) if total_views > 0 else 0,
-                'top_videos': top_videos[:10],  # Return top 10
-                'estimated_monthly_searches': self._estimate_searches(avg_views),
-                'competition_level': self._calculate_competition(video_count, avg_views)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error fetching YouTube data for '{keyword}': {str(e)}")
-            return self._empty_response(keyword)
+            ), keyword)
+        except youtube_quota.YouTubeQuotaExceeded:
+            return self._known_video_ids(keyword, entry)
+        
+        video_ids = [
+            item['id']['videoId']
+            for item in search_response.get('items', [])
+            if item['id']['kind'] == 'youtube#video'
+        ]
+        ttl = getattr(settings, 'YOUTUBE_SEARCH_CACHE_TTL', 24 * 60 * 60)
+        cache.set(
+            cache_key,
+            {'video_ids': video_ids, 'max_results': max_results, 'fresh_until': time.time() + ttl},
+            ttl + getattr(settings, 'YOUTUBE_STALE_TTL', 7 * 24 * 60 * 60)
+        )
+        return video_ids
+    
+    def _known_video_ids(self, keyword: str, entry: Optional[Dict]) -> List[str]:
+        if entry is not None:
+            return entry['video_ids']
+        
+        from .models import KeywordResearch
+        youtube_data = KeywordResearch.objects.filter(
+            keyword_key=query_key(keyword)
+        ).exclude(youtube_data={}).values_list('youtube_data', flat=True).first()
+        return [video['video_id'] for video in (youtube_data or {}).get('top_videos', [])]
+    
+    def get_video_stats(self, video_ids: List[str], level: str = youtube_quota.NORMAL) -> Dict[str, Dict]:
+        """
+        Statistics for videos by id, from the cache where possible
+        
+        Stale cached statistics are used for videos that can't be refreshed
+        because the quota is used up.
+        
+        Returns:
+            Dict of video id -> video summary (videos YouTube doesn't return are omitted)
+        """
+        unique_ids = list(dict.fromkeys(video_ids))
+        cached = cache.get_many([f'youtube:video:{vid}' for vid in unique_ids])
+        now = time.time()
+        videos, stale = {}, {}
+        for key, entry in cached.items():
+            (videos if now < entry['fresh_until'] else stale)[key.rsplit(':', 1)[-1]] = entry['video']
+        
+        missing = [vid for vid in unique_ids if vid not in videos]
+        fetched = {}
+        if level != youtube_quota.EXHAUSTED:
+            for start in range(0, len(missing), self.VIDEOS_BATCH_SIZE):
+                try:
+                    stats_response = self._execute('videos.list', self.youtube.videos().list(
+                        part='statistics,snippet',
+                        id=','.join(missing[start:start + self.VIDEOS_BATCH_SIZE])
+                    ))
+                except youtube_quota.YouTubeQuotaExceeded:
+                    break
+                for item in stats_response.get('items', []):
+                    fetched[item['id']] = self._video_summary(item)
+        
+        self._cache_videos(fetched)
+        videos.update(fetched)
+        for vid in missing:
+            if vid not in videos and vid in stale:
+                videos[vid] = stale[vid]
+        return videos
+    
+    def _execute(self, call_type: str, request, keyword: str = '') -> Dict:
+        """
+        Execute an API request, charging its units to the quota ledger
+        
+        Raises:
+            YouTubeQuotaExceeded: No quota left (ours or YouTube's count)
+        """
+        ledger = youtube_quota.ledger
+        if ledger.enabled:
+            ledger.charge(call_type, keyword)
+        try:
+            return request.execute(http=thread_http())
+        except HttpError as e:
+            if ledger.enabled and youtube_quota.is_quota_error(e):
+                ledger.mark_exhausted(call_type, keyword)
+                raise youtube_quota.YouTubeQuotaExceeded(str(e))
+            raise
+    
+    def _cache_videos(self, videos: Dict[str, Dict]):
+        if not videos:
+            return
+        ttl = getattr(settings, 'YOUTUBE_VIDEO_STATS_TTL', 6 * 60 * 60)
+        fresh_until = time.time() + ttl
+        cache.set_many(
+            {f'youtube:video:{vid}': {'video': video, 'fresh_until': fresh_until} for vid, video in videos.items()},
+            ttl + getattr(settings, 'YOUTUBE_STALE_TTL', 7 * 24 * 60 * 60)
+        )
+    
+    def _video_summary(self, video: Dict) -> Dict:
+        stats = video.get('statistics', {})
+        snippet = video.get('snippet', {})
+        
+        views = int(stats.get('viewCount', 0))
+        likes = int(stats.get('likeCount', 0))
+        
+        return {
+            'video_id': video['id'],
+            'title': snippet.get('title', ''),
+            'channel': snippet.get('channelTitle', ''),
+            'published_at': snippet.get('publishedAt', ''),
+            'thumbnail': snippet.get('thumbnails', {}).get('medium', {}).get('url', ''),
+            'views': views,
+            'likes': likes,
+            'comments': int(stats.get('commentCount', 0)),
+            'engagement_rate': round((likes / views * 100), 2) if views > 0 else 0
+        }
+    
+    def _aggregate(self, keyword: str, video_ids: List[str], videos: Dict[str, Dict]) -> Dict:
+        """Aggregate statistics for one keyword's search results"""
+        top_videos = [videos[vid] for vid in video_ids if vid in videos]
+        
+        total_views = sum(video['views'] for video in top_videos)
+        total_likes = sum(video['likes'] for video in top_videos)
+        total_comments = sum(video['comments'] for video in top_videos)
+        
+        # Sort by views
+        top_videos.sort(key=lambda x: x['views'], reverse=True)
+        
+        video_count = len(video_ids)
+        avg_views = total_views // video_count if video_count > 0 else 0
+        
+        return {
+            'keyword': keyword,
+            'platform': 'youtube',
+            'video_count': video_count,
+            'total_views': total_views,
+            'avg_views': avg_views,
+            'total_likes': total_likes,
+            'total_comments': total_comments,
+            'engagement_rate': round((total_likes / total_views * 100), 2) if total_views > 0 else 0,
+            'top_videos': top_videos[:10],  # Return top 10
+            'estimated_monthly_searches': self._estimate_searches(avg_views),
+            'competition_level': self._calculate_competition(video_count, avg_views)
+        }
     
     def _estimate_searches(self, avg_views: int) -> str:
         """Estimate monthly searches based on average views"""
@@ -177,15 +362,19 @@ class YouTubeResearchService:
             return []
         
         try:
-            response = self.youtube.videos().list(
+            response = self._execute('videos.list', self.youtube.videos().list(
                 part='snippet,statistics',
                 chart='mostPopular',
                 regionCode=region_code,
                 maxResults=max_results
-            ).execute()
+            ))
+            
+            items = response.get('items', [])
+            # Same statistics keyword lookups use - save them a videos().list call
+            self._cache_videos({video['id']: self._video_summary(video) for video in items})
             
             trending = []
-            for video in response.get('items', []):
+            for video in items:
                 snippet = video.get('snippet', {})
                 stats = video.get('statistics', {})
                 
@@ -201,6 +390,10 @@ class YouTubeResearchService:
             
             return trending
             
+        except youtube_quota.YouTubeQuotaExceeded:
+            logger.warning("YouTube quota used up, no trending topics until the reset")
+            return []
+            
         except Exception as e:
             logger.error(f"Error fetching trending topics: {str(e)}")
             return []
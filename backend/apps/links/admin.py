@@ -15,7 +15,8 @@ class TrackableLinkAdmin(admin.ModelAdmin):
     list_display = ['short_code', 'user', 'platform', 'clicks', 'unique_visitors', 'conversions', 'created_at']
     list_filter = ['platform', 'is_active', 'created_at']
     search_fields = ['short_code', 'custom_slug', 'destination_url', 'user__email']
-    readonly_fields = ['short_code', 'clicks', 'unique_visitors', 'created_at', 'full_url']
+    list_select_related = ['user']
+    readonly_fields = ['short_code', 'clicks', 'unique_visitors', 'last_clicked_at', 'created_at', 'full_url']
     inlines = [LinkClickInline]
     
     fieldsets = (
@@ -23,7 +24,7 @@ class TrackableLinkAdmin(admin.ModelAdmin):
             'fields': ('user', 'content_block', 'platform', 'short_code', 'custom_slug', 'destination_url', 'full_url')
         }),
         ('Metrics', {
-            'fields': ('clicks', 'unique_visitors', 'conversions', 'revenue')
+            'fields': ('clicks', 'unique_visitors', 'last_clicked_at', 'conversions', 'revenue')
         }),
         ('Settings', {
             'fields': ('is_active',)
@@ -36,4 +37,5 @@ class LinkClickAdmin(admin.ModelAdmin):
     list_display = ['link', 'country', 'device_type', 'browser', 'is_unique', 'clicked_at']
     list_filter = ['country', 'device_type', 'browser', 'is_unique', 'clicked_at']
     search_fields = ['link__short_code', 'ip_address']
+    list_select_related = ['link']
     readonly_fields = ['clicked_at']
@@ -0,0 +1,22 @@
+# Generated by Django 5.0 on 2026-10-19 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("links", "0003_trackablelink_campaign_trackablelink_description_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="trackablelink",
+            name="last_clicked_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="trackablelink",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
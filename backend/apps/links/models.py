@@ -35,6 +35,8 @@ class TrackableLink(models.Model):
     
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    last_clicked_at = models.DateTimeField(null=True, blank=True)  # Bumped with the click counters
     
     class Meta:
         db_table = 'trackable_links'
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from viral_ai.sparse_fields import SparseFieldsetSerializerMixin
 from .models import TrackableLink, LinkClick
 
 
@@ -24,7 +25,7 @@ class LinkClickSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class TrackableLinkSerializer(serializers.ModelSerializer):
+class TrackableLinkSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for trackable links"""
     
     total_clicks = serializers.IntegerField(source='clicks', read_only=True)
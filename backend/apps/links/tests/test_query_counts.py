@@ -0,0 +1,41 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.links.models import LinkClick, TrackableLink
+from viral_ai.testing import QueryCountMixin
+
+User = get_user_model()
+
+
+class LinkQueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='links@example.com', username='links', password='pw12345!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.link = TrackableLink.objects.create(user=self.user, destination_url='https://example.com')
+
+    def add_links(self, count):
+        for _ in range(count):
+            link = TrackableLink.objects.create(user=self.user, destination_url='https://example.com/more')
+            LinkClick.objects.create(link=link, country='US')
+
+    def add_clicks(self, count):
+        for _ in range(count):
+            LinkClick.objects.create(link=self.link, country='US', device_type='mobile')
+
+    def test_link_list(self):
+        self.assertConstantQueries(lambda: self.client.get('/api/links/'), self.add_links)
+
+    def test_link_detail_and_analytics(self):
+        self.assertConstantQueries(lambda: self.client.get(f'/api/links/{self.link.id}/'), self.add_clicks)
+        self.assertConstantQueries(lambda: self.client.get(f'/api/links/{self.link.id}/analytics/'), self.add_clicks)
+
+    def test_admin_changelists(self):
+        admin = User.objects.create_superuser(email='admin@example.com', username='admin', password='pw12345!')
+        self.client.force_login(admin)
+
+        for model in ('trackablelink', 'linkclick'):
+            with self.subTest(model=model):
+                self.assertConstantQueries(lambda: self.client.get(reverse(f'admin:links_{model}_changelist')), self.add_links)
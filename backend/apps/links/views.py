@@ -2,8 +2,13 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from viral_ai.conditional import ConditionalGetMixin
+from viral_ai.pagination import HybridPagination
+from viral_ai.sparse_fields import SparseFieldsetViewMixin
+from django.db.models import F
 from django.shortcuts import get_object_or_404, redirect
 from django.http import HttpResponse
+from django.utils import timezone
 from .models import TrackableLink, LinkClick
 from .serializers import TrackableLinkSerializer, TrackableLinkCreateSerializer, LinkClickSerializer
 import qrcode
@@ -13,10 +18,17 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class TrackableLinkViewSet(viewsets.ModelViewSet):
-    """API endpoint for trackable links"""
+class TrackableLinkViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    """
+    API endpoint for trackable links
+    
+    GET /api/links/?pagination=cursor&fields=id,short_code,total_clicks
+    """
     
     permission_classes = [IsAuthenticated]
+    pagination_class = HybridPagination
+    # Clicks only touch last_clicked_at (see redirect_short_link), not updated_at
+    conditional_timestamp_fields = ('updated_at', 'last_clicked_at')
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -74,6 +86,10 @@ class TrackableLinkViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def analytics(self, request, pk=None):
         """Get detailed analytics for link"""
+        # Every new click bumps last_clicked_at, so the link's validators cover the click breakdown too
+        return self._conditional(self.get_queryset().filter(pk=pk), self._analytics, request, pk=pk, single=True)
+    
+    def _analytics(self, request, pk=None):
         link = self.get_object()
         
         # Get recent clicks
@@ -142,11 +158,12 @@ def redirect_short_link(request, short_code):
             is_unique=is_unique
         )
         
-        # Update link metrics
-        link.clicks += 1
-        if is_unique:
-            link.unique_visitors += 1
-        link.save(update_fields=['clicks', 'unique_visitors'])
+        # Update link metrics in the database so concurrent clicks aren't lost
+        TrackableLink.objects.filter(pk=link.pk).update(
+            clicks=F('clicks') + 1,
+            unique_visitors=F('unique_visitors') + int(is_unique),
+            last_clicked_at=timezone.now(),
+        )
         
     except Exception as e:
         logger.error(f"Error tracking click: {str(e)}")
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Subscription, UsageTracking, TeamMember
+from .models import User, Subscription, UsageTracking, LLMUsageLog, TeamMember
 
 
 @admin.register(User)
@@ -27,19 +27,31 @@ class SubscriptionAdmin(admin.ModelAdmin):
     list_display = ['user', 'tier', 'status', 'current_period_end', 'cancel_at_period_end']
     list_filter = ['tier', 'status', 'cancel_at_period_end']
     search_fields = ['user__email', 'stripe_subscription_id']
+    list_select_related = ['user']
     readonly_fields = ['created_at', 'updated_at']
 
 
 @admin.register(UsageTracking)
 class UsageTrackingAdmin(admin.ModelAdmin):
-    list_display = ['user', 'month', 'content_blocks_created', 'video_generations', 'api_calls']
+    list_display = ['user', 'month', 'content_blocks_created', 'video_generations', 'api_calls', 'llm_calls', 'llm_cost']
     list_filter = ['month']
     search_fields = ['user__email']
+    list_select_related = ['user']
     readonly_fields = ['updated_at']
 
 
+@admin.register(LLMUsageLog)
+class LLMUsageLogAdmin(admin.ModelAdmin):
+    list_display = ['model', 'user', 'purpose', 'prompt_tokens', 'completion_tokens', 'latency_ms', 'cost', 'created_at']
+    list_filter = ['provider', 'model', 'kind', 'created_at']
+    search_fields = ['user__email', 'purpose']
+    list_select_related = ['user']
+    readonly_fields = ['created_at']
+
+
 @admin.register(TeamMember)
 class TeamMemberAdmin(admin.ModelAdmin):
     list_display = ['member', 'team_owner', 'role', 'is_active', 'invited_at']
     list_filter = ['role', 'is_active']
     search_fields = ['member__email', 'team_owner__email']
+    list_select_related = ['member', 'team_owner']
@@ -0,0 +1,86 @@
+# Generated by Django 5.0 on 2026-10-19 18:40
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usagetracking",
+            name="llm_calls",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="usagetracking",
+            name="llm_completion_tokens",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="usagetracking",
+            name="llm_cost",
+            field=models.DecimalField(decimal_places=6, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name="usagetracking",
+            name="llm_prompt_tokens",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name="LLMUsageLog",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("provider", models.CharField(max_length=50)),
+                ("model", models.CharField(max_length=100)),
+                ("kind", models.CharField(default="chat", max_length=20)),
+                ("purpose", models.CharField(blank=True, max_length=100)),
+                ("prompt_tokens", models.IntegerField(default=0)),
+                ("completion_tokens", models.IntegerField(default=0)),
+                ("max_tokens", models.IntegerField(blank=True, null=True)),
+                ("latency_ms", models.IntegerField(default=0)),
+                (
+                    "cost",
+                    models.DecimalField(decimal_places=6, default=0, max_digits=12),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="llm_usage",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "llm_usage_log",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-created_at"],
+                        name="llm_usage_l_user_id_8eac24_idx",
+                    ),
+                    models.Index(
+                        fields=["model", "-created_at"],
+                        name="llm_usage_l_model_22f41e_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
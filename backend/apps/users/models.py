@@ -75,6 +75,15 @@ class Subscription(models.Model):
         return f"{self.user.email} - {self.tier}"
 
 
+# Monthly allowances per subscription tier
+TIER_LIMITS = {
+    'free': {'content_blocks': 1, 'videos': 0, 'images': 1},
+    'creator': {'content_blocks': 50, 'videos': 5, 'images': 50},
+    'pro': {'content_blocks': 200, 'videos': 999, 'images': 200},
+    'agency': {'content_blocks': 9999, 'videos': 9999, 'images': 9999},
+}
+
+
 class UsageTracking(models.Model):
     """Track monthly usage per user"""
     
@@ -87,6 +96,12 @@ class UsageTracking(models.Model):
     api_calls = models.IntegerField(default=0)
     image_generations = models.IntegerField(default=0)
     
+    # LLM usage (aggregated from LLMUsageLog)
+    llm_calls = models.IntegerField(default=0)
+    llm_prompt_tokens = models.BigIntegerField(default=0)
+    llm_completion_tokens = models.BigIntegerField(default=0)
+    llm_cost = models.DecimalField(max_digits=12, decimal_places=6, default=0)  # USD
+    
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
@@ -98,6 +113,37 @@ class UsageTracking(models.Model):
         return f"{self.user.email} - {self.month}"
 
 
+class LLMUsageLog(models.Model):
+    """One LLM / image API call: model, tokens, latency and cost"""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='llm_usage')
+    
+    provider = models.CharField(max_length=50)
+    model = models.CharField(max_length=100)
+    kind = models.CharField(max_length=20, default='chat')  # chat, image
+    purpose = models.CharField(max_length=100, blank=True)  # e.g. "content:twitter", "video_script", "humanize"
+    
+    prompt_tokens = models.IntegerField(default=0)
+    completion_tokens = models.IntegerField(default=0)
+    max_tokens = models.IntegerField(null=True, blank=True)
+    latency_ms = models.IntegerField(default=0)
+    cost = models.DecimalField(max_digits=12, decimal_places=6, default=0)  # USD
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'llm_usage_log'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['model', '-created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.model} ({self.prompt_tokens}+{self.completion_tokens} tokens)"
+
+
 class TeamMember(models.Model):
     """Team members for Pro/Agency plans"""
     
@@ -125,6 +125,10 @@ class UsageTrackingSerializer(serializers.ModelSerializer):
             'video_generations',
             'api_calls',
             'image_generations',
+            'llm_calls',
+            'llm_prompt_tokens',
+            'llm_completion_tokens',
+            'llm_cost',
             'updated_at',
         ]
         read_only_fields = ['id', 'updated_at']
@@ -0,0 +1,45 @@
+from datetime import date
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.users.models import LLMUsageLog, Subscription, TeamMember, UsageTracking
+from viral_ai.testing import QueryCountMixin
+
+User = get_user_model()
+
+
+class UserQueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='usage@example.com', username='usage', password='pw12345!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_usage(self, count):
+        for i in range(count):
+            LLMUsageLog.objects.create(user=self.user, provider='openai', model='gpt-4o-mini', kind='chat', prompt_tokens=10)
+            UsageTracking.objects.get_or_create(user=self.user, month=date(2020, 1 + i % 12, 1))
+
+    def test_profile_and_usage(self):
+        self.assertConstantQueries(lambda: self.client.get(reverse('profile')), self.add_usage)
+        self.assertConstantQueries(lambda: self.client.get(reverse('usage')), self.add_usage)
+
+    def test_admin_changelists(self):
+        admin = User.objects.create_superuser(email='admin@example.com', username='admin', password='pw12345!')
+        self.client.force_login(admin)
+
+        for model in ('usagetracking', 'llmusagelog'):
+            with self.subTest(model=model):
+                self.assertConstantQueries(lambda: self.client.get(reverse(f'admin:users_{model}_changelist')), self.add_usage)
+
+        def add_teams(count):
+            for _ in range(count):
+                n = User.objects.count()
+                owner = User.objects.create_user(email=f'owner{n}@example.com', username=f'owner{n}', password='pw12345!')
+                Subscription.objects.create(user=owner, tier='pro', status='active')
+                TeamMember.objects.create(team_owner=owner, member=self.user)
+
+        for model in ('subscription', 'teammember'):
+            with self.subTest(model=model):
+                self.assertConstantQueries(lambda: self.client.get(reverse(f'admin:users_{model}_changelist')), add_teams)
@@ -6,7 +6,7 @@ from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import update_session_auth_hash
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from .models import User, UsageTracking
+from .models import TIER_LIMITS, User, UsageTracking
 from .serializers import (
     UserSerializer,
     RegisterSerializer,
@@ -208,13 +208,6 @@ class UserUsageView(APIView):
         )
         
         # Get subscription limits
-        TIER_LIMITS = {
-            'free': {'content_blocks': 1, 'videos': 0, 'images': 1},
-            'creator': {'content_blocks': 50, 'videos': 5, 'images': 50},
-            'pro': {'content_blocks': 200, 'videos': 999, 'images': 200},
-            'agency': {'content_blocks': 9999, 'videos': 9999, 'images': 9999},
-        }
-        
         limits = TIER_LIMITS.get(request.user.subscription_tier, TIER_LIMITS['free'])
         
         return Response({
@@ -0,0 +1,64 @@
+"""
+Benchmark helpers
+Boots Django against a throwaway test database so benchmarks never touch real data
+"""
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django():
+    """Configure settings and import path; call before importing any app code"""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'viral_ai.settings')
+
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Create a fresh test database for the duration of the benchmark"""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def timed(fn, repeat=20, warmup=2):
+    """
+    Time a callable
+
+    Returns:
+        (median seconds, last return value)
+    """
+    result = None
+    for _ in range(warmup):
+        result = fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def report(title, rows):
+    """Print a small aligned table: rows are (label, value...) tuples"""
+    print(f"\n{title}")
+    print('-' * len(title))
+    width = max(len(str(row[0])) for row in rows)
+    for label, *values in rows:
+        print(f"  {str(label):<{width}}  " + '  '.join(str(value) for value in values))
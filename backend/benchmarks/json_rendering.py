@@ -0,0 +1,85 @@
+"""
+API JSON rendering/parsing: stdlib vs orjson
+
+    python benchmarks/json_rendering.py [--repeat 50]
+
+Renders and parses real response shapes - a page of full KeywordResearch
+payloads and a page of ContentBlocks with their platform versions - with
+DRF's JSONRenderer/JSONParser and with viral_ai.renderers.
+"""
+import argparse
+import io
+
+from common import report, setup_django, test_database, timed
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.content.models import ContentBlock, PlatformContent  # noqa: E402
+from apps.content.serializers import ContentBlockSerializer  # noqa: E402
+from apps.keywords.models import KeywordResearch  # noqa: E402
+from apps.keywords.serializers import KeywordResearchSerializer  # noqa: E402
+from keyword_list import seed as seed_keywords  # noqa: E402
+from viral_ai import renderers  # noqa: E402
+
+
+def seed_content(user, rows):
+    for n in range(rows):
+        block = ContentBlock.objects.create(user=user, title=f'Post {n} - carousel', keyword_text=f'topic {n}')
+        for platform in ('instagram', 'linkedin', 'twitter', 'tiktok'):
+            PlatformContent.objects.create(
+                content_block=block,
+                platform=platform,
+                content_type='carousel',
+                caption='Generated caption with some emoji ✨ and a call to action. ' * 6,
+                hashtags=[f'#tag{i}' for i in range(15)],
+                content_data={
+                    'hook': 'Stop scrolling - this changes everything',
+                    'cta': 'Save this for later',
+                    'slides': [{'title': f'Slide {i}', 'body': 'Tip text ' * 12} for i in range(8)],
+                },
+                images=[f'https://cdn.example.com/{n}/{i}.png' for i in range(5)],
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    if renderers.orjson is None:
+        print('orjson is not installed - FastJSONRenderer will use the stdlib fallback')
+
+    with test_database():
+        user = get_user_model().objects.create_user(email='bench@example.com', username='bench', password='bench')
+        seed_keywords(user, 20)
+        seed_content(user, 20)
+
+        shapes = {
+            'keyword research x20': KeywordResearchSerializer(KeywordResearch.objects.all(), many=True).data,
+            'content blocks x20': ContentBlockSerializer(
+                ContentBlock.objects.prefetch_related('platform_versions'), many=True
+            ).data,
+        }
+
+        rows = [('', 'bytes', 'stdlib ms', 'fast ms', 'speedup')]
+        for name, data in shapes.items():
+            body = JSONRenderer().render(data)
+            stdlib_time, _ = timed(lambda: JSONRenderer().render(data), repeat=args.repeat)
+            fast_time, _ = timed(lambda: renderers.FastJSONRenderer().render(data), repeat=args.repeat)
+            rows.append((f'render {name}', len(body), f'{stdlib_time * 1000:.2f}', f'{fast_time * 1000:.2f}',
+                         f'{stdlib_time / fast_time:.1f}x'))
+
+            stdlib_time, _ = timed(lambda: JSONParser().parse(io.BytesIO(body)), repeat=args.repeat)
+            fast_time, _ = timed(lambda: renderers.FastJSONParser().parse(io.BytesIO(body)), repeat=args.repeat)
+            rows.append((f'parse {name}', len(body), f'{stdlib_time * 1000:.2f}', f'{fast_time * 1000:.2f}',
+                         f'{stdlib_time / fast_time:.1f}x'))
+
+        report(f'JSON rendering/parsing (median of {args.repeat})', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Keyword research list: full payload vs summary representation
+
+    python benchmarks/keyword_list.py [--rows 200] [--repeat 20]
+
+Creates research rows with realistic suggestion payloads in a throwaway
+database, then compares the old full-payload list (KeywordResearchSerializer
+over every column) with the summary list endpoint.
+"""
+import argparse
+
+from common import report, setup_django, test_database, timed
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.keywords.models import KeywordResearch  # noqa: E402
+from apps.keywords.serializers import KeywordResearchSerializer  # noqa: E402
+from apps.keywords.services import KeywordResearchService  # noqa: E402
+
+
+def categories(keyword, terms):
+    return [
+        {
+            'category': term,
+            'query': f'{keyword} {term}',
+            'suggestions': [
+                {'keyword': f'{keyword} {term} suggestion {i}', 'popularity_score': 10 - i, 'estimated_volume': '1K-5K'}
+                for i in range(10)
+            ],
+            'count': 10,
+        }
+        for term in terms
+    ]
+
+
+def seed(user, rows):
+    service = KeywordResearchService
+    for n in range(rows):
+        keyword = f'keyword {n}'
+        KeywordResearch.objects.create(
+            user=user,
+            keyword=keyword,
+            search_volume=400,
+            questions=categories(keyword, service.QUESTIONS),
+            prepositions=categories(keyword, service.PREPOSITIONS),
+            alphabetical=categories(keyword, service.ALPHABET),
+            comparisons=categories(keyword, ['vs', 'versus', 'or', 'compared to', 'better than']),
+            related_keywords=[f'{keyword} related {i}' for i in range(20)],
+            platform_breakdown={'youtube': {'count': 3, 'percentage': 100.0}},
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with test_database(), override_settings(ALLOWED_HOSTS=['*']):
+        user = get_user_model().objects.create_user(email='bench@example.com', username='bench', password='bench')
+        seed(user, args.rows)
+
+        client = APIClient()
+        client.force_authenticate(user)
+        page = 'page_size=100&pagination=cursor'
+
+        def full_list():
+            rows = KeywordResearch.objects.filter(user=user)[:100]
+            return JSONRenderer().render(KeywordResearchSerializer(rows, many=True).data)
+
+        def summary_list():
+            return client.get(f'/api/keywords/?{page}').content
+
+        full_time, full_body = timed(full_list, repeat=args.repeat)
+        summary_time, summary_body = timed(summary_list, repeat=args.repeat)
+
+        report(f'Keyword research list, 100 of {args.rows} rows (median of {args.repeat})', [
+            ('', 'bytes', 'ms'),
+            ('full payload', len(full_body), f'{full_time * 1000:.1f}'),
+            ('summary', len(summary_body), f'{summary_time * 1000:.1f}'),
+            ('ratio', f'{len(full_body) / len(summary_body):.1f}x', f'{full_time / summary_time:.1f}x'),
+        ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Platform breakdown: substring loop vs the word-level Aho-Corasick classifier
+
+    python benchmarks/platform_breakdown.py [--suggestions 20000] [--repeat 10]
+
+Generates autocomplete-like suggestions mixing indicator words with filler
+(including words that merely contain an indicator, like "network"), then
+times the old suggestion x platform x indicator substring loop against
+calculate_platform_breakdown and reports how many substring hits were
+inside other words.
+"""
+import argparse
+import random
+
+from common import report, setup_django, timed
+
+setup_django()
+
+from apps.keywords.platform_classifier import platform_indicators  # noqa: E402
+from apps.keywords.services import KeywordResearchService  # noqa: E402
+
+FILLER = [
+    'ai', 'best', 'free', 'online', 'near me', 'for kids', 'network', 'homework', 'storage', 'soundcloud',
+    'photography', 'newsletter', 'jobless', 'coursera', 'guidelines', 'reviewer', 'app', '2024', 'price',
+    'download', 'ideas', 'examples', 'course', 'vs', 'without',
+]
+
+# Pre-change vocabulary, for the substring loop
+LEGACY_INDICATORS = {
+    'instagram': ['photo', 'picture', 'image', 'aesthetic', 'feed', 'story', 'reel'],
+    'tiktok': ['video', 'trend', 'viral', 'dance', 'challenge', 'sound'],
+    'linkedin': ['professional', 'career', 'business', 'job', 'work', 'industry'],
+    'twitter': ['news', 'update', 'tweet', 'thread', 'breaking'],
+    'youtube': ['tutorial', 'how to', 'guide', 'review', 'watch'],
+}
+
+
+def substring_scores(suggestions, indicators):
+    scores = {platform: 0 for platform in indicators}
+    for suggestion in suggestions:
+        suggestion_lower = suggestion.lower()
+        for platform, words in indicators.items():
+            for indicator in words:
+                if indicator in suggestion_lower:
+                    scores[platform] += 1
+    return scores
+
+
+def make_suggestions(count, seed=7):
+    rng = random.Random(seed)
+    vocabulary = [word for words in platform_indicators().values() for word in words] + FILLER * 4
+    return [
+        ' '.join(['ai'] + rng.sample(vocabulary, rng.randint(1, 4)))
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--suggestions', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    suggestions = make_suggestions(args.suggestions)
+    service = KeywordResearchService('ai')
+    indicators = platform_indicators()
+    vocabulary_size = sum(len(words) for words in indicators.values())
+
+    legacy_time, _ = timed(lambda: substring_scores(suggestions, LEGACY_INDICATORS), repeat=args.repeat)
+    large_time, substring_hits = timed(lambda: substring_scores(suggestions, indicators), repeat=args.repeat)
+    classifier_time, breakdown = timed(lambda: service.calculate_platform_breakdown(suggestions), repeat=args.repeat)
+    word_hits = sum(platform['count'] for platform in breakdown.values())
+
+    report(f'Platform breakdown of {len(suggestions)} suggestions', [
+        ('', 'ms', 'matches'),
+        ('substring loop, old vocabulary (31 indicators)', f'{legacy_time * 1000:.1f}',
+         sum(substring_scores(suggestions, LEGACY_INDICATORS).values())),
+        (f'substring loop, current vocabulary ({vocabulary_size})', f'{large_time * 1000:.1f}',
+         sum(substring_hits.values())),
+        (f'Aho-Corasick, current vocabulary ({vocabulary_size})', f'{classifier_time * 1000:.1f}', word_hits),
+        ('speedup at the same vocabulary', f'{large_time / classifier_time:.1f}x', ''),
+    ])
+
+
+if __name__ == '__main__':
+    main()
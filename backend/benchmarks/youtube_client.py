@@ -0,0 +1,62 @@
+"""
+YouTube client construction: build() per request vs the shared lazy client
+
+    python benchmarks/youtube_client.py [--repeat 50]
+
+Measures what every research request used to pay before its first API
+call - build('youtube', 'v3') loading and parsing the ~400 KB discovery
+document - against YouTubeResearchService with the process-wide client.
+Neither side touches the network: requests are built but not executed.
+"""
+import argparse
+import time
+
+from common import report, setup_django, timed
+
+setup_django()
+
+from googleapiclient.discovery import build  # noqa: E402
+
+from apps.keywords import youtube_service  # noqa: E402
+from apps.keywords.youtube_service import YouTubeResearchService, reset_youtube_clients  # noqa: E402
+
+API_KEY = 'benchmark-key'
+
+
+def prepare_request(youtube):
+    return youtube.search().list(q='ai tools', part='id', maxResults=50, type='video')
+
+
+def per_request_build():
+    # Pre-change behaviour: a fresh client in every service instance
+    return prepare_request(build('youtube', 'v3', developerKey=API_KEY, cache_discovery=False))
+
+
+def shared_client():
+    return prepare_request(YouTubeResearchService(api_key=API_KEY).youtube)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    reset_youtube_clients()
+    started = time.perf_counter()
+    youtube_service.get_youtube_client(API_KEY)
+    first_use = time.perf_counter() - started
+
+    build_time, _ = timed(per_request_build, repeat=args.repeat)
+    shared_time, _ = timed(shared_client, repeat=args.repeat)
+
+    report('YouTube client overhead per research request', [
+        ('', 'ms'),
+        ('build() per request', f'{build_time * 1000:.2f}'),
+        ('shared client', f'{shared_time * 1000:.3f}'),
+        ('shared client, first use (once per process)', f'{first_use * 1000:.2f}'),
+        ('saved per request', f'{(build_time - shared_time) * 1000:.2f}  ({build_time / shared_time:.0f}x)'),
+    ])
+
+
+if __name__ == '__main__':
+    main()
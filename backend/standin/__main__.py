@@ -0,0 +1,81 @@
+"""
+Run the external API stand-in
+
+    python -m standin record --cassette recordings/                 # proxy to the real APIs, saving responses
+    python -m standin replay --cassette recordings/ --latency 150 --jitter 50 \\
+        --latency serpapi=900 --error-rate 0.02 --error-status 503 --seed 7
+
+Point the backend at it (see settings.py):
+
+    GOOGLE_AUTOCOMPLETE_URL=http://localhost:8900/google/complete/search
+    SERPAPI_BASE_URL=http://localhost:8900/serpapi/search.json
+    YOUTUBE_API_ENDPOINT=http://localhost:8900/youtube/
+    OPENAI_BASE_URL=http://localhost:8900/openai/v1
+    LITELLM_BASE_URL=http://localhost:8900/litellm/v1
+
+GET /_standin/stats reports hits, misses, recordings and injected errors.
+"""
+import argparse
+import logging
+
+from .server import RECORD, REPLAY, Cassette, FaultProfile, StandInServer
+
+
+def per_service(values, cast=float):
+    """['150', 'serpapi=900'] -> {'*': 150.0, 'serpapi': 900.0}"""
+    table = {}
+    for value in values or []:
+        service, _, number = value.rpartition('=')
+        table[service or '*'] = cast(number)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m standin', description='Record/replay stand-in for external APIs')
+    parser.add_argument('mode', choices=[RECORD, REPLAY])
+    parser.add_argument('--cassette', default='recordings', help='Directory holding recorded responses')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--upstream', action='append', help='Override an upstream origin, e.g. litellm=https://llm.example.com')
+    parser.add_argument('--latency', action='append', help='Added latency in ms, optionally per service (serpapi=900)')
+    parser.add_argument('--jitter', type=float, default=0, help='Uniform +/- latency jitter in ms')
+    parser.add_argument('--error-rate', action='append', help='Injected error probability, optionally per service')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--seed', type=int, default=None, help='Seed for repeatable latency/error sequences')
+    parser.add_argument('--on-miss', choices=['error', 'route'], default='error',
+                        help="'route' serves another recording of the same endpoint when the exact request wasn't recorded")
+    parser.add_argument('-v', '--verbose', action='store_true')
+    options = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if options.verbose else logging.INFO, format='%(asctime)s %(message)s')
+
+    upstreams = {}
+    for value in options.upstream or []:
+        service, _, origin = value.partition('=')
+        upstreams[service] = origin.rstrip('/')
+
+    server = StandInServer(
+        (options.host, options.port),
+        Cassette(options.cassette),
+        mode=options.mode,
+        upstreams=upstreams,
+        faults=FaultProfile(
+            latency_ms=per_service(options.latency),
+            jitter_ms=options.jitter,
+            error_rate=per_service(options.error_rate),
+            error_status=options.error_status,
+            seed=options.seed,
+        ),
+        on_miss=options.on_miss,
+    )
+    print(f'Stand-in {options.mode}ing on {server.url} (cassette: {options.cassette})')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
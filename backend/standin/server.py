@@ -0,0 +1,321 @@
+"""
+External API Stand-in
+Records real Google Autocomplete, SerpApi, YouTube and OpenAI-compatible responses,
+then replays them offline with configurable latency and error injection
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Path prefix on the stand-in -> real upstream origin
+UPSTREAMS = {
+    'google': 'http://suggestqueries.google.com',
+    'serpapi': 'https://serpapi.com',
+    'youtube': 'https://youtube.googleapis.com',
+    'openai': 'https://api.openai.com',
+    'litellm': 'https://litellm.ai-it.io',
+}
+
+# Never part of a recording key, and never written to disk
+SECRET_PARAMS = {'api_key', 'key', 'access_token'}
+FORWARDED_HEADERS = ('Authorization', 'Content-Type', 'Accept', 'User-Agent', 'OpenAI-Organization')
+
+# Image URLs in recorded generations point at this placeholder; it becomes
+# http://<stand-in host>/_standin/blobs/ when served
+BLOB_PLACEHOLDER = 'standin://blobs/'
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+
+class Cassette:
+    """
+    Recorded responses on disk, one JSON file per request
+
+    Files live in <directory>/<service>/<route key>-<request key>.json. The
+    request key covers method, path, query (minus secrets) and JSON body; the
+    route key only covers method and path, so a replay can fall back to any
+    recording of the same endpoint.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, '_blobs'), exist_ok=True)
+
+    @staticmethod
+    def _digest(*parts) -> str:
+        return hashlib.sha1(json.dumps(parts, sort_keys=True).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def normalize_body(body: bytes):
+        if not body:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            return hashlib.sha1(body).hexdigest()
+
+    def keys(self, service: str, method: str, path: str, query: str, body: bytes) -> Tuple[str, str]:
+        """(route key, request key) for a request"""
+        params = sorted((name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+                        if name not in SECRET_PARAMS)
+        route = self._digest(service, method, path)
+        return route, self._digest(route, params, self.normalize_body(body))
+
+    def _path(self, service: str, route: str, key: str) -> str:
+        return os.path.join(self.directory, service, f'{route}-{key}.json')
+
+    def load(self, service: str, route: str, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(service, route, key)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def load_for_route(self, service: str, route: str, key: str) -> Optional[Dict]:
+        """Any recording of the same endpoint, picked deterministically from the request key"""
+        folder = os.path.join(self.directory, service)
+        try:
+            names = sorted(name for name in os.listdir(folder) if name.startswith(f'{route}-'))
+        except FileNotFoundError:
+            return None
+        if not names:
+            return None
+        with open(os.path.join(folder, names[int(key, 16) % len(names)])) as f:
+            return json.load(f)
+
+    def save(self, service: str, route: str, key: str, entry: Dict):
+        path = self._path(service, route, key)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f'{path}.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(entry, f, indent=2, sort_keys=True)
+            os.replace(tmp, path)
+
+    def put_blob(self, content: bytes, content_type: str) -> str:
+        name = hashlib.sha1(content).hexdigest()
+        with open(os.path.join(self.directory, '_blobs', name), 'wb') as f:
+            f.write(content)
+        with open(os.path.join(self.directory, '_blobs', f'{name}.type'), 'w') as f:
+            f.write(content_type)
+        return name
+
+    def get_blob(self, name: str) -> Optional[Tuple[bytes, str]]:
+        if not re.fullmatch(r'[0-9a-f]{40}', name):
+            return None
+        try:
+            with open(os.path.join(self.directory, '_blobs', name), 'rb') as f:
+                content = f.read()
+            with open(os.path.join(self.directory, '_blobs', f'{name}.type')) as f:
+                return content, f.read()
+        except FileNotFoundError:
+            return None
+
+
+class FaultProfile:
+    """
+    Latency and error injection for replayed responses
+
+    Args:
+        latency_ms: Base latency per service ('*' is the default)
+        jitter_ms: Uniform +/- jitter added to the base latency
+        error_rate: Probability per service ('*' default) of an injected error
+        error_status: Status code of injected errors (429 adds Retry-After)
+        seed: Random seed, so a run's sequence of delays and errors repeats
+    """
+
+    def __init__(self, latency_ms: Optional[Dict[str, float]] = None, jitter_ms: float = 0,
+                 error_rate: Optional[Dict[str, float]] = None, error_status: int = 503, seed: Optional[int] = None):
+        self.latency_ms = latency_ms or {}
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate or {}
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _for(self, table: Dict[str, float], service: str) -> float:
+        return table.get(service, table.get('*', 0))
+
+    def draw(self, service: str) -> Tuple[float, bool]:
+        """(seconds to wait, whether to fail) for one request"""
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+            fail = self._random.random() < self._for(self.error_rate, service)
+        delay = max(self._for(self.latency_ms, service) + jitter, 0) / 1000
+        return delay, fail
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, cassette: Cassette, mode: str = REPLAY, upstreams: Optional[Dict[str, str]] = None,
+                 faults: Optional[FaultProfile] = None, on_miss: str = 'error'):
+        super().__init__(address, StandInHandler)
+        self.cassette = cassette
+        self.mode = mode
+        self.upstreams = {**UPSTREAMS, **(upstreams or {})}
+        self.faults = faults or FaultProfile()
+        self.on_miss = on_miss
+        self.stats = Counter()
+        self.stats_lock = threading.Lock()
+
+    def count(self, *names):
+        with self.stats_lock:
+            for name in names:
+                self.stats[name] += 1
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: StandInServer
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def do_GET(self):
+        self.handle_request()
+
+    def do_POST(self):
+        self.handle_request()
+
+    def handle_request(self):
+        url = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        if url.path.startswith('/_standin/'):
+            return self.handle_control(url.path)
+
+        service, _, path = url.path.lstrip('/').partition('/')
+        if service not in self.server.upstreams:
+            return self.send_json(404, {'error': f'Unknown service {service!r}', 'services': sorted(self.server.upstreams)})
+        path = f'/{path}'
+
+        cassette = self.server.cassette
+        route, key = cassette.keys(service, self.command, path, url.query, body)
+
+        if self.server.mode == RECORD:
+            entry = self.record(service, path, url.query, body)
+            if entry['status'] < 500 and entry['status'] != 429:
+                cassette.save(service, route, key, entry)
+                self.server.count('recorded', f'{service}.recorded')
+            return self.send_entry(entry)
+
+        delay, fail = self.server.faults.draw(service)
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self.server.count('injected_errors', f'{service}.injected_errors')
+            status = self.server.faults.error_status
+            headers = {'Retry-After': '1'} if status == 429 else {}
+            return self.send_json(status, {'error': {'message': 'Injected fault', 'type': 'standin_fault'}}, headers)
+
+        entry = cassette.load(service, route, key)
+        if entry is None and self.server.on_miss == 'route':
+            entry = cassette.load_for_route(service, route, key)
+        if entry is None:
+            self.server.count('misses', f'{service}.misses')
+            return self.send_json(404, {'error': {'message': f'No recording for {self.command} /{service}{path}',
+                                                  'type': 'standin_miss'}})
+
+        self.server.count('hits', f'{service}.hits')
+        self.send_entry(entry)
+
+    def handle_control(self, path: str):
+        if path == '/_standin/stats':
+            with self.server.stats_lock:
+                return self.send_json(200, {'mode': self.server.mode, **self.server.stats})
+        if path.startswith('/_standin/blobs/'):
+            blob = self.server.cassette.get_blob(path.rsplit('/', 1)[-1])
+            if blob:
+                return self.send_bytes(200, blob[0], blob[1])
+        self.send_json(404, {'error': 'Not found'})
+
+    def record(self, service: str, path: str, query: str, body: bytes) -> Dict:
+        """Forward to the real upstream and turn the response into a cassette entry"""
+        headers = {name: self.headers[name] for name in FORWARDED_HEADERS if self.headers.get(name)}
+        response = requests.request(
+            self.command,
+            f'{self.server.upstreams[service]}{path}',
+            params=parse_qsl(query, keep_blank_values=True),
+            data=body or None,
+            headers=headers,
+            timeout=120
+        )
+        content_type = response.headers.get('Content-Type', 'application/octet-stream')
+        content = response.content
+
+        if service in ('openai', 'litellm') and path.endswith('/images/generations') and response.status_code == 200:
+            content = self.capture_images(content)
+
+        entry = {
+            'status': response.status_code,
+            'content_type': content_type,
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'request': {'method': self.command, 'path': path,
+                        'query': urlencode([(k, v) for k, v in parse_qsl(query) if k not in SECRET_PARAMS])},
+        }
+        try:
+            entry['body'] = content.decode('utf-8')
+        except UnicodeDecodeError:
+            entry['body_base64'] = base64.b64encode(content).decode()
+        return entry
+
+    def capture_images(self, content: bytes) -> bytes:
+        """Store generated images locally; hosted image URLs expire and need the network"""
+        try:
+            payload = json.loads(content)
+            for item in payload.get('data', []):
+                if item.get('url'):
+                    image = requests.get(item['url'], timeout=60)
+                    image.raise_for_status()
+                    name = self.server.cassette.put_blob(image.content, image.headers.get('Content-Type', 'image/png'))
+                    item['url'] = f'{BLOB_PLACEHOLDER}{name}'
+            return json.dumps(payload).encode()
+        except Exception as e:
+            logger.warning(f"Could not capture generated images, keeping upstream URLs: {str(e)}")
+            return content
+
+    def send_entry(self, entry: Dict):
+        if 'body_base64' in entry:
+            content = base64.b64decode(entry['body_base64'])
+        else:
+            body = entry.get('body', '')
+            if BLOB_PLACEHOLDER in body:
+                body = body.replace(BLOB_PLACEHOLDER, f"http://{self.headers.get('Host')}/_standin/blobs/")
+            content = body.encode('utf-8')
+        self.send_bytes(entry['status'], content, entry.get('content_type', 'application/json'))
+
+    def send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+        self.send_bytes(status, json.dumps(payload).encode(), 'application/json', headers)
+
+    def send_bytes(self, status: int, content: bytes, content_type: str, headers: Optional[Dict] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(content)
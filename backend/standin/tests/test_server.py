@@ -0,0 +1,96 @@
+import glob
+import json
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from apps.keywords.serpapi_service import SerpApiTrendingService
+from standin.server import RECORD, REPLAY, Cassette, FaultProfile, StandInServer
+
+TRENDS = {'related_queries': {'top': [{'query': 'ai tools', 'value': 80}]}}
+
+
+class FakeSerpApi(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        FakeSerpApi.requests_seen.append(self.path)
+        body = json.dumps(TRENDS).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@override_settings(SERPAPI_KEY='test-key', SERPAPI_QUOTA_ENABLED=False)
+class StandInTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        FakeSerpApi.requests_seen = []
+
+    def start(self, mode, **kwargs):
+        server = serve(StandInServer(('127.0.0.1', 0), Cassette(self.directory), mode=mode, **kwargs))
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_record_then_replay_offline(self):
+        upstream = serve(ThreadingHTTPServer(('127.0.0.1', 0), FakeSerpApi))
+        recorder = self.start(RECORD, upstreams={'serpapi': f'http://127.0.0.1:{upstream.server_address[1]}'})
+
+        with self.settings(SERPAPI_BASE_URL=f'{recorder.url}/serpapi/search.json'):
+            recorded = SerpApiTrendingService().get_related_topics('AI')
+        upstream.shutdown()
+        upstream.server_close()
+
+        self.assertEqual(recorded['related_queries'], [{'query': 'ai tools', 'value': 80}])
+        self.assertIn('api_key=test-key', FakeSerpApi.requests_seen[0])
+        [recording] = glob.glob(f'{self.directory}/serpapi/*.json')
+        with open(recording) as f:
+            self.assertNotIn('test-key', f.read())
+
+        cache.clear()
+        replayer = self.start(REPLAY)
+        with self.settings(SERPAPI_BASE_URL=f'{replayer.url}/serpapi/search.json', SERPAPI_KEY='other-key'):
+            self.assertEqual(SerpApiTrendingService().get_related_topics('AI'), recorded)
+            self.assertIn('error', SerpApiTrendingService().get_related_topics('not recorded'))
+        self.assertEqual((replayer.stats['hits'], replayer.stats['misses']), (1, 1))
+
+    def test_latency_and_error_injection(self):
+        server = self.start(REPLAY, faults=FaultProfile(latency_ms={'*': 0, 'serpapi': 100}, error_rate={'openai': 1},
+                                                        error_status=429, seed=1))
+
+        started = time.monotonic()
+        requests.get(f'{server.url}/serpapi/search.json')
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+
+        response = requests.post(f'{server.url}/openai/v1/chat/completions', json={'messages': []})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '1')
+        self.assertEqual(requests.get(f'{server.url}/_standin/stats').json()['injected_errors'], 1)
+
+    def test_route_fallback_serves_another_recording_of_the_endpoint(self):
+        cassette = Cassette(self.directory)
+        route, key = cassette.keys('google', 'GET', '/complete/search', 'q=cats&client=firefox', b'')
+        cassette.save('google', route, key, {'status': 200, 'content_type': 'application/json', 'body': '["cats", ["cats memes"]]'})
+
+        server = self.start(REPLAY, on_miss='route')
+        response = requests.get(f'{server.url}/google/complete/search', params={'q': 'dogs', 'client': 'firefox'})
+        self.assertEqual(response.json(), ['cats', ['cats memes']])
@@ -0,0 +1,159 @@
+"""
+Background Jobs
+Runs batch jobs on background threads with a heartbeat, and re-queues jobs whose runner died
+
+Job models need `status` ('pending'/'running'/... /'failed'), `attempts`,
+`heartbeat_at`, `created_at` and `finished_at` fields. A runner is called as
+runner(job_id, heartbeat) and must:
+
+- pick up every item not yet recorded as finished, so a re-queued job resumes
+  where its last flush left off
+- call heartbeat.beat() from its loop (at least every few seconds)
+
+A restart or deploy kills the threads and leaves their jobs 'running' with a
+heartbeat that stops moving. recover_stale_jobs() claims those jobs again;
+it runs whenever a job of the same kind is started or a stale job is polled.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+
+class JobLost(Exception):
+    """Another runner claimed the job after this runner's heartbeat lapsed"""
+
+
+class Heartbeat:
+    """Keeps a claimed job's heartbeat_at current while its runner works"""
+
+    def __init__(self, model, job_id, attempt: int):
+        self.model = model
+        self.job_id = job_id
+        self.attempt = attempt
+        self.interval = getattr(settings, 'JOB_HEARTBEAT_INTERVAL', 15)
+        self._last = time.monotonic()
+
+    def beat(self, force: bool = False):
+        """
+        Record that the runner is alive (at most once per JOB_HEARTBEAT_INTERVAL)
+
+        Raises:
+            JobLost: The job was re-queued to another runner; stop without writing
+        """
+        if not force and time.monotonic() - self._last < self.interval:
+            return
+        # attempts only changes when the job is claimed, so a zero-row update means it was re-claimed
+        if not self.model.objects.filter(id=self.job_id, attempts=self.attempt).update(heartbeat_at=timezone.now()):
+            raise JobLost(f'{self.model.__name__} {self.job_id} was claimed by another runner')
+        self._last = time.monotonic()
+
+
+def _claim(model, job_id, attempts: int) -> bool:
+    """Take ownership of a job whose attempt count is still `attempts`"""
+    return bool(model.objects.filter(id=job_id, attempts=attempts, status__in=ACTIVE_STATUSES).update(
+        attempts=F('attempts') + 1, heartbeat_at=timezone.now()
+    ))
+
+
+def _run(model, runner: Callable, job_id, attempt: int):
+    try:
+        runner(job_id, Heartbeat(model, job_id, attempt))
+    except JobLost as e:
+        logger.warning(str(e))
+    except Exception as e:
+        logger.exception(f"{model.__name__} {job_id} crashed: {str(e)}")
+        model.objects.filter(id=job_id, attempts=attempt).update(status='failed', finished_at=timezone.now())
+
+
+def _run_in_thread(model, runner: Callable, job_id, attempt: int):
+    close_old_connections()
+    try:
+        _run(model, runner, job_id, attempt)
+    finally:
+        connection.close()
+
+
+def _launch(model, runner: Callable, job_id, attempt: int, inline: bool):
+    if inline:
+        _run(model, runner, job_id, attempt)
+        return
+    threading.Thread(
+        target=_run_in_thread, args=(model, runner, job_id, attempt),
+        name=f'{model._meta.model_name}-{job_id}', daemon=True
+    ).start()
+
+
+def stale_jobs(model, queryset=None):
+    """Active jobs whose heartbeat (or, never started, creation) is older than JOB_STALE_AFTER"""
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'JOB_STALE_AFTER', 120))
+    queryset = model.objects.all() if queryset is None else queryset
+    return queryset.filter(status__in=ACTIVE_STATUSES).filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, created_at__lt=cutoff)
+    )
+
+
+def recover_stale_jobs(model, runner: Callable, queryset=None, inline: bool = False) -> int:
+    """
+    Resume stale jobs, or fail them once they have used JOB_MAX_ATTEMPTS
+
+    Args:
+        model: Job model
+        runner: Function the jobs run with
+        queryset: Limit the sweep (e.g. to one polled job)
+        inline: Run resumed jobs in this thread (tests/debugging)
+
+    Returns:
+        Number of jobs re-queued
+    """
+    max_attempts = getattr(settings, 'JOB_MAX_ATTEMPTS', 3)
+    resumed = 0
+    for job_id, attempts in stale_jobs(model, queryset).values_list('id', 'attempts'):
+        if attempts >= max_attempts:
+            if model.objects.filter(id=job_id, attempts=attempts).update(status='failed', finished_at=timezone.now()):
+                logger.error(f"{model.__name__} {job_id} failed: runner died {attempts} times")
+            continue
+        if _claim(model, job_id, attempts):
+            logger.warning(f"Resuming stale {model.__name__} {job_id} (attempt {attempts + 1})")
+            _launch(model, runner, job_id, attempts + 1, inline)
+            resumed += 1
+    return resumed
+
+
+def start_job(job, runner: Callable, inline: bool = False):
+    """
+    Run a new job in the background once the request's transaction has committed
+
+    Stale jobs of the same model are resumed at the same time.
+
+    Args:
+        job: Saved job with attempts = 0
+        runner: Called as runner(job_id, heartbeat)
+        inline: Run in this thread before returning (tests/debugging)
+    """
+    model = type(job)
+
+    def _start():
+        recover_stale_jobs(model, runner, inline=inline)
+        if _claim(model, job.id, 0):
+            _launch(model, runner, job.id, 1, inline)
+
+    if inline:
+        _start()
+    else:
+        transaction.on_commit(_start)
+
+
+def resume_if_stale(jobs, runner: Callable, inline: bool = False) -> bool:
+    """Resume the job in `jobs` (e.g. the one being polled) if its runner has died - one query when it hasn't"""
+    return bool(recover_stale_jobs(jobs.model, runner, jobs, inline=inline))
@@ -0,0 +1,89 @@
+"""
+Conditional GET
+Cheap ETag/Last-Modified validators for viewsets, checked before serialization
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Answers unchanged list/retrieve requests with 304 without serializing
+
+    Validators come from one aggregate query over the rows the response
+    would contain: the latest timestamp of each `conditional_timestamp_fields`
+    path (e.g. 'updated_at', 'platform_versions__updated_at') plus row counts,
+    so edits, inserts and deletes all change the ETag.
+
+    Last-Modified is only sent for a single object whose timestamps are all
+    its own. A deleted list row or related row leaves the latest timestamp
+    unchanged, so an If-Modified-Since check there would answer a stale 304;
+    those responses rely on the ETag alone.
+
+    Views without usable timestamps can leave the fields empty - responses
+    still get a content-hash ETag from ConditionalGetMiddleware, which saves
+    the transfer but not the serialization.
+    """
+
+    conditional_timestamp_fields = ()
+
+    def _validators(self, queryset):
+        aggregates = {'rows': Count('pk', distinct=True)}
+        for index, path in enumerate(self.conditional_timestamp_fields):
+            aggregates[f'latest_{index}'] = Max(path)
+            relation = path.rpartition('__')[0]
+            if relation:
+                aggregates[f'rows_{index}'] = Count(f'{relation}__pk', distinct=True)
+
+        values = queryset.order_by().aggregate(**aggregates)
+
+        timestamps = [value for key, value in values.items() if key.startswith('latest_') and value]
+        last_modified = max(timestamps) if timestamps else None
+
+        # Responses differ per user, URL (page, cursor, fields) and renderer
+        fingerprint = '|'.join([
+            str(getattr(self.request.user, 'pk', '')),
+            self.request.get_full_path(),
+            str(getattr(self.request, 'accepted_media_type', '')),
+            *(f'{key}={values[key]!r}' for key in sorted(values)),
+        ])
+        etag = quote_etag(hashlib.md5(fingerprint.encode()).hexdigest())
+        return etag, last_modified, values['rows']
+
+    def _conditional(self, queryset, handler, request, *args, single=False, **kwargs):
+        if not self.conditional_timestamp_fields or request.method not in ('GET', 'HEAD'):
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified, rows = self._validators(queryset)
+        own_timestamps = not any('__' in path for path in self.conditional_timestamp_fields)
+        last_modified_ts = int(last_modified.timestamp()) if last_modified and single and own_timestamps else None
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+        if not_modified is not None and rows:
+            patch_vary_headers(not_modified, ('Accept', 'Authorization', 'Cookie'))
+            return not_modified
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified_ts is not None:
+                response['Last-Modified'] = http_date(last_modified_ts)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self._conditional(queryset, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset().filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+        return self._conditional(queryset, super().retrieve, request, *args, single=True, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        # ETags are per user; keep shared caches from mixing them up
+        patch_vary_headers(response, ('Authorization', 'Cookie'))
+        return response
@@ -0,0 +1,64 @@
+"""
+Pagination
+Page-number pagination by default, cursor pagination on request
+"""
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination over created_at
+
+    Walks the (user, -created_at) indexes instead of OFFSET scans, and
+    skips the COUNT(*) query - deep pages cost the same as the first one.
+    """
+    ordering = '-created_at'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class HybridPagination(BasePagination):
+    """
+    Page numbers for existing clients, cursors for large lists
+
+    GET /api/content/blocks/?page=3                  -> page-number response (count/next/previous)
+    GET /api/content/blocks/?pagination=cursor       -> first cursor page (next/previous)
+    GET /api/content/blocks/?cursor=cD0yMDI2LTEw...  -> following cursor pages
+    """
+    page_number_class = PageNumberPagination
+    cursor_class = CreatedAtCursorPagination
+
+    def __init__(self):
+        self.page_number = self.page_number_class()
+        self.cursor = self.cursor_class()
+        self.active = self.page_number
+
+    @property
+    def display_page_controls(self):
+        return self.active.display_page_controls
+
+    def uses_cursor(self, request) -> bool:
+        params = request.query_params
+        return self.cursor.cursor_query_param in params or params.get('pagination') == 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.active = self.cursor if self.uses_cursor(request) else self.page_number
+        return self.active.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.active.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.active.to_html()
+
+    def get_results(self, data):
+        return self.active.get_results(data)
+
+    def get_schema_operation_parameters(self, view):
+        return (
+            self.page_number.get_schema_operation_parameters(view)
+            + self.cursor.get_schema_operation_parameters(view)
+        )
@@ -0,0 +1,98 @@
+"""
+Fast JSON
+orjson-backed renderer/parser with a stdlib fallback when orjson isn't installed
+"""
+import math
+
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+_drf_encoder = encoders.JSONEncoder()
+
+
+def _orjson_default(obj):
+    """Fallback for types orjson doesn't handle natively (Decimal, lazy strings, querysets...)"""
+    return _drf_encoder.default(obj)
+
+
+# Datetimes/dates/times go through DRF's encoder too, so output matches the stdlib renderer
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+
+def _has_non_finite(data) -> bool:
+    """Whether data holds a NaN or infinite float anywhere (orjson writes those as null)"""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer using orjson
+
+    Produces the same output as DRF's renderer for compact, unicode JSON (the
+    defaults): U+2028/U+2029 are escaped as DRF does, and NaN/Infinity raise
+    ValueError under STRICT_JSON (or render as the stdlib does without it)
+    instead of orjson's silent null. Indented output and settings orjson
+    can't honour (ASCII-only, non-compact) fall back to the stdlib renderer.
+    """
+
+    def _can_use_orjson(self, accepted_media_type, renderer_context) -> bool:
+        if orjson is None or not self.compact or self.ensure_ascii:
+            return False
+        return self.get_indent(accepted_media_type, renderer_context or {}) is None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not self._can_use_orjson(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(data, default=_orjson_default, option=ORJSON_OPTIONS)
+
+        # Non-finite floats come out as null, so only output with a null needs the walk
+        if b'null' in ret and _has_non_finite(data):
+            if self.strict:
+                raise ValueError('Out of range float values are not JSON compliant')
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Valid JSON but not valid JavaScript; DRF escapes these line separators too
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser using orjson; falls back to the stdlib parser without it"""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read() if stream is not None else b''
+            if encoding.lower().replace('-', '') != 'utf8':
+                body = body.decode(encoding).encode('utf-8')
+            return orjson.loads(body)
+        except (ValueError, UnicodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
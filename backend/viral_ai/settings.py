@@ -64,6 +64,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',  # Content-hash ETags + 304s for GET responses
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS middleware
     'django.middleware.common.CommonMiddleware',
@@ -104,6 +105,11 @@ DATABASES = {
     }
 }
 
+# Cache (e.g. CACHE_URL=redis://localhost:6379/1 in production; per-process memory by default)
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -163,6 +169,20 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
 }
 
+# orjson-backed JSON renderer/parser (viral_ai/renderers.py); falls back to the
+# stdlib encoder when orjson isn't installed
+API_FAST_JSON = env.bool('API_FAST_JSON', default=True)
+if API_FAST_JSON:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'viral_ai.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = [
+        'viral_ai.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ]
+
 # JWT Settings
 from datetime import timedelta
 
@@ -222,11 +242,153 @@ CSRF_TRUSTED_ORIGINS = env.list(
 LITELLM_API_KEY = env('LITELLM_API_KEY', default='')
 LITELLM_BASE_URL = env('LITELLM_BASE_URL', default='https://litellm.ai-it.io/v1')
 
+# LLM provider client layer (apps/content/providers.py)
+LLM_REQUEST_TIMEOUT = env.int('LLM_REQUEST_TIMEOUT', default=60)  # seconds per call
+LLM_RETRY_MAX_ATTEMPTS = env.int('LLM_RETRY_MAX_ATTEMPTS', default=3)
+LLM_RETRY_BASE_DELAY = env.float('LLM_RETRY_BASE_DELAY', default=1.0)  # seconds, doubled per attempt + jitter
+LLM_RETRY_MAX_DELAY = env.float('LLM_RETRY_MAX_DELAY', default=8.0)
+LLM_RATE_LIMIT_MAX_WAIT = env.float('LLM_RATE_LIMIT_MAX_WAIT', default=10.0)  # seconds to queue for a token
+LLM_BREAKER_FAILURE_THRESHOLD = env.int('LLM_BREAKER_FAILURE_THRESHOLD', default=5)
+LLM_BREAKER_RESET_SECONDS = env.int('LLM_BREAKER_RESET_SECONDS', default=30)
+# Requests per minute per model (token bucket per provider + model)
+LLM_RATE_LIMITS = {
+    'gpt-4o-mini': 500,
+    'gpt-4o': 500,
+    'dall-e-3': 7,
+    'gpt-image-1': 7,
+    'default': 60,
+}
+# Provider -> models that accept response_format={"type": "json_object"}
+LLM_JSON_MODE_MODELS = {
+    'openai': ['gpt-4o-mini', 'gpt-4o'],
+    'litellm': env.list('LITELLM_JSON_MODE_MODELS', default=['gpt-4o-mini', 'gpt-4o']),
+}
+# USD per 1M tokens (input/output) or per image, for usage accounting
+LLM_PRICING = {
+    'gpt-4o-mini': {'input': 0.15, 'output': 0.60},
+    'gpt-4o': {'input': 2.50, 'output': 10.00},
+    'dall-e-3': {'image': 0.040},
+    'gpt-image-1': {'image': 0.042},
+}
+
+# Background job runner (viral_ai/background_jobs.py): seconds between a running job's
+# heartbeats, seconds without one before the job counts as orphaned and is resumed,
+# and how many runners a job may go through before it is failed
+JOB_HEARTBEAT_INTERVAL = env.int('JOB_HEARTBEAT_INTERVAL', default=15)
+JOB_STALE_AFTER = env.int('JOB_STALE_AFTER', default=120)
+JOB_MAX_ATTEMPTS = env.int('JOB_MAX_ATTEMPTS', default=3)
+
+# Batch content generation (apps/content/batch.py)
+CONTENT_BATCH_MAX_ITEMS = env.int('CONTENT_BATCH_MAX_ITEMS', default=100)  # specs per request
+CONTENT_BATCH_WORKERS = env.int('CONTENT_BATCH_WORKERS', default=8)  # shared worker pool size
+CONTENT_BATCH_FLUSH_SIZE = env.int('CONTENT_BATCH_FLUSH_SIZE', default=10)  # blocks per bulk insert
+CONTENT_BATCH_RUN_INLINE = env.bool('CONTENT_BATCH_RUN_INLINE', default=False)  # run in the request (tests/debugging)
+# Concurrent generations per user, by subscription tier
+CONTENT_BATCH_USER_CONCURRENCY = {
+    'free': 1,
+    'creator': 2,
+    'pro': 3,
+    'agency': 5,
+}
+
 # AI API Keys
 ANTHROPIC_API_KEY = env('ANTHROPIC_API_KEY', default='')
 OPENAI_API_KEY = env('OPENAI_API_KEY', default='')
 YOUTUBE_API_KEY = env('YOUTUBE_API_KEY', default='')
 
+# Upstream endpoints - override to point at the record/replay stand-in
+# (python -m standin) for offline benchmarks and load tests
+GOOGLE_AUTOCOMPLETE_URL = env('GOOGLE_AUTOCOMPLETE_URL', default='http://suggestqueries.google.com/complete/search')
+SERPAPI_BASE_URL = env('SERPAPI_BASE_URL', default='https://serpapi.com/search.json')
+YOUTUBE_API_ENDPOINT = env('YOUTUBE_API_ENDPOINT', default='')  # empty: Google's endpoint
+OPENAI_BASE_URL = env('OPENAI_BASE_URL', default='')  # empty: api.openai.com
+
+# Keyword research reuse (apps/keywords/research_cache.py): seconds a research
+# result is reused for the same keyword/country/language, and whether another
+# user's result may be reused (built only from public autocomplete data). Reuse
+# adds a reference row whose shared_from points at the source instead of copying
+# its suggestions; hand_over_shared_research moves them to a reference row when
+# the source is deleted
+KEYWORD_RESEARCH_CACHE_TTL = env.int('KEYWORD_RESEARCH_CACHE_TTL', default=86400)
+KEYWORD_RESEARCH_SHARED_CACHE = env.bool('KEYWORD_RESEARCH_SHARED_CACHE', default=True)
+
+# Keyword expansion crawler (GET /api/keywords/expand/): caps on the depth and
+# autocomplete requests a client can ask for, and requests in flight per crawl
+KEYWORD_EXPANSION_MAX_DEPTH = env.int('KEYWORD_EXPANSION_MAX_DEPTH', default=3)
+KEYWORD_EXPANSION_MAX_REQUESTS = env.int('KEYWORD_EXPANSION_MAX_REQUESTS', default=300)
+KEYWORD_EXPANSION_WORKERS = env.int('KEYWORD_EXPANSION_WORKERS', default=4)
+
+# Bulk keyword research (apps/keywords/bulk.py)
+KEYWORD_BULK_MAX_KEYWORDS = env.int('KEYWORD_BULK_MAX_KEYWORDS', default=100)  # keywords per request
+KEYWORD_BULK_WORKERS = env.int('KEYWORD_BULK_WORKERS', default=16)  # shared autocomplete fetch pool size
+KEYWORD_BULK_JOB_CONCURRENCY = env.int('KEYWORD_BULK_JOB_CONCURRENCY', default=8)  # queries in flight per job
+KEYWORD_BULK_FLUSH_SIZE = env.int('KEYWORD_BULK_FLUSH_SIZE', default=10)  # research rows per bulk insert
+KEYWORD_BULK_RUN_INLINE = env.bool('KEYWORD_BULK_RUN_INLINE', default=False)  # run in the request (tests/debugging)
+
+# Suggestion store (apps/keywords/suggestion_index.py): seconds before a process
+# rebuilds its in-memory prefix index from the table, and the fewest local
+# completions GET /api/keywords/autocomplete/ returns before asking Google
+SUGGESTION_INDEX_REFRESH = env.int('SUGGESTION_INDEX_REFRESH', default=300)
+AUTOCOMPLETE_MIN_LOCAL_RESULTS = env.int('AUTOCOMPLETE_MIN_LOCAL_RESULTS', default=5)
+
+# Extra platform indicator words/phrases for the research platform breakdown,
+# added to the defaults in apps/keywords/platform_classifier.py, e.g.
+# {'youtube': ['full episode'], 'pinterest': ['diy', 'recipe']}
+PLATFORM_INDICATORS = {}
+
+# Stored interest over time (apps/keywords/trend_series.py): seconds before a series'
+# newest window is fetched again, and the most points a chart request returns
+TREND_SERIES_REFRESH = env.int('TREND_SERIES_REFRESH', default=6 * 60 * 60)
+TREND_SERIES_MAX_POINTS = env.int('TREND_SERIES_MAX_POINTS', default=200)
+
+# SerpApi response cache (apps/keywords/caching.py): seconds each search stays fresh,
+# then how long a stale copy is served while it refreshes in the background
+SERPAPI_CACHE_TTLS = {
+    'trending_now': env.int('SERPAPI_TRENDING_TTL', default=30 * 60),
+    'interest_over_time': env.int('SERPAPI_INTEREST_TTL', default=6 * 60 * 60),
+    'related_topics': env.int('SERPAPI_RELATED_TTL', default=6 * 60 * 60),
+    'niche_keywords': env.int('SERPAPI_NICHE_TTL', default=3 * 60 * 60),
+    'default': 60 * 60,
+}
+SERPAPI_CACHE_STALE_TTL = env.int('SERPAPI_CACHE_STALE_TTL', default=24 * 60 * 60)
+
+# SerpApi quota (apps/keywords/quota.py): daily searches across the plan, the share
+# background pre-warms may use, per-user budgets by tier, and concurrent searches
+# (interactive requests are queued ahead of background ones)
+SERPAPI_QUOTA_ENABLED = env.bool('SERPAPI_QUOTA_ENABLED', default=True)
+SERPAPI_DAILY_BUDGET = env.int('SERPAPI_DAILY_BUDGET', default=1000)
+SERPAPI_BACKGROUND_SHARE = env.float('SERPAPI_BACKGROUND_SHARE', default=0.5)
+SERPAPI_USER_DAILY_BUDGETS = {
+    'free': 20,
+    'creator': 100,
+    'pro': 300,
+    'agency': 1000,
+}
+SERPAPI_MAX_CONCURRENT = env.int('SERPAPI_MAX_CONCURRENT', default=4)
+SERPAPI_QUEUE_TIMEOUT = env.int('SERPAPI_QUEUE_TIMEOUT', default=30)
+
+# YouTube Data API caches (youtube_service.py): keyword search -> video ids, and
+# per-video statistics shared across keywords
+YOUTUBE_SEARCH_CACHE_TTL = env.int('YOUTUBE_SEARCH_CACHE_TTL', default=24 * 60 * 60)
+YOUTUBE_VIDEO_STATS_TTL = env.int('YOUTUBE_VIDEO_STATS_TTL', default=6 * 60 * 60)
+YOUTUBE_STALE_TTL = env.int('YOUTUBE_STALE_TTL', default=7 * 24 * 60 * 60)  # kept for when quota runs out
+
+# YouTube quota (apps/keywords/youtube_quota.py): daily units, and the share of the quota
+# left below which lookups degrade - smaller searches, then no searches (known video ids)
+YOUTUBE_QUOTA_ENABLED = env.bool('YOUTUBE_QUOTA_ENABLED', default=True)
+YOUTUBE_DAILY_QUOTA = env.int('YOUTUBE_DAILY_QUOTA', default=10000)
+YOUTUBE_DEGRADE_THRESHOLDS = {
+    'reduced': 0.5,
+    'no_search': 0.1,
+}
+YOUTUBE_REDUCED_MAX_RESULTS = env.int('YOUTUBE_REDUCED_MAX_RESULTS', default=20)
+
+# Niche snapshots (manage.py prewarm_niches): geos to pre-compute, keywords kept per
+# snapshot, and the age after which the endpoint falls back to a live search
+NICHE_PREWARM_GEOS = env.list('NICHE_PREWARM_GEOS', default=['US', 'GB', 'CA', 'AU', 'IN'])
+NICHE_SNAPSHOT_SIZE = env.int('NICHE_SNAPSHOT_SIZE', default=50)
+NICHE_SNAPSHOT_MAX_AGE = env.int('NICHE_SNAPSHOT_MAX_AGE', default=48 * 60 * 60)
+
 # Stripe Configuration (Placeholder)
 STRIPE_PUBLIC_KEY = env('STRIPE_PUBLIC_KEY', default='')
 STRIPE_SECRET_KEY = env('STRIPE_SECRET_KEY', default='')
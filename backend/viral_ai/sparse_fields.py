@@ -0,0 +1,155 @@
+"""
+Sparse Fieldsets
+`?fields=` support for serializers and the querysets behind them
+"""
+from typing import Dict, Optional
+
+from django.db.models import Prefetch
+from django.core.exceptions import FieldDoesNotExist
+
+FIELDS_PARAM = 'fields'
+
+
+def parse_fields_param(value: Optional[str]) -> Dict:
+    """
+    Parse a fields parameter into a tree
+
+    "id,title,platform_versions.caption" ->
+    {'id': {}, 'title': {}, 'platform_versions': {'caption': {}}}
+
+    An empty subtree means "all of this field's subfields".
+    """
+    tree = {}
+    if not value:
+        return tree
+
+    for path in value.split(','):
+        node = tree
+        for part in path.strip().split('.'):
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Drops fields a client didn't ask for
+
+    Root serializers read ?fields= from the request in their context; nested
+    serializers using the mixin are restricted by their parent. `id` is always
+    kept so clients can fetch the full object.
+
+    Can also be passed explicitly: MySerializer(obj, fields={'id': {}, 'title': {}})
+    """
+
+    always_included = ('id',)
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is None:
+            request = self.context.get('request')
+            if request is not None and getattr(request, 'method', 'GET') == 'GET':
+                fields = parse_fields_param(request.query_params.get(FIELDS_PARAM))
+
+        if fields:
+            self.restrict_fields(fields)
+
+    def restrict_fields(self, tree: Dict):
+        keep = set(tree) | set(self.always_included)
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
+
+        for name, subtree in tree.items():
+            if not subtree or name not in self.fields:
+                continue
+            nested = getattr(self.fields[name], 'child', self.fields[name])
+            if isinstance(nested, SparseFieldsetSerializerMixin):
+                nested.restrict_fields(subtree)
+
+
+def _model_columns(serializer, model, prefetch_lookups):
+    """
+    Column names a (restricted) serializer reads, plus Prefetch objects for nested relations
+
+    Returns (None, None) if any field can't be mapped to a column (e.g. a
+    SerializerMethodField), in which case nothing should be deferred.
+    """
+    columns = []
+    prefetches = []
+
+    for field in serializer.fields.values():
+        source = field.source
+        if source == '*' or '.' in source:
+            return None, None
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return None, None
+
+        if model_field.concrete and not model_field.many_to_many:
+            columns.append(source)
+            continue
+
+        # Reverse relation rendered by a nested serializer (e.g. platform_versions)
+        nested = getattr(field, 'child', field)
+        if source not in prefetch_lookups or not hasattr(nested, 'fields'):
+            return None, None
+        related_model = model_field.related_model
+        nested_columns, _ = _model_columns(nested, related_model, ())
+        if nested_columns is None:
+            return None, None
+        nested_columns.append(model_field.field.name)  # FK back to the parent, needed to match rows
+        prefetches.append(Prefetch(source, queryset=related_model._default_manager.only(*nested_columns)))
+
+    return columns, prefetches
+
+
+class SparseFieldsetViewMixin:
+    """
+    Loads only the columns a ?fields= request will render
+
+    Applies .only() on list/retrieve so heavy JSON columns aren't read from
+    the database at all, and narrows prefetched relations the same way.
+    """
+
+    sparse_fieldset_actions = ('list', 'retrieve')
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        if getattr(self, 'action', None) not in self.sparse_fieldset_actions:
+            return queryset
+        if not self.request.query_params.get(FIELDS_PARAM):
+            return queryset
+
+        serializer = self.get_serializer()
+        if not isinstance(serializer, SparseFieldsetSerializerMixin):
+            return queryset
+
+        prefetch_lookups = tuple(
+            lookup if isinstance(lookup, str) else lookup.prefetch_through
+            for lookup in queryset._prefetch_related_lookups
+        )
+        columns, prefetches = _model_columns(serializer, queryset.model, prefetch_lookups)
+        if columns is None:
+            return queryset
+
+        # Ordering columns are read by cursor pagination; keep them loaded
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        columns += [name.lstrip('-') for name in ordering if isinstance(name, str)]
+
+        # Prefetch only the relations that are still rendered, with their columns narrowed too
+        narrowed = {prefetch.prefetch_through: prefetch for prefetch in prefetches}
+        rendered = {field.source for field in serializer.fields.values()}
+        lookups = []
+        for lookup in queryset._prefetch_related_lookups:
+            through = lookup if isinstance(lookup, str) else lookup.prefetch_through
+            if through in narrowed:
+                lookups.append(narrowed[through])
+            elif through.split('__')[0] in rendered:
+                lookups.append(lookup)
+
+        return queryset.only(*columns).prefetch_related(None).prefetch_related(*lookups)
@@ -0,0 +1,40 @@
+"""
+Shared test helpers
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountMixin:
+    """
+    Regression checks for N+1 queries
+
+    assertConstantQueries fetches an endpoint, adds more rows, fetches it
+    again and fails if the number of queries grew with the data.
+    """
+
+    def count_queries(self, fetch):
+        with CaptureQueriesContext(connection) as context:
+            response = fetch()
+        self.assertLess(response.status_code, 400, getattr(response, 'data', response))
+        return len(context.captured_queries), [query['sql'] for query in context.captured_queries]
+
+    def assertConstantQueries(self, fetch, add_rows, extra_rows=4):
+        """
+        Args:
+            fetch: Callable making the request (returns a response)
+            add_rows: Callable taking a row count and creating that many rows
+            extra_rows: Rows added between the two fetches
+        """
+        add_rows(1)
+        fetch()  # Warm-up: first requests may lazily create rows (e.g. monthly usage)
+        baseline, _ = self.count_queries(fetch)
+
+        add_rows(extra_rows)
+        grown, queries = self.count_queries(fetch)
+
+        self.assertEqual(
+            baseline, grown,
+            f"Query count grew from {baseline} to {grown} with more rows:\n" + '\n'.join(queries)
+        )
+        return grown